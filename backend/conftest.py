@@ -20,6 +20,8 @@ from rest_framework.test import APIClient
 from rest_framework_simplejwt.tokens import RefreshToken
 from channels.testing import WebsocketCommunicator
 from matcher.consumers import NotificationConsumer
+from matcher.near_cache import clear_near_caches
+from matcher.cache_metrics import cache_metrics
 from matcher.models import User, JobSeekerProfile, RecruiterProfile
 from factories import (
     UserFactory, 
@@ -210,6 +212,18 @@ def enable_db_access_for_all_tests(db):
     pass
 
 
+@pytest.fixture(autouse=True)
+def reset_near_caches():
+    """Start every test without values near-cached by earlier tests."""
+    clear_near_caches()
+
+
+@pytest.fixture(autouse=True)
+def reset_cache_metrics():
+    """Start every test with empty per-prefix cache counters."""
+    cache_metrics.reset()
+
+
 @pytest.fixture
 def disable_migrations():
     """Disable migrations for faster test execution."""
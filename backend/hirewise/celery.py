@@ -40,8 +40,18 @@ app.conf.update(
         'matcher.tasks.generate_resume_insights_task': {'queue': 'ai_processing'},
         'matcher.tasks.cleanup_old_analysis_results_task': {'queue': 'maintenance'},
         'matcher.tasks.cleanup_old_files_task': {'queue': 'maintenance'},
+        'matcher.tasks.cleanup_expired_exports_task': {'queue': 'maintenance'},
         'matcher.tasks.send_notification_task': {'queue': 'notifications'},
         'matcher.tasks.batch_send_notifications_task': {'queue': 'notifications'},
+        'matcher.tasks.fan_out_job_posted_notifications_task': {'queue': 'notifications'},
+        'matcher.tasks.create_job_posted_notifications_task': {'queue': 'notifications'},
+        'matcher.tasks.flush_search_events_task': {'queue': 'maintenance'},
+        'matcher.tasks.flush_job_view_events_task': {'queue': 'maintenance'},
+        'matcher.tasks.build_job_analytics_rollups_task': {'queue': 'maintenance'},
+        'matcher.tasks.reconcile_job_search_documents_task': {'queue': 'maintenance'},
+        'matcher.tasks.reconcile_dashboard_counters_task': {'queue': 'maintenance'},
+        'matcher.tasks.refresh_system_stats_task': {'queue': 'maintenance'},
+        'matcher.tasks.warm_caches_task': {'queue': 'maintenance'},
     },
     
     # Worker configuration
@@ -79,10 +89,42 @@ app.conf.update(
             'schedule': 24 * 60 * 60,  # Run daily
             'args': (365,),  # Clean up files older than 365 days
         },
+        'cleanup-expired-exports': {
+            'task': 'matcher.tasks.cleanup_expired_exports_task',
+            'schedule': 60 * 60,  # Run hourly
+        },
         'health-check': {
             'task': 'matcher.tasks.health_check_task',
             'schedule': 5 * 60,  # Run every 5 minutes
         },
+        'flush-search-events': {
+            'task': 'matcher.tasks.flush_search_events_task',
+            'schedule': getattr(settings, 'SEARCH_EVENTS', {}).get('FLUSH_INTERVAL', 30),
+        },
+        'flush-job-view-events': {
+            'task': 'matcher.tasks.flush_job_view_events_task',
+            'schedule': getattr(settings, 'JOB_VIEW_EVENTS', {}).get('FLUSH_INTERVAL', 30),
+        },
+        'build-job-analytics-rollups': {
+            'task': 'matcher.tasks.build_job_analytics_rollups_task',
+            'schedule': getattr(settings, 'ANALYTICS_ROLLUPS', {}).get('ROLLUP_INTERVAL', 5 * 60),
+        },
+        'reconcile-job-search-documents': {
+            'task': 'matcher.tasks.reconcile_job_search_documents_task',
+            'schedule': getattr(settings, 'SEARCH_DOCUMENTS', {}).get('RECONCILE_INTERVAL', 15 * 60),
+        },
+        'reconcile-dashboard-counters': {
+            'task': 'matcher.tasks.reconcile_dashboard_counters_task',
+            'schedule': getattr(settings, 'DASHBOARD_COUNTERS', {}).get('RECONCILE_INTERVAL', 60 * 60),
+        },
+        'refresh-system-stats': {
+            'task': 'matcher.tasks.refresh_system_stats_task',
+            'schedule': getattr(settings, 'SYSTEM_STATS', {}).get('SNAPSHOT_INTERVAL', 60),
+        },
+        'warm-caches': {
+            'task': 'matcher.tasks.warm_caches_task',
+            'schedule': getattr(settings, 'CACHE_WARMING', {}).get('SCHEDULE_INTERVAL', 30 * 60),
+        },
     },
 )
 
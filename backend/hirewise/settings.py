@@ -174,10 +174,10 @@ REST_FRAMEWORK = {
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 20,
     "DEFAULT_RENDERER_CLASSES": [
-        "rest_framework.renderers.JSONRenderer",
+        "matcher.renderers.FastJSONRenderer",
     ],
     "DEFAULT_PARSER_CLASSES": [
-        "rest_framework.parsers.JSONParser",
+        "matcher.parsers.FastJSONParser",
         "rest_framework.parsers.MultiPartParser",
         "rest_framework.parsers.FormParser",
     ],
@@ -310,6 +310,149 @@ CACHE_OPTIMIZATION = {
     'SHORT_CACHE_TIMEOUT': config('SHORT_CACHE_TIMEOUT', default=60, cast=int),
 }
 
+# Single-flight recomputation and stale-while-revalidate for cached API responses
+CACHE_COALESCING = {
+    'LOCK_TIMEOUT': config('CACHE_COALESCING_LOCK_TIMEOUT', default=30, cast=int),  # seconds
+    'WAIT_TIMEOUT': config('CACHE_COALESCING_WAIT_TIMEOUT', default=5.0, cast=float),  # seconds
+    'EARLY_EXPIRATION_BETA': config('CACHE_EARLY_EXPIRATION_BETA', default=1.0, cast=float),
+    'REFRESH_WORKERS': config('CACHE_REFRESH_WORKERS', default=4, cast=int),
+}
+
+# Per-process LRU in front of the shared cache for hot, rarely-changing prefixes
+NEAR_CACHE = {
+    'PREFIXES': config(
+        'NEAR_CACHE_PREFIXES',
+        default='skills:list,notifications:templates,resume:template-categories'
+    ).split(','),
+    'MAX_ENTRIES': config('NEAR_CACHE_MAX_ENTRIES', default=1000, cast=int),
+    'TIMEOUT': config('NEAR_CACHE_TIMEOUT', default=60, cast=int),  # seconds
+    'POLL_INTERVAL': config('NEAR_CACHE_POLL_INTERVAL', default=1.0, cast=float),  # seconds
+}
+
+# Values pickled to at least COMPRESS_MIN_BYTES are zlib-compressed before they are cached
+CACHE_CODEC = {
+    'COMPRESS_MIN_BYTES': config('CACHE_COMPRESS_MIN_BYTES', default=1024, cast=int),
+    'COMPRESSION_LEVEL': config('CACHE_COMPRESSION_LEVEL', default=6, cast=int),
+}
+
+# Per-prefix cache hit/miss counters, aggregated across workers in Redis
+CACHE_METRICS = {
+    'ENABLED': config('CACHE_METRICS_ENABLED', default=True, cast=bool),
+    'FLUSH_INTERVAL': config('CACHE_METRICS_FLUSH_INTERVAL', default=10, cast=int),  # seconds
+    'TTL': config('CACHE_METRICS_TTL', default=7 * 24 * 3600, cast=int),  # seconds
+}
+
+# OptimizedPaginator reports the planner's estimate for results at least this large,
+# and caches exact counts of smaller ones for CACHE_TIMEOUT seconds
+PAGINATION_COUNT = {
+    'ESTIMATE_THRESHOLD': config('PAGINATION_COUNT_ESTIMATE_THRESHOLD', default=10000, cast=int),
+    'CACHE_TIMEOUT': config('PAGINATION_COUNT_CACHE_TIMEOUT', default=60, cast=int),  # seconds
+}
+
+# Cache warming from recent traffic, on deploy (manage.py warm_cache) and on a beat schedule
+CACHE_WARMING = {
+    'CONCURRENCY': config('CACHE_WARMING_CONCURRENCY', default=4, cast=int),
+    'TOP_SEARCHES': config('CACHE_WARMING_TOP_SEARCHES', default=50, cast=int),  # per search type
+    'SEARCH_WINDOW_DAYS': config('CACHE_WARMING_SEARCH_WINDOW_DAYS', default=7, cast=int),
+    'ACTIVE_USERS': config('CACHE_WARMING_ACTIVE_USERS', default=200, cast=int),  # per user type
+    'ACTIVE_WITHIN_DAYS': config('CACHE_WARMING_ACTIVE_WITHIN_DAYS', default=7, cast=int),
+    'POPULAR_JOBS': config('CACHE_WARMING_POPULAR_JOBS', default=50, cast=int),
+    'SCHEDULE_INTERVAL': config('CACHE_WARMING_SCHEDULE_INTERVAL', default=30 * 60, cast=int),  # seconds
+}
+
+# Job-posted notification fan-out to relevant job seekers, in chunk tasks
+NOTIFICATION_FANOUT = {
+    'CHUNK_SIZE': config('NOTIFICATION_FANOUT_CHUNK_SIZE', default=1000, cast=int),  # recipients per task
+    'LOCATION_RADIUS_KM': config('NOTIFICATION_FANOUT_LOCATION_RADIUS_KM', default=50, cast=float),
+}
+
+# Batched real-time delivery of bulk notifications
+NOTIFICATION_DELIVERY = {
+    'BULK_SEND_CONCURRENCY': config('NOTIFICATION_BULK_SEND_CONCURRENCY', default=100, cast=int),
+}
+
+# Per-user Redis streams of notifications queued for offline users
+NOTIFICATION_STREAM = {
+    'MAX_LENGTH': config('NOTIFICATION_STREAM_MAX_LENGTH', default=100, cast=int),  # entries kept per user
+    'TTL': config('NOTIFICATION_STREAM_TTL', default=604800, cast=int),  # seconds
+    'REPLAY_LIMIT': config('NOTIFICATION_STREAM_REPLAY_LIMIT', default=500, cast=int),  # entries per replay batch
+}
+
+# Shared WebSocket presence, so workers can tell who is connected
+WEBSOCKET_PRESENCE = {
+    'TTL': config('WEBSOCKET_PRESENCE_TTL', default=90, cast=int),  # seconds without a refresh before a channel counts as gone
+    'REFRESH_INTERVAL': config('WEBSOCKET_PRESENCE_REFRESH_INTERVAL', default=30, cast=int),  # seconds between heartbeat refreshes
+}
+
+# Search result caching
+SEARCH_CACHE_TIMEOUT = config('SEARCH_CACHE_TIMEOUT', default=1800, cast=int)  # shared result-ID layer
+SEARCH_PERSONALIZATION_CACHE_TIMEOUT = config('SEARCH_PERSONALIZATION_CACHE_TIMEOUT', default=300, cast=int)
+
+# Search analytics event pipeline
+SEARCH_EVENTS = {
+    'FLUSH_INTERVAL': config('SEARCH_EVENTS_FLUSH_INTERVAL', default=30, cast=int),  # seconds
+    'FLUSH_BATCH_SIZE': config('SEARCH_EVENTS_FLUSH_BATCH_SIZE', default=1000, cast=int),
+    'MAX_BUFFER_LENGTH': config('SEARCH_EVENTS_MAX_BUFFER_LENGTH', default=100000, cast=int),
+    'DEAD_LETTER_MAX_LENGTH': config('SEARCH_EVENTS_DEAD_LETTER_MAX_LENGTH', default=10000, cast=int),
+}
+
+# Buffered job view tracking
+JOB_VIEW_EVENTS = {
+    'FLUSH_INTERVAL': config('JOB_VIEW_EVENTS_FLUSH_INTERVAL', default=30, cast=int),  # seconds
+    'FLUSH_BATCH_SIZE': config('JOB_VIEW_EVENTS_FLUSH_BATCH_SIZE', default=2000, cast=int),
+    'MAX_BUFFER_LENGTH': config('JOB_VIEW_EVENTS_MAX_BUFFER_LENGTH', default=200000, cast=int),
+}
+
+# CSV exports: larger exports run in the background and are stored gzip-compressed
+EXPORTS = {
+    'CHUNK_SIZE': config('EXPORTS_CHUNK_SIZE', default=2000, cast=int),
+    'ASYNC_THRESHOLD': config('EXPORTS_ASYNC_THRESHOLD', default=50000, cast=int),  # rows
+    'STORAGE_PREFIX': config('EXPORTS_STORAGE_PREFIX', default='exports'),
+    # Private root outside MEDIA_ROOT; files are served only by the signed download view
+    'STORAGE_ROOT': config('EXPORTS_STORAGE_ROOT', default=str(BASE_DIR / 'private_media')),
+    'RETENTION': config('EXPORTS_RETENTION', default=24 * 3600, cast=int),  # seconds
+}
+
+# Recruiter application analytics cache (0 disables); invalidated by application changes
+APPLICATION_ANALYTICS_CACHE_TIMEOUT = config('APPLICATION_ANALYTICS_CACHE_TIMEOUT', default=1800, cast=int)  # seconds
+
+# Hourly/daily job analytics rollups
+ANALYTICS_ROLLUPS = {
+    'ROLLUP_INTERVAL': config('ANALYTICS_ROLLUP_INTERVAL', default=300, cast=int),  # seconds
+    'LATE_ARRIVAL_GRACE': config('ANALYTICS_ROLLUP_LATE_ARRIVAL_GRACE', default=300, cast=int),  # seconds
+    'HOURLY_RETENTION_DAYS': config('ANALYTICS_ROLLUP_HOURLY_RETENTION_DAYS', default=90, cast=int),
+    'MAX_SERIES_BUCKETS': config('ANALYTICS_ROLLUP_MAX_SERIES_BUCKETS', default=1000, cast=int),
+}
+
+# Denormalized job search documents
+SEARCH_DOCUMENTS = {
+    'RECONCILE_INTERVAL': config('SEARCH_DOCUMENTS_RECONCILE_INTERVAL', default=900, cast=int),  # seconds
+    'RECONCILE_BATCH_SIZE': config('SEARCH_DOCUMENTS_RECONCILE_BATCH_SIZE', default=500, cast=int),
+}
+
+# Per-user dashboard counters, kept by signals and recounted periodically
+DASHBOARD_COUNTERS = {
+    'RECONCILE_INTERVAL': config('DASHBOARD_COUNTERS_RECONCILE_INTERVAL', default=3600, cast=int),  # seconds
+    'RECONCILE_BATCH_SIZE': config('DASHBOARD_COUNTERS_RECONCILE_BATCH_SIZE', default=500, cast=int),
+}
+
+# Admin statistics snapshot, recomputed by a beat task and pushed to admin dashboards
+SYSTEM_STATS = {
+    'SNAPSHOT_INTERVAL': config('SYSTEM_STATS_SNAPSHOT_INTERVAL', default=60, cast=int),  # seconds
+    'DAILY_SERIES_DAYS': config('SYSTEM_STATS_DAILY_SERIES_DAYS', default=90, cast=int),
+}
+
+# JSON encoding for API responses, WebSocket messages and structured logs
+JSON_BACKEND = {
+    'ENGINE': config('JSON_BACKEND_ENGINE', default='orjson'),  # 'orjson' (when installed) or 'json'
+}
+
+# Gazetteer-backed location matching
+GEO_MATCHING = {
+    'DEFAULT_RADIUS_KM': config('GEO_DEFAULT_RADIUS_KM', default=50, cast=float),
+    'MAX_RADIUS_KM': config('GEO_MAX_RADIUS_KM', default=500, cast=float),
+}
+
 # Celery Configuration
 CELERY_BROKER_URL = config('CELERY_BROKER_URL', default=f'redis://{":" + REDIS_PASSWORD + "@" if REDIS_PASSWORD else ""}{REDIS_HOST}:{REDIS_PORT}/1')
 CELERY_RESULT_BACKEND = config('CELERY_RESULT_BACKEND', default=f'redis://{":" + REDIS_PASSWORD + "@" if REDIS_PASSWORD else ""}{REDIS_HOST}:{REDIS_PORT}/2')
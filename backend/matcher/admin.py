@@ -21,6 +21,9 @@ from .models import (
     JobAnalytics, JobView, Notification, NotificationPreference,
     NotificationTemplate
 )
+from .search_documents import sync_job_search_documents
+from .dashboard_counters import rebuild_dashboard_counters
+from .cache_utils import AnalyticsCacheManager
 
 
 # Custom Filters
@@ -544,28 +547,42 @@ class JobPostAdmin(admin.ModelAdmin):
 
     # Bulk Actions
     def activate_jobs(self, request, queryset):
+        job_ids = list(queryset.values_list('id', flat=True))
+        recruiter_ids = set(queryset.values_list('recruiter_id', flat=True))
         updated = queryset.update(is_active=True)
+        sync_job_search_documents(job_ids)
+        rebuild_dashboard_counters(recruiter_ids)
         self.message_user(request, f'{updated} jobs activated successfully.')
     activate_jobs.short_description = "Activate selected jobs"
 
     def deactivate_jobs(self, request, queryset):
+        job_ids = list(queryset.values_list('id', flat=True))
+        recruiter_ids = set(queryset.values_list('recruiter_id', flat=True))
         updated = queryset.update(is_active=False)
+        sync_job_search_documents(job_ids)
+        rebuild_dashboard_counters(recruiter_ids)
         self.message_user(request, f'{updated} jobs deactivated successfully.')
     deactivate_jobs.short_description = "Deactivate selected jobs"
 
     def mark_featured(self, request, queryset):
+        job_ids = list(queryset.values_list('id', flat=True))
         updated = queryset.update(is_featured=True)
+        sync_job_search_documents(job_ids)
         self.message_user(request, f'{updated} jobs marked as featured.')
     mark_featured.short_description = "Mark as featured"
 
     def unmark_featured(self, request, queryset):
+        job_ids = list(queryset.values_list('id', flat=True))
         updated = queryset.update(is_featured=False)
+        sync_job_search_documents(job_ids)
         self.message_user(request, f'{updated} jobs unmarked as featured.')
     unmark_featured.short_description = "Remove featured status"
 
     def bulk_extend_deadline(self, request, queryset):
         new_deadline = timezone.now() + timedelta(days=30)
+        job_ids = list(queryset.values_list('id', flat=True))
         updated = queryset.update(application_deadline=new_deadline)
+        sync_job_search_documents(job_ids)
         self.message_user(request, f'{updated} job deadlines extended by 30 days.')
     bulk_extend_deadline.short_description = "Extend deadline by 30 days"
 
@@ -731,18 +748,35 @@ class ApplicationAdmin(admin.ModelAdmin):
     application_details.short_description = 'Application Details'
 
     # Bulk Actions
+    def _application_users(self, queryset):
+        return list(queryset.values_list('job_post__recruiter_id', 'job_seeker_id').distinct())
+
+    def _after_bulk_status_change(self, users):
+        # queryset.update() skips signals; invalidate cached application analytics
+        # and recount dashboard counters here
+        recruiter_ids = {recruiter_id for recruiter_id, _ in users}
+        for recruiter_id in recruiter_ids:
+            AnalyticsCacheManager.bump_application_generation(recruiter_id)
+        rebuild_dashboard_counters(recruiter_ids | {job_seeker_id for _, job_seeker_id in users})
+
     def mark_reviewed(self, request, queryset):
+        users = self._application_users(queryset)
         updated = queryset.update(status='reviewed')
+        self._after_bulk_status_change(users)
         self.message_user(request, f'{updated} applications marked as reviewed.')
     mark_reviewed.short_description = "Mark as reviewed"
 
     def mark_shortlisted(self, request, queryset):
+        users = self._application_users(queryset)
         updated = queryset.update(status='shortlisted')
+        self._after_bulk_status_change(users)
         self.message_user(request, f'{updated} applications shortlisted.')
     mark_shortlisted.short_description = "Mark as shortlisted"
 
     def mark_rejected(self, request, queryset):
+        users = self._application_users(queryset)
         updated = queryset.update(status='rejected')
+        self._after_bulk_status_change(users)
         self.message_user(request, f'{updated} applications rejected.')
     mark_rejected.short_description = "Mark as rejected"
 
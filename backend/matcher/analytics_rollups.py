@@ -0,0 +1,328 @@
+"""
+Time-bucketed job analytics rollups for HireWise backend.
+
+A scheduled task folds raw JobView and Application rows into hourly buckets
+per job (views, unique viewers, applications, referrer hosts) and sums the
+hourly buckets of each touched day into its daily bucket. Each run starts
+from a high-water mark and recomputes only the hours still open to new rows
+(those ending after the mark minus the late-arrival grace), so reruns are
+idempotent, late rows inside the grace window are picked up, and raw rows
+are read once per hour rather than once per day. Analytics endpoints answer any time range from at most one
+daily row per whole day plus hourly rows for the partial days at the edges.
+"""
+
+import logging
+from collections import Counter, defaultdict
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Max, Min, Q
+from django.db.models.functions import TruncHour
+from django.utils import timezone
+
+from .models import Application, JobAnalyticsDaily, JobAnalyticsHourly, JobView
+
+logger = logging.getLogger(__name__)
+
+ANALYTICS_ROLLUPS_CONFIG = getattr(settings, 'ANALYTICS_ROLLUPS', {})
+
+HIGH_WATER_MARK_KEY = 'analytics_rollups:high_water_mark'
+LATE_ARRIVAL_GRACE = timedelta(seconds=ANALYTICS_ROLLUPS_CONFIG.get('LATE_ARRIVAL_GRACE', 300))
+HOURLY_RETENTION = timedelta(days=ANALYTICS_ROLLUPS_CONFIG.get('HOURLY_RETENTION_DAYS', 90))
+MAX_SERIES_BUCKETS = ANALYTICS_ROLLUPS_CONFIG.get('MAX_SERIES_BUCKETS', 1000)
+
+HOUR = timedelta(hours=1)
+DAY = timedelta(days=1)
+
+GRANULARITIES = {
+    'hour': (JobAnalyticsHourly, HOUR),
+    'day': (JobAnalyticsDaily, DAY),
+}
+
+ROLLUP_FIELDS = ['views', 'unique_viewers', 'applications', 'referrers', 'updated_at']
+
+
+def floor_bucket(value: datetime, granularity: str) -> datetime:
+    """
+    Start of the UTC hour or day containing value
+    """
+    value = value.astimezone(dt_timezone.utc)
+    if granularity == 'day':
+        return datetime.combine(value.date(), time.min, tzinfo=dt_timezone.utc)
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+def ceil_bucket(value: datetime, granularity: str) -> datetime:
+    """
+    Start of the first UTC hour or day at or after value
+    """
+    floor = floor_bucket(value, granularity)
+    return floor if floor == value else floor + GRANULARITIES[granularity][1]
+
+
+def referrer_host(referrer: str) -> str:
+    if not referrer:
+        return 'direct'
+    return urlparse(referrer).netloc.lower() or 'direct'
+
+
+def build_job_analytics_rollups(now: Optional[datetime] = None) -> Dict[str, Any]:
+    """
+    Fold raw views and applications recorded since the high-water mark into rollups.
+
+    Works through one UTC day at a time and advances the mark after each day,
+    so a first run over a long history can be interrupted and resumed.
+    """
+    now = now or timezone.now()
+    mark = get_high_water_mark()
+    if mark is None:
+        logger.info("No job views or applications to roll up yet")
+        return {'hourly_buckets': 0, 'daily_buckets': 0, 'days': 0, 'high_water_mark': None}
+
+    hour_start = floor_bucket(mark - LATE_ARRIVAL_GRACE, 'hour')
+    day_start = floor_bucket(hour_start, 'day')
+
+    hourly_buckets = daily_buckets = days = 0
+    while day_start < now:
+        day_end = min(day_start + DAY, now)
+        with transaction.atomic():
+            hourly_buckets += _rebuild_hourly_buckets(max(day_start, hour_start), day_end)
+            daily_buckets += _rebuild_daily_buckets(day_start)
+        _set_high_water_mark(day_end)
+        day_start += DAY
+        days += 1
+
+    pruned, _ = JobAnalyticsHourly.objects.filter(bucket_start__lt=now - HOURLY_RETENTION).delete()
+
+    logger.info(
+        f"Rolled up job analytics from {hour_start.isoformat()}: "
+        f"{hourly_buckets} hourly and {daily_buckets} daily buckets, {pruned} hourly pruned"
+    )
+    return {
+        'hourly_buckets': hourly_buckets,
+        'daily_buckets': daily_buckets,
+        'hourly_pruned': pruned,
+        'days': days,
+        'high_water_mark': now.isoformat(),
+    }
+
+
+def get_high_water_mark() -> Optional[datetime]:
+    """
+    Time up to which raw rows have been rolled up.
+
+    Kept in the cache; if it is lost the latest hourly bucket (or, before the
+    first run, the oldest raw row) is used, which only costs recomputing buckets.
+    """
+    value = cache.get(HIGH_WATER_MARK_KEY)
+    if value:
+        return datetime.fromisoformat(value)
+
+    latest_bucket = JobAnalyticsHourly.objects.aggregate(latest=Max('bucket_start'))['latest']
+    if latest_bucket is not None:
+        return latest_bucket
+
+    earliest = [
+        JobView.objects.aggregate(earliest=Min('viewed_at'))['earliest'],
+        Application.objects.aggregate(earliest=Min('applied_at'))['earliest'],
+    ]
+    earliest = [value for value in earliest if value is not None]
+    return min(earliest) if earliest else None
+
+
+def _set_high_water_mark(value: datetime) -> None:
+    cache.set(HIGH_WATER_MARK_KEY, value.isoformat(), None)
+
+
+def _rebuild_hourly_buckets(start: datetime, end: datetime) -> int:
+    """
+    Recompute every hourly bucket overlapping [start, end) from the raw rows
+    """
+    start = floor_bucket(start, 'hour')
+    end = ceil_bucket(end, 'hour')
+
+    views = JobView.objects.filter(viewed_at__gte=start, viewed_at__lt=end).annotate(
+        bucket=TruncHour('viewed_at', tzinfo=dt_timezone.utc)
+    )
+    applications = Application.objects.filter(applied_at__gte=start, applied_at__lt=end).annotate(
+        bucket=TruncHour('applied_at', tzinfo=dt_timezone.utc)
+    )
+
+    buckets = defaultdict(lambda: {
+        'views': 0, 'unique_viewers': 0, 'applications': 0, 'referrers': Counter()
+    })
+    for row in views.values('job_post_id', 'bucket').annotate(
+        total=Count('id'), unique=Count('ip_address', distinct=True)
+    ).order_by():
+        bucket = buckets[(row['job_post_id'], row['bucket'])]
+        bucket['views'] = row['total']
+        bucket['unique_viewers'] = row['unique']
+    for row in views.values('job_post_id', 'bucket', 'referrer').annotate(total=Count('id')).order_by():
+        buckets[(row['job_post_id'], row['bucket'])]['referrers'][referrer_host(row['referrer'])] += row['total']
+    for row in applications.values('job_post_id', 'bucket').annotate(total=Count('id')).order_by():
+        buckets[(row['job_post_id'], row['bucket'])]['applications'] = row['total']
+
+    return _upsert_buckets(JobAnalyticsHourly, buckets)
+
+
+def _rebuild_daily_buckets(day_start: datetime) -> int:
+    """
+    Recompute the daily buckets of one UTC day by summing its hourly buckets.
+
+    A viewer seen in several hours of the day counts once per hour towards
+    unique_viewers, since the hourly buckets keep no viewer identities.
+    """
+    buckets = defaultdict(lambda: {
+        'views': 0, 'unique_viewers': 0, 'applications': 0, 'referrers': Counter()
+    })
+    for row in JobAnalyticsHourly.objects.filter(
+        bucket_start__gte=day_start, bucket_start__lt=day_start + DAY
+    ).values('job_post_id', 'views', 'unique_viewers', 'applications', 'referrers').order_by():
+        bucket = buckets[(row['job_post_id'], day_start)]
+        bucket['views'] += row['views']
+        bucket['unique_viewers'] += row['unique_viewers']
+        bucket['applications'] += row['applications']
+        bucket['referrers'].update(row['referrers'] or {})
+
+    return _upsert_buckets(JobAnalyticsDaily, buckets)
+
+
+def _upsert_buckets(model, buckets: Dict) -> int:
+    """
+    Write (job_post_id, bucket_start) -> values rollups, replacing existing rows
+    """
+    if not buckets:
+        return 0
+
+    model.objects.bulk_create(
+        [
+            model(
+                job_post_id=job_post_id,
+                bucket_start=bucket_start,
+                views=values['views'],
+                unique_viewers=values['unique_viewers'],
+                applications=values['applications'],
+                referrers=dict(values['referrers']),
+            )
+            for (job_post_id, bucket_start), values in buckets.items()
+        ],
+        update_conflicts=True,
+        unique_fields=['job_post', 'bucket_start'],
+        update_fields=ROLLUP_FIELDS,
+        batch_size=500,
+    )
+    return len(buckets)
+
+
+def _range_buckets(job_post_id, start: datetime, end: datetime):
+    """
+    Rollup rows covering [start, end): daily rows for whole days, hourly rows for the edges.
+
+    Hourly rows older than the retention window are gone, so edges that old
+    widen to whole days.
+    """
+    hourly_since = ceil_bucket(timezone.now() - HOURLY_RETENTION, 'day')
+    if start < hourly_since:
+        start = floor_bucket(start, 'day')
+    if end < hourly_since:
+        end = ceil_bucket(end, 'day')
+
+    start = floor_bucket(start, 'hour')
+    end = ceil_bucket(end, 'hour')
+    first_day = ceil_bucket(start, 'day')
+    last_day = floor_bucket(end, 'day')
+
+    if first_day >= last_day:
+        return start, end, JobAnalyticsHourly.objects.filter(
+            job_post_id=job_post_id, bucket_start__gte=start, bucket_start__lt=end
+        ), JobAnalyticsDaily.objects.none()
+
+    hourly = JobAnalyticsHourly.objects.filter(job_post_id=job_post_id).filter(
+        Q(bucket_start__gte=start, bucket_start__lt=first_day) |
+        Q(bucket_start__gte=last_day, bucket_start__lt=end)
+    )
+    daily = JobAnalyticsDaily.objects.filter(
+        job_post_id=job_post_id, bucket_start__gte=first_day, bucket_start__lt=last_day
+    )
+    return start, end, hourly, daily
+
+
+def get_job_analytics_range(job_post_id, start: datetime, end: datetime) -> Dict[str, Any]:
+    """
+    Views, applications and referrer hosts for one job over [start, end).
+
+    Boundaries are widened to whole hours. Unique viewers are not additive
+    across buckets and are only reported per bucket by get_job_analytics_series().
+    """
+    start, end, hourly, daily = _range_buckets(job_post_id, start, end)
+
+    views = applications = 0
+    referrers = Counter()
+    for queryset in (hourly, daily):
+        for row in queryset.values('views', 'applications', 'referrers'):
+            views += row['views']
+            applications += row['applications']
+            referrers.update(row['referrers'] or {})
+
+    return {
+        'start': start.isoformat(),
+        'end': end.isoformat(),
+        'views': views,
+        'applications': applications,
+        'conversion_rate': round((applications / views) * 100, 2) if views else 0.0,
+        'top_referrers': dict(referrers.most_common(10)),
+    }
+
+
+def get_job_analytics_series(job_post_id, start: datetime, end: datetime,
+                             granularity: str = 'day') -> List[Dict[str, Any]]:
+    """
+    One entry per hour or day in [start, end), zero-filled where nothing happened.
+
+    Raises ValueError for an unknown granularity or a range longer than MAX_SERIES_BUCKETS.
+    """
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"Unknown granularity '{granularity}', expected one of {sorted(GRANULARITIES)}")
+
+    model, step = GRANULARITIES[granularity]
+    start = floor_bucket(start, granularity)
+    end = ceil_bucket(end, granularity)
+    if (end - start) / step > MAX_SERIES_BUCKETS:
+        raise ValueError(f"Range covers more than {MAX_SERIES_BUCKETS} {granularity} buckets")
+
+    rows = {
+        row['bucket_start']: row
+        for row in model.objects.filter(
+            job_post_id=job_post_id, bucket_start__gte=start, bucket_start__lt=end
+        ).values('bucket_start', 'views', 'unique_viewers', 'applications')
+    }
+
+    series = []
+    bucket_start = start
+    while bucket_start < end:
+        row = rows.get(bucket_start, {})
+        series.append({
+            'bucket_start': bucket_start.isoformat(),
+            'views': row.get('views', 0),
+            'unique_viewers': row.get('unique_viewers', 0),
+            'applications': row.get('applications', 0),
+        })
+        bucket_start += step
+    return series
+
+
+def get_daily_applications(job_post_id, days: int = 30) -> List[Dict[str, Any]]:
+    """
+    Applications per day over the last `days` days, from daily rollups
+    """
+    since = floor_bucket(timezone.now() - timedelta(days=days), 'day')
+    return [
+        {'day': row['bucket_start'].date(), 'applications': row['applications']}
+        for row in JobAnalyticsDaily.objects.filter(
+            job_post_id=job_post_id, bucket_start__gte=since, applications__gt=0
+        ).values('bucket_start', 'applications').order_by('bucket_start')
+    ]
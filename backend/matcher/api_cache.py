@@ -6,7 +6,8 @@ Provides comprehensive caching for REST API endpoints.
 import json
 import hashlib
 import logging
-from typing import Any, Dict, Optional, List, Callable
+import uuid
+from typing import Any, Dict, Optional, List, Callable, Union
 from functools import wraps
 from datetime import timedelta
 
@@ -22,7 +23,13 @@ from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.request import Request
 
-from .cache_utils import cache_manager, CACHE_TIMEOUTS, CACHE_PREFIXES
+from .cache_utils import (
+    cache_manager, coalesced_get_or_set, coalescing_stats, unwrap_cache_entry,
+    metered_get, metered_set, get_cache_metrics,
+    invalidate_tags, tagged_cache_key, job_tag, recruiter_tag, user_tag, resume_tag,
+    CACHE_TIMEOUTS, CACHE_PREFIXES, EARLY_EXPIRATION_BETA, JOB_LIST_TAG, MATCH_SCORE_TAG, RECOMMENDATIONS_TAG
+)
+from .near_cache import get_near_cache
 
 logger = logging.getLogger(__name__)
 
@@ -81,19 +88,27 @@ class APICacheManager:
             'headers': headers or {},
         }
         
-        return cache.set(cache_key, cache_data, timeout)
+        return metered_set(APICacheManager._endpoint(cache_key), cache_key, cache_data, timeout)
     
     @staticmethod
     def get_cached_api_response(cache_key: str) -> Optional[Dict]:
         """
         Get cached API response with metadata.
         """
-        return cache.get(cache_key)
+        return unwrap_cache_entry(metered_get(APICacheManager._endpoint(cache_key), cache_key))
+    
+    @staticmethod
+    def _endpoint(cache_key: str) -> str:
+        # Keys look like api:<endpoint>:...; stats are kept per endpoint like api_cache's
+        return ':'.join(cache_key.split(':')[:2])
     
     @staticmethod
     def invalidate_api_cache_pattern(pattern: str) -> int:
         """
         Invalidate API cache entries matching pattern.
+        
+        Scans the keyspace; data changes should use CacheInvalidationManager,
+        which invalidates tags instead.
         """
         return cache_manager.delete_pattern(f"api:{pattern}")
 
@@ -104,11 +119,26 @@ def api_cache(
     vary_on_user: bool = True,
     vary_on_params: List[str] = None,
     cache_anonymous_only: bool = False,
-    cache_authenticated_only: bool = False
+    cache_authenticated_only: bool = False,
+    tags: Optional[Union[List[str], Callable]] = None,
+    stale_timeout: int = 0,
+    early_expiration_beta: float = EARLY_EXPIRATION_BETA,
+    coalesce: bool = True,
+    local_cache: bool = False
 ):
     """
     Decorator for caching API responses.
     
+    Concurrent misses for the same key run the view once; the other requests
+    wait for its response (see coalesced_get_or_set). Stale and early
+    refreshes re-render the view in the request that takes the refresh lock,
+    never on a background thread: the view needs a live request, and the one
+    that found the stale entry has already been answered by then.
+    
+    Responses are stored under cache tags and dropped by invalidating any of
+    them. Responses that vary on the user are tagged user:{id}, and also
+    recruiter:{id} for recruiters.
+    
     Args:
         timeout: Cache timeout in seconds
         key_func: Custom function to generate cache key
@@ -116,6 +146,12 @@ def api_cache(
         vary_on_params: List of query parameters to include in cache key
         cache_anonymous_only: Only cache for anonymous users
         cache_authenticated_only: Only cache for authenticated users
+        tags: Tag templates formatted with the view's URL kwargs (e.g. 'job:{pk}'),
+            or a function of (request, *args, **kwargs) returning tags
+        stale_timeout: Seconds an expired response is served to other requests while one request refreshes it
+        early_expiration_beta: Probabilistic early refresh strength, 0 to disable
+        coalesce: Make concurrent misses wait for a single view call
+        local_cache: Keep responses in the per-process near cache as well
     """
     def decorator(view_func):
         @wraps(view_func)
@@ -127,6 +163,9 @@ def api_cache(
             if cache_authenticated_only and not request.user.is_authenticated:
                 return view_func(request, *args, **kwargs)
             
+            resolver_match = getattr(request, 'resolver_match', None)
+            endpoint = (resolver_match.url_name if resolver_match else None) or 'unknown'
+            
             # Generate cache key
             if key_func:
                 cache_key = key_func(request, *args, **kwargs)
@@ -138,47 +177,77 @@ def api_cache(
                     query_params = {k: v for k, v in query_params.items() if k in vary_on_params}
                 
                 cache_key = APICacheManager.generate_api_cache_key(
-                    endpoint=request.resolver_match.url_name or 'unknown',
+                    endpoint=endpoint,
                     method=request.method,
                     user_id=user_id,
                     query_params=query_params,
                     path_params=kwargs
                 )
             
-            # Try to get from cache
-            cached_response = APICacheManager.get_cached_api_response(cache_key)
-            if cached_response:
-                response = Response(cached_response['data'])
-                
-                # Add cache headers
-                response['X-Cache'] = 'HIT'
-                response['X-Cache-Key'] = cache_key
-                response['X-Cached-At'] = cached_response['cached_at']
-                
-                # Add any custom headers
-                for header, value in cached_response.get('headers', {}).items():
-                    response[header] = value
-                
-                return response
+            if callable(tags):
+                entry_tags = list(tags(request, *args, **kwargs))
+            else:
+                entry_tags = [tag.format(**kwargs) for tag in (tags or [])]
+            if vary_on_user and request.user.is_authenticated:
+                entry_tags.append(user_tag(request.user.id))
+                if getattr(request.user, 'user_type', None) == 'recruiter':
+                    entry_tags.append(recruiter_tag(request.user.id))
+            cache_key = tagged_cache_key(cache_key, entry_tags)
             
-            # Execute view and cache response
-            response = view_func(request, *args, **kwargs)
+            computed = {}
             
-            # Only cache successful responses
-            if response.status_code == 200:
-                headers = {
-                    'Content-Type': response.get('Content-Type', 'application/json'),
+            def render_view():
+                # Only cache successful responses
+                response = view_func(request, *args, **kwargs)
+                computed['response'] = response
+                if response.status_code != 200:
+                    return None
+                return {
+                    'data': response.data,
+                    'cached_at': timezone.now().isoformat(),
+                    'headers': {
+                        'Content-Type': response.get('Content-Type', 'application/json'),
+                    },
                 }
-                
-                APICacheManager.cache_api_response(
+            
+            lookup = {'state': 'local'}
+            
+            def get_shared():
+                cached, lookup['state'] = coalesced_get_or_set(
                     cache_key,
-                    response.data,
+                    render_view,
                     timeout,
-                    headers
+                    name=f"api:{endpoint}",
+                    stale_timeout=stale_timeout,
+                    early_expiration_beta=early_expiration_beta,
+                    coalesce=coalesce,
+                    background_refresh=False
                 )
-                
-                response['X-Cache'] = 'MISS'
-                response['X-Cache-Key'] = cache_key
+                if near_cache is not None:
+                    near_cache.record('shared_misses' if lookup['state'] == 'miss' else 'shared_hits')
+                return cached
+            
+            near_cache = get_near_cache(f"api:{endpoint}", enabled=True) if local_cache else None
+            cached_response = near_cache.get(cache_key, get_shared) if near_cache else get_shared()
+            state = lookup['state']
+            
+            if state == 'miss':
+                response = computed['response']
+                if cached_response is not None:
+                    response['X-Cache'] = 'MISS'
+                    response['X-Cache-Key'] = cache_key
+                return response
+            
+            response = Response(cached_response['data'])
+            
+            # Add cache headers: LOCAL, HIT, STALE or COALESCED
+            response['X-Cache'] = state.upper()
+            response['X-Cache-Key'] = cache_key
+            response['X-Cached-At'] = cached_response['cached_at']
+            
+            # Add any custom headers
+            for header, value in cached_response.get('headers', {}).items():
+                response[header] = value
             
             return response
         
@@ -206,89 +275,72 @@ def conditional_cache(condition_func: Callable):
 class CacheInvalidationManager:
     """
     Manages cache invalidation for different types of data changes.
+    
+    Each change invalidates the cache tags of the data it touches; see
+    cache_utils.invalidate_tags.
     """
     
     @staticmethod
     def invalidate_job_caches(job_id: Optional[str] = None, recruiter_id: Optional[str] = None):
         """
-        Invalidate job-related API caches.
+        Invalidate job lists and searches, the job's own caches and the recruiter's.
         """
-        patterns = [
-            'jobs:*',
-            'job-list:*',
-            'job-search:*',
-            'recommendations:*',
-        ]
-        
-        if job_id:
-            patterns.extend([
-                f'job-detail:*:{job_id}',
-                f'job-analytics:*:{job_id}',
-            ])
-        
-        if recruiter_id:
-            patterns.extend([
-                f'recruiter-jobs:*:user:{recruiter_id}',
-                f'dashboard:*:user:{recruiter_id}',
-            ])
-        
-        for pattern in patterns:
-            APICacheManager.invalidate_api_cache_pattern(pattern)
+        invalidate_tags(
+            JOB_LIST_TAG,
+            RECOMMENDATIONS_TAG,
+            job_tag(job_id) if job_id else None,
+            recruiter_tag(recruiter_id) if recruiter_id else None,
+        )
     
     @staticmethod
     def invalidate_user_caches(user_id: str):
         """
         Invalidate user-related API caches.
         """
-        patterns = [
-            f'*:user:{user_id}',
-            f'profile:*:{user_id}',
-            f'applications:*:user:{user_id}',
-            f'dashboard:*:user:{user_id}',
-        ]
-        
-        for pattern in patterns:
-            APICacheManager.invalidate_api_cache_pattern(pattern)
+        invalidate_tags(user_tag(user_id))
     
     @staticmethod
-    def invalidate_application_caches(application_id: str, job_seeker_id: str, recruiter_id: str):
+    def invalidate_application_caches(application_id: Optional[str] = None, job_seeker_id: Optional[str] = None,
+                                      recruiter_id: Optional[str] = None, job_id: Optional[str] = None):
         """
         Invalidate application-related API caches.
+        
+        Missing job seeker, recruiter and job IDs are looked up from the application.
         """
-        patterns = [
-            f'applications:*:user:{job_seeker_id}',
-            f'applications:*:user:{recruiter_id}',
-            f'dashboard:*:user:{job_seeker_id}',
-            f'dashboard:*:user:{recruiter_id}',
-            f'analytics:*',
-        ]
+        if application_id and not (job_seeker_id and recruiter_id and job_id):
+            from .models import Application
+            
+            application = Application.objects.filter(id=application_id).values(
+                'job_seeker_id', 'job_post_id', 'job_post__recruiter_id'
+            ).first()
+            if application:
+                job_seeker_id = job_seeker_id or application['job_seeker_id']
+                recruiter_id = recruiter_id or application['job_post__recruiter_id']
+                job_id = job_id or application['job_post_id']
         
-        for pattern in patterns:
-            APICacheManager.invalidate_api_cache_pattern(pattern)
+        invalidate_tags(
+            'analytics',
+            user_tag(job_seeker_id) if job_seeker_id else None,
+            recruiter_tag(recruiter_id) if recruiter_id else None,
+            job_tag(job_id) if job_id else None,
+        )
     
     @staticmethod
     def invalidate_ai_caches(resume_id: Optional[str] = None, job_id: Optional[str] = None):
         """
         Invalidate AI-related API caches.
         """
-        patterns = [
-            'match-score:*',
-            'recommendations:*',
-        ]
-        
-        if resume_id:
-            patterns.append(f'resume-parse:*:{resume_id}')
-        
-        if job_id:
-            patterns.append(f'job-match:*:{job_id}')
-        
-        for pattern in patterns:
-            APICacheManager.invalidate_api_cache_pattern(pattern)
+        invalidate_tags(
+            MATCH_SCORE_TAG,
+            RECOMMENDATIONS_TAG,
+            resume_tag(resume_id) if resume_id else None,
+            job_tag(job_id) if job_id else None,
+        )
 
 
 # Specific caching strategies for different endpoints
 
-def cache_job_list(timeout: int = CACHE_TIMEOUTS['short']):
+def cache_job_list(timeout: int = CACHE_TIMEOUTS['short'], stale_timeout: int = 60):
     """
     Cache job list responses with search and filter parameters.
     """
@@ -296,7 +348,9 @@ def cache_job_list(timeout: int = CACHE_TIMEOUTS['short']):
         timeout=timeout,
         vary_on_user=False,  # Job lists can be shared
         vary_on_params=['search', 'location', 'job_type', 'experience_level', 'page'],
-        cache_anonymous_only=False
+        cache_anonymous_only=False,
+        tags=[JOB_LIST_TAG],
+        stale_timeout=stale_timeout
     )
 
 
@@ -308,6 +362,7 @@ def cache_job_detail(timeout: int = CACHE_TIMEOUTS['medium']):
         timeout=timeout,
         vary_on_user=False,  # Job details can be shared
         vary_on_params=[],
+        tags=['job:{pk}'],
     )
 
 
@@ -340,18 +395,21 @@ def cache_analytics_data(timeout: int = CACHE_TIMEOUTS['medium']):
     return api_cache(
         timeout=timeout,
         vary_on_user=True,
-        cache_authenticated_only=True
+        cache_authenticated_only=True,
+        tags=['analytics']
     )
 
 
-def cache_skills_list(timeout: int = CACHE_TIMEOUTS['very_long']):
+def cache_skills_list(timeout: int = CACHE_TIMEOUTS['very_long'], stale_timeout: int = CACHE_TIMEOUTS['long']):
     """
     Cache skills list (rarely changes).
     """
     return api_cache(
         timeout=timeout,
         vary_on_user=False,
-        vary_on_params=['category', 'search']
+        vary_on_params=['category', 'search'],
+        stale_timeout=stale_timeout,
+        local_cache=True
     )
 
 
@@ -430,18 +488,29 @@ class APICacheMonitor:
     def get_cache_hit_rate(endpoint: str, time_period: timedelta = timedelta(hours=1)) -> float:
         """
         Calculate cache hit rate for specific endpoint.
+        
+        Counters are cumulative across workers for as long as the endpoint
+        keeps being used, so time_period is not applied.
+        """
+        return get_cache_metrics().get(f"api:{endpoint}", {}).get('hit_rate', 0.0)
+    
+    @staticmethod
+    def get_coalescing_stats() -> Dict[str, Dict[str, float]]:
+        """
+        This process's hit, stale, miss and coalesced-wait counters per endpoint.
         """
-        # This would require storing cache hit/miss statistics
-        # Implementation depends on monitoring infrastructure
-        return 0.0
+        return coalescing_stats.snapshot()
     
     @staticmethod
     def get_most_cached_endpoints() -> List[Dict]:
         """
         Get list of most frequently cached endpoints.
         """
-        # This would require cache access statistics
-        return []
+        endpoints = [
+            {'endpoint': name.split(':', 1)[1], **stats}
+            for name, stats in get_cache_metrics().items() if name.startswith('api:')
+        ]
+        return sorted(endpoints, key=lambda stats: stats['hits'] + stats['misses'], reverse=True)
     
     @staticmethod
     def log_cache_performance():
@@ -457,6 +526,13 @@ class APICacheMonitor:
                 ) * 100
                 
                 logger.info(f"API Cache Performance - Hit Rate: {hit_rate:.2f}%")
+            
+            for endpoint, stats in coalescing_stats.snapshot().items():
+                logger.info(
+                    f"API Cache Coalescing - {endpoint}: {stats.get('coalesced_waits', 0):.0f} coalesced waits "
+                    f"(avg {stats['avg_wait_ms']}ms), {stats.get('wait_timeouts', 0):.0f} wait timeouts, "
+                    f"{stats.get('stale_served', 0):.0f} stale responses served"
+                )
         
         except Exception as e:
             logger.error(f"Error logging cache performance: {e}")
@@ -467,8 +543,14 @@ class APICacheMonitor:
 class CacheInvalidationMiddleware:
     """
     Middleware to automatically invalidate caches on data changes.
+    
+    Writes are mapped to cache tags by the URL name of the route they hit.
     """
     
+    # Routes whose writes only change the requesting user's own data
+    USER_RESOURCE_PREFIXES = ('job-seeker-profile-', 'recruiter-profile-', 'user-skill-', 'resume-')
+    USER_URL_NAMES = ('user-profile', 'delete-account', 'change-password')
+    
     def __init__(self, get_response):
         self.get_response = get_response
     
@@ -483,45 +565,47 @@ class CacheInvalidationMiddleware:
     
     def _invalidate_caches_for_request(self, request, response):
         """
-        Invalidate relevant caches based on the request.
+        Invalidate the cache tags of the resource the request wrote to.
         """
-        path = request.path
+        resolver_match = getattr(request, 'resolver_match', None)
+        url_name = resolver_match.url_name if resolver_match else None
+        if not url_name:
+            return
+        
+        user_id = str(request.user.id) if request.user.is_authenticated else None
+        object_id = resolver_match.kwargs.get('pk') or resolver_match.kwargs.get('id') or self._created_object_id(response)
         
         try:
-            if '/api/jobs/' in path:
-                # Extract job ID if present
-                job_id = self._extract_id_from_path(path, 'jobs')
-                user_id = str(request.user.id) if request.user.is_authenticated else None
-                
-                CacheInvalidationManager.invalidate_job_caches(job_id, user_id)
+            if url_name.startswith('job-post-'):
+                CacheInvalidationManager.invalidate_job_caches(object_id, user_id)
             
-            elif '/api/applications/' in path:
-                application_id = self._extract_id_from_path(path, 'applications')
-                user_id = str(request.user.id) if request.user.is_authenticated else None
-                
+            elif url_name.startswith('application-'):
+                if self._is_uuid(object_id):
+                    CacheInvalidationManager.invalidate_application_caches(application_id=object_id)
                 if user_id:
-                    CacheInvalidationManager.invalidate_application_caches(
-                        application_id, user_id, user_id
-                    )
+                    CacheInvalidationManager.invalidate_user_caches(user_id)
             
-            elif '/api/profile/' in path or '/api/users/' in path:
-                user_id = str(request.user.id) if request.user.is_authenticated else None
+            elif url_name.startswith(self.USER_RESOURCE_PREFIXES) or url_name in self.USER_URL_NAMES:
                 if user_id:
                     CacheInvalidationManager.invalidate_user_caches(user_id)
         
         except Exception as e:
             logger.error(f"Error in cache invalidation middleware: {e}")
     
-    def _extract_id_from_path(self, path: str, resource: str) -> Optional[str]:
+    @staticmethod
+    def _created_object_id(response) -> Optional[str]:
         """
-        Extract resource ID from URL path.
+        ID of the object a create request returned, if any.
         """
+        data = getattr(response, 'data', None)
+        if isinstance(data, dict) and data.get('id') is not None:
+            return str(data['id'])
+        return None
+    
+    @staticmethod
+    def _is_uuid(value: Optional[str]) -> bool:
         try:
-            parts = path.split('/')
-            resource_index = parts.index(resource)
-            if resource_index + 1 < len(parts):
-                return parts[resource_index + 1]
-        except (ValueError, IndexError):
-            pass
-        
-        return None
\ No newline at end of file
+            uuid.UUID(str(value))
+            return True
+        except ValueError:
+            return False
@@ -0,0 +1,131 @@
+"""
+Cache value codec for HireWise backend.
+
+encode_value() pickles a value and zlib-compresses it when the pickle is at
+least CACHE_CODEC['COMPRESS_MIN_BYTES'] long. The result starts with a
+marker and a codec byte saying whether the payload is compressed, so
+decode_value() can tell plain, compressed and pre-codec entries apart and
+they can coexist in the cache during a rollout. The stored size of every
+encoded value is recorded in a per-prefix histogram in this process.
+"""
+
+import logging
+import pickle
+import threading
+import zlib
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+CACHE_CODEC_CONFIG = getattr(settings, 'CACHE_CODEC', {})
+
+COMPRESS_MIN_BYTES = CACHE_CODEC_CONFIG.get('COMPRESS_MIN_BYTES', 1024)
+COMPRESSION_LEVEL = CACHE_CODEC_CONFIG.get('COMPRESSION_LEVEL', 6)
+
+# Never the first bytes of a pickle (protocol 2+ starts with b'\x80')
+MARKER = b'\x00hw'
+CODEC_PLAIN = b'p'
+CODEC_ZLIB = b'z'
+HEADER_LENGTH = len(MARKER) + 1
+
+# Upper bounds of the stored-size histogram buckets, in bytes
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+
+def _bucket_label(size: int) -> str:
+    for bound in SIZE_BUCKETS:
+        if size <= bound:
+            return f"<={bound}"
+    return f">{SIZE_BUCKETS[-1]}"
+
+
+class SizeHistograms:
+    """
+    In-process stored-size histograms, per cache prefix
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, Dict[str, Any]] = {}
+
+    def record(self, prefix: str, stored_size: int, raw_size: int, compressed: bool) -> None:
+        with self._lock:
+            histogram = self._histograms.get(prefix)
+            if histogram is None:
+                histogram = self._histograms[prefix] = {
+                    'count': 0, 'compressed': 0, 'stored_bytes': 0, 'raw_bytes': 0,
+                    'max_bytes': 0, 'buckets': {},
+                }
+            histogram['count'] += 1
+            histogram['compressed'] += int(compressed)
+            histogram['stored_bytes'] += stored_size
+            histogram['raw_bytes'] += raw_size
+            histogram['max_bytes'] = max(histogram['max_bytes'], stored_size)
+            label = _bucket_label(stored_size)
+            histogram['buckets'][label] = histogram['buckets'].get(label, 0) + 1
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Histograms per prefix, with the average stored size and the compression ratio
+        """
+        with self._lock:
+            result = {
+                prefix: {**histogram, 'buckets': dict(histogram['buckets'])}
+                for prefix, histogram in self._histograms.items()
+            }
+        for histogram in result.values():
+            histogram['avg_bytes'] = round(histogram['stored_bytes'] / histogram['count'])
+            histogram['compression_ratio'] = round(
+                histogram['stored_bytes'] / histogram['raw_bytes'], 3
+            ) if histogram['raw_bytes'] else 1.0
+        return result
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+
+
+size_histograms = SizeHistograms()
+
+
+def encode_value(value: Any, prefix: str = 'default', min_bytes: Optional[int] = None) -> bytes:
+    """
+    Pickle a value for the cache, compressed when it is large enough to pay off
+    """
+    data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+    min_bytes = COMPRESS_MIN_BYTES if min_bytes is None else min_bytes
+
+    encoded = None
+    if len(data) >= min_bytes:
+        compressed = zlib.compress(data, COMPRESSION_LEVEL)
+        # Already-compact payloads can grow; store those plain
+        if len(compressed) < len(data):
+            encoded = MARKER + CODEC_ZLIB + compressed
+    if encoded is None:
+        encoded = MARKER + CODEC_PLAIN + data
+
+    size_histograms.record(prefix, len(encoded), len(data), encoded[len(MARKER):HEADER_LENGTH] == CODEC_ZLIB)
+    return encoded
+
+
+def is_encoded(stored: Any) -> bool:
+    return isinstance(stored, bytes) and stored[:len(MARKER)] == MARKER
+
+
+def decode_value(stored: Any) -> Any:
+    """
+    The value behind an encode_value() result; anything else is returned unchanged
+    """
+    if not is_encoded(stored):
+        return stored
+
+    codec = stored[len(MARKER):HEADER_LENGTH]
+    payload = stored[HEADER_LENGTH:]
+    if codec == CODEC_ZLIB:
+        payload = zlib.decompress(payload)
+    elif codec != CODEC_PLAIN:
+        logger.error(f"Unknown cache codec {codec!r}; treating entry as missing")
+        return None
+    return pickle.loads(payload)
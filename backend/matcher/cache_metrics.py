@@ -0,0 +1,268 @@
+"""
+Per-prefix cache instrumentation for HireWise backend.
+
+CacheManager, MatchScoreCache, api_cache and the recommendation and search
+caches record hits, misses, sets, bytes moved and time spent per cache
+prefix. Counters live in per-thread shards, so recording takes no lock; a
+snapshot sums the shards. Shards of finished threads are folded into one
+retired total, so short-lived threads do not grow the shard list. Every process adds what it recorded since its
+last flush to Redis hashes at most once per CACHE_METRICS['FLUSH_INTERVAL'],
+piggybacking on a recording call, so get_cache_metrics() can report totals
+across all web and Celery workers.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+CACHE_METRICS_CONFIG = getattr(settings, 'CACHE_METRICS', {})
+
+METRICS_ENABLED = CACHE_METRICS_CONFIG.get('ENABLED', True)
+FLUSH_INTERVAL = CACHE_METRICS_CONFIG.get('FLUSH_INTERVAL', 10)
+# Aggregates of prefixes nobody records any more age out
+METRICS_TTL = CACHE_METRICS_CONFIG.get('TTL', 7 * 24 * 3600)
+
+METRICS_KEY_PREFIX = 'cache:metrics'
+METRICS_PREFIXES_KEY = f'{METRICS_KEY_PREFIX}:prefixes'
+
+COUNTER_FIELDS = ('hits', 'misses', 'sets', 'bytes_read', 'bytes_written', 'get_seconds', 'set_seconds')
+
+
+def stored_size(raw: Any) -> int:
+    """
+    Size of a value as read from the cache; 0 when it was not stored as bytes or text
+    """
+    return len(raw) if isinstance(raw, (bytes, str)) else 0
+
+
+def _empty_counters() -> Dict[str, float]:
+    return dict.fromkeys(COUNTER_FIELDS, 0)
+
+
+def _add(totals: Dict[str, Dict[str, float]], prefix: str, counters: Dict[str, float], sign: int = 1) -> None:
+    target = totals.setdefault(prefix, _empty_counters())
+    for field in COUNTER_FIELDS:
+        target[field] += sign * counters.get(field, 0)
+
+
+def _summarize(totals: Dict[str, Dict[str, float]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Counters per prefix with hit rate and average latencies
+    """
+    result = {}
+    for prefix, counters in sorted(totals.items()):
+        lookups = counters['hits'] + counters['misses']
+        stats = {field: int(counters[field]) for field in COUNTER_FIELDS if not field.endswith('_seconds')}
+        stats['hit_rate'] = round(counters['hits'] / lookups * 100, 2) if lookups else 0.0
+        stats['avg_get_ms'] = round(counters['get_seconds'] / lookups * 1000, 3) if lookups else 0.0
+        stats['avg_set_ms'] = round(counters['set_seconds'] / counters['sets'] * 1000, 3) if counters['sets'] else 0.0
+        result[prefix] = stats
+    return result
+
+
+class CacheMetrics:
+    """
+    Lock-free per-thread counters per cache prefix, flushed to Redis periodically
+    """
+
+    def __init__(self, flush_interval: float = FLUSH_INTERVAL):
+        self.flush_interval = flush_interval
+        self._thread_local = threading.local()
+        # Only taken the first time a thread records
+        self._shards_lock = threading.Lock()
+        self._shards: List[Tuple[threading.Thread, Dict[str, Dict[str, float]]]] = []
+        # Counters of threads that have finished, folded together
+        self._retired: Dict[str, Dict[str, float]] = {}
+        self._flush_lock = threading.Lock()
+        self._flushed: Dict[str, Dict[str, float]] = {}
+        self._next_flush = time.monotonic() + flush_interval
+
+    def _shard(self) -> Dict[str, Dict[str, float]]:
+        shard = getattr(self._thread_local, 'counters', None)
+        if shard is None:
+            shard = self._thread_local.counters = {}
+            with self._shards_lock:
+                self._shards.append((threading.current_thread(), shard))
+        return shard
+
+    def _counters(self, prefix: str) -> Dict[str, float]:
+        shard = self._shard()
+        counters = shard.get(prefix)
+        if counters is None:
+            counters = shard[prefix] = _empty_counters()
+        return counters
+
+    def record_get(self, prefix: str, hit: bool, nbytes: int = 0, seconds: float = 0.0) -> None:
+        if not METRICS_ENABLED:
+            return
+        counters = self._counters(prefix)
+        counters['hits' if hit else 'misses'] += 1
+        counters['bytes_read'] += nbytes
+        counters['get_seconds'] += seconds
+        self._maybe_flush()
+
+    def record_set(self, prefix: str, nbytes: int = 0, seconds: float = 0.0) -> None:
+        if not METRICS_ENABLED:
+            return
+        counters = self._counters(prefix)
+        counters['sets'] += 1
+        counters['bytes_written'] += nbytes
+        counters['set_seconds'] += seconds
+        self._maybe_flush()
+
+    def local_totals(self) -> Dict[str, Dict[str, float]]:
+        """
+        Raw counters recorded by this process, summed over its threads
+        """
+        totals = {}
+        with self._shards_lock:
+            self._retire_finished_shards()
+            for prefix, counters in self._retired.items():
+                _add(totals, prefix, counters)
+            shards = [shard for _, shard in self._shards]
+        for shard in shards:
+            for prefix, counters in list(shard.items()):
+                _add(totals, prefix, dict(counters))
+        return totals
+
+    def _retire_finished_shards(self) -> None:
+        """
+        Fold the shards of finished threads into the retired totals; called with _shards_lock held
+        """
+        live = []
+        for thread, shard in self._shards:
+            if thread.is_alive():
+                live.append((thread, shard))
+                continue
+            # A finished thread no longer writes to its shard
+            for prefix, counters in shard.items():
+                _add(self._retired, prefix, counters)
+        self._shards = live
+
+    def _unflushed(self, totals: Optional[Dict[str, Dict[str, float]]] = None) -> Dict[str, Dict[str, float]]:
+        """
+        What totals (by default, a fresh local_totals()) add to the last flushed totals
+        """
+        if totals is None:
+            totals = self.local_totals()
+        deltas = {prefix: dict(counters) for prefix, counters in totals.items()}
+        for prefix, counters in self._flushed.items():
+            _add(deltas, prefix, counters, sign=-1)
+        return deltas
+
+    def _maybe_flush(self) -> None:
+        if time.monotonic() < self._next_flush or not self._flush_lock.acquire(blocking=False):
+            return
+        try:
+            self._next_flush = time.monotonic() + self.flush_interval
+            self._flush()
+        finally:
+            self._flush_lock.release()
+
+    def flush(self) -> None:
+        """
+        Add what this process recorded since the last flush to the shared aggregates
+        """
+        with self._flush_lock:
+            self._flush()
+
+    def _flush(self) -> None:
+        from .cache_utils import get_redis_client
+
+        client = get_redis_client()
+        if client is None:
+            return
+
+        # Deltas and the new flushed baseline come from the same snapshot, so
+        # nothing recorded meanwhile is both sent now and left out of the baseline
+        totals = self.local_totals()
+        deltas = self._unflushed(totals)
+        try:
+            pipe = client.pipeline(transaction=False)
+            for prefix, counters in deltas.items():
+                changed = {field: value for field, value in counters.items() if value}
+                if not changed:
+                    continue
+                key = cache.make_key(f'{METRICS_KEY_PREFIX}:{prefix}')
+                for field, value in changed.items():
+                    if isinstance(value, float):
+                        pipe.hincrbyfloat(key, field, value)
+                    else:
+                        pipe.hincrby(key, field, value)
+                pipe.expire(key, METRICS_TTL)
+                pipe.sadd(cache.make_key(METRICS_PREFIXES_KEY), prefix)
+            pipe.expire(cache.make_key(METRICS_PREFIXES_KEY), METRICS_TTL)
+            pipe.execute()
+            self._flushed = totals
+        except Exception as e:
+            logger.error(f"Error flushing cache metrics: {e}")
+
+    def _shared_totals(self) -> Optional[Dict[str, Dict[str, float]]]:
+        from .cache_utils import get_redis_client
+
+        client = get_redis_client()
+        if client is None:
+            return None
+        try:
+            prefixes = [
+                prefix.decode() if isinstance(prefix, bytes) else prefix
+                for prefix in client.smembers(cache.make_key(METRICS_PREFIXES_KEY))
+            ]
+            pipe = client.pipeline(transaction=False)
+            for prefix in prefixes:
+                pipe.hgetall(cache.make_key(f'{METRICS_KEY_PREFIX}:{prefix}'))
+            totals = {}
+            for prefix, stored in zip(prefixes, pipe.execute()):
+                _add(totals, prefix, {
+                    (field.decode() if isinstance(field, bytes) else field): float(value)
+                    for field, value in stored.items()
+                })
+            return totals
+        except Exception as e:
+            logger.error(f"Error reading cache metrics: {e}")
+            return None
+
+    def snapshot(self, scope: str = 'cluster') -> Dict[str, Dict[str, Any]]:
+        """
+        Counters per prefix for this process ('local') or all workers ('cluster').
+
+        The cluster view is the flushed aggregates plus what this process has
+        not flushed yet; other workers' latest interval may be missing.
+        """
+        if scope == 'local':
+            return _summarize(self.local_totals())
+
+        with self._flush_lock:
+            totals = self._shared_totals()
+            if totals is None:
+                return _summarize(self.local_totals())
+            for prefix, counters in self._unflushed().items():
+                _add(totals, prefix, counters)
+        return _summarize(totals)
+
+    def reset(self) -> None:
+        """
+        Drop this process's counters, e.g. between tests
+        """
+        with self._flush_lock:
+            with self._shards_lock:
+                for _, shard in self._shards:
+                    shard.clear()
+                self._retired = {}
+            self._flushed = {}
+
+
+cache_metrics = CacheMetrics()
+
+
+def get_cache_metrics(scope: str = 'cluster') -> Dict[str, Dict[str, Any]]:
+    """
+    Hits, misses, sets, bytes and latency per cache prefix
+    """
+    return cache_metrics.snapshot(scope)
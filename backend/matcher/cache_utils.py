@@ -6,16 +6,27 @@ Provides Redis-based caching for frequently accessed data.
 import json
 import hashlib
 import logging
-from typing import Any, Optional, Dict, List, Union
+import math
+import random
+import threading
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, Dict, List, Tuple, Union
 from functools import wraps
 from datetime import timedelta
 
 from django.core.cache import cache
 from django.conf import settings
-from django.db.models import QuerySet
+from django.db import close_old_connections
+from django.db.models import F, QuerySet
 from django.core.serializers.json import DjangoJSONEncoder
 from django.utils import timezone
 
+from .cache_codec import decode_value, encode_value, size_histograms
+from .cache_metrics import cache_metrics, get_cache_metrics, stored_size
+
 logger = logging.getLogger(__name__)
 
 # Cache key prefixes
@@ -30,6 +41,8 @@ CACHE_PREFIXES = {
     'analytics': 'analytics',
     'recommendations': 'recommendations',
     'notifications': 'notifications',
+    'notification_templates': 'notifications:templates',
+    'resume_template_categories': 'resume:template-categories',
 }
 
 # Cache timeouts (in seconds)
@@ -40,6 +53,380 @@ CACHE_TIMEOUTS = {
     'very_long': 86400, # 24 hours
 }
 
+CACHE_COALESCING_CONFIG = getattr(settings, 'CACHE_COALESCING', {})
+
+# How long a recompute may hold a key's lock before another request takes over
+COALESCE_LOCK_TIMEOUT = CACHE_COALESCING_CONFIG.get('LOCK_TIMEOUT', 30)
+# How long a request waits for another request's recompute before computing itself
+COALESCE_WAIT_TIMEOUT = CACHE_COALESCING_CONFIG.get('WAIT_TIMEOUT', 5.0)
+# XFetch beta: higher refreshes earlier, 0 disables probabilistic early expiration
+EARLY_EXPIRATION_BETA = CACHE_COALESCING_CONFIG.get('EARLY_EXPIRATION_BETA', 1.0)
+REFRESH_WORKERS = CACHE_COALESCING_CONFIG.get('REFRESH_WORKERS', 4)
+
+
+class CacheEntry:
+    """
+    Cached value with the time it stops being fresh and how long it took to compute
+    """
+
+    __slots__ = ('value', 'fresh_until', 'compute_time')
+
+    def __init__(self, value: Any, fresh_until: float, compute_time: float = 0.0):
+        self.value = value
+        self.fresh_until = fresh_until
+        self.compute_time = compute_time
+
+    def __getstate__(self):
+        return (self.value, self.fresh_until, self.compute_time)
+
+    def __setstate__(self, state):
+        self.value, self.fresh_until, self.compute_time = state
+
+
+def unwrap_cache_entry(value: Any) -> Any:
+    """
+    The payload of a CacheEntry; other values are returned unchanged
+    """
+    return value.value if isinstance(value, CacheEntry) else value
+
+
+class CoalescingStats:
+    """
+    In-process counters for coalesced cache reads, per cache name
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Counter] = {}
+
+    def record(self, name: str, field: str, amount: float = 1) -> None:
+        with self._lock:
+            self._stats.setdefault(name, Counter())[field] += amount
+
+    def record_wait(self, name: str, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(name, Counter())
+            stats['wait_timeouts' if timed_out else 'coalesced_waits'] += 1
+            stats['wait_seconds'] += seconds
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """
+        Counters per cache name, with the average coalesced wait in milliseconds
+        """
+        with self._lock:
+            result = {name: dict(stats) for name, stats in self._stats.items()}
+        for stats in result.values():
+            waits = stats.get('coalesced_waits', 0) + stats.get('wait_timeouts', 0)
+            stats['avg_wait_ms'] = round(stats.get('wait_seconds', 0) / waits * 1000, 2) if waits else 0.0
+        return result
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+
+coalescing_stats = CoalescingStats()
+
+_refresh_executor = None
+_refresh_executor_lock = threading.Lock()
+
+
+def _get_refresh_executor() -> ThreadPoolExecutor:
+    global _refresh_executor
+    if _refresh_executor is None:
+        with _refresh_executor_lock:
+            if _refresh_executor is None:
+                _refresh_executor = ThreadPoolExecutor(
+                    max_workers=REFRESH_WORKERS, thread_name_prefix='cache-refresh'
+                )
+    return _refresh_executor
+
+
+def _read_entry(cache_key: str, name: Optional[str] = None) -> Optional[CacheEntry]:
+    """
+    Read a key as a CacheEntry, recording the lookup under name when given
+    """
+    started = time.perf_counter()
+    try:
+        raw = cache.get(cache_key)
+        value = decode_value(raw)
+    except Exception as e:
+        logger.error(f"Cache get error for key {cache_key}: {e}")
+        return None
+    if name is not None:
+        cache_metrics.record_get(name, value is not None, stored_size(raw), time.perf_counter() - started)
+    if value is None or isinstance(value, CacheEntry):
+        return value
+    # Written with a plain set(): fresh until its TTL
+    return CacheEntry(value, math.inf)
+
+
+def _store_entry(cache_key: str, value: Any, timeout: Optional[int], stale_timeout: int,
+                 compute_time: float, name: str) -> None:
+    if timeout is None:
+        entry, ttl = CacheEntry(value, math.inf, compute_time), None
+    else:
+        entry, ttl = CacheEntry(value, time.time() + timeout, compute_time), timeout + stale_timeout
+    encoded = encode_value(entry, name)
+    started = time.perf_counter()
+    try:
+        cache.set(cache_key, encoded, ttl)
+    except Exception as e:
+        logger.error(f"Cache set error for key {cache_key}: {e}")
+        return
+    cache_metrics.record_set(name, len(encoded), time.perf_counter() - started)
+
+
+def _acquire_lock(lock_key: str, lock_timeout: int) -> Optional[str]:
+    token = uuid.uuid4().hex
+    try:
+        return token if cache.add(lock_key, token, lock_timeout) else None
+    except Exception as e:
+        # Without a working cache there is nothing to coalesce on
+        logger.error(f"Cache lock error for key {lock_key}: {e}")
+        return token
+
+
+def _release_lock(lock_key: str, token: str) -> None:
+    try:
+        if cache.get(lock_key) == token:
+            cache.delete(lock_key)
+    except Exception as e:
+        logger.error(f"Cache unlock error for key {lock_key}: {e}")
+
+
+def _expires_early(entry: CacheEntry, now: float, beta: float) -> bool:
+    """
+    XFetch: refresh before the soft expiry with a probability that grows as it
+    approaches, sooner for values that are slow to compute
+    """
+    if not beta or not entry.compute_time or entry.fresh_until == math.inf:
+        return False
+    return now - entry.compute_time * beta * math.log(1.0 - random.random()) >= entry.fresh_until
+
+
+def _compute_and_store(cache_key: str, lock_key: Optional[str], token: Optional[str],
+                       compute: Callable[[], Any], timeout: Optional[int], stale_timeout: int,
+                       name: str) -> Any:
+    try:
+        started = time.monotonic()
+        value = compute()
+        if value is not None:
+            _store_entry(cache_key, value, timeout, stale_timeout, time.monotonic() - started, name)
+        return value
+    finally:
+        if token is not None:
+            _release_lock(lock_key, token)
+
+
+def _refresh_in_background(cache_key: str, lock_key: str, token: str, compute: Callable[[], Any],
+                           timeout: Optional[int], stale_timeout: int, name: str) -> None:
+    try:
+        _compute_and_store(cache_key, lock_key, token, compute, timeout, stale_timeout, name)
+    except Exception as e:
+        logger.error(f"Background cache refresh failed for key {cache_key}: {e}")
+    finally:
+        close_old_connections()
+
+
+def coalesced_get_or_set(
+    cache_key: str,
+    compute: Callable[[], Any],
+    timeout: Optional[int],
+    name: Optional[str] = None,
+    stale_timeout: int = 0,
+    early_expiration_beta: float = EARLY_EXPIRATION_BETA,
+    coalesce: bool = True,
+    background_refresh: bool = True,
+    lock_timeout: int = COALESCE_LOCK_TIMEOUT,
+    wait_timeout: float = COALESCE_WAIT_TIMEOUT,
+) -> Tuple[Any, str]:
+    """
+    Read-through cache that recomputes each key at most once at a time.
+
+    Values are fresh for timeout seconds and then served stale for up to
+    stale_timeout more while a single request refreshes them, in the
+    background unless background_refresh is False. Fresh values may be
+    refreshed early with a probability that rises towards expiry
+    (early_expiration_beta). On a miss one request computes the value and
+    concurrent requests for the key wait for it, up to wait_timeout.
+
+    compute() returns the value to cache, or None for a result that must not
+    be cached. Returns (value, state) with state 'hit', 'stale', 'coalesced'
+    or 'miss'; only 'miss' means compute() ran in the calling thread.
+    """
+    name = name or cache_key.split(':', 1)[0]
+    lock_key = f"{cache_key}:lock"
+
+    entry = _read_entry(cache_key, name)
+    if entry is not None:
+        now = time.time()
+        is_stale = now >= entry.fresh_until
+        if not is_stale and not _expires_early(entry, now, early_expiration_beta):
+            coalescing_stats.record(name, 'hits')
+            return entry.value, 'hit'
+
+        token = _acquire_lock(lock_key, lock_timeout)
+        if token is None:
+            # Someone else is already refreshing this key
+            coalescing_stats.record(name, 'stale_served' if is_stale else 'hits')
+            return entry.value, 'stale' if is_stale else 'hit'
+
+        coalescing_stats.record(name, 'stale_refreshes' if is_stale else 'early_refreshes')
+        if background_refresh:
+            _get_refresh_executor().submit(
+                _refresh_in_background, cache_key, lock_key, token, compute, timeout, stale_timeout, name
+            )
+            return entry.value, 'stale' if is_stale else 'hit'
+        return _compute_and_store(cache_key, lock_key, token, compute, timeout, stale_timeout, name), 'miss'
+
+    coalescing_stats.record(name, 'misses')
+    if not coalesce:
+        return _compute_and_store(cache_key, None, None, compute, timeout, stale_timeout, name), 'miss'
+
+    started = time.monotonic()
+    delay = 0.02
+    waited = False
+    while True:
+        token = _acquire_lock(lock_key, lock_timeout)
+        if token is not None:
+            # The previous holder may have stored the value before releasing the lock
+            entry = _read_entry(cache_key) if waited else None
+            if entry is not None:
+                _release_lock(lock_key, token)
+                coalescing_stats.record_wait(name, time.monotonic() - started)
+                return entry.value, 'coalesced'
+            return _compute_and_store(cache_key, lock_key, token, compute, timeout, stale_timeout, name), 'miss'
+
+        waited = True
+        if time.monotonic() - started >= wait_timeout:
+            coalescing_stats.record_wait(name, time.monotonic() - started, timed_out=True)
+            return _compute_and_store(cache_key, None, None, compute, timeout, stale_timeout, name), 'miss'
+
+        time.sleep(delay)
+        delay = min(delay * 1.5, 0.1)
+        entry = _read_entry(cache_key)
+        if entry is not None:
+            coalescing_stats.record_wait(name, time.monotonic() - started)
+            return entry.value, 'coalesced'
+
+
+# Tags group cache entries for invalidation. Every tag has a generation
+# counter that is folded into the keys of the entries stored under it;
+# invalidating a tag bumps its counter so those keys are never read again
+# and age out on their TTL.
+TAG_GENERATION_PREFIX = 'cache:tag'
+JOB_LIST_TAG = 'job-list'
+# Every cached recommendation list and match score, dropped when jobs or AI results change
+RECOMMENDATIONS_TAG = 'recommendations'
+MATCH_SCORE_TAG = 'match-score'
+
+
+def job_tag(job_id) -> str:
+    return f"job:{job_id}"
+
+
+def recruiter_tag(recruiter_id) -> str:
+    return f"recruiter:{recruiter_id}"
+
+
+def user_tag(user_id) -> str:
+    return f"user:{user_id}"
+
+
+def resume_tag(resume_id) -> str:
+    return f"resume:{resume_id}"
+
+
+def _tag_generation_key(tag: str) -> str:
+    return f"{TAG_GENERATION_PREFIX}:{tag}"
+
+
+def _initial_generation() -> int:
+    # Time based, so a counter lost to eviction cannot restart at a value old entries used
+    return int(time.time() * 1000)
+
+
+def get_tag_generations(tags: List[str]) -> Dict[str, int]:
+    """
+    Current generation of each tag, creating counters that do not exist yet
+    """
+    keys = {tag: _tag_generation_key(tag) for tag in tags}
+    try:
+        stored = cache.get_many(list(keys.values()))
+        missing = [key for key in keys.values() if key not in stored]
+        if missing:
+            for key in missing:
+                cache.add(key, _initial_generation(), None)
+            stored.update(cache.get_many(missing))
+        return {tag: stored.get(key, 0) for tag, key in keys.items()}
+    except Exception as e:
+        logger.error(f"Error reading cache tag generations for {tags}: {e}")
+        return {tag: 0 for tag in tags}
+
+
+def tagged_cache_key(cache_key: str, tags: Optional[List[str]]) -> str:
+    """
+    Cache key that changes whenever one of the tags is invalidated
+    """
+    tags = sorted(set(tag for tag in (tags or []) if tag))
+    if not tags:
+        return cache_key
+    generations = get_tag_generations(tags)
+    version = ','.join(f"{tag}={generations[tag]}" for tag in tags)
+    return f"{cache_key}:t{hashlib.md5(version.encode()).hexdigest()[:12]}"
+
+
+def invalidate_tags(*tags: str) -> Dict[str, int]:
+    """
+    Orphan every cache entry stored under any of the tags; one increment per tag.
+    
+    Returns the new generation of each tag whose counter was updated.
+    """
+    generations = {}
+    for tag in set(tag for tag in tags if tag):
+        key = _tag_generation_key(tag)
+        try:
+            generations[tag] = cache.incr(key)
+        except ValueError:
+            # Nothing was stored under this tag yet
+            generation = _initial_generation()
+            if cache.add(key, generation, None):
+                generations[tag] = generation
+        except Exception as e:
+            logger.error(f"Error invalidating cache tag {tag}: {e}")
+    return generations
+
+
+def metered_get(prefix: str, cache_key: str, default: Any = None) -> Any:
+    """
+    Read and decode a cache value, recording the lookup under the prefix
+    """
+    started = time.perf_counter()
+    try:
+        raw = cache.get(cache_key)
+        value = decode_value(raw)
+    except Exception as e:
+        logger.error(f"Cache get error for key {cache_key}: {e}")
+        return default
+    cache_metrics.record_get(prefix, value is not None, stored_size(raw), time.perf_counter() - started)
+    return default if value is None else value
+
+
+def metered_set(prefix: str, cache_key: str, value: Any, timeout: Optional[int]) -> bool:
+    """
+    Encode and store a cache value, recording the write under the prefix
+    """
+    encoded = encode_value(value, prefix)
+    started = time.perf_counter()
+    try:
+        cache.set(cache_key, encoded, timeout)
+    except Exception as e:
+        logger.error(f"Cache set error for key {cache_key}: {e}")
+        return False
+    cache_metrics.record_set(prefix, len(encoded), time.perf_counter() - started)
+    return True
+
 
 class CacheManager:
     """
@@ -74,11 +461,30 @@ class CacheManager:
         Get cached value by prefix and parameters.
         """
         cache_key = self._generate_cache_key(prefix, *args, **kwargs)
+        near_cache = self._near_cache(prefix)
+        if near_cache is not None:
+            return near_cache.get(cache_key, lambda: self._get_shared(prefix, cache_key, near_cache))
+        return self._get_shared(prefix, cache_key)
+    
+    def _get_shared(self, prefix: str, cache_key: str, near_cache=None) -> Any:
+        started = time.perf_counter()
         try:
-            return self.cache.get(cache_key)
+            raw = self.cache.get(cache_key)
+            value = unwrap_cache_entry(decode_value(raw))
         except Exception as e:
             logger.error(f"Cache get error for key {cache_key}: {e}")
             return None
+        cache_metrics.record_get(prefix, value is not None, stored_size(raw), time.perf_counter() - started)
+        if near_cache is not None:
+            near_cache.record('shared_hits' if value is not None else 'shared_misses')
+        return value
+    
+    def _near_cache(self, prefix: str):
+        """
+        The prefix's in-process tier, if it opted in to near caching.
+        """
+        from .near_cache import get_near_cache
+        return get_near_cache(prefix)
     
     def set(self, prefix: str, value: Any, timeout: Optional[int] = None, *args, **kwargs) -> bool:
         """
@@ -87,11 +493,22 @@ class CacheManager:
         cache_key = self._generate_cache_key(prefix, *args, **kwargs)
         timeout = timeout or self.default_timeout
         
+        encoded = encode_value(value, prefix)
+        started = time.perf_counter()
         try:
-            return self.cache.set(cache_key, value, timeout)
+            stored = self.cache.set(cache_key, encoded, timeout)
         except Exception as e:
             logger.error(f"Cache set error for key {cache_key}: {e}")
             return False
+        cache_metrics.record_set(prefix, len(encoded), time.perf_counter() - started)
+        
+        near_cache = self._near_cache(prefix)
+        if near_cache is not None:
+            # Other processes drop their copies; this one adopts the new
+            # generation and keeps the new value
+            near_cache.invalidate(cache_key)
+            near_cache.set(cache_key, value)
+        return stored
     
     def delete(self, prefix: str, *args, **kwargs) -> bool:
         """
@@ -99,38 +516,72 @@ class CacheManager:
         """
         cache_key = self._generate_cache_key(prefix, *args, **kwargs)
         try:
-            return self.cache.delete(cache_key)
+            deleted = self.cache.delete(cache_key)
         except Exception as e:
             logger.error(f"Cache delete error for key {cache_key}: {e}")
-            return False
+            deleted = False
+        
+        near_cache = self._near_cache(prefix)
+        if near_cache is not None:
+            # Only after the shared delete: a process reloading between a
+            # generation bump and the delete would keep the old value locally
+            near_cache.invalidate(cache_key)
+        return deleted
     
     def delete_pattern(self, pattern: str) -> int:
         """
         Delete all cache keys matching a pattern.
+        
+        Scans the whole keyspace, so it is meant for maintenance such as
+        clear_all_caches(); invalidate data changes with invalidate_tags().
         """
         try:
-            # This requires django-redis backend
-            return self.cache.delete_pattern(pattern)
-        except AttributeError:
-            logger.warning("Pattern deletion not supported by cache backend")
-            return 0
+            if hasattr(self.cache, 'delete_pattern'):
+                return self.cache.delete_pattern(pattern)
+            
+            client = get_redis_client()
+            if client is None:
+                logger.warning("Pattern deletion not supported by cache backend")
+                return 0
+            
+            deleted = 0
+            batch = []
+            for key in client.scan_iter(match=self.cache.make_key(pattern), count=1000):
+                batch.append(key)
+                if len(batch) >= 1000:
+                    deleted += client.delete(*batch)
+                    batch = []
+            if batch:
+                deleted += client.delete(*batch)
+            return deleted
         except Exception as e:
             logger.error(f"Cache pattern delete error for pattern {pattern}: {e}")
             return 0
     
-    def get_or_set(self, prefix: str, default_func, timeout: Optional[int] = None, *args, **kwargs) -> Any:
+    def get_or_set(self, prefix: str, default_func, timeout: Optional[int] = None, *args,
+                   stale_timeout: int = 0, **kwargs) -> Any:
         """
         Get cached value or set it using default function.
+        
+        Concurrent misses for the same key run default_func once; with
+        stale_timeout the expired value is served while one caller refreshes it.
         """
-        cached_value = self.get(prefix, *args, **kwargs)
-        if cached_value is not None:
-            return cached_value
+        cache_key = self._generate_cache_key(prefix, *args, **kwargs)
+        near_cache = self._near_cache(prefix)
+        
+        def get_shared():
+            value, state = coalesced_get_or_set(
+                cache_key, default_func, timeout or self.default_timeout,
+                name=prefix, stale_timeout=stale_timeout
+            )
+            if near_cache is not None:
+                near_cache.record('shared_misses' if state == 'miss' else 'shared_hits')
+            return value
         
-        # Generate new value
         try:
-            new_value = default_func()
-            self.set(prefix, new_value, timeout, *args, **kwargs)
-            return new_value
+            if near_cache is not None:
+                return near_cache.get(cache_key, get_shared)
+            return get_shared()
         except Exception as e:
             logger.error(f"Error generating cache value for {prefix}: {e}")
             return None
@@ -140,6 +591,22 @@ class CacheManager:
 cache_manager = CacheManager()
 
 
+def get_redis_client():
+    """
+    Get the raw Redis client behind the default cache.
+
+    Returns None when the configured cache backend is not Redis, so callers
+    can fall back to an in-process implementation.
+    """
+    try:
+        return cache._cache.get_client(write=True)
+    except AttributeError:
+        return None
+    except Exception as e:
+        logger.error(f"Error getting Redis client: {e}")
+        return None
+
+
 def cache_result(prefix: str, timeout: Optional[int] = None, key_args: Optional[List[str]] = None):
     """
     Decorator to cache function results.
@@ -192,9 +659,9 @@ class JobCacheManager:
     
     @staticmethod
     def get_job_list_cache_key(filters: Dict, page: int = 1) -> str:
-        """Generate cache key for job list with filters."""
+        """Generate cache key for job list with filters, under the job-list tag."""
         filter_hash = hashlib.md5(json.dumps(filters, sort_keys=True).encode()).hexdigest()[:8]
-        return f"{CACHE_PREFIXES['job_list']}:{filter_hash}:page:{page}"
+        return tagged_cache_key(f"{CACHE_PREFIXES['job_list']}:{filter_hash}:page:{page}", [JOB_LIST_TAG])
     
     @staticmethod
     def cache_job_list(filters: Dict, page: int, data: Any, timeout: int = CACHE_TIMEOUTS['short']):
@@ -210,17 +677,8 @@ class JobCacheManager:
     
     @staticmethod
     def invalidate_job_caches(job_id: Optional[str] = None):
-        """Invalidate job-related caches."""
-        patterns_to_clear = [
-            f"{CACHE_PREFIXES['job_list']}:*",
-            f"{CACHE_PREFIXES['job_search']}:*",
-        ]
-        
-        if job_id:
-            patterns_to_clear.append(f"{CACHE_PREFIXES['job_detail']}:{job_id}")
-        
-        for pattern in patterns_to_clear:
-            cache_manager.delete_pattern(pattern)
+        """Invalidate job lists and searches, and the job's own entries."""
+        invalidate_tags(JOB_LIST_TAG, job_tag(job_id) if job_id else None)
 
 
 class UserCacheManager:
@@ -243,14 +701,8 @@ class UserCacheManager:
     @staticmethod
     def invalidate_user_cache(user_id: str):
         """Invalidate user-related caches."""
-        patterns_to_clear = [
-            f"{CACHE_PREFIXES['user_profile']}:{user_id}",
-            f"{CACHE_PREFIXES['recommendations']}:{user_id}:*",
-            f"{CACHE_PREFIXES['notifications']}:{user_id}:*",
-        ]
-        
-        for pattern in patterns_to_clear:
-            cache_manager.delete_pattern(pattern)
+        cache.delete(f"{CACHE_PREFIXES['user_profile']}:{user_id}")
+        invalidate_tags(user_tag(user_id))
 
 
 class AICacheManager:
@@ -270,34 +722,35 @@ class AICacheManager:
         cache_key = f"{CACHE_PREFIXES['resume_parse']}:{resume_hash}"
         return cache.get(cache_key)
     
+    @staticmethod
+    def _match_score_key(resume_id: str, job_id: str) -> str:
+        return tagged_cache_key(
+            f"{CACHE_PREFIXES['match_score']}:{resume_id}:{job_id}",
+            [MATCH_SCORE_TAG, resume_tag(resume_id), job_tag(job_id)]
+        )
+    
     @staticmethod
     def cache_match_score(resume_id: str, job_id: str, score: float, timeout: int = CACHE_TIMEOUTS['long']):
         """Cache match score results."""
-        cache_key = f"{CACHE_PREFIXES['match_score']}:{resume_id}:{job_id}"
+        cache_key = AICacheManager._match_score_key(resume_id, job_id)
         cache.set(cache_key, score, timeout)
     
     @staticmethod
     def get_cached_match_score(resume_id: str, job_id: str) -> Optional[float]:
         """Get cached match score results."""
-        cache_key = f"{CACHE_PREFIXES['match_score']}:{resume_id}:{job_id}"
+        cache_key = AICacheManager._match_score_key(resume_id, job_id)
         return cache.get(cache_key)
     
     @staticmethod
     def invalidate_ai_caches(resume_id: Optional[str] = None, job_id: Optional[str] = None):
         """Invalidate AI-related caches."""
-        patterns_to_clear = []
-        
         if resume_id:
-            patterns_to_clear.extend([
-                f"{CACHE_PREFIXES['resume_parse']}:{resume_id}",
-                f"{CACHE_PREFIXES['match_score']}:{resume_id}:*",
-            ])
-        
-        if job_id:
-            patterns_to_clear.append(f"{CACHE_PREFIXES['match_score']}:*:{job_id}")
+            cache.delete(f"{CACHE_PREFIXES['resume_parse']}:{resume_id}")
         
-        for pattern in patterns_to_clear:
-            cache_manager.delete_pattern(pattern)
+        invalidate_tags(
+            resume_tag(resume_id) if resume_id else None,
+            job_tag(job_id) if job_id else None,
+        )
 
 
 class AnalyticsCacheManager:
@@ -317,6 +770,33 @@ class AnalyticsCacheManager:
         cache_key = f"{CACHE_PREFIXES['analytics']}:{key}"
         return cache.get(cache_key)
     
+    @staticmethod
+    def _application_generation_key(recruiter_id) -> str:
+        return f"{CACHE_PREFIXES['analytics']}:applications:generation:{recruiter_id}"
+    
+    @staticmethod
+    def get_application_generation(recruiter_id) -> Optional[int]:
+        """Get the generation counter of a recruiter's applications, bumped on every change."""
+        cache_key = AnalyticsCacheManager._application_generation_key(recruiter_id)
+        try:
+            cache.add(cache_key, 1, None)
+            return cache.get(cache_key) or 1
+        except Exception as e:
+            logger.error(f"Error reading application generation for {recruiter_id}: {e}")
+            return None
+    
+    @staticmethod
+    def bump_application_generation(recruiter_id):
+        """Orphan every cached report built from a recruiter's applications."""
+        cache_key = AnalyticsCacheManager._application_generation_key(recruiter_id)
+        try:
+            cache.incr(cache_key)
+        except ValueError:
+            # Nothing has read a generation yet; start past the first one anyway
+            cache.add(cache_key, 2, None)
+        except Exception as e:
+            logger.error(f"Error bumping application generation for {recruiter_id}: {e}")
+    
     @staticmethod
     def invalidate_analytics_cache(pattern: Optional[str] = None):
         """Invalidate analytics caches."""
@@ -333,19 +813,17 @@ def warm_cache():
     logger.info("Starting cache warm-up process")
     
     try:
-        from .models import JobPost, Skill
+        from .models import JobSearchDocument, Skill
         
         # Warm up skills cache
         skills = list(Skill.objects.filter(is_verified=True).values('id', 'name', 'category'))
         cache_manager.set(CACHE_PREFIXES['skills'], skills, CACHE_TIMEOUTS['very_long'])
         
-        # Warm up recent jobs cache
-        recent_jobs = JobPost.objects.filter(
-            is_active=True,
+        # Warm up recent jobs cache from the denormalized search documents
+        recent_jobs = JobSearchDocument.objects.filter(
             created_at__gte=timezone.now() - timedelta(days=7)
-        ).select_related('recruiter__recruiter_profile').values(
-            'id', 'title', 'location', 'job_type', 'created_at',
-            'recruiter__recruiter_profile__company_name'
+        ).values(
+            'title', 'location', 'job_type', 'created_at', 'company_name', id=F('job_post_id')
         )[:50]
         
         JobCacheManager.cache_job_list(
@@ -402,10 +880,36 @@ class CacheMonitor:
             logger.error(f"Error getting cache stats: {e}")
             return {}
     
+    @staticmethod
+    def get_near_cache_stats() -> Dict:
+        """Get this process's local and shared tier counters per near-cached prefix."""
+        from .near_cache import get_near_cache_stats
+        return get_near_cache_stats()
+    
+    @staticmethod
+    def get_prefix_stats(scope: str = 'cluster') -> Dict:
+        """Get hits, misses, sets, bytes and latency per cache prefix, across workers by default."""
+        return get_cache_metrics(scope)
+    
+    @staticmethod
+    def get_value_size_stats() -> Dict:
+        """Get this process's stored-size histograms and compression ratios per prefix."""
+        return size_histograms.snapshot()
+    
     @staticmethod
     def log_cache_performance():
         """Log cache performance metrics."""
         stats = CacheMonitor.get_cache_stats()
         if stats:
             logger.info(f"Cache Performance - Hit Rate: {stats.get('hit_rate', 0):.2f}%, "
-                       f"Memory Usage: {stats.get('memory_usage', 'N/A')}")
\ No newline at end of file
+                       f"Memory Usage: {stats.get('memory_usage', 'N/A')}")
+        
+        for prefix, prefix_stats in get_cache_metrics('local').items():
+            logger.info(f"Cache Prefix - {prefix}: hit rate {prefix_stats['hit_rate']:.2f}% "
+                       f"({prefix_stats['hits']} hits, {prefix_stats['misses']} misses), "
+                       f"avg get {prefix_stats['avg_get_ms']}ms")
+        
+        for prefix, sizes in size_histograms.snapshot().items():
+            logger.info(f"Cache Value Sizes - {prefix}: {sizes['count']} writes, "
+                       f"avg {sizes['avg_bytes']} bytes, max {sizes['max_bytes']} bytes, "
+                       f"compression ratio {sizes['compression_ratio']}")
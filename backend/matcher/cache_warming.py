@@ -0,0 +1,248 @@
+"""
+Data-driven cache warming for HireWise backend.
+
+After a deploy or a Redis flush, the caches hit hardest are refilled from
+recent traffic instead of waiting for users to pay for the misses:
+
+- searches: the first result page of the most frequent PopularSearchTerms
+- recommendations: job recommendations of recently active job seekers, and
+  the candidate recommendations behind recently active recruiters' dashboards
+- popular jobs: candidate recommendations of the most viewed active jobs
+
+Each target calls the code path that serves it with the same arguments as
+the API, so it fills the exact keys requests read. Targets run on a thread
+pool bounded by CACHE_WARMING['CONCURRENCY']. Run it with the warm_cache
+management command on deploy; warm_caches_task repeats it on a beat schedule.
+"""
+
+import logging
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import F
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+CACHE_WARMING_CONFIG = getattr(settings, 'CACHE_WARMING', {})
+
+CONCURRENCY = CACHE_WARMING_CONFIG.get('CONCURRENCY', 4)
+TOP_SEARCHES = CACHE_WARMING_CONFIG.get('TOP_SEARCHES', 50)
+SEARCH_WINDOW_DAYS = CACHE_WARMING_CONFIG.get('SEARCH_WINDOW_DAYS', 7)
+ACTIVE_USERS = CACHE_WARMING_CONFIG.get('ACTIVE_USERS', 200)
+ACTIVE_WITHIN_DAYS = CACHE_WARMING_CONFIG.get('ACTIVE_WITHIN_DAYS', 7)
+POPULAR_JOBS = CACHE_WARMING_CONFIG.get('POPULAR_JOBS', 50)
+
+TARGET_KINDS = ('searches', 'recommendations', 'popular_jobs')
+
+# Page sizes the API and dashboards request, so warmed keys are the ones read
+SEARCH_PAGE_SIZE = 20
+JOB_RECOMMENDATION_LIMITS = (20, 10)  # recommendations endpoint, job seeker dashboard
+DASHBOARD_CANDIDATE_LIMIT = 5
+DASHBOARD_JOBS = 3
+CANDIDATE_RECOMMENDATION_LIMIT = 20
+
+
+class WarmTarget:
+    """
+    One cache entry (or group of entries) to fill, and how to fill it
+    """
+
+    def __init__(self, kind: str, label: str, warm: Callable[[], Any]):
+        self.kind = kind
+        self.label = label
+        self.warm = warm
+
+    def __repr__(self):
+        return f"<WarmTarget {self.kind}:{self.label}>"
+
+
+def search_targets(limit: int = TOP_SEARCHES) -> List[WarmTarget]:
+    """
+    First result page of the most frequent recent job and candidate searches
+    """
+    from .recommendation_engine import SearchOptimizer
+    from .search_analytics import PopularSearchTerms
+
+    optimizer = SearchOptimizer()
+    since = timezone.now() - timedelta(days=SEARCH_WINDOW_DAYS)
+    search_functions = {'jobs': optimizer.search_jobs, 'candidates': optimizer.search_candidates}
+
+    targets = []
+    for search_type, search in search_functions.items():
+        terms = PopularSearchTerms.objects.filter(
+            search_type=search_type, last_searched__gte=since
+        ).order_by('-search_count').values_list('term', flat=True)[:limit]
+        for term in terms:
+            targets.append(WarmTarget(
+                'searches', f"{search_type}:{term}",
+                lambda search=search, term=term: search(
+                    query=term, filters={}, user=None, limit=SEARCH_PAGE_SIZE, offset=0
+                )
+            ))
+    return targets
+
+
+def recommendation_targets(limit: int = ACTIVE_USERS) -> List[WarmTarget]:
+    """
+    Recommendations shown to recently active job seekers and recruiters
+    """
+    from .models import JobPost, User
+    from .recommendation_engine import RecommendationEngine
+
+    engine = RecommendationEngine()
+    since = timezone.now() - timedelta(days=ACTIVE_WITHIN_DAYS)
+    active_users = User.objects.filter(is_active=True, last_login__gte=since).order_by('-last_login')
+
+    targets = []
+    job_seekers = active_users.filter(
+        user_type='job_seeker', job_seeker_profile__isnull=False
+    ).select_related('job_seeker_profile')[:limit]
+    for user in job_seekers:
+        targets.append(WarmTarget(
+            'recommendations', f"user:{user.id}",
+            lambda user=user: [
+                engine.get_job_recommendations_for_user(user, limit=recommendation_limit)
+                for recommendation_limit in JOB_RECOMMENDATION_LIMITS
+            ]
+        ))
+
+    recruiter_ids = list(active_users.filter(user_type='recruiter').values_list('id', flat=True)[:limit])
+    dashboard_jobs = JobPost.objects.filter(
+        recruiter_id__in=recruiter_ids, is_active=True
+    ).order_by('recruiter_id', '-created_at')
+    jobs_per_recruiter = Counter()
+    for job in dashboard_jobs:
+        # Recruiter dashboards show candidates for their newest active jobs
+        if jobs_per_recruiter[job.recruiter_id] >= DASHBOARD_JOBS:
+            continue
+        jobs_per_recruiter[job.recruiter_id] += 1
+        targets.append(WarmTarget(
+            'recommendations', f"job:{job.id}:dashboard",
+            lambda job=job: engine.get_candidate_recommendations_for_job(job, limit=DASHBOARD_CANDIDATE_LIMIT)
+        ))
+    return targets
+
+
+def popular_job_targets(limit: int = POPULAR_JOBS) -> List[WarmTarget]:
+    """
+    Candidate recommendations of the most viewed and applied-to active jobs
+    """
+    from .models import JobPost
+    from .recommendation_engine import RecommendationEngine
+
+    engine = RecommendationEngine()
+    jobs = JobPost.objects.filter(is_active=True).order_by(
+        (F('views_count') + F('applications_count')).desc(), '-created_at'
+    )[:limit]
+    return [
+        WarmTarget(
+            'popular_jobs', f"job:{job.id}",
+            lambda job=job: engine.get_candidate_recommendations_for_job(job, limit=CANDIDATE_RECOMMENDATION_LIMIT)
+        )
+        for job in jobs
+    ]
+
+
+TARGET_BUILDERS = {
+    'searches': search_targets,
+    'recommendations': recommendation_targets,
+    'popular_jobs': popular_job_targets,
+}
+
+
+def collect_targets(kinds: Optional[Iterable[str]] = None) -> List[WarmTarget]:
+    """
+    Warming targets of the given kinds (all by default), without duplicates
+    """
+    targets = []
+    seen = set()
+    for kind in kinds or TARGET_KINDS:
+        try:
+            built = TARGET_BUILDERS[kind]()
+        except Exception as e:
+            logger.error(f"Error collecting {kind} cache warming targets: {e}")
+            continue
+        for target in built:
+            if (target.kind, target.label) not in seen:
+                seen.add((target.kind, target.label))
+                targets.append(target)
+    return targets
+
+
+def _run_target(target: WarmTarget) -> float:
+    started = time.monotonic()
+    try:
+        target.warm()
+    finally:
+        close_old_connections()
+    return time.monotonic() - started
+
+
+def warm_targets(
+    targets: List[WarmTarget],
+    concurrency: int = CONCURRENCY,
+    progress: Optional[Callable[[int, int, WarmTarget, Optional[Exception]], None]] = None,
+) -> Dict[str, Any]:
+    """
+    Fill the targets' caches, at most concurrency at a time.
+
+    progress(done, total, target, error) is called as each target finishes.
+    Returns warmed and failed counts per kind and the total duration.
+    """
+    started = time.monotonic()
+    warmed, failed = Counter(), Counter()
+    total = len(targets)
+
+    def finished(done, target, error):
+        (failed if error else warmed)[target.kind] += 1
+        if error:
+            logger.error(f"Error warming cache for {target.kind}:{target.label}: {error}")
+        if progress:
+            progress(done, total, target, error)
+
+    if concurrency <= 1:
+        for done, target in enumerate(targets, 1):
+            try:
+                target.warm()
+                error = None
+            except Exception as e:
+                error = e
+            finished(done, target, error)
+    else:
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='cache-warming') as executor:
+            futures = {executor.submit(_run_target, target): target for target in targets}
+            for done, future in enumerate(as_completed(futures), 1):
+                finished(done, futures[future], future.exception())
+
+    return {
+        'targets': total,
+        'warmed': dict(warmed),
+        'failed': dict(failed),
+        'duration_seconds': round(time.monotonic() - started, 3),
+    }
+
+
+def run_cache_warming(
+    kinds: Optional[Iterable[str]] = None,
+    concurrency: Optional[int] = None,
+    progress: Optional[Callable[[int, int, WarmTarget, Optional[Exception]], None]] = None,
+) -> Dict[str, Any]:
+    """
+    Warm the static caches, then every data-driven target of the given kinds
+    """
+    from .cache_utils import warm_cache
+
+    warm_cache()
+    targets = collect_targets(kinds)
+    result = warm_targets(targets, CONCURRENCY if concurrency is None else concurrency, progress)
+    logger.info(
+        f"Cache warming finished: {sum(result['warmed'].values())}/{result['targets']} targets warmed "
+        f"in {result['duration_seconds']}s ({result['failed'] or 'no failures'})"
+    )
+    return result
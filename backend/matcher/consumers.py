@@ -2,15 +2,17 @@
 WebSocket consumers for real-time notifications, messaging, and updates.
 """
 
-import json
+import asyncio
 import logging
 from datetime import datetime
+from urllib.parse import parse_qs
 from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
 from django.contrib.auth.models import AnonymousUser
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 from .middleware import websocket_connection_manager
+from . import fast_json, notification_stream
 
 User = get_user_model()
 logger = logging.getLogger(__name__)
@@ -59,12 +61,46 @@ class NotificationConsumer(AsyncWebsocketConsumer):
         await self.accept()
         
         # Send connection confirmation
-        await self.send(text_data=json.dumps({
+        await self.send(text_data=fast_json.dumps({
             'type': 'connection_established',
             'user_id': str(self.user.id),
             'user_type': self.user.user_type,
             'timestamp': self.get_current_timestamp()
         }))
+        
+        # Catch up on notifications queued while the client was away
+        await self.replay_queued_notifications(self.requested_cursor())
+
+    def requested_cursor(self):
+        """
+        Offline notification cursor the client passed as ?cursor=<id>, if any.
+        """
+        query_params = parse_qs(self.scope.get('query_string', b'').decode())
+        cursor = query_params.get('cursor', [None])[0]
+        return cursor if notification_stream.is_valid_cursor(cursor) else None
+
+    async def replay_queued_notifications(self, cursor):
+        """
+        Send everything queued after the cursor in one batch and remember where this connection is.
+        """
+        entries, self.notification_cursor = await database_sync_to_async(notification_stream.read_after)(
+            str(self.user.id), cursor
+        )
+        if not entries:
+            return
+        
+        await self.send_queued_notifications(entries, self.notification_cursor)
+        await database_sync_to_async(notification_stream.mark_delivered)(
+            str(self.user.id), self.notification_cursor
+        )
+
+    async def send_queued_notifications(self, entries, cursor):
+        await self.send(text_data=fast_json.dumps({
+            'type': 'queued_notifications',
+            'notifications': entries,
+            'cursor': cursor,
+            'timestamp': self.get_current_timestamp()
+        }))
 
     async def register_connection(self):
         """
@@ -82,6 +118,10 @@ class NotificationConsumer(AsyncWebsocketConsumer):
             self.channel_name, 
             connection_info
         )
+        # Keeps the shared presence of an idle connection from expiring
+        self.presence_heartbeat = asyncio.ensure_future(
+            websocket_connection_manager.keep_presence(str(self.user.id), self.channel_name)
+        )
 
     def get_current_timestamp(self):
         """
@@ -110,6 +150,8 @@ class NotificationConsumer(AsyncWebsocketConsumer):
         
         # Unregister connection from connection manager
         if hasattr(self, 'user') and self.user != AnonymousUser():
+            if hasattr(self, 'presence_heartbeat'):
+                self.presence_heartbeat.cancel()
             await database_sync_to_async(websocket_connection_manager.remove_connection)(
                 str(self.user.id), 
                 self.channel_name
@@ -120,13 +162,16 @@ class NotificationConsumer(AsyncWebsocketConsumer):
         """
         Handle messages received from WebSocket.
         """
+        await database_sync_to_async(websocket_connection_manager.touch_connection)(
+            str(self.user.id), self.channel_name
+        )
         try:
-            text_data_json = json.loads(text_data)
+            text_data_json = fast_json.loads(text_data)
             message_type = text_data_json.get('type', 'ping')
             
             if message_type == 'ping':
                 # Respond to ping with pong
-                await self.send(text_data=json.dumps({
+                await self.send(text_data=fast_json.dumps({
                     'type': 'pong',
                     'timestamp': text_data_json.get('timestamp', self.get_current_timestamp())
                 }))
@@ -138,22 +183,22 @@ class NotificationConsumer(AsyncWebsocketConsumer):
                 await self.handle_unsubscription(text_data_json)
             else:
                 # Unknown message type
-                await self.send(text_data=json.dumps({
+                await self.send(text_data=fast_json.dumps({
                     'type': 'error',
                     'message': f'Unknown message type: {message_type}',
                     'timestamp': self.get_current_timestamp()
                 }))
                 
-        except json.JSONDecodeError:
+        except fast_json.JSONDecodeError:
             # Invalid JSON received
-            await self.send(text_data=json.dumps({
+            await self.send(text_data=fast_json.dumps({
                 'type': 'error',
                 'message': 'Invalid JSON format',
                 'timestamp': self.get_current_timestamp()
             }))
         except Exception as e:
             logger.error(f"Error handling WebSocket message: {e}")
-            await self.send(text_data=json.dumps({
+            await self.send(text_data=fast_json.dumps({
                 'type': 'error',
                 'message': 'Internal server error',
                 'timestamp': self.get_current_timestamp()
@@ -170,7 +215,7 @@ class NotificationConsumer(AsyncWebsocketConsumer):
                 group_name = f"{notification_type}_{self.user.user_type}"
                 await self.channel_layer.group_add(group_name, self.channel_name)
         
-        await self.send(text_data=json.dumps({
+        await self.send(text_data=fast_json.dumps({
             'type': 'subscription_confirmed',
             'notification_types': notification_types,
             'timestamp': self.get_current_timestamp()
@@ -187,7 +232,7 @@ class NotificationConsumer(AsyncWebsocketConsumer):
                 group_name = f"{notification_type}_{self.user.user_type}"
                 await self.channel_layer.group_discard(group_name, self.channel_name)
         
-        await self.send(text_data=json.dumps({
+        await self.send(text_data=fast_json.dumps({
             'type': 'unsubscription_confirmed',
             'notification_types': notification_types,
             'timestamp': self.get_current_timestamp()
@@ -198,7 +243,7 @@ class NotificationConsumer(AsyncWebsocketConsumer):
         Handle notification messages sent to the group.
         """
         # Send message to WebSocket
-        await self.send(text_data=json.dumps({
+        await self.send(text_data=fast_json.dumps({
             'type': 'notification',
             'message': event['message'],
             'notification_type': event.get('notification_type', 'info'),
@@ -207,11 +252,26 @@ class NotificationConsumer(AsyncWebsocketConsumer):
             'priority': event.get('priority', 'normal')
         }))
 
+    async def queued_notifications(self, event):
+        """
+        Handle a batch of queued notifications, skipping entries this connection already replayed.
+        """
+        seen = notification_stream.cursor_position(getattr(self, 'notification_cursor', None))
+        entries = [
+            entry for entry in event.get('notifications', [])
+            if notification_stream.cursor_position(entry.get('cursor')) > seen
+        ]
+        if not entries:
+            return
+        
+        self.notification_cursor = entries[-1]['cursor']
+        await self.send_queued_notifications(entries, self.notification_cursor)
+
     async def job_posted_notification(self, event):
         """
         Handle job posted notifications.
         """
-        await self.send(text_data=json.dumps({
+        await self.send(text_data=fast_json.dumps({
             'type': 'job_posted',
             'message': event['message'],
             'job_id': event.get('job_id'),
@@ -226,7 +286,7 @@ class NotificationConsumer(AsyncWebsocketConsumer):
         """
         Handle application received notifications.
         """
-        await self.send(text_data=json.dumps({
+        await self.send(text_data=fast_json.dumps({
             'type': 'application_received',
             'message': event['message'],
             'application_id': event.get('application_id'),
@@ -240,7 +300,7 @@ class NotificationConsumer(AsyncWebsocketConsumer):
         """
         Handle application status change notifications.
         """
-        await self.send(text_data=json.dumps({
+        await self.send(text_data=fast_json.dumps({
             'type': 'application_status_changed',
             'message': event['message'],
             'application_id': event.get('application_id'),
@@ -255,7 +315,7 @@ class NotificationConsumer(AsyncWebsocketConsumer):
         """
         Handle match score calculation notifications.
         """
-        await self.send(text_data=json.dumps({
+        await self.send(text_data=fast_json.dumps({
             'type': 'match_score_calculated',
             'message': event['message'],
             'job_id': event.get('job_id'),
@@ -298,7 +358,7 @@ class MessageConsumer(AsyncWebsocketConsumer):
         await self.accept()
         
         # Send connection confirmation
-        await self.send(text_data=json.dumps({
+        await self.send(text_data=fast_json.dumps({
             'type': 'connection_established',
             'user_id': str(self.user.id),
             'timestamp': timezone.now().isoformat()
@@ -319,6 +379,10 @@ class MessageConsumer(AsyncWebsocketConsumer):
             self.channel_name, 
             connection_info
         )
+        # Keeps the shared presence of an idle connection from expiring
+        self.presence_heartbeat = asyncio.ensure_future(
+            websocket_connection_manager.keep_presence(str(self.user.id), self.channel_name)
+        )
 
     async def disconnect(self, close_code):
         """
@@ -332,6 +396,8 @@ class MessageConsumer(AsyncWebsocketConsumer):
         
         # Unregister connection
         if hasattr(self, 'user') and self.user != AnonymousUser():
+            if hasattr(self, 'presence_heartbeat'):
+                self.presence_heartbeat.cancel()
             await database_sync_to_async(websocket_connection_manager.remove_connection)(
                 str(self.user.id), 
                 self.channel_name
@@ -342,12 +408,15 @@ class MessageConsumer(AsyncWebsocketConsumer):
         """
         Handle messages received from WebSocket.
         """
+        await database_sync_to_async(websocket_connection_manager.touch_connection)(
+            str(self.user.id), self.channel_name
+        )
         try:
-            data = json.loads(text_data)
+            data = fast_json.loads(text_data)
             message_type = data.get('type', 'ping')
             
             if message_type == 'ping':
-                await self.send(text_data=json.dumps({
+                await self.send(text_data=fast_json.dumps({
                     'type': 'pong',
                     'timestamp': timezone.now().isoformat()
                 }))
@@ -360,21 +429,21 @@ class MessageConsumer(AsyncWebsocketConsumer):
             elif message_type == 'mark_read':
                 await self.handle_mark_read(data)
             else:
-                await self.send(text_data=json.dumps({
+                await self.send(text_data=fast_json.dumps({
                     'type': 'error',
                     'message': f'Unknown message type: {message_type}',
                     'timestamp': timezone.now().isoformat()
                 }))
                 
-        except json.JSONDecodeError:
-            await self.send(text_data=json.dumps({
+        except fast_json.JSONDecodeError:
+            await self.send(text_data=fast_json.dumps({
                 'type': 'error',
                 'message': 'Invalid JSON format',
                 'timestamp': timezone.now().isoformat()
             }))
         except Exception as e:
             logger.error(f"Error handling message WebSocket: {e}")
-            await self.send(text_data=json.dumps({
+            await self.send(text_data=fast_json.dumps({
                 'type': 'error',
                 'message': 'Internal server error',
                 'timestamp': timezone.now().isoformat()
@@ -390,7 +459,7 @@ class MessageConsumer(AsyncWebsocketConsumer):
             message_type = data.get('message_type', 'text')
             
             if not conversation_id or not content:
-                await self.send(text_data=json.dumps({
+                await self.send(text_data=fast_json.dumps({
                     'type': 'error',
                     'message': 'Missing conversation_id or content',
                     'timestamp': timezone.now().isoformat()
@@ -423,7 +492,7 @@ class MessageConsumer(AsyncWebsocketConsumer):
             
         except Exception as e:
             logger.error(f"Error sending message: {e}")
-            await self.send(text_data=json.dumps({
+            await self.send(text_data=fast_json.dumps({
                 'type': 'error',
                 'message': 'Failed to send message',
                 'timestamp': timezone.now().isoformat()
@@ -574,7 +643,7 @@ class MessageConsumer(AsyncWebsocketConsumer):
         """
         Handle message received event.
         """
-        await self.send(text_data=json.dumps({
+        await self.send(text_data=fast_json.dumps({
             'type': 'message_received',
             'message_id': event['message_id'],
             'conversation_id': event['conversation_id'],
@@ -590,7 +659,7 @@ class MessageConsumer(AsyncWebsocketConsumer):
         """
         Handle typing indicator event.
         """
-        await self.send(text_data=json.dumps({
+        await self.send(text_data=fast_json.dumps({
             'type': 'typing_indicator',
             'conversation_id': event['conversation_id'],
             'user_id': event['user_id'],
@@ -603,7 +672,7 @@ class MessageConsumer(AsyncWebsocketConsumer):
         """
         Handle message read receipt event.
         """
-        await self.send(text_data=json.dumps({
+        await self.send(text_data=fast_json.dumps({
             'type': 'message_read_receipt',
             'message_id': event['message_id'],
             'reader_id': event['reader_id'],
@@ -646,7 +715,7 @@ class UpdateConsumer(AsyncWebsocketConsumer):
         await self.accept()
         
         # Send connection confirmation
-        await self.send(text_data=json.dumps({
+        await self.send(text_data=fast_json.dumps({
             'type': 'connection_established',
             'user_id': str(self.user.id),
             'timestamp': timezone.now().isoformat()
@@ -667,6 +736,10 @@ class UpdateConsumer(AsyncWebsocketConsumer):
             self.channel_name, 
             connection_info
         )
+        # Keeps the shared presence of an idle connection from expiring
+        self.presence_heartbeat = asyncio.ensure_future(
+            websocket_connection_manager.keep_presence(str(self.user.id), self.channel_name)
+        )
 
     async def disconnect(self, close_code):
         """
@@ -680,6 +753,8 @@ class UpdateConsumer(AsyncWebsocketConsumer):
         
         # Unregister connection
         if hasattr(self, 'user') and self.user != AnonymousUser():
+            if hasattr(self, 'presence_heartbeat'):
+                self.presence_heartbeat.cancel()
             await database_sync_to_async(websocket_connection_manager.remove_connection)(
                 str(self.user.id), 
                 self.channel_name
@@ -690,12 +765,15 @@ class UpdateConsumer(AsyncWebsocketConsumer):
         """
         Handle messages received from WebSocket.
         """
+        await database_sync_to_async(websocket_connection_manager.touch_connection)(
+            str(self.user.id), self.channel_name
+        )
         try:
-            data = json.loads(text_data)
+            data = fast_json.loads(text_data)
             message_type = data.get('type', 'ping')
             
             if message_type == 'ping':
-                await self.send(text_data=json.dumps({
+                await self.send(text_data=fast_json.dumps({
                     'type': 'pong',
                     'timestamp': timezone.now().isoformat()
                 }))
@@ -704,21 +782,21 @@ class UpdateConsumer(AsyncWebsocketConsumer):
             elif message_type == 'unsubscribe_updates':
                 await self.handle_unsubscribe_updates(data)
             else:
-                await self.send(text_data=json.dumps({
+                await self.send(text_data=fast_json.dumps({
                     'type': 'error',
                     'message': f'Unknown message type: {message_type}',
                     'timestamp': timezone.now().isoformat()
                 }))
                 
-        except json.JSONDecodeError:
-            await self.send(text_data=json.dumps({
+        except fast_json.JSONDecodeError:
+            await self.send(text_data=fast_json.dumps({
                 'type': 'error',
                 'message': 'Invalid JSON format',
                 'timestamp': timezone.now().isoformat()
             }))
         except Exception as e:
             logger.error(f"Error handling update WebSocket: {e}")
-            await self.send(text_data=json.dumps({
+            await self.send(text_data=fast_json.dumps({
                 'type': 'error',
                 'message': 'Internal server error',
                 'timestamp': timezone.now().isoformat()
@@ -735,7 +813,7 @@ class UpdateConsumer(AsyncWebsocketConsumer):
                 group_name = f"updates_{update_type}_{self.user.user_type}"
                 await self.channel_layer.group_add(group_name, self.channel_name)
         
-        await self.send(text_data=json.dumps({
+        await self.send(text_data=fast_json.dumps({
             'type': 'subscription_confirmed',
             'update_types': update_types,
             'timestamp': timezone.now().isoformat()
@@ -752,7 +830,7 @@ class UpdateConsumer(AsyncWebsocketConsumer):
                 group_name = f"updates_{update_type}_{self.user.user_type}"
                 await self.channel_layer.group_discard(group_name, self.channel_name)
         
-        await self.send(text_data=json.dumps({
+        await self.send(text_data=fast_json.dumps({
             'type': 'unsubscription_confirmed',
             'update_types': update_types,
             'timestamp': timezone.now().isoformat()
@@ -763,7 +841,7 @@ class UpdateConsumer(AsyncWebsocketConsumer):
         """
         Handle job match updates.
         """
-        await self.send(text_data=json.dumps({
+        await self.send(text_data=fast_json.dumps({
             'type': 'job_match_update',
             'job_id': event.get('job_id'),
             'job_title': event.get('job_title'),
@@ -777,7 +855,7 @@ class UpdateConsumer(AsyncWebsocketConsumer):
         """
         Handle application status updates.
         """
-        await self.send(text_data=json.dumps({
+        await self.send(text_data=fast_json.dumps({
             'type': 'application_status_update',
             'application_id': event.get('application_id'),
             'job_title': event.get('job_title'),
@@ -792,7 +870,7 @@ class UpdateConsumer(AsyncWebsocketConsumer):
         """
         Handle profile view updates.
         """
-        await self.send(text_data=json.dumps({
+        await self.send(text_data=fast_json.dumps({
             'type': 'profile_view_update',
             'viewer_name': event.get('viewer_name'),
             'viewer_company': event.get('viewer_company'),
@@ -805,7 +883,7 @@ class UpdateConsumer(AsyncWebsocketConsumer):
         """
         Handle system updates.
         """
-        await self.send(text_data=json.dumps({
+        await self.send(text_data=fast_json.dumps({
             'type': 'system_update',
             'update_type': event.get('update_type'),
             'message': event.get('message'),
@@ -854,7 +932,7 @@ class InterviewConsumer(AsyncWebsocketConsumer):
         await self.accept()
         
         # Send connection confirmation
-        await self.send(text_data=json.dumps({
+        await self.send(text_data=fast_json.dumps({
             'type': 'connection_established',
             'user_id': str(self.user.id),
             'session_id': self.session_id,
@@ -877,6 +955,10 @@ class InterviewConsumer(AsyncWebsocketConsumer):
             self.channel_name, 
             connection_info
         )
+        # Keeps the shared presence of an idle connection from expiring
+        self.presence_heartbeat = asyncio.ensure_future(
+            websocket_connection_manager.keep_presence(str(self.user.id), self.channel_name)
+        )
 
     @database_sync_to_async
     def verify_session_access(self):
@@ -908,6 +990,8 @@ class InterviewConsumer(AsyncWebsocketConsumer):
         
         # Unregister connection
         if hasattr(self, 'user') and self.user != AnonymousUser():
+            if hasattr(self, 'presence_heartbeat'):
+                self.presence_heartbeat.cancel()
             await database_sync_to_async(websocket_connection_manager.remove_connection)(
                 str(self.user.id), 
                 self.channel_name
@@ -918,12 +1002,15 @@ class InterviewConsumer(AsyncWebsocketConsumer):
         """
         Handle messages received from WebSocket.
         """
+        await database_sync_to_async(websocket_connection_manager.touch_connection)(
+            str(self.user.id), self.channel_name
+        )
         try:
-            data = json.loads(text_data)
+            data = fast_json.loads(text_data)
             message_type = data.get('type', 'ping')
             
             if message_type == 'ping':
-                await self.send(text_data=json.dumps({
+                await self.send(text_data=fast_json.dumps({
                     'type': 'pong',
                     'timestamp': timezone.now().isoformat()
                 }))
@@ -934,21 +1021,21 @@ class InterviewConsumer(AsyncWebsocketConsumer):
             elif message_type == 'end_interview':
                 await self.handle_end_interview(data)
             else:
-                await self.send(text_data=json.dumps({
+                await self.send(text_data=fast_json.dumps({
                     'type': 'error',
                     'message': f'Unknown message type: {message_type}',
                     'timestamp': timezone.now().isoformat()
                 }))
                 
-        except json.JSONDecodeError:
-            await self.send(text_data=json.dumps({
+        except fast_json.JSONDecodeError:
+            await self.send(text_data=fast_json.dumps({
                 'type': 'error',
                 'message': 'Invalid JSON format',
                 'timestamp': timezone.now().isoformat()
             }))
         except Exception as e:
             logger.error(f"Error handling interview WebSocket: {e}")
-            await self.send(text_data=json.dumps({
+            await self.send(text_data=fast_json.dumps({
                 'type': 'error',
                 'message': 'Internal server error',
                 'timestamp': timezone.now().isoformat()
@@ -964,7 +1051,7 @@ class InterviewConsumer(AsyncWebsocketConsumer):
             response_type = data.get('response_type', 'text')
             
             if not question_id or not response_text:
-                await self.send(text_data=json.dumps({
+                await self.send(text_data=fast_json.dumps({
                     'type': 'error',
                     'message': 'Missing question_id or response',
                     'timestamp': timezone.now().isoformat()
@@ -975,7 +1062,7 @@ class InterviewConsumer(AsyncWebsocketConsumer):
             analysis = await self.save_interview_response(question_id, response_text, response_type)
             
             # Send response confirmation and analysis
-            await self.send(text_data=json.dumps({
+            await self.send(text_data=fast_json.dumps({
                 'type': 'response_received',
                 'question_id': question_id,
                 'analysis': analysis,
@@ -984,7 +1071,7 @@ class InterviewConsumer(AsyncWebsocketConsumer):
             
         except Exception as e:
             logger.error(f"Error handling interview response: {e}")
-            await self.send(text_data=json.dumps({
+            await self.send(text_data=fast_json.dumps({
                 'type': 'error',
                 'message': 'Failed to process response',
                 'timestamp': timezone.now().isoformat()
@@ -998,13 +1085,13 @@ class InterviewConsumer(AsyncWebsocketConsumer):
             next_question = await self.get_next_question()
             
             if next_question:
-                await self.send(text_data=json.dumps({
+                await self.send(text_data=fast_json.dumps({
                     'type': 'next_question',
                     'question': next_question,
                     'timestamp': timezone.now().isoformat()
                 }))
             else:
-                await self.send(text_data=json.dumps({
+                await self.send(text_data=fast_json.dumps({
                     'type': 'interview_complete',
                     'message': 'No more questions available',
                     'timestamp': timezone.now().isoformat()
@@ -1012,7 +1099,7 @@ class InterviewConsumer(AsyncWebsocketConsumer):
                 
         except Exception as e:
             logger.error(f"Error getting next question: {e}")
-            await self.send(text_data=json.dumps({
+            await self.send(text_data=fast_json.dumps({
                 'type': 'error',
                 'message': 'Failed to get next question',
                 'timestamp': timezone.now().isoformat()
@@ -1038,7 +1125,7 @@ class InterviewConsumer(AsyncWebsocketConsumer):
             
         except Exception as e:
             logger.error(f"Error ending interview: {e}")
-            await self.send(text_data=json.dumps({
+            await self.send(text_data=fast_json.dumps({
                 'type': 'error',
                 'message': 'Failed to end interview',
                 'timestamp': timezone.now().isoformat()
@@ -1135,7 +1222,7 @@ class InterviewConsumer(AsyncWebsocketConsumer):
         """
         Handle interview ended event.
         """
-        await self.send(text_data=json.dumps({
+        await self.send(text_data=fast_json.dumps({
             'type': 'interview_ended',
             'final_analysis': event['final_analysis'],
             'ended_by': event['ended_by'],
@@ -1146,7 +1233,7 @@ class InterviewConsumer(AsyncWebsocketConsumer):
         """
         Handle question update event.
         """
-        await self.send(text_data=json.dumps({
+        await self.send(text_data=fast_json.dumps({
             'type': 'question_update',
             'question': event['question'],
             'timestamp': event['timestamp']
@@ -1189,7 +1276,7 @@ class AdminConsumer(AsyncWebsocketConsumer):
         await self.accept()
         
         # Send connection confirmation
-        await self.send(text_data=json.dumps({
+        await self.send(text_data=fast_json.dumps({
             'type': 'connection_established',
             'user_id': str(self.user.id),
             'admin_level': 'superuser' if self.user.is_superuser else 'staff',
@@ -1212,6 +1299,10 @@ class AdminConsumer(AsyncWebsocketConsumer):
             self.channel_name, 
             connection_info
         )
+        # Keeps the shared presence of an idle connection from expiring
+        self.presence_heartbeat = asyncio.ensure_future(
+            websocket_connection_manager.keep_presence(str(self.user.id), self.channel_name)
+        )
 
     async def disconnect(self, close_code):
         """
@@ -1222,6 +1313,8 @@ class AdminConsumer(AsyncWebsocketConsumer):
         
         # Unregister connection
         if hasattr(self, 'user') and self.user != AnonymousUser():
+            if hasattr(self, 'presence_heartbeat'):
+                self.presence_heartbeat.cancel()
             await database_sync_to_async(websocket_connection_manager.remove_connection)(
                 str(self.user.id), 
                 self.channel_name
@@ -1232,12 +1325,15 @@ class AdminConsumer(AsyncWebsocketConsumer):
         """
         Handle messages received from WebSocket.
         """
+        await database_sync_to_async(websocket_connection_manager.touch_connection)(
+            str(self.user.id), self.channel_name
+        )
         try:
-            data = json.loads(text_data)
+            data = fast_json.loads(text_data)
             message_type = data.get('type', 'ping')
             
             if message_type == 'ping':
-                await self.send(text_data=json.dumps({
+                await self.send(text_data=fast_json.dumps({
                     'type': 'pong',
                     'timestamp': timezone.now().isoformat()
                 }))
@@ -1246,21 +1342,21 @@ class AdminConsumer(AsyncWebsocketConsumer):
             elif message_type == 'broadcast_message':
                 await self.handle_broadcast_message(data)
             else:
-                await self.send(text_data=json.dumps({
+                await self.send(text_data=fast_json.dumps({
                     'type': 'error',
                     'message': f'Unknown message type: {message_type}',
                     'timestamp': timezone.now().isoformat()
                 }))
                 
-        except json.JSONDecodeError:
-            await self.send(text_data=json.dumps({
+        except fast_json.JSONDecodeError:
+            await self.send(text_data=fast_json.dumps({
                 'type': 'error',
                 'message': 'Invalid JSON format',
                 'timestamp': timezone.now().isoformat()
             }))
         except Exception as e:
             logger.error(f"Error handling admin WebSocket: {e}")
-            await self.send(text_data=json.dumps({
+            await self.send(text_data=fast_json.dumps({
                 'type': 'error',
                 'message': 'Internal server error',
                 'timestamp': timezone.now().isoformat()
@@ -1273,7 +1369,7 @@ class AdminConsumer(AsyncWebsocketConsumer):
         try:
             stats = await self.get_system_statistics()
             
-            await self.send(text_data=json.dumps({
+            await self.send(text_data=fast_json.dumps({
                 'type': 'system_stats',
                 'stats': stats,
                 'timestamp': timezone.now().isoformat()
@@ -1281,7 +1377,7 @@ class AdminConsumer(AsyncWebsocketConsumer):
             
         except Exception as e:
             logger.error(f"Error getting system stats: {e}")
-            await self.send(text_data=json.dumps({
+            await self.send(text_data=fast_json.dumps({
                 'type': 'error',
                 'message': 'Failed to get system statistics',
                 'timestamp': timezone.now().isoformat()
@@ -1293,7 +1389,7 @@ class AdminConsumer(AsyncWebsocketConsumer):
         """
         try:
             if not self.user.is_superuser:
-                await self.send(text_data=json.dumps({
+                await self.send(text_data=fast_json.dumps({
                     'type': 'error',
                     'message': 'Insufficient permissions for broadcast',
                     'timestamp': timezone.now().isoformat()
@@ -1305,7 +1401,7 @@ class AdminConsumer(AsyncWebsocketConsumer):
             priority = data.get('priority', 'normal')
             
             if not message:
-                await self.send(text_data=json.dumps({
+                await self.send(text_data=fast_json.dumps({
                     'type': 'error',
                     'message': 'Message content is required',
                     'timestamp': timezone.now().isoformat()
@@ -1315,7 +1411,7 @@ class AdminConsumer(AsyncWebsocketConsumer):
             # Broadcast to appropriate groups
             await self.broadcast_admin_message(message, target_group, priority)
             
-            await self.send(text_data=json.dumps({
+            await self.send(text_data=fast_json.dumps({
                 'type': 'broadcast_sent',
                 'message': 'Message broadcasted successfully',
                 'timestamp': timezone.now().isoformat()
@@ -1323,7 +1419,7 @@ class AdminConsumer(AsyncWebsocketConsumer):
             
         except Exception as e:
             logger.error(f"Error broadcasting message: {e}")
-            await self.send(text_data=json.dumps({
+            await self.send(text_data=fast_json.dumps({
                 'type': 'error',
                 'message': 'Failed to broadcast message',
                 'timestamp': timezone.now().isoformat()
@@ -1332,55 +1428,14 @@ class AdminConsumer(AsyncWebsocketConsumer):
     @database_sync_to_async
     def get_system_statistics(self):
         """
-        Get current system statistics.
+        Get current system statistics from the periodic snapshot.
         """
         try:
-            from .models import User, JobPost, Application, Notification
-            from django.db.models import Count, Q
-            from datetime import timedelta
-            
-            now = timezone.now()
-            last_24h = now - timedelta(hours=24)
-            last_7d = now - timedelta(days=7)
-            
-            stats = {
-                'users': {
-                    'total': User.objects.count(),
-                    'active_24h': User.objects.filter(last_login__gte=last_24h).count(),
-                    'job_seekers': User.objects.filter(user_type='job_seeker').count(),
-                    'recruiters': User.objects.filter(user_type='recruiter').count(),
-                },
-                'jobs': {
-                    'total': JobPost.objects.count(),
-                    'active': JobPost.objects.filter(is_active=True).count(),
-                    'posted_24h': JobPost.objects.filter(created_at__gte=last_24h).count(),
-                    'posted_7d': JobPost.objects.filter(created_at__gte=last_7d).count(),
-                },
-                'applications': {
-                    'total': Application.objects.count(),
-                    'submitted_24h': Application.objects.filter(applied_at__gte=last_24h).count(),
-                    'submitted_7d': Application.objects.filter(applied_at__gte=last_7d).count(),
-                    'pending': Application.objects.filter(status='pending').count(),
-                },
-                'notifications': {
-                    'total': Notification.objects.count(),
-                    'unread': Notification.objects.filter(is_read=False).count(),
-                    'sent_24h': Notification.objects.filter(created_at__gte=last_24h).count(),
-                },
-                'websocket_connections': {
-                    'total': len(websocket_connection_manager.connection_metadata),
-                    'online_users': len(websocket_connection_manager.active_connections),
-                    'by_type': {}
-                }
-            }
-            
-            # Get connection stats by type
-            for channel_name, metadata in websocket_connection_manager.connection_metadata.items():
-                consumer_type = metadata.get('connection_info', {}).get('consumer_type', 'unknown')
-                if consumer_type not in stats['websocket_connections']['by_type']:
-                    stats['websocket_connections']['by_type'][consumer_type] = 0
-                stats['websocket_connections']['by_type'][consumer_type] += 1
+            from .system_stats import get_system_stats_snapshot
             
+            stats = dict(get_system_stats_snapshot())
+            # Connections are tracked per process, so they are added at read time
+            stats['websocket_connections'] = websocket_connection_manager.get_connection_stats()
             return stats
             
         except Exception as e:
@@ -1419,7 +1474,7 @@ class AdminConsumer(AsyncWebsocketConsumer):
         """
         Handle system alert events.
         """
-        await self.send(text_data=json.dumps({
+        await self.send(text_data=fast_json.dumps({
             'type': 'system_alert',
             'alert_type': event.get('alert_type'),
             'message': event.get('message'),
@@ -1432,7 +1487,7 @@ class AdminConsumer(AsyncWebsocketConsumer):
         """
         Handle user activity alerts.
         """
-        await self.send(text_data=json.dumps({
+        await self.send(text_data=fast_json.dumps({
             'type': 'user_activity_alert',
             'user_id': event.get('user_id'),
             'activity_type': event.get('activity_type'),
@@ -1441,11 +1496,23 @@ class AdminConsumer(AsyncWebsocketConsumer):
             'data': event.get('data', {})
         }))
 
+    async def system_stats_update(self, event):
+        """
+        Handle system statistics changes pushed by the snapshot task.
+        """
+        await self.send(text_data=fast_json.dumps({
+            'type': 'system_stats_update',
+            'changes': event['changes'],
+            'full': event.get('full', False),
+            'generated_at': event['generated_at'],
+            'timestamp': timezone.now().isoformat()
+        }))
+
     async def admin_broadcast(self, event):
         """
         Handle admin broadcast messages.
         """
-        await self.send(text_data=json.dumps({
+        await self.send(text_data=fast_json.dumps({
             'type': 'admin_broadcast',
             'message': event['message'],
             'priority': event['priority'],
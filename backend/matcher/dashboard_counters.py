@@ -0,0 +1,312 @@
+"""
+Counter-backed dashboard statistics for HireWise backend.
+
+Each job seeker and recruiter has one DashboardCounters row holding the
+numbers their dashboard shows: applications by status, scheduled interviews,
+job posts, profile completion and unread notifications. Signals and the
+notification service shift the counters atomically as applications,
+interviews, job posts, profiles and notifications change, so the dashboard
+and the unread badge are a primary-key read instead of COUNT queries per poll.
+reconcile_dashboard_counters() recounts everything from the source tables to
+correct drift from queryset.update() and other writes that skip signals.
+"""
+
+import logging
+from typing import Any, Dict, Iterable, Optional
+
+from django.conf import settings
+from django.core.exceptions import ObjectDoesNotExist
+from django.db.models import Count, Exists, F, OuterRef, Q
+from django.db.models.functions import Greatest
+
+from .models import Application, DashboardCounters, InterviewSession, JobPost, Notification, User, UserSkill
+
+logger = logging.getLogger(__name__)
+
+DASHBOARD_COUNTERS_CONFIG = getattr(settings, 'DASHBOARD_COUNTERS', {})
+
+RECONCILE_BATCH_SIZE = DASHBOARD_COUNTERS_CONFIG.get('RECONCILE_BATCH_SIZE', 500)
+
+COUNTED_USER_TYPES = ('job_seeker', 'recruiter')
+
+# Application statuses with their own counter
+STATUS_FIELDS = {
+    'pending': 'applications_pending',
+    'shortlisted': 'applications_shortlisted',
+    'interview_scheduled': 'applications_interview_scheduled',
+    'hired': 'applications_hired',
+}
+
+COUNTER_FIELDS = [
+    'applications_total', *STATUS_FIELDS.values(), 'interviews_scheduled',
+    'job_posts_total', 'job_posts_active', 'profile_completion', 'notifications_unread',
+]
+
+JOB_SEEKER_PROFILE_FIELDS = ('date_of_birth', 'location', 'experience_level', 'current_position', 'bio')
+RECRUITER_PROFILE_FIELDS = ('company_name', 'company_website', 'industry', 'company_description', 'location')
+
+
+def _completion(filled: Iterable[Any]) -> int:
+    filled = list(filled)
+    return int((sum(1 for value in filled if value) / len(filled)) * 100)
+
+
+def calculate_profile_completion(user, has_skills: Optional[bool] = None) -> int:
+    """
+    Profile completion percentage; job seekers also need at least one skill
+    """
+    try:
+        if user.user_type == 'job_seeker':
+            profile = user.job_seeker_profile
+            if has_skills is None:
+                has_skills = user.user_skills.exists()
+            return _completion(
+                [getattr(profile, field) for field in JOB_SEEKER_PROFILE_FIELDS] + [has_skills]
+            )
+        if user.user_type == 'recruiter':
+            profile = user.recruiter_profile
+            return _completion(getattr(profile, field) for field in RECRUITER_PROFILE_FIELDS)
+    except ObjectDoesNotExist:
+        return 0
+    return 0
+
+
+def application_deltas(status: str, amount: int, total: bool = True) -> Dict[str, int]:
+    """
+    Counter changes for adding (amount=1) or removing (amount=-1) an application in a status
+    """
+    deltas = {'applications_total': amount} if total else {}
+    if status in STATUS_FIELDS:
+        deltas[STATUS_FIELDS[status]] = amount
+    return deltas
+
+
+def adjust_dashboard_counters(user_id, create_missing: bool = True, **deltas: int) -> None:
+    """
+    Atomically shift a user's counters.
+
+    A user without a counters row gets one built from the source tables, which
+    already include the change being counted. Delete handlers pass
+    create_missing=False so a cascade from deleting the user cannot recreate it.
+    """
+    deltas = {field: amount for field, amount in deltas.items() if amount}
+    if user_id is None or not deltas:
+        return
+
+    updated = DashboardCounters.objects.filter(user_id=user_id).update(**{
+        field: Greatest(F(field) + amount, 0) for field, amount in deltas.items()
+    })
+    if not updated and create_missing:
+        rebuild_dashboard_counters([user_id])
+
+
+def adjust_many_dashboard_counters(user_ids: Iterable, **deltas: int) -> None:
+    """
+    Atomically shift the same counters of many users with one UPDATE; users without a row get one built
+    """
+    user_ids = list(user_ids)
+    deltas = {field: amount for field, amount in deltas.items() if amount}
+    if not user_ids or not deltas:
+        return
+
+    updated = DashboardCounters.objects.filter(user_id__in=user_ids).update(**{
+        field: Greatest(F(field) + amount, 0) for field, amount in deltas.items()
+    })
+    if updated < len(set(user_ids)):
+        stored = set(DashboardCounters.objects.filter(user_id__in=user_ids).values_list('user_id', flat=True))
+        rebuild_dashboard_counters([user_id for user_id in user_ids if user_id not in stored])
+
+
+def refresh_profile_completion(user_id, create_missing: bool = True) -> None:
+    """
+    Recompute a user's profile completion after a profile or skill change
+    """
+    user = User.objects.select_related('job_seeker_profile', 'recruiter_profile').filter(id=user_id).first()
+    if user is None:
+        return
+
+    updated = DashboardCounters.objects.filter(user_id=user_id).update(
+        profile_completion=calculate_profile_completion(user)
+    )
+    if not updated and create_missing:
+        rebuild_dashboard_counters([user_id])
+
+
+def refresh_job_post_counters(recruiter_id, create_missing: bool = True) -> None:
+    """
+    Recount a recruiter's job posts; job post writes are rare enough to count exactly
+    """
+    counts = JobPost.objects.filter(recruiter_id=recruiter_id).aggregate(
+        total=Count('id'), active=Count('id', filter=Q(is_active=True))
+    )
+    updated = DashboardCounters.objects.filter(user_id=recruiter_id).update(
+        job_posts_total=counts['total'], job_posts_active=counts['active']
+    )
+    if not updated and create_missing:
+        rebuild_dashboard_counters([recruiter_id])
+
+
+def get_dashboard_counters(user) -> DashboardCounters:
+    """
+    The user's counters row, built on first access
+    """
+    counters = DashboardCounters.objects.filter(user_id=user.id).first()
+    if counters is None:
+        rebuild_dashboard_counters([user.id])
+        counters = DashboardCounters.objects.filter(user_id=user.id).first() or DashboardCounters(user_id=user.id)
+    return counters
+
+
+def get_unread_notifications_count(user_id) -> int:
+    """
+    The user's unread notification count from their counters row, counted directly for users without one
+    """
+    unread = DashboardCounters.objects.filter(user_id=user_id).values_list('notifications_unread', flat=True).first()
+    if unread is None and rebuild_dashboard_counters([user_id]):
+        unread = DashboardCounters.objects.filter(user_id=user_id).values_list('notifications_unread', flat=True).first()
+    if unread is None:
+        # Admins and other uncounted user types
+        unread = Notification.objects.filter(recipient_id=user_id, is_read=False).count()
+    return unread
+
+
+def dashboard_stats_for(user, counters: DashboardCounters) -> Dict[str, int]:
+    """
+    Dashboard payload for the user's type
+    """
+    if user.user_type == 'job_seeker':
+        return {
+            'total_applications': counters.applications_total,
+            'pending_applications': counters.applications_pending,
+            'shortlisted_applications': counters.applications_shortlisted,
+            'interviews_scheduled': counters.interviews_scheduled,
+            'profile_completion': counters.profile_completion,
+        }
+    if user.user_type == 'recruiter':
+        return {
+            'total_job_posts': counters.job_posts_total,
+            'active_job_posts': counters.job_posts_active,
+            'total_applications': counters.applications_total,
+            'pending_applications': counters.applications_pending,
+            'interviews_scheduled': counters.interviews_scheduled,
+        }
+    return {}
+
+
+def _application_counts(applications, user_field: str) -> Dict[Any, Dict[str, int]]:
+    aggregates = {'applications_total': Count('id')}
+    aggregates.update({
+        field: Count('id', filter=Q(status=status)) for status, field in STATUS_FIELDS.items()
+    })
+    return {
+        row.pop(user_field): row
+        for row in applications.values(user_field).annotate(**aggregates).order_by()
+    }
+
+
+def _interview_counts(user_field: str, user_ids) -> Dict[Any, int]:
+    return dict(
+        InterviewSession.objects.filter(status='scheduled', **{f'{user_field}__in': user_ids})
+        .values(user_field).annotate(total=Count('id')).order_by()
+        .values_list(user_field, 'total')
+    )
+
+
+def _compute_counters(user_ids) -> Dict[Any, Dict[str, int]]:
+    """
+    Counter values for the given users, recounted with one grouped query per source
+    """
+    users = list(
+        User.objects.filter(id__in=user_ids, user_type__in=COUNTED_USER_TYPES)
+        .select_related('job_seeker_profile', 'recruiter_profile')
+        .annotate(has_skills=Exists(UserSkill.objects.filter(user=OuterRef('pk'))))
+    )
+    seeker_ids = [user.id for user in users if user.user_type == 'job_seeker']
+    recruiter_ids = [user.id for user in users if user.user_type == 'recruiter']
+
+    applications = {}
+    interviews = {}
+    if seeker_ids:
+        applications.update(_application_counts(
+            Application.objects.filter(job_seeker_id__in=seeker_ids), 'job_seeker_id'
+        ))
+        interviews.update(_interview_counts('application__job_seeker_id', seeker_ids))
+    job_posts = {}
+    if recruiter_ids:
+        applications.update(_application_counts(
+            Application.objects.filter(job_post__recruiter_id__in=recruiter_ids), 'job_post__recruiter_id'
+        ))
+        interviews.update(_interview_counts('application__job_post__recruiter_id', recruiter_ids))
+        job_posts = {
+            row.pop('recruiter_id'): row
+            for row in JobPost.objects.filter(recruiter_id__in=recruiter_ids).values('recruiter_id').annotate(
+                job_posts_total=Count('id'), job_posts_active=Count('id', filter=Q(is_active=True))
+            ).order_by()
+        }
+
+    unread_notifications = dict(
+        Notification.objects.filter(recipient_id__in=[user.id for user in users], is_read=False)
+        .values('recipient_id').annotate(total=Count('id')).order_by()
+        .values_list('recipient_id', 'total')
+    ) if users else {}
+
+    counters = {}
+    for user in users:
+        values = {field: 0 for field in COUNTER_FIELDS}
+        values.update(applications.get(user.id, {}))
+        values.update(job_posts.get(user.id, {}))
+        values['notifications_unread'] = unread_notifications.get(user.id, 0)
+        values['interviews_scheduled'] = interviews.get(user.id, 0)
+        values['profile_completion'] = calculate_profile_completion(user, has_skills=user.has_skills)
+        counters[user.id] = values
+    return counters
+
+
+def rebuild_dashboard_counters(user_ids: Iterable) -> int:
+    """
+    Recount the given users' counters and store rows that drifted.
+
+    Returns the number of rows created or corrected.
+    """
+    computed = _compute_counters(list(user_ids))
+    if not computed:
+        return 0
+
+    stored = {
+        row.pop('user_id'): row
+        for row in DashboardCounters.objects.filter(user_id__in=list(computed)).values('user_id', *COUNTER_FIELDS)
+    }
+    changed = [
+        DashboardCounters(user_id=user_id, **values)
+        for user_id, values in computed.items()
+        if stored.get(user_id) != values
+    ]
+    if changed:
+        DashboardCounters.objects.bulk_create(
+            changed,
+            update_conflicts=True,
+            unique_fields=['user'],
+            update_fields=[*COUNTER_FIELDS, 'updated_at'],
+        )
+    return len(changed)
+
+
+def reconcile_dashboard_counters(batch_size: int = RECONCILE_BATCH_SIZE) -> Dict[str, int]:
+    """
+    Recount every job seeker's and recruiter's counters in batches
+    """
+    users = corrected = 0
+    batch = []
+    user_ids = User.objects.filter(user_type__in=COUNTED_USER_TYPES).order_by('id').values_list('id', flat=True)
+    for user_id in user_ids.iterator(chunk_size=batch_size):
+        batch.append(user_id)
+        if len(batch) >= batch_size:
+            corrected += rebuild_dashboard_counters(batch)
+            users += len(batch)
+            batch = []
+    if batch:
+        corrected += rebuild_dashboard_counters(batch)
+        users += len(batch)
+
+    logger.info(f"Reconciled dashboard counters for {users} users, {corrected} created or corrected")
+    return {'users': users, 'corrected': corrected}
@@ -0,0 +1,195 @@
+"""
+CSV exports for HireWise backend.
+
+Rows are read with a values() projection over the joins they need and
+iterated in chunks, so neither the streamed response nor the background
+gzip export holds more than one chunk of rows in memory.
+
+Background exports are written to a private storage root that the web
+server does not serve. Files get an unguessable name and are downloaded
+through an authenticated view with a signed link that expires after
+EXPORTS['RETENTION'] seconds, after which cleanup_expired_exports_task
+deletes them.
+"""
+
+import csv
+import gzip
+import io
+import logging
+import secrets
+import tempfile
+from datetime import timedelta
+from typing import Iterable, Iterator, List, Optional
+
+from django.conf import settings
+from django.core import signing
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.db.models.functions import Substr
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import Application
+
+logger = logging.getLogger(__name__)
+
+EXPORTS_CONFIG = getattr(settings, 'EXPORTS', {})
+
+CHUNK_SIZE = EXPORTS_CONFIG.get('CHUNK_SIZE', 2000)
+ASYNC_THRESHOLD = EXPORTS_CONFIG.get('ASYNC_THRESHOLD', 50000)
+STORAGE_PREFIX = EXPORTS_CONFIG.get('STORAGE_PREFIX', 'exports')
+STORAGE_ROOT = EXPORTS_CONFIG.get('STORAGE_ROOT', settings.BASE_DIR / 'private_media')
+# Download links expire and files are deleted after this many seconds
+RETENTION = EXPORTS_CONFIG.get('RETENTION', 24 * 3600)
+
+DOWNLOAD_SALT = 'matcher.exports.download'
+
+# Outside MEDIA_ROOT, so exports are only reachable through the download view
+export_storage = FileSystemStorage(location=STORAGE_ROOT)
+
+COVER_LETTER_PREVIEW = 100
+
+APPLICATION_EXPORT_HEADER = [
+    'Application ID', 'Job Title', 'Company', 'Applicant', 'Status',
+    'Applied Date', 'Match Score', 'Cover Letter Preview'
+]
+
+
+class Echo:
+    """
+    File-like object whose write() returns the line instead of storing it,
+    so csv.writer can feed a StreamingHttpResponse
+    """
+
+    def write(self, value):
+        return value
+
+
+def application_export_rows(applications, chunk_size: int = CHUNK_SIZE) -> Iterator[List]:
+    """
+    CSV rows for an application queryset, keeping its filters and ordering
+    """
+    status_labels = dict(Application.STATUS_CHOICES)
+    rows = applications.select_related(None).prefetch_related(None).annotate(
+        cover_letter_start=Substr('cover_letter', 1, COVER_LETTER_PREVIEW + 1)
+    ).values_list(
+        'id', 'job_post__title', 'job_post__recruiter__recruiter_profile__company_name',
+        'job_seeker__username', 'status', 'applied_at', 'match_score', 'cover_letter_start',
+    )
+
+    for app_id, title, company, applicant, status, applied_at, match_score, cover_letter in rows.iterator(
+        chunk_size=chunk_size
+    ):
+        cover_letter = cover_letter or ''
+        yield [
+            str(app_id),
+            title,
+            company or '',
+            applicant,
+            status_labels.get(status, status),
+            applied_at.strftime('%Y-%m-%d %H:%M'),
+            f"{match_score:.2f}",
+            cover_letter[:COVER_LETTER_PREVIEW] + '...' if len(cover_letter) > COVER_LETTER_PREVIEW else cover_letter,
+        ]
+
+
+def stream_csv(header: List[str], rows: Iterable[List]) -> Iterator[str]:
+    """
+    Yield a CSV document line by line
+    """
+    writer = csv.writer(Echo())
+    yield writer.writerow(header)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def write_gzip_csv(name: str, header: List[str], rows: Iterable[List]) -> dict:
+    """
+    Write rows as a gzip-compressed CSV to the private export storage.
+
+    The file is built in a temporary file on disk and handed to storage once
+    complete. Returns the stored name and the number of data rows.
+    """
+    row_count = 0
+    with tempfile.TemporaryFile() as raw:
+        with gzip.GzipFile(fileobj=raw, mode='wb') as compressed:
+            text = io.TextIOWrapper(compressed, encoding='utf-8', newline='')
+            writer = csv.writer(text)
+            writer.writerow(header)
+            for row in rows:
+                writer.writerow(row)
+                row_count += 1
+            text.flush()
+            text.detach()
+
+        raw.seek(0)
+        stored_name = export_storage.save(name, File(raw))
+
+    return {'name': stored_name, 'rows': row_count}
+
+
+def export_applications_to_storage(user, applications) -> dict:
+    """
+    Export an application queryset to a gzip CSV under the user's export folder
+    """
+    timestamp = timezone.now().strftime('%Y%m%d-%H%M%S')
+    name = f"{STORAGE_PREFIX}/applications/{user.id}/applications-{timestamp}-{secrets.token_hex(8)}.csv.gz"
+
+    result = write_gzip_csv(name, APPLICATION_EXPORT_HEADER, application_export_rows(applications))
+    result['url'] = reverse(
+        'v1:application-download-export', kwargs={'token': export_download_token(user, result['name'])}
+    )
+
+    logger.info(f"Exported {result['rows']} applications for user {user.id} to {result['name']}")
+    return result
+
+
+def export_download_token(user, name: str) -> str:
+    """
+    Signed token naming an export file and the user allowed to download it
+    """
+    return signing.dumps({'user': str(user.id), 'name': name}, salt=DOWNLOAD_SALT)
+
+
+def resolve_export_download(user, token: str) -> Optional[str]:
+    """
+    Stored name of the export a download token points to, or None when the
+    token is invalid, expired, issued to another user or the file is gone
+    """
+    try:
+        payload = signing.loads(token, salt=DOWNLOAD_SALT, max_age=RETENTION)
+    except signing.BadSignature:
+        return None
+
+    name = payload.get('name')
+    if payload.get('user') != str(user.id) or not name or not export_storage.exists(name):
+        return None
+    return name
+
+
+def delete_expired_exports(max_age: int = RETENTION) -> int:
+    """
+    Delete export files older than max_age seconds; returns how many were deleted
+    """
+    cutoff = timezone.now() - timedelta(seconds=max_age)
+    deleted = 0
+    pending = [STORAGE_PREFIX]
+
+    while pending:
+        directory = pending.pop()
+        try:
+            subdirectories, files = export_storage.listdir(directory)
+        except FileNotFoundError:
+            continue
+        pending.extend(f"{directory}/{subdirectory}" for subdirectory in subdirectories)
+
+        for file_name in files:
+            name = f"{directory}/{file_name}"
+            try:
+                if export_storage.get_modified_time(name) < cutoff:
+                    export_storage.delete(name)
+                    deleted += 1
+            except OSError as e:
+                logger.error(f"Error deleting expired export {name}: {e}")
+
+    return deleted
@@ -0,0 +1,111 @@
+"""
+Shared JSON encoding for HireWise backend.
+
+dumps()/loads() use orjson when it is installed and the stdlib json module
+otherwise. Both backends handle the types API payloads and WebSocket
+messages carry: UUID, datetime/date/time, timedelta, Decimal and lazy
+translation strings, with the same output as DRF's JSONEncoder. Set
+JSON_BACKEND['ENGINE'] to 'json' to force the stdlib backend.
+
+This module has no DRF imports so logging can use it before apps are loaded;
+the DRF renderer and parser live in renderers.py and parsers.py.
+"""
+
+import datetime
+import decimal
+import json
+import uuid
+from typing import Any, Union
+
+from django.conf import settings
+from django.utils.encoding import force_str
+from django.utils.functional import Promise
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+JSON_BACKEND_CONFIG = getattr(settings, 'JSON_BACKEND', {})
+
+USE_ORJSON = ORJSON_AVAILABLE and JSON_BACKEND_CONFIG.get('ENGINE', 'orjson') == 'orjson'
+
+# Raised by loads() for malformed input; orjson's error subclasses it
+JSONDecodeError = json.JSONDecodeError
+
+if ORJSON_AVAILABLE:
+    # Non-string dict keys are coerced like the stdlib does; UTC offsets render as 'Z' like DRF
+    ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+
+
+def default(obj: Any) -> Any:
+    """
+    Encode types neither backend handles natively, following DRF's JSONEncoder
+    """
+    if isinstance(obj, Promise):
+        return force_str(obj)
+    if isinstance(obj, datetime.datetime):
+        representation = obj.isoformat()
+        if representation.endswith('+00:00'):
+            representation = representation[:-6] + 'Z'
+        return representation
+    if isinstance(obj, (datetime.date, datetime.time)):
+        return obj.isoformat()
+    if isinstance(obj, datetime.timedelta):
+        return str(obj.total_seconds())
+    if isinstance(obj, decimal.Decimal):
+        return float(obj)
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    if isinstance(obj, bytes):
+        return obj.decode()
+    if hasattr(obj, 'tolist'):
+        # numpy arrays and scalars
+        return obj.tolist()
+    if isinstance(obj, (set, frozenset)) or hasattr(obj, '__iter__'):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _lenient_default(obj: Any) -> Any:
+    try:
+        return default(obj)
+    except TypeError:
+        return str(obj)
+
+
+def dumps_bytes(obj: Any, lenient: bool = False) -> bytes:
+    """
+    Encode to compact UTF-8 JSON bytes.
+
+    lenient=True falls back to str() for unknown types instead of raising,
+    for log records whose extra fields can hold anything.
+    """
+    encode_default = _lenient_default if lenient else default
+    if USE_ORJSON:
+        return orjson.dumps(obj, default=encode_default, option=ORJSON_OPTIONS)
+    return json.dumps(
+        obj, default=encode_default, ensure_ascii=False, separators=(',', ':')
+    ).encode('utf-8')
+
+
+def dumps(obj: Any, lenient: bool = False) -> str:
+    """
+    Encode to a compact JSON string
+    """
+    if USE_ORJSON:
+        return dumps_bytes(obj, lenient=lenient).decode('utf-8')
+    encode_default = _lenient_default if lenient else default
+    return json.dumps(obj, default=encode_default, ensure_ascii=False, separators=(',', ':'))
+
+
+def loads(data: Union[str, bytes, bytearray, memoryview]) -> Any:
+    """
+    Decode a JSON document; raises JSONDecodeError on malformed input
+    """
+    if USE_ORJSON:
+        return orjson.loads(data)
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
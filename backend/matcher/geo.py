@@ -0,0 +1,335 @@
+"""
+Location normalization and radius matching for HireWise backend.
+
+Free-text locations ("SF Bay Area", "San Francisco, CA, USA") are resolved
+against the Location gazetteer loaded from the bundled CSV, so jobs and
+profiles can be matched on an indexed foreign key or by distance instead of
+substring comparison.
+"""
+
+import csv
+import math
+import os
+import re
+import logging
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, FloatField, Q, QuerySet
+from django.db.models.functions import ASin, Cos, Power, Radians, Sin, Sqrt
+
+logger = logging.getLogger(__name__)
+
+GEO_CONFIG = getattr(settings, 'GEO_MATCHING', {})
+
+DEFAULT_RADIUS_KM = GEO_CONFIG.get('DEFAULT_RADIUS_KM', 50)
+MAX_RADIUS_KM = GEO_CONFIG.get('MAX_RADIUS_KM', 500)
+GAZETTEER_PATH = GEO_CONFIG.get(
+    'GAZETTEER_PATH', os.path.join(os.path.dirname(__file__), 'data', 'gazetteer.csv')
+)
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE_LAT = 111.32
+
+REMOTE_TERMS = frozenset({'remote', 'anywhere', 'worldwide', 'work from home', 'wfh'})
+
+_SEPARATORS = re.compile(r'[;/|()\[\]]')
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_location(value: Optional[str]) -> str:
+    """
+    Normalize a free-text location: lower-cased, comma-separated parts with
+    collapsed whitespace and no periods ("Washington, D.C." -> "washington, dc")
+    """
+    if not value:
+        return ''
+    value = _SEPARATORS.sub(',', value.lower().replace('.', ''))
+    parts = [_WHITESPACE.sub(' ', part).strip(' -') for part in value.split(',')]
+    return ', '.join(part for part in parts if part)
+
+
+def is_remote_location(value: Optional[str]) -> bool:
+    """
+    Check whether a free-text location describes remote work
+    """
+    normalized = normalize_location(value)
+    return any(term in normalized for term in REMOTE_TERMS)
+
+
+def _candidate_keys(normalized: str) -> List[str]:
+    """
+    Alias keys to try for a normalized location, most specific first
+    ("a, b, c" -> ["a, b, c", "a, b", "a"])
+    """
+    parts = normalized.split(', ')
+    return [', '.join(parts[:end]) for end in range(len(parts), 0, -1)]
+
+
+@lru_cache(maxsize=4096)
+def _resolve_normalized(normalized: str):
+    from .models import LocationAlias
+
+    keys = _candidate_keys(normalized)
+    aliases = {
+        alias.alias: alias.location
+        for alias in LocationAlias.objects.filter(alias__in=keys).select_related('location')
+    }
+    for key in keys:
+        if key in aliases:
+            return aliases[key]
+    return None
+
+
+def resolve_location(value: Optional[str]):
+    """
+    Resolve free text to a Location from the gazetteer, or None.
+
+    Results (including misses) are cached per process; the gazetteer is
+    read-only outside load_gazetteer(), which clears the cache.
+    """
+    normalized = normalize_location(value)
+    if not normalized or is_remote_location(normalized):
+        return None
+    try:
+        return _resolve_normalized(normalized)
+    except Exception as e:
+        logger.warning(f"Error resolving location '{value}': {str(e)}")
+        return None
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """
+    Great-circle distance between two points in kilometres
+    """
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = math.radians(lat2 - lat1)
+    d_lambda = math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def bounding_box(latitude: float, longitude: float, radius_km: float) -> Tuple[float, float, float, float]:
+    """
+    Lat/lon box enclosing the radius, as (min_lat, max_lat, min_lon, max_lon).
+
+    The longitude span widens to the full range near the poles or when the box
+    would cross the antimeridian, so the box never excludes a point in range.
+    """
+    d_lat = radius_km / KM_PER_DEGREE_LAT
+    min_lat, max_lat = max(-90.0, latitude - d_lat), min(90.0, latitude + d_lat)
+
+    cos_lat = math.cos(math.radians(max(abs(min_lat), abs(max_lat))))
+    if cos_lat <= 1e-6:
+        return min_lat, max_lat, -180.0, 180.0
+    d_lon = radius_km / (KM_PER_DEGREE_LAT * cos_lat)
+    min_lon, max_lon = longitude - d_lon, longitude + d_lon
+    if min_lon < -180.0 or max_lon > 180.0:
+        return min_lat, max_lat, -180.0, 180.0
+    return min_lat, max_lat, min_lon, max_lon
+
+
+def clamp_radius(radius_km) -> float:
+    """
+    Parse a requested radius, falling back to the default and capping it
+    """
+    try:
+        radius_km = float(radius_km)
+    except (TypeError, ValueError):
+        return float(DEFAULT_RADIUS_KM)
+    if not math.isfinite(radius_km) or radius_km < 0:
+        return float(DEFAULT_RADIUS_KM)
+    return min(radius_km, float(MAX_RADIUS_KM))
+
+
+def within_radius(queryset: QuerySet, latitude: float, longitude: float, radius_km: float,
+                  prefix: str = '') -> QuerySet:
+    """
+    Filter a queryset to rows within radius_km of a point, annotated with distance_km.
+
+    The indexed latitude/longitude columns are range-filtered to the bounding
+    box first; the haversine distance is only computed for rows inside it.
+    `prefix` points at the coordinates through a relation, e.g. 'geo_location__'.
+    """
+    lat_field, lon_field = f'{prefix}latitude', f'{prefix}longitude'
+    min_lat, max_lat, min_lon, max_lon = bounding_box(latitude, longitude, radius_km)
+
+    queryset = queryset.filter(**{
+        f'{lat_field}__gte': min_lat, f'{lat_field}__lte': max_lat,
+        f'{lon_field}__gte': min_lon, f'{lon_field}__lte': max_lon,
+    })
+
+    lat_rad = math.radians(latitude)
+    d_phi = (Radians(F(lat_field)) - lat_rad) / 2
+    d_lambda = (Radians(F(lon_field)) - math.radians(longitude)) / 2
+    a = Power(Sin(d_phi), 2) + math.cos(lat_rad) * Cos(Radians(F(lat_field))) * Power(Sin(d_lambda), 2)
+
+    return queryset.annotate(
+        distance_km=ASin(Sqrt(a), output_field=FloatField()) * (2 * EARTH_RADIUS_KM)
+    ).filter(distance_km__lte=radius_km)
+
+
+@lru_cache(maxsize=2048)
+def _nearby_location_ids(location_id: int, latitude: float, longitude: float, radius_km: float) -> Tuple[int, ...]:
+    from .models import Location
+
+    ids = set(within_radius(Location.objects.all(), latitude, longitude, radius_km).values_list('id', flat=True))
+    ids.add(location_id)
+    return tuple(sorted(ids))
+
+
+def nearby_location_ids(location, radius_km: Optional[float] = None) -> Tuple[int, ...]:
+    """
+    Ids of gazetteer locations within radius_km of a location (itself included)
+    """
+    radius_km = clamp_radius(DEFAULT_RADIUS_KM if radius_km is None else radius_km)
+    return _nearby_location_ids(location.id, location.latitude, location.longitude, radius_km)
+
+
+def location_filter_q(value: str, radius_km: Optional[float] = None,
+                      field: str = 'geo_location', text_field: str = 'location') -> Q:
+    """
+    Build a Q matching rows located within radius_km of a free-text location.
+
+    Resolved locations filter on the indexed `field` foreign key. Text that is
+    not in the gazetteer falls back to a substring match on `text_field`.
+    """
+    location = resolve_location(value)
+    if location is None:
+        return Q(**{f'{text_field}__icontains': value})
+    return Q(**{f'{field}__in': nearby_location_ids(location, radius_km)})
+
+
+def _as_location(value):
+    if value is None or isinstance(value, str):
+        return resolve_location(value)
+    return value
+
+
+def location_distance_km(first, second) -> Optional[float]:
+    """
+    Distance between two locations (Location instances or free text), or None
+    when either cannot be resolved
+    """
+    first_location, second_location = _as_location(first), _as_location(second)
+    if first_location is None or second_location is None:
+        return None
+    if first_location.pk == second_location.pk:
+        return 0.0
+    return haversine_km(first_location.latitude, first_location.longitude,
+                        second_location.latitude, second_location.longitude)
+
+
+def locations_match(first, second, radius_km: Optional[float] = None,
+                    first_text: str = '', second_text: str = '') -> bool:
+    """
+    Check whether two locations are within radius_km of each other.
+
+    Accepts Location instances or free text. When either side is not in the
+    gazetteer, falls back to a containment check on the normalized text
+    (`first_text`/`second_text` supply it when Location fields are passed).
+    """
+    distance = location_distance_km(first, second)
+    if distance is not None:
+        return distance <= clamp_radius(DEFAULT_RADIUS_KM if radius_km is None else radius_km)
+
+    first_text = normalize_location(first if isinstance(first, str) else first_text)
+    second_text = normalize_location(second if isinstance(second, str) else second_text)
+    if not first_text or not second_text:
+        return False
+    return first_text in second_text or second_text in first_text
+
+
+def clear_location_cache():
+    """
+    Drop per-process resolution and radius caches
+    """
+    _resolve_normalized.cache_clear()
+    _nearby_location_ids.cache_clear()
+
+
+def _location_aliases(row: Dict[str, str]) -> List[str]:
+    name = normalize_location(row['name'])
+    region = normalize_location(row.get('region', ''))
+    country = normalize_location(row['country_code'])
+
+    aliases = [name, f'{name}, {country}']
+    if region:
+        aliases.extend([f'{name}, {region}', f'{name}, {region}, {country}'])
+    aliases.extend(normalize_location(alias) for alias in (row.get('aliases') or '').split('|'))
+    return [alias for alias in dict.fromkeys(aliases) if alias]
+
+
+def read_gazetteer(path: Optional[str] = None) -> Iterable[Dict[str, str]]:
+    """
+    Read gazetteer rows (name, region, country_code, latitude, longitude, aliases)
+    """
+    with open(path or GAZETTEER_PATH, newline='', encoding='utf-8') as gazetteer_file:
+        yield from csv.DictReader(gazetteer_file)
+
+
+@transaction.atomic
+def load_gazetteer(path: Optional[str] = None) -> Tuple[int, int]:
+    """
+    Load (or refresh) Location and LocationAlias rows from the gazetteer CSV.
+
+    A bare name shared by several places ("cambridge") is not registered as an
+    alias, so it falls back to text matching rather than guessing. Returns
+    (locations, aliases) written.
+    """
+    from .models import Location, LocationAlias
+
+    rows = list(read_gazetteer(path))
+    alias_owners: Dict[str, set] = {}
+    locations = []
+
+    for row in rows:
+        location, _ = Location.objects.update_or_create(
+            name=row['name'].strip(),
+            region=(row.get('region') or '').strip(),
+            country_code=row['country_code'].strip().upper(),
+            defaults={
+                'latitude': float(row['latitude']),
+                'longitude': float(row['longitude']),
+            }
+        )
+        locations.append(location)
+        for alias in _location_aliases(row):
+            alias_owners.setdefault(alias, set()).add(location.id)
+
+    alias_count = 0
+    for alias, owner_ids in alias_owners.items():
+        if len(owner_ids) > 1:
+            LocationAlias.objects.filter(alias=alias).delete()
+            continue
+        LocationAlias.objects.update_or_create(alias=alias, defaults={'location_id': next(iter(owner_ids))})
+        alias_count += 1
+
+    transaction.on_commit(clear_location_cache)
+    clear_location_cache()
+    return len(locations), alias_count
+
+
+def backfill_geo_locations(batch_size: int = 500) -> Dict[str, int]:
+    """
+    Resolve geo_location for existing job posts and job seeker profiles
+    """
+    from .models import JobPost, JobSeekerProfile
+
+    updated = {}
+    for model in (JobPost, JobSeekerProfile):
+        pending = []
+        count = 0
+        for obj in model.objects.exclude(location='').only('id', 'location', 'geo_location').iterator(chunk_size=batch_size):
+            location = resolve_location(obj.location)
+            if location is not None and obj.geo_location_id != location.id:
+                obj.geo_location = location
+                pending.append(obj)
+            if len(pending) >= batch_size:
+                count += model.objects.bulk_update(pending, ['geo_location'])
+                pending = []
+        if pending:
+            count += model.objects.bulk_update(pending, ['geo_location'])
+        updated[model.__name__] = count
+    return updated
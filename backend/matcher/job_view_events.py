@@ -0,0 +1,286 @@
+"""
+Buffered job view tracking for HireWise backend.
+
+Job detail requests append a view event to a buffer instead of inserting a
+JobView, bumping views_count and recomputing JobAnalytics on the request path.
+A periodic Celery task drains the Redis buffer: JobView rows are bulk
+inserted, each job gets one views_count increment, and analytics are refreshed
+once per job per batch. Without Redis each process buffers its own views and a
+daemon thread in that process flushes them, never the request. Unique viewers are estimated with a Redis HyperLogLog per job
+instead of COUNT(DISTINCT ip_address) over all of its views.
+
+JobView.viewed_at is auto_now_add, so stored view times are flush times and
+lag the actual view by at most the flush interval.
+"""
+
+import time
+import ipaddress
+import logging
+from collections import Counter, defaultdict
+from typing import Any, Dict, List
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, F
+from django.utils import timezone
+
+from .cache_utils import get_redis_client
+from .exceptions import get_client_ip
+from .search_events import LocalFlusher, SearchEventBuffer, _incr_stat, persist_claimed_batch
+
+logger = logging.getLogger(__name__)
+
+JOB_VIEW_EVENTS_CONFIG = getattr(settings, 'JOB_VIEW_EVENTS', {})
+
+BUFFER_KEY = 'job_view_events:buffer'
+PROCESSING_KEY = 'job_view_events:processing'
+STATS_KEY = 'job_view_events:stats'
+VISITORS_KEY = 'job_view_events:visitors'
+FLUSH_INTERVAL = JOB_VIEW_EVENTS_CONFIG.get('FLUSH_INTERVAL', 30)
+MAX_BUFFER_LENGTH = JOB_VIEW_EVENTS_CONFIG.get('MAX_BUFFER_LENGTH', 200000)
+FLUSH_BATCH_SIZE = JOB_VIEW_EVENTS_CONFIG.get('FLUSH_BATCH_SIZE', 2000)
+LOCAL_FLUSH_THRESHOLD = JOB_VIEW_EVENTS_CONFIG.get('LOCAL_FLUSH_THRESHOLD', 500)
+
+COUNTER_FIELDS = ('flush_runs', 'views_flushed', 'dropped_events', 'failed_flushes', 'dead_lettered_events')
+
+# JobView.ip_address is required; views without a usable address are stored under this one
+FALLBACK_IP = '127.0.0.1'
+
+
+class JobViewEventBuffer(SearchEventBuffer):
+    """
+    Search event buffer with its own keys, stats and in-process flusher
+    """
+
+    def _record_dropped(self, count: int) -> None:
+        _incr_stat('dropped_events', count, stats_key=STATS_KEY)
+
+    def _on_local_push(self, pending: int) -> None:
+        _local_flusher.ensure(request_flush=pending >= LOCAL_FLUSH_THRESHOLD)
+
+
+job_view_buffer = JobViewEventBuffer(
+    key=BUFFER_KEY, max_length=MAX_BUFFER_LENGTH, processing_key=PROCESSING_KEY
+)
+
+_local_flusher = LocalFlusher('job-view-events-flusher', lambda: flush_job_view_events(), FLUSH_INTERVAL)
+
+
+def _is_ip_address(value) -> bool:
+    try:
+        ipaddress.ip_address(value)
+    except ValueError:
+        return False
+    return True
+
+
+def viewer_ip_address(request) -> str:
+    """
+    The client address from X-Forwarded-For, else REMOTE_ADDR, else FALLBACK_IP; only valid addresses are used
+    """
+    for candidate in (get_client_ip(request), request.META.get('REMOTE_ADDR')):
+        candidate = (candidate or '').strip()
+        if candidate and _is_ip_address(candidate):
+            return candidate
+    return FALLBACK_IP
+
+
+def record_job_view(job_post, request) -> bool:
+    """
+    Buffer a view of a job detail page.
+    """
+    user = getattr(request, 'user', None)
+    session = getattr(request, 'session', None)
+
+    return job_view_buffer.push({
+        'job_post_id': str(job_post.id),
+        'viewer_id': str(user.id) if user is not None and user.is_authenticated else None,
+        'ip_address': viewer_ip_address(request),
+        'user_agent': request.META.get('HTTP_USER_AGENT', ''),
+        'referrer': request.META.get('HTTP_REFERER', '')[:200],
+        'session_id': (getattr(session, 'session_key', None) or '')[:40],
+        'enqueued_at': time.time(),
+    })
+
+
+def flush_job_view_events(batch_size: int = FLUSH_BATCH_SIZE, max_batches: int = 10) -> Dict[str, Any]:
+    """
+    Drain buffered job views into JobView, JobPost.views_count and JobAnalytics.
+
+    Each batch commits in one transaction. A batch that fails because the
+    database is unavailable is put back on the buffer and the error re-raised;
+    views that cannot be stored are dead-lettered (see persist_claimed_batch).
+    """
+    job_view_buffer.recover_stale_claims()
+
+    total_views = 0
+    batches = 0
+    jobs = set()
+
+    try:
+        for _ in range(max_batches):
+            claim_id, events = job_view_buffer.claim_batch(batch_size)
+            if claim_id is None:
+                break
+
+            for persisted_jobs in persist_claimed_batch(
+                job_view_buffer, claim_id, events, _persist_views, stats_key=STATS_KEY
+            ):
+                jobs.update(persisted_jobs)
+            batches += 1
+            total_views += len(events)
+
+            if len(events) < batch_size:
+                break
+    finally:
+        _incr_stat('flush_runs', stats_key=STATS_KEY)
+        if total_views:
+            _incr_stat('views_flushed', total_views, stats_key=STATS_KEY)
+
+    return {
+        'views_flushed': total_views,
+        'batches': batches,
+        'jobs_updated': len(jobs),
+        'pending': len(job_view_buffer),
+    }
+
+
+def _persist_views(events: List[Dict[str, Any]]) -> List[str]:
+    from .models import JobPost, JobView
+    from .search_documents import adjust_document_counters
+
+    existing_jobs = set(
+        str(job_id) for job_id in JobPost.objects.filter(
+            id__in={event['job_post_id'] for event in events}
+        ).values_list('id', flat=True)
+    )
+    # Views of jobs deleted since the event was buffered are dropped
+    events = [event for event in events if event.get('job_post_id') in existing_jobs]
+    if not events:
+        return []
+
+    views_per_job = Counter(event['job_post_id'] for event in events)
+
+    with transaction.atomic():
+        JobView.objects.bulk_create(
+            [
+                JobView(
+                    job_post_id=event['job_post_id'],
+                    viewer_id=event.get('viewer_id'),
+                    ip_address=event['ip_address'],
+                    user_agent=event.get('user_agent', ''),
+                    referrer=event.get('referrer', ''),
+                    session_id=event.get('session_id', ''),
+                )
+                for event in events
+            ],
+            batch_size=500,
+        )
+
+        for job_id, views in views_per_job.items():
+            JobPost.objects.filter(id=job_id).update(views_count=F('views_count') + views)
+            adjust_document_counters(job_id, views=views)
+
+        unique_views = _count_unique_viewers(events)
+        _refresh_job_analytics(list(views_per_job), unique_views)
+
+    return list(views_per_job)
+
+
+def _count_unique_viewers(events: List[Dict[str, Any]]) -> Dict[str, int]:
+    """
+    Add this batch's viewer IPs to each job's HyperLogLog and return the estimates.
+
+    A sketch missing from Redis (new job, eviction) is seeded once from the
+    stored JobView rows. Without Redis the distinct count runs in the database,
+    once per job per flush rather than once per view.
+    """
+    from .models import JobView
+
+    ips_per_job = defaultdict(set)
+    for event in events:
+        ips_per_job[event['job_post_id']].add(event['ip_address'])
+
+    client = get_redis_client()
+    if client is None:
+        return {
+            str(row['job_post']): row['unique_views']
+            for row in JobView.objects.filter(job_post_id__in=list(ips_per_job)).values(
+                'job_post'
+            ).annotate(unique_views=Count('ip_address', distinct=True))
+        }
+
+    keys = {job_id: cache.make_key(f"{VISITORS_KEY}:{job_id}") for job_id in ips_per_job}
+
+    pipe = client.pipeline(transaction=False)
+    for key in keys.values():
+        pipe.exists(key)
+    missing = [job_id for job_id, exists in zip(keys, pipe.execute()) if not exists]
+
+    pipe = client.pipeline(transaction=False)
+    for job_id in missing:
+        stored_ips = JobView.objects.filter(job_post_id=job_id).values_list('ip_address', flat=True).distinct()
+        ips_per_job[job_id].update(stored_ips)
+    for job_id, ips in ips_per_job.items():
+        pipe.pfadd(keys[job_id], *ips)
+    pipe.execute()
+
+    pipe = client.pipeline(transaction=False)
+    for key in keys.values():
+        pipe.pfcount(key)
+    return dict(zip(keys, pipe.execute()))
+
+
+def _refresh_job_analytics(job_ids: List[str], unique_views: Dict[str, int]) -> None:
+    from .models import JobAnalytics, JobPost
+
+    JobAnalytics.objects.bulk_create(
+        [JobAnalytics(job_post_id=job_id) for job_id in job_ids],
+        ignore_conflicts=True,
+    )
+
+    totals = {
+        str(row['id']): row
+        for row in JobPost.objects.filter(id__in=job_ids).annotate(
+            total_applications=Count('applications')
+        ).values('id', 'views_count', 'total_applications')
+    }
+
+    analytics = list(JobAnalytics.objects.filter(job_post_id__in=job_ids))
+    for item in analytics:
+        row = totals.get(str(item.job_post_id))
+        if row is None:
+            continue
+        item.total_views = row['views_count']
+        item.total_applications = row['total_applications']
+        item.unique_views = unique_views.get(str(item.job_post_id), item.unique_views)
+        item.conversion_rate = (
+            (item.total_applications / item.total_views) * 100 if item.total_views > 0 else 0.0
+        )
+        item.updated_at = timezone.now()
+
+    JobAnalytics.objects.bulk_update(
+        analytics,
+        ['total_views', 'unique_views', 'total_applications', 'conversion_rate', 'updated_at'],
+        batch_size=500,
+    )
+
+
+def get_job_view_stats() -> Dict[str, Any]:
+    """
+    Get buffer depth and flush counters for monitoring.
+    """
+    stats = {field: 0 for field in COUNTER_FIELDS}
+    client = get_redis_client()
+
+    if client is not None:
+        for field, value in client.hgetall(cache.make_key(STATS_KEY)).items():
+            field = field.decode() if isinstance(field, bytes) else field
+            stats[field] = int(value)
+    else:
+        values = cache.get_many([f"{STATS_KEY}:{field}" for field in COUNTER_FIELDS])
+        stats.update({key.split(':')[-1]: value for key, value in values.items()})
+
+    stats['pending_events'] = len(job_view_buffer)
+    return stats
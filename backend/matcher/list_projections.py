@@ -0,0 +1,157 @@
+"""
+Read-only list projections for HireWise backend.
+
+List endpoints build their rows from a values() projection of only the
+columns the requested fields need, instead of loading model instances and
+running them through a ModelSerializer. Clients can ask for a subset of the
+fields with `?fields=id,title,company_name`; joins are only made for the
+fields that need them. Output matches the corresponding list serializer.
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+from django.core.files.storage import default_storage
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+
+_datetime_field = serializers.DateTimeField()
+
+
+class ListField:
+    """
+    One output field: the columns it reads and how a row is turned into its value
+    """
+
+    def __init__(self, *columns: str, render: Optional[Callable[[Dict[str, Any], Dict[str, Any]], Any]] = None):
+        self.columns = columns
+        self.render = render or (lambda row, context: row[columns[0]])
+
+
+def _file_url(column: str):
+    def render(row, context):
+        """Absolute URL of a stored file, like ImageField would render it"""
+        name = row[column]
+        if not name:
+            return None
+        url = default_storage.url(name)
+        request = context.get('request')
+        return request.build_absolute_uri(url) if request else url
+    return render
+
+
+def _datetime(column: str):
+    return lambda row, context: _datetime_field.to_representation(row[column]) if row[column] else None
+
+
+def _is_expired(row, context):
+    return bool(row['application_deadline'] and context['now'] > row['application_deadline'])
+
+
+def _days_since_posted(row, context):
+    return (context['now'] - row['created_at']).days
+
+
+def _split_skills(row, context):
+    skills = [skill.strip() for skill in (row['skills_required'] or '').split(',') if skill.strip()]
+    return skills[:5]
+
+
+def _job_common_fields() -> Dict[str, ListField]:
+    return {
+        'title': ListField('title'),
+        'location': ListField('location'),
+        'job_type': ListField('job_type'),
+        'experience_level': ListField('experience_level'),
+        'salary_min': ListField('salary_min'),
+        'salary_max': ListField('salary_max'),
+        'salary_currency': ListField('salary_currency'),
+        'is_featured': ListField('is_featured'),
+        'created_at': ListField('created_at', render=_datetime('created_at')),
+        'views_count': ListField('views_count'),
+        'applications_count': ListField('applications_count'),
+        'is_expired': ListField('application_deadline', render=_is_expired),
+        'days_since_posted': ListField('created_at', render=_days_since_posted),
+        'slug': ListField('slug'),
+    }
+
+
+# Same fields, in the same order, as JobPostListSerializer
+JOB_POST_LIST_FIELDS = {
+    'id': ListField('id', render=lambda row, context: str(row['id'])),
+    'company_name': ListField('recruiter__recruiter_profile__company_name'),
+    'company_logo': ListField(
+        'recruiter__recruiter_profile__company_logo',
+        render=_file_url('recruiter__recruiter_profile__company_logo')
+    ),
+    'recruiter_name': ListField('recruiter__username'),
+    'skills_list': ListField('skills_required', render=_split_skills),
+    'is_active': ListField('is_active'),
+    **_job_common_fields(),
+}
+
+# Same fields, in the same order, as JobSearchDocumentListSerializer
+JOB_DOCUMENT_LIST_FIELDS = {
+    'id': ListField('job_post_id', render=lambda row, context: str(row['job_post_id'])),
+    'company_name': ListField('company_name'),
+    'company_logo': ListField('company_logo', render=_file_url('company_logo')),
+    'recruiter_name': ListField('recruiter_name'),
+    'skills_list': ListField('skills', render=lambda row, context: row['skills'][:5]),
+    # Documents only exist for active jobs
+    'is_active': ListField(render=lambda row, context: True),
+    **_job_common_fields(),
+}
+
+LIST_FIELD_ORDER = [
+    'id', 'title', 'company_name', 'company_logo', 'recruiter_name', 'location', 'job_type',
+    'experience_level', 'salary_min', 'salary_max', 'salary_currency',
+    'skills_list', 'is_active', 'is_featured', 'created_at', 'views_count',
+    'applications_count', 'is_expired', 'days_since_posted', 'slug'
+]
+
+
+def parse_fields_param(value: Optional[str], spec: Dict[str, ListField]) -> List[str]:
+    """
+    Requested field names in output order; all fields when the parameter is absent.
+
+    Raises ValidationError naming any unknown fields.
+    """
+    ordered = [name for name in LIST_FIELD_ORDER if name in spec]
+    if not value:
+        return ordered
+
+    requested = {name.strip() for name in value.split(',') if name.strip()}
+    unknown = sorted(requested - set(spec))
+    if unknown:
+        raise ValidationError({
+            'fields': f"Unknown fields: {', '.join(unknown)}. Available: {', '.join(ordered)}"
+        })
+    return [name for name in ordered if name in requested]
+
+
+def project_rows(queryset, spec: Dict[str, ListField], fields: Sequence[str], extra_columns: Sequence[str] = ()):
+    """
+    values() queryset with only the columns needed for the given fields,
+    plus extra_columns (e.g. the pagination keyset)
+    """
+    columns = []
+    for name in fields:
+        for column in spec[name].columns:
+            if column not in columns:
+                columns.append(column)
+    for column in extra_columns:
+        if column not in columns:
+            columns.append(column)
+    # values() without arguments would select every column
+    return queryset.values(*(columns or ['pk']))
+
+
+def render_rows(rows: Iterable[Dict[str, Any]], spec: Dict[str, ListField], fields: Sequence[str],
+                context: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    """
+    Turn projected rows into response dicts
+    """
+    context = dict(context or {})
+    context.setdefault('now', timezone.now())
+    renderers = [(name, spec[name].render) for name in fields]
+    return [{name: render(row, context) for name, render in renderers} for row in rows]
@@ -4,13 +4,14 @@ Advanced logging configuration for HireWise application
 
 import logging
 import logging.handlers
-import json
 import uuid
 from datetime import datetime
 from django.conf import settings
 from django.utils import timezone
 from typing import Dict, Any, Optional
 
+from . import fast_json
+
 
 class StructuredFormatter(logging.Formatter):
     """
@@ -50,7 +51,7 @@ class StructuredFormatter(logging.Formatter):
         if extra_fields:
             log_entry['extra'] = extra_fields
         
-        return json.dumps(log_entry, default=str)
+        return fast_json.dumps(log_entry, lenient=True)
 
 
 class RequestContextFilter(logging.Filter):
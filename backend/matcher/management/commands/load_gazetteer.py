@@ -0,0 +1,31 @@
+"""
+Management command to load the bundled location gazetteer.
+"""
+
+from django.core.management.base import BaseCommand
+
+from matcher.geo import backfill_geo_locations, load_gazetteer
+
+
+class Command(BaseCommand):
+    help = 'Load Location rows from the offline gazetteer and resolve existing job and profile locations'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path',
+            help='Gazetteer CSV to load instead of the bundled one',
+        )
+        parser.add_argument(
+            '--skip-backfill',
+            action='store_true',
+            help='Do not resolve geo_location for existing job posts and profiles',
+        )
+    
+    def handle(self, *args, **options):
+        locations, aliases = load_gazetteer(options.get('path'))
+        self.stdout.write(self.style.SUCCESS(f'Loaded {locations} locations and {aliases} aliases'))
+        
+        if not options['skip_backfill']:
+            updated = backfill_geo_locations()
+            for model_name, count in updated.items():
+                self.stdout.write(f'Resolved {count} {model_name} locations')
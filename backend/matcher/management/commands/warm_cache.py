@@ -6,14 +6,15 @@ import logging
 from django.core.management.base import BaseCommand
 from django.conf import settings
 
-from matcher.cache_utils import warm_cache, clear_all_caches
+from matcher.cache_utils import clear_all_caches
 from matcher.api_cache import APICacheWarmer
+from matcher.cache_warming import run_cache_warming, CONCURRENCY, TARGET_KINDS
 
 logger = logging.getLogger(__name__)
 
 
 class Command(BaseCommand):
-    help = 'Warm up application caches with frequently accessed data'
+    help = 'Warm up application caches from recent searches, active users and popular jobs'
     
     def add_arguments(self, parser):
         parser.add_argument(
@@ -31,6 +32,33 @@ class Command(BaseCommand):
             action='store_true',
             help='Skip skills cache warming',
         )
+        parser.add_argument(
+            '--skip-searches',
+            action='store_true',
+            help='Skip popular search result warming',
+        )
+        parser.add_argument(
+            '--skip-recommendations',
+            action='store_true',
+            help='Skip active users\' recommendation warming',
+        )
+        parser.add_argument(
+            '--skip-popular-jobs',
+            action='store_true',
+            help='Skip popular job warming',
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=CONCURRENCY,
+            help=f'Number of targets warmed in parallel (default: {CONCURRENCY})',
+        )
+        parser.add_argument(
+            '--async',
+            action='store_true',
+            dest='run_async',
+            help='Queue the warm-up as a Celery task and return immediately',
+        )
         parser.add_argument(
             '--verbose',
             action='store_true',
@@ -54,9 +82,34 @@ class Command(BaseCommand):
                     self.style.SUCCESS('Caches cleared successfully')
                 )
             
-            # Warm up general caches
-            self.stdout.write('Warming up general caches...')
-            warm_cache()
+            kinds = [
+                kind for kind in TARGET_KINDS
+                if not options[f'skip_{kind}']
+            ]
+            
+            if options['run_async']:
+                from matcher.tasks import warm_caches_task
+                
+                task = warm_caches_task.delay(kinds=kinds, concurrency=options['concurrency'])
+                self.stdout.write(
+                    self.style.SUCCESS(f'Cache warm-up queued as task {task.id}')
+                )
+                return
+            
+            # Warm up general caches, then searches, recommendations and popular jobs
+            self.stdout.write(
+                f"Warming up general caches and {', '.join(kinds) or 'no data-driven targets'} "
+                f"({options['concurrency']} at a time)..."
+            )
+            result = run_cache_warming(kinds, options['concurrency'], progress=self._progress)
+            self.stdout.write(
+                f"Warmed {sum(result['warmed'].values())}/{result['targets']} targets "
+                f"in {result['duration_seconds']}s"
+            )
+            if result['failed']:
+                self.stdout.write(
+                    self.style.WARNING(f"Failed targets per kind: {result['failed']}")
+                )
             
             # Warm up job list cache
             if not options['skip_jobs']:
@@ -77,4 +130,11 @@ class Command(BaseCommand):
             self.stdout.write(
                 self.style.ERROR(f'Cache warm-up failed: {e}')
             )
-            raise
\ No newline at end of file
+            raise
+    
+    def _progress(self, done, total, target, error):
+        """Report every tenth of the targets, and each failure."""
+        if error:
+            self.stdout.write(self.style.WARNING(f'  [{done}/{total}] {target.kind}:{target.label} failed: {error}'))
+        elif done == total or done % max(total // 10, 1) == 0:
+            self.stdout.write(f'  [{done}/{total}] targets warmed')
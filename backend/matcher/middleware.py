@@ -2,6 +2,7 @@
 Custom middleware for error handling, logging, rate limiting, and WebSocket JWT authentication
 """
 
+import asyncio
 import time
 import uuid
 import json
@@ -575,9 +576,25 @@ class JWTAuthMiddleware(BaseMiddleware):
             return AnonymousUser()
 
 
+WEBSOCKET_PRESENCE_CONFIG = getattr(settings, 'WEBSOCKET_PRESENCE', {})
+
+# A channel counts as connected for this long after its last refresh, so
+# channels of a process that died without disconnecting drop out quickly
+PRESENCE_TTL = WEBSOCKET_PRESENCE_CONFIG.get('TTL', 90)
+# Open connections refresh their presence this often, well inside the TTL
+PRESENCE_REFRESH_INTERVAL = WEBSOCKET_PRESENCE_CONFIG.get('REFRESH_INTERVAL', PRESENCE_TTL // 3)
+PRESENCE_KEY_PREFIX = 'ws:online'
+
+
 class WebSocketConnectionManager:
     """
     Manager for tracking WebSocket connections and providing connection utilities.
+    
+    Connections are tracked per process; each user's channel names are also
+    kept in a Redis sorted set scored by when they expire, so Celery workers
+    and other ASGI processes can tell whether a user is connected anywhere.
+    Open connections push their expiry forward from a heartbeat and whenever
+    the client sends something.
     """
     
     def __init__(self):
@@ -585,6 +602,8 @@ class WebSocketConnectionManager:
         self.active_connections = {}
         # Store connection metadata
         self.connection_metadata = {}
+        # Connection counts by consumer type, kept in step with connection_metadata
+        self.connections_by_type = {}
     
     def add_connection(self, user_id, channel_name, connection_info=None):
         """
@@ -595,13 +614,19 @@ class WebSocketConnectionManager:
         
         self.active_connections[user_id].add(channel_name)
         
+        if channel_name not in self.connection_metadata:
+            consumer_type = (connection_info or {}).get('consumer_type', 'unknown')
+            self.connections_by_type[consumer_type] = self.connections_by_type.get(consumer_type, 0) + 1
+        
         # Store connection metadata
         self.connection_metadata[channel_name] = {
             'user_id': user_id,
             'connected_at': timezone.now(),
             'last_activity': timezone.now(),
+            'presence_refreshed_at': time.monotonic(),
             'connection_info': connection_info or {}
         }
+        self._update_presence(user_id, channel_name, connected=True)
         
         logger.info(f"WebSocket connection added for user {user_id}: {channel_name}")
     
@@ -618,7 +643,12 @@ class WebSocketConnectionManager:
         
         # Remove connection metadata
         if channel_name in self.connection_metadata:
-            del self.connection_metadata[channel_name]
+            metadata = self.connection_metadata.pop(channel_name)
+            consumer_type = metadata['connection_info'].get('consumer_type', 'unknown')
+            self.connections_by_type[consumer_type] -= 1
+            if not self.connections_by_type[consumer_type]:
+                del self.connections_by_type[consumer_type]
+        self._update_presence(user_id, channel_name, connected=False)
         
         logger.info(f"WebSocket connection removed for user {user_id}: {channel_name}")
     
@@ -628,11 +658,94 @@ class WebSocketConnectionManager:
         """
         return self.active_connections.get(user_id, set())
     
+    def _presence_key(self, user_id):
+        return cache.make_key(f"{PRESENCE_KEY_PREFIX}:{user_id}")
+    
+    def _update_presence(self, user_id, channel_name, connected):
+        """
+        Add, refresh or remove a channel in the user's shared presence set.
+        
+        A connected channel is scored with its expiry time; channels that
+        expired are dropped on the way, and the key itself expires once the
+        last channel stops refreshing.
+        """
+        from .cache_utils import get_redis_client
+        
+        client = get_redis_client()
+        if client is None:
+            return
+        try:
+            key = self._presence_key(user_id)
+            pipe = client.pipeline(transaction=False)
+            if connected:
+                now = time.time()
+                pipe.zadd(key, {channel_name: now + PRESENCE_TTL})
+                pipe.zremrangebyscore(key, '-inf', now)
+                pipe.expire(key, PRESENCE_TTL)
+            else:
+                pipe.zrem(key, channel_name)
+            pipe.execute()
+        except Exception as e:
+            logger.error(f"Error updating WebSocket presence for user {user_id}: {e}")
+    
+    def refresh_presence(self, user_id, channel_name):
+        """
+        Push an open connection's shared presence forward, at most once per
+        PRESENCE_REFRESH_INTERVAL.
+        """
+        metadata = self.connection_metadata.get(channel_name)
+        if metadata is None:
+            return
+        if time.monotonic() - metadata.get('presence_refreshed_at', 0) < PRESENCE_REFRESH_INTERVAL:
+            return
+        metadata['presence_refreshed_at'] = time.monotonic()
+        self._update_presence(user_id, channel_name, connected=True)
+    
+    def touch_connection(self, user_id, channel_name):
+        """
+        Record a message from the client and refresh its presence.
+        """
+        self.update_last_activity(channel_name)
+        self.refresh_presence(user_id, channel_name)
+    
+    async def keep_presence(self, user_id, channel_name):
+        """
+        Heartbeat for an open connection, run as a task by the consumer until
+        it disconnects, so idle clients stay online without sending anything.
+        """
+        while channel_name in self.connection_metadata:
+            await asyncio.sleep(PRESENCE_REFRESH_INTERVAL)
+            await database_sync_to_async(self.refresh_presence)(user_id, channel_name)
+    
+    def online_user_ids(self, user_ids):
+        """
+        The given users that have a WebSocket connection in this or any other
+        process, checked with one pipelined Redis round trip.
+        """
+        from .cache_utils import get_redis_client
+        
+        user_ids = [str(user_id) for user_id in user_ids]
+        online = {user_id for user_id in user_ids if self.active_connections.get(user_id)}
+        remaining = [user_id for user_id in user_ids if user_id not in online]
+        
+        client = get_redis_client()
+        if remaining and client is not None:
+            try:
+                pipe = client.pipeline(transaction=False)
+                now = time.time()
+                for user_id in remaining:
+                    # Channels whose expiry has passed no longer count
+                    pipe.zcount(self._presence_key(user_id), f'({now}', '+inf')
+                online.update(user_id for user_id, channels in zip(remaining, pipe.execute()) if channels)
+            except Exception as e:
+                logger.error(f"Error reading WebSocket presence: {e}")
+        return online
+    
     def is_user_online(self, user_id):
         """
-        Check if a user has any active WebSocket connections.
+        Check if a user has any active WebSocket connections, in any process.
         """
-        return user_id in self.active_connections and len(self.active_connections[user_id]) > 0
+        return bool(self.online_user_ids([user_id]))
     
     def get_online_users(self):
         """
@@ -640,6 +753,16 @@ class WebSocketConnectionManager:
         """
         return list(self.active_connections.keys())
     
+    def get_connection_stats(self):
+        """
+        Connection totals for this process, without walking the connection metadata.
+        """
+        return {
+            'total': len(self.connection_metadata),
+            'online_users': len(self.active_connections),
+            'by_type': dict(self.connections_by_type),
+        }
+    
     def update_last_activity(self, channel_name):
         """
         Update last activity timestamp for a connection.
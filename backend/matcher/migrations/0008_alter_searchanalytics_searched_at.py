@@ -0,0 +1,19 @@
+# Generated by Django 5.2.4 on 2026-10-18 21:37
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matcher', '0007_remove_jobseekerprofile_skills_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='searchanalytics',
+            name='searched_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
@@ -0,0 +1,110 @@
+# Generated by Django 5.2.4 on 2026-10-18 22:05
+
+import csv
+import os
+import re
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Frozen copy of the gazetteer loading in matcher.geo as of this migration,
+# so later changes to the app code cannot change what it does
+GAZETTEER_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'gazetteer.csv')
+
+_SEPARATORS = re.compile(r'[;/|()\[\]]')
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_location(value):
+    if not value:
+        return ''
+    value = _SEPARATORS.sub(',', value.lower().replace('.', ''))
+    parts = [_WHITESPACE.sub(' ', part).strip(' -') for part in value.split(',')]
+    return ', '.join(part for part in parts if part)
+
+
+def location_aliases(row):
+    name = normalize_location(row['name'])
+    region = normalize_location(row.get('region', ''))
+    country = normalize_location(row['country_code'])
+
+    aliases = [name, f'{name}, {country}']
+    if region:
+        aliases.extend([f'{name}, {region}', f'{name}, {region}, {country}'])
+    aliases.extend(normalize_location(alias) for alias in (row.get('aliases') or '').split('|'))
+    return [alias for alias in dict.fromkeys(aliases) if alias]
+
+
+def load_bundled_gazetteer(apps, schema_editor):
+    Location = apps.get_model('matcher', 'Location')
+    LocationAlias = apps.get_model('matcher', 'LocationAlias')
+
+    with open(GAZETTEER_PATH, newline='', encoding='utf-8') as gazetteer_file:
+        rows = list(csv.DictReader(gazetteer_file))
+
+    alias_owners = {}
+    for row in rows:
+        location, _ = Location.objects.update_or_create(
+            name=row['name'].strip(),
+            region=(row.get('region') or '').strip(),
+            country_code=row['country_code'].strip().upper(),
+            defaults={
+                'latitude': float(row['latitude']),
+                'longitude': float(row['longitude']),
+            }
+        )
+        for alias in location_aliases(row):
+            alias_owners.setdefault(alias, set()).add(location.id)
+
+    for alias, owner_ids in alias_owners.items():
+        # Names shared by several places are left to text matching
+        if len(owner_ids) == 1:
+            LocationAlias.objects.update_or_create(alias=alias, defaults={'location_id': next(iter(owner_ids))})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matcher', '0008_alter_searchanalytics_searched_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Location',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255)),
+                ('region', models.CharField(blank=True, max_length=255)),
+                ('country_code', models.CharField(db_index=True, max_length=2)),
+                ('latitude', models.FloatField()),
+                ('longitude', models.FloatField()),
+            ],
+            options={
+                'indexes': [models.Index(fields=['latitude', 'longitude'], name='matcher_loc_latitud_c9fba4_idx')],
+                'unique_together': {('name', 'region', 'country_code')},
+            },
+        ),
+        migrations.CreateModel(
+            name='LocationAlias',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('alias', models.CharField(max_length=255, unique=True)),
+                ('location', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='aliases', to='matcher.location')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='jobpost',
+            name='geo_location',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='job_posts', to='matcher.location'),
+        ),
+        migrations.AddField(
+            model_name='jobseekerprofile',
+            name='geo_location',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='job_seeker_profiles', to='matcher.location'),
+        ),
+        migrations.AddIndex(
+            model_name='jobpost',
+            index=models.Index(fields=['geo_location', 'is_active'], name='matcher_job_geo_loc_622015_idx'),
+        ),
+        migrations.RunPython(load_bundled_gazetteer, migrations.RunPython.noop),
+    ]
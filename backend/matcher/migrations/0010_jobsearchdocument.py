@@ -0,0 +1,159 @@
+# Generated by Django 5.2.4 on 2026-10-18 22:30
+
+from datetime import timedelta
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+# Frozen copy of the document building in matcher.search_documents as of this
+# migration, so later changes to the app code cannot change what it does
+BATCH_SIZE = 500
+APPLICATION_WEIGHT = 2
+
+
+def normalize_skills(skills_required):
+    seen = set()
+    skills = []
+    for skill in (skills_required or '').split(','):
+        skill = skill.strip()
+        if skill and skill.lower() not in seen:
+            seen.add(skill.lower())
+            skills.append(skill)
+    return skills
+
+
+def freshness_score(created_at, now):
+    age = now - created_at
+    if age <= timedelta(days=7):
+        return 3
+    if age <= timedelta(days=30):
+        return 2
+    return 1
+
+
+def related_count(related_model):
+    counts = related_model.objects.filter(job_post=OuterRef('pk')).order_by().values(
+        'job_post'
+    ).annotate(total=Count('pk')).values('total')
+    return Coalesce(Subquery(counts), 0)
+
+
+def search_document(JobSearchDocument, job, now):
+    profile = getattr(job.recruiter, 'recruiter_profile', None)
+    company_name = profile.company_name if profile else ''
+    skills = normalize_skills(job.skills_required)
+    lowered_skills = [skill.lower() for skill in skills]
+    search_text = ' '.join(
+        part for part in (
+            job.title, company_name, job.location, ' '.join(skills), job.description, job.requirements
+        ) if part
+    ).lower()
+
+    return JobSearchDocument(
+        job_post_id=job.id,
+        recruiter_id=job.recruiter_id,
+        title=job.title,
+        slug=job.slug,
+        company_name=company_name,
+        company_logo=profile.company_logo.name if profile and profile.company_logo else '',
+        recruiter_name=job.recruiter.username,
+        location=job.location,
+        geo_location_id=job.geo_location_id,
+        remote_work_allowed=job.remote_work_allowed,
+        job_type=job.job_type,
+        experience_level=job.experience_level,
+        salary_min=job.salary_min,
+        salary_max=job.salary_max,
+        salary_currency=job.salary_currency,
+        skills=skills,
+        skills_text=f",{','.join(lowered_skills)}," if lowered_skills else '',
+        search_text=search_text,
+        is_featured=job.is_featured,
+        application_deadline=job.application_deadline,
+        created_at=job.created_at,
+        views_count=job.document_views,
+        applications_count=job.document_applications,
+        popularity_score=job.document_views + job.document_applications * APPLICATION_WEIGHT,
+        freshness_score=freshness_score(job.created_at, now),
+    )
+
+
+def build_search_documents(apps, schema_editor):
+    JobPost = apps.get_model('matcher', 'JobPost')
+    JobView = apps.get_model('matcher', 'JobView')
+    Application = apps.get_model('matcher', 'Application')
+    JobSearchDocument = apps.get_model('matcher', 'JobSearchDocument')
+
+    now = timezone.now()
+    jobs = JobPost.objects.filter(is_active=True).select_related(
+        'recruiter', 'recruiter__recruiter_profile'
+    ).annotate(
+        document_views=related_count(JobView),
+        document_applications=related_count(Application),
+    ).order_by('created_at', 'id')
+
+    batch = []
+    for job in jobs.iterator(chunk_size=BATCH_SIZE):
+        batch.append(search_document(JobSearchDocument, job, now))
+        if len(batch) >= BATCH_SIZE:
+            JobSearchDocument.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        JobSearchDocument.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matcher', '0009_location_locationalias_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobSearchDocument',
+            fields=[
+                ('job_post', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='search_document', serialize=False, to='matcher.jobpost')),
+                ('title', models.CharField(max_length=255)),
+                ('slug', models.SlugField(blank=True, max_length=300)),
+                ('company_name', models.CharField(blank=True, db_index=True, max_length=255)),
+                ('company_logo', models.CharField(blank=True, max_length=255)),
+                ('recruiter_name', models.CharField(blank=True, max_length=150)),
+                ('location', models.CharField(max_length=255)),
+                ('remote_work_allowed', models.BooleanField(default=False)),
+                ('job_type', models.CharField(choices=[('full_time', 'Full Time'), ('part_time', 'Part Time'), ('contract', 'Contract'), ('internship', 'Internship'), ('freelance', 'Freelance'), ('remote', 'Remote'), ('hybrid', 'Hybrid')], max_length=20)),
+                ('experience_level', models.CharField(choices=[('entry', 'Entry Level (0-2 years)'), ('mid', 'Mid Level (3-5 years)'), ('senior', 'Senior Level (6-10 years)'), ('lead', 'Lead Level (10+ years)'), ('executive', 'Executive Level')], max_length=20)),
+                ('salary_min', models.IntegerField(blank=True, null=True)),
+                ('salary_max', models.IntegerField(blank=True, null=True)),
+                ('salary_currency', models.CharField(default='USD', max_length=3)),
+                ('skills', models.JSONField(default=list, help_text='Skill names as entered, de-duplicated')),
+                ('skills_text', models.TextField(blank=True, help_text='Lower-cased skills, comma-delimited for containment lookups')),
+                ('search_text', models.TextField(blank=True, help_text='Lower-cased title, company, location, skills and description')),
+                ('is_featured', models.BooleanField(default=False)),
+                ('application_deadline', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(db_index=True)),
+                ('views_count', models.IntegerField(default=0)),
+                ('applications_count', models.IntegerField(default=0)),
+                ('popularity_score', models.IntegerField(default=0)),
+                ('freshness_score', models.IntegerField(default=1)),
+                ('synced_at', models.DateTimeField(auto_now=True)),
+                ('geo_location', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='job_search_documents', to='matcher.location')),
+                ('recruiter', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='job_search_documents', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [
+                    models.Index(fields=['job_type', 'experience_level'], name='matcher_job_job_typ_938c46_idx'),
+                    models.Index(fields=['geo_location', 'created_at'], name='matcher_job_geo_loc_06e8f5_idx'),
+                    models.Index(fields=['salary_min', 'salary_max'], name='matcher_job_salary__1300e2_idx'),
+                    models.Index(fields=['-popularity_score', '-created_at'], name='matcher_job_popular_10c147_idx'),
+                    models.Index(fields=['is_featured', 'created_at'], name='matcher_job_is_feat_9564ac_idx'),
+                ],
+            },
+        ),
+        migrations.RunPython(build_search_documents, migrations.RunPython.noop),
+    ]
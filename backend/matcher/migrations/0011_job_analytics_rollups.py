@@ -0,0 +1,61 @@
+# Generated by Django 5.2.4 on 2026-10-18 23:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matcher', '0010_jobsearchdocument'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobAnalyticsDaily',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket_start', models.DateTimeField()),
+                ('views', models.PositiveIntegerField(default=0)),
+                ('unique_viewers', models.PositiveIntegerField(default=0)),
+                ('applications', models.PositiveIntegerField(default=0)),
+                ('referrers', models.JSONField(default=dict)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('job_post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='%(class)s_buckets', to='matcher.jobpost')),
+            ],
+            options={
+                'verbose_name_plural': 'Job Analytics (daily)',
+                'ordering': ['bucket_start'],
+                'abstract': False,
+                'unique_together': {('job_post', 'bucket_start')},
+            },
+        ),
+        migrations.CreateModel(
+            name='JobAnalyticsHourly',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket_start', models.DateTimeField()),
+                ('views', models.PositiveIntegerField(default=0)),
+                ('unique_viewers', models.PositiveIntegerField(default=0)),
+                ('applications', models.PositiveIntegerField(default=0)),
+                ('referrers', models.JSONField(default=dict)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('job_post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='%(class)s_buckets', to='matcher.jobpost')),
+            ],
+            options={
+                'verbose_name_plural': 'Job Analytics (hourly)',
+                'ordering': ['bucket_start'],
+                'abstract': False,
+                'indexes': [models.Index(fields=['bucket_start'], name='matcher_job_bucket__9dcc6a_idx')],
+                'unique_together': {('job_post', 'bucket_start')},
+            },
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['applied_at'], name='matcher_app_applied_ff0b9b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobview',
+            index=models.Index(fields=['viewed_at'], name='matcher_job_viewed__d4ae09_idx'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.4 on 2026-10-18 23:40
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matcher', '0011_job_analytics_rollups'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DashboardCounters',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='dashboard_counters', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('applications_total', models.IntegerField(default=0)),
+                ('applications_pending', models.IntegerField(default=0)),
+                ('applications_shortlisted', models.IntegerField(default=0)),
+                ('applications_interview_scheduled', models.IntegerField(default=0)),
+                ('applications_hired', models.IntegerField(default=0)),
+                ('interviews_scheduled', models.IntegerField(default=0)),
+                ('job_posts_total', models.IntegerField(default=0)),
+                ('job_posts_active', models.IntegerField(default=0)),
+                ('profile_completion', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Dashboard Counters',
+            },
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.4 on 2026-10-18 23:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matcher', '0012_dashboardcounters'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='jobpost',
+            name='matcher_job_is_acti_4ce893_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='message',
+            name='matcher_mes_convers_fd2c5a_idx',
+        ),
+        migrations.AddIndex(
+            model_name='jobpost',
+            index=models.Index(fields=['is_active', 'created_at', 'id'], name='matcher_job_is_acti_974485_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobpost',
+            index=models.Index(fields=['recruiter', 'created_at', 'id'], name='matcher_job_recruit_b65451_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobsearchdocument',
+            index=models.Index(fields=['created_at', 'job_post'], name='matcher_job_created_874e00_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['job_seeker', 'applied_at', 'id'], name='matcher_app_job_see_070a10_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['job_post', 'applied_at', 'id'], name='matcher_app_job_pos_a49242_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['recipient', 'created_at', 'id'], name='matcher_not_recipie_cb6d91_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['conversation', 'sent_at', 'id'], name='matcher_mes_convers_897f3f_idx'),
+        ),
+    ]
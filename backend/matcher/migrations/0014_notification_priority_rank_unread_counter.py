@@ -0,0 +1,52 @@
+# Generated by Django 5.2.4 on 2026-10-19 00:20
+
+from django.db import migrations, models
+
+
+def set_priority_ranks(apps, schema_editor):
+    Notification = apps.get_model('matcher', 'Notification')
+    for priority, rank in {'low': 1, 'high': 3, 'urgent': 4}.items():
+        Notification.objects.filter(priority=priority).update(priority_rank=rank)
+
+
+def count_unread_notifications(apps, schema_editor):
+    from django.db.models import Count
+
+    DashboardCounters = apps.get_model('matcher', 'DashboardCounters')
+    Notification = apps.get_model('matcher', 'Notification')
+    unread = (
+        Notification.objects.filter(is_read=False, recipient__dashboard_counters__isnull=False)
+        .values('recipient_id').annotate(total=Count('id')).order_by()
+    )
+    for row in unread.iterator():
+        DashboardCounters.objects.filter(user_id=row['recipient_id']).update(notifications_unread=row['total'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matcher', '0013_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notification',
+            name='priority_rank',
+            field=models.PositiveSmallIntegerField(default=2, editable=False),
+        ),
+        migrations.AddField(
+            model_name='dashboardcounters',
+            name='notifications_unread',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(set_priority_ranks, migrations.RunPython.noop),
+        migrations.RunPython(count_unread_notifications, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='notification',
+            name='matcher_not_recipie_91c434_idx',
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['recipient', 'is_read', 'priority_rank', 'created_at'], name='matcher_not_recipie_cb3aae_idx'),
+        ),
+    ]
@@ -25,6 +25,11 @@ from django.core.cache import cache
 from django.utils import timezone
 from django.db import models
 
+from .geo import is_remote_location, locations_match
+from .cache_utils import (
+    metered_get, metered_set, invalidate_tags, tagged_cache_key, job_tag, resume_tag, MATCH_SCORE_TAG
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -313,10 +318,10 @@ class JobMatchMLModel:
         features.append(1 - exp_diff)  # Higher score for smaller difference
         
         # Location match
-        job_location = job_data.get('location', '').lower()
-        resume_location = resume_data.get('location', '').lower()
+        job_location = job_data.get('location', '')
+        resume_location = resume_data.get('location', '')
         remote_allowed = job_data.get('remote_work_allowed', False)
-        location_match = 1.0 if job_location == resume_location or 'remote' in job_location or remote_allowed else 0.3
+        location_match = 1.0 if remote_allowed or is_remote_location(job_location) or locations_match(job_location, resume_location) else 0.3
         features.append(location_match)
         
         # Education match (simplified)
@@ -868,9 +873,11 @@ class MatchScoreCache:
     @staticmethod
     def get_cache_key(resume_id: str, job_id: str) -> str:
         """
-        Generate cache key for match score
+        Generate cache key for match score, tagged so resume, job and AI changes drop it
         """
-        return f"match_score:{resume_id}:{job_id}"
+        return tagged_cache_key(
+            f"match_score:{resume_id}:{job_id}", [MATCH_SCORE_TAG, resume_tag(resume_id), job_tag(job_id)]
+        )
     
     @staticmethod
     def get_cached_score(resume_id: str, job_id: str) -> Optional[Dict[str, Any]]:
@@ -878,7 +885,7 @@ class MatchScoreCache:
         Get cached match score
         """
         cache_key = MatchScoreCache.get_cache_key(resume_id, job_id)
-        return cache.get(cache_key)
+        return metered_get('match_score', cache_key)
     
     @staticmethod
     def cache_score(resume_id: str, job_id: str, score_data: Dict[str, Any]):
@@ -886,7 +893,7 @@ class MatchScoreCache:
         Cache match score
         """
         cache_key = MatchScoreCache.get_cache_key(resume_id, job_id)
-        cache.set(cache_key, score_data, MatchScoreCache.CACHE_TIMEOUT)
+        metered_set('match_score', cache_key, score_data, MatchScoreCache.CACHE_TIMEOUT)
     
     @staticmethod
     def invalidate_cache(resume_id: str = None, job_id: str = None):
@@ -898,9 +905,10 @@ class MatchScoreCache:
             cache_key = MatchScoreCache.get_cache_key(resume_id, job_id)
             cache.delete(cache_key)
         else:
-            # This would require a more sophisticated cache invalidation strategy
-            # For now, we'll rely on cache timeout
-            pass
+            invalidate_tags(
+                resume_tag(resume_id) if resume_id else None,
+                job_tag(job_id) if job_id else None,
+            )
 
 
 # =============================================================================
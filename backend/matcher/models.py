@@ -36,6 +36,37 @@ class User(AbstractUser):
         return f"{self.username} ({self.get_user_type_display()})"
 
 
+class Location(models.Model):
+    """
+    Normalized place from the bundled gazetteer, used for indexed location matching
+    """
+    name = models.CharField(max_length=255)
+    region = models.CharField(max_length=255, blank=True)
+    country_code = models.CharField(max_length=2, db_index=True)
+    latitude = models.FloatField()
+    longitude = models.FloatField()
+    
+    class Meta:
+        unique_together = ('name', 'region', 'country_code')
+        indexes = [
+            models.Index(fields=['latitude', 'longitude'], name='matcher_loc_latitud_c9fba4_idx'),
+        ]
+    
+    def __str__(self):
+        return ', '.join(part for part in (self.name, self.region, self.country_code) if part)
+
+
+class LocationAlias(models.Model):
+    """
+    Normalized spelling that resolves to a Location (e.g. "sf bay area", "nyc")
+    """
+    alias = models.CharField(max_length=255, unique=True)
+    location = models.ForeignKey(Location, on_delete=models.CASCADE, related_name='aliases')
+    
+    def __str__(self):
+        return f"{self.alias} -> {self.location.name}"
+
+
 class JobSeekerProfile(models.Model):
     EXPERIENCE_LEVELS = (
         ('entry', 'Entry Level (0-2 years)'),
@@ -47,6 +78,9 @@ class JobSeekerProfile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='job_seeker_profile')
     date_of_birth = models.DateField(blank=True, null=True)
     location = models.CharField(max_length=255, blank=True)
+    geo_location = models.ForeignKey(
+        Location, on_delete=models.SET_NULL, null=True, blank=True, related_name='job_seeker_profiles'
+    )
     experience_level = models.CharField(max_length=20, choices=EXPERIENCE_LEVELS, blank=True)
     current_position = models.CharField(max_length=255, blank=True)
     current_company = models.CharField(max_length=255, blank=True)
@@ -64,6 +98,15 @@ class JobSeekerProfile(models.Model):
     # Relationships to new profile sections
     # (see below for models)
     
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'location' in update_fields:
+            from .geo import resolve_location
+            self.geo_location = resolve_location(self.location)
+            if update_fields is not None:
+                kwargs['update_fields'] = set(update_fields) | {'geo_location'}
+        super().save(*args, **kwargs)
+    
     def __str__(self):
         return f"{self.user.username}'s Profile"
 
@@ -198,6 +241,9 @@ class JobPost(models.Model):
     requirements = models.TextField()
     responsibilities = models.TextField(blank=True)
     location = models.CharField(max_length=255, db_index=True)
+    geo_location = models.ForeignKey(
+        Location, on_delete=models.SET_NULL, null=True, blank=True, related_name='job_posts'
+    )
     remote_work_allowed = models.BooleanField(default=False)
     job_type = models.CharField(max_length=20, choices=JOB_TYPES, db_index=True)
     experience_level = models.CharField(max_length=20, choices=EXPERIENCE_LEVELS, db_index=True)
@@ -222,8 +268,11 @@ class JobPost(models.Model):
     class Meta:
         ordering = ['-created_at']
         indexes = [
-            models.Index(fields=['is_active', 'created_at']),
+            # Keyset pagination seeks on (created_at, id)
+            models.Index(fields=['is_active', 'created_at', 'id'], name='matcher_job_is_acti_974485_idx'),
+            models.Index(fields=['recruiter', 'created_at', 'id'], name='matcher_job_recruit_b65451_idx'),
             models.Index(fields=['location', 'is_active']),
+            models.Index(fields=['geo_location', 'is_active'], name='matcher_job_geo_loc_622015_idx'),
             models.Index(fields=['job_type', 'experience_level']),
             models.Index(fields=['salary_min', 'salary_max']),
         ]
@@ -236,11 +285,6 @@ class JobPost(models.Model):
         return queryset.select_related(
             'recruiter',
             'recruiter__recruiter_profile'
-        ).prefetch_related(
-            models.Prefetch(
-                'applications',
-                queryset=cls.applications.related.related_model.objects.select_related('job_seeker')
-            )
         )
     
     def save(self, *args, **kwargs):
@@ -248,6 +292,12 @@ class JobPost(models.Model):
             from django.utils.text import slugify
             base_slug = slugify(f"{self.title}-{self.recruiter.recruiter_profile.company_name}")
             self.slug = base_slug[:300]
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'location' in update_fields:
+            from .geo import resolve_location
+            self.geo_location = resolve_location(self.location)
+            if update_fields is not None:
+                kwargs['update_fields'] = set(update_fields) | {'geo_location'}
         super().save(*args, **kwargs)
     
     def __str__(self):
@@ -276,6 +326,72 @@ class JobPost(models.Model):
         self.save(update_fields=['applications_count'])
 
 
+class JobSearchDocument(models.Model):
+    """
+    Denormalized, read-optimized projection of an active JobPost.
+    
+    Kept in step by signals and rebuilt by reconcile_job_search_documents(); search,
+    listings, recommendations and cache warming read from it instead of joining the
+    recruiter profile and counting applications and views per query.
+    """
+    job_post = models.OneToOneField(
+        JobPost, on_delete=models.CASCADE, primary_key=True, related_name='search_document'
+    )
+    recruiter = models.ForeignKey(User, on_delete=models.CASCADE, related_name='job_search_documents')
+    title = models.CharField(max_length=255)
+    slug = models.SlugField(max_length=300, blank=True)
+    company_name = models.CharField(max_length=255, blank=True, db_index=True)
+    company_logo = models.CharField(max_length=255, blank=True)
+    recruiter_name = models.CharField(max_length=150, blank=True)
+    location = models.CharField(max_length=255)
+    geo_location = models.ForeignKey(
+        Location, on_delete=models.SET_NULL, null=True, blank=True, related_name='job_search_documents'
+    )
+    remote_work_allowed = models.BooleanField(default=False)
+    job_type = models.CharField(max_length=20, choices=JobPost.JOB_TYPES)
+    experience_level = models.CharField(max_length=20, choices=JobPost.EXPERIENCE_LEVELS)
+    salary_min = models.IntegerField(blank=True, null=True)
+    salary_max = models.IntegerField(blank=True, null=True)
+    salary_currency = models.CharField(max_length=3, default='USD')
+    skills = models.JSONField(default=list, help_text="Skill names as entered, de-duplicated")
+    skills_text = models.TextField(blank=True, help_text="Lower-cased skills, comma-delimited for containment lookups")
+    search_text = models.TextField(blank=True, help_text="Lower-cased title, company, location, skills and description")
+    is_featured = models.BooleanField(default=False)
+    application_deadline = models.DateTimeField(blank=True, null=True)
+    created_at = models.DateTimeField(db_index=True)
+    views_count = models.IntegerField(default=0)
+    applications_count = models.IntegerField(default=0)
+    popularity_score = models.IntegerField(default=0)
+    freshness_score = models.IntegerField(default=1)
+    synced_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['job_type', 'experience_level'], name='matcher_job_job_typ_938c46_idx'),
+            models.Index(fields=['geo_location', 'created_at'], name='matcher_job_geo_loc_06e8f5_idx'),
+            models.Index(fields=['salary_min', 'salary_max'], name='matcher_job_salary__1300e2_idx'),
+            models.Index(fields=['-popularity_score', '-created_at'], name='matcher_job_popular_10c147_idx'),
+            models.Index(fields=['is_featured', 'created_at'], name='matcher_job_is_feat_9564ac_idx'),
+            models.Index(fields=['created_at', 'job_post'], name='matcher_job_created_874e00_idx'),
+        ]
+    
+    def __str__(self):
+        return f"Search document for {self.title}"
+    
+    @property
+    def is_expired(self):
+        """Check if job posting has expired"""
+        if self.application_deadline:
+            return timezone.now() > self.application_deadline
+        return False
+    
+    @property
+    def days_since_posted(self):
+        """Get number of days since job was posted"""
+        return (timezone.now() - self.created_at).days
+
+
 class Application(models.Model):
     STATUS_CHOICES = (
         ('pending', 'Pending'),
@@ -301,6 +417,12 @@ class Application(models.Model):
     class Meta:
         unique_together = ('job_seeker', 'job_post')
         ordering = ['-applied_at']
+        indexes = [
+            models.Index(fields=['applied_at'], name='matcher_app_applied_ff0b9b_idx'),
+            # Keyset pagination of each side's feed seeks on (applied_at, id)
+            models.Index(fields=['job_seeker', 'applied_at', 'id'], name='matcher_app_job_see_070a10_idx'),
+            models.Index(fields=['job_post', 'applied_at', 'id'], name='matcher_app_job_pos_a49242_idx'),
+        ]
     
     @classmethod
     def get_pagination_optimizations(cls, queryset):
@@ -542,6 +664,7 @@ class JobView(models.Model):
             models.Index(fields=['job_post', 'viewed_at']),
             models.Index(fields=['viewer', 'viewed_at']),
             models.Index(fields=['ip_address', 'viewed_at']),
+            models.Index(fields=['viewed_at'], name='matcher_job_viewed__d4ae09_idx'),
         ]
     
     def __str__(self):
@@ -549,6 +672,67 @@ class JobView(models.Model):
         return f"{self.job_post.title} viewed by {viewer_info}"
 
 
+class JobAnalyticsRollup(models.Model):
+    """
+    Per-job analytics for one time bucket, rebuilt from JobView and Application rows
+    """
+    job_post = models.ForeignKey(JobPost, on_delete=models.CASCADE, related_name='%(class)s_buckets')
+    bucket_start = models.DateTimeField()  # UTC
+    views = models.PositiveIntegerField(default=0)
+    unique_viewers = models.PositiveIntegerField(default=0)  # distinct IPs per hour; daily rows sum their hours
+    applications = models.PositiveIntegerField(default=0)
+    referrers = models.JSONField(default=dict)  # referrer host -> views
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        abstract = True
+        unique_together = ('job_post', 'bucket_start')
+        ordering = ['bucket_start']
+    
+    def __str__(self):
+        return f"{self.job_post_id} @ {self.bucket_start:%Y-%m-%d %H:%M}: {self.views} views"
+
+
+class JobAnalyticsHourly(JobAnalyticsRollup):
+    class Meta(JobAnalyticsRollup.Meta):
+        verbose_name_plural = "Job Analytics (hourly)"
+        indexes = [
+            models.Index(fields=['bucket_start'], name='matcher_job_bucket__9dcc6a_idx'),
+        ]
+
+
+class JobAnalyticsDaily(JobAnalyticsRollup):
+    class Meta(JobAnalyticsRollup.Meta):
+        verbose_name_plural = "Job Analytics (daily)"
+
+
+class DashboardCounters(models.Model):
+    """
+    Per-user dashboard statistics, maintained by signals and reconciled periodically.
+
+    Application and interview counters cover the applications a job seeker sent
+    or, for a recruiter, the applications received on their job posts.
+    """
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='dashboard_counters')
+    applications_total = models.IntegerField(default=0)
+    applications_pending = models.IntegerField(default=0)
+    applications_shortlisted = models.IntegerField(default=0)
+    applications_interview_scheduled = models.IntegerField(default=0)
+    applications_hired = models.IntegerField(default=0)
+    interviews_scheduled = models.IntegerField(default=0)
+    job_posts_total = models.IntegerField(default=0)
+    job_posts_active = models.IntegerField(default=0)
+    profile_completion = models.IntegerField(default=0)  # percentage
+    notifications_unread = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = "Dashboard Counters"
+
+    def __str__(self):
+        return f"Dashboard counters for {self.user_id}"
+
+
 class Notification(models.Model):
     """
     Model for storing notification history and persistence.
@@ -570,12 +754,16 @@ class Notification(models.Model):
         ('urgent', 'Urgent'),
     )
     
+    # Stored as priority_rank so listings can order by priority in the database
+    PRIORITY_RANKS = {'low': 1, 'normal': 2, 'high': 3, 'urgent': 4}
+    
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     recipient = models.ForeignKey(User, on_delete=models.CASCADE, related_name='notifications')
     notification_type = models.CharField(max_length=30, choices=NOTIFICATION_TYPES)
     title = models.CharField(max_length=255)
     message = models.TextField()
     priority = models.CharField(max_length=10, choices=PRIORITY_LEVELS, default='normal')
+    priority_rank = models.PositiveSmallIntegerField(default=2, editable=False)
     
     # Related objects for context
     job_post = models.ForeignKey(JobPost, on_delete=models.CASCADE, null=True, blank=True)
@@ -600,7 +788,10 @@ class Notification(models.Model):
     class Meta:
         ordering = ['-created_at']
         indexes = [
-            models.Index(fields=['recipient', 'is_read', 'created_at']),
+            models.Index(
+                fields=['recipient', 'is_read', 'priority_rank', 'created_at'], name='matcher_not_recipie_cb3aae_idx'
+            ),
+            models.Index(fields=['recipient', 'created_at', 'id'], name='matcher_not_recipie_cb6d91_idx'),
             models.Index(fields=['notification_type', 'created_at']),
             models.Index(fields=['priority', 'is_read']),
             models.Index(fields=['expires_at']),
@@ -609,6 +800,17 @@ class Notification(models.Model):
     def __str__(self):
         return f"{self.get_notification_type_display()} for {self.recipient.username}"
     
+    @classmethod
+    def rank_for(cls, priority):
+        return cls.PRIORITY_RANKS.get(priority, cls.PRIORITY_RANKS['normal'])
+    
+    def save(self, *args, **kwargs):
+        self.priority_rank = self.rank_for(self.priority)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'priority' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'priority_rank'}
+        super().save(*args, **kwargs)
+    
     def mark_as_read(self):
         """Mark notification as read"""
         if not self.is_read:
@@ -920,7 +1122,7 @@ class Message(models.Model):
         db_table = 'matcher_message'
         ordering = ['sent_at']
         indexes = [
-            models.Index(fields=['conversation', 'sent_at']),
+            models.Index(fields=['conversation', 'sent_at', 'id'], name='matcher_mes_convers_897f3f_idx'),
             models.Index(fields=['sender', 'sent_at']),
             models.Index(fields=['is_read']),
         ]
@@ -0,0 +1,205 @@
+"""
+Per-process near cache for HireWise backend.
+
+Hot, rarely-changing values such as the skills list, notification templates
+and resume template categories are kept in a bounded, TTL-aware LRU inside
+each process, in front of the Django cache. A local hit saves a Redis round
+trip and an unpickle. Near caching is opt-in per CacheManager prefix
+(settings.NEAR_CACHE['PREFIXES']); api_cache endpoints opt in with
+local_cache=True.
+
+Invalidation uses a cache tag per prefix. Changing or deleting a key through
+CacheManager invalidates the tag, and each process compares the tag's
+generation with the one its local entries were loaded under at most once
+per POLL_INTERVAL, dropping them when it moved. Values are shared between
+threads and must be treated as read-only.
+"""
+
+import logging
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+from django.conf import settings
+
+from .cache_utils import get_tag_generations, invalidate_tags
+
+logger = logging.getLogger(__name__)
+
+NEAR_CACHE_CONFIG = getattr(settings, 'NEAR_CACHE', {})
+
+NEAR_CACHE_PREFIXES = set(NEAR_CACHE_CONFIG.get('PREFIXES', []))
+MAX_ENTRIES = NEAR_CACHE_CONFIG.get('MAX_ENTRIES', 1000)
+LOCAL_TIMEOUT = NEAR_CACHE_CONFIG.get('TIMEOUT', 60)
+POLL_INTERVAL = NEAR_CACHE_CONFIG.get('POLL_INTERVAL', 1.0)
+
+_MISSING = object()
+
+
+class LocalLRUCache:
+    """
+    Thread-safe LRU with a per-entry TTL
+    """
+
+    def __init__(self, max_entries: int = MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return default
+            value, expires_at = item
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, timeout: float) -> None:
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + timeout)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class NearCache:
+    """
+    Local LRU tier for one prefix, kept coherent through the prefix's cache tag
+    """
+
+    def __init__(self, prefix: str, max_entries: int = MAX_ENTRIES, timeout: float = LOCAL_TIMEOUT,
+                 poll_interval: float = POLL_INTERVAL):
+        self.prefix = prefix
+        self.tag = f"near:{prefix}"
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.local = LocalLRUCache(max_entries)
+        self._generation = None
+        self._checked_at = 0.0
+        self._stats = Counter()
+        self._stats_lock = threading.Lock()
+
+    def record(self, field: str, amount: int = 1) -> None:
+        with self._stats_lock:
+            self._stats[field] += amount
+
+    def _sync_generation(self) -> None:
+        """
+        Drop local entries if another process invalidated the prefix since the last check
+        """
+        now = time.monotonic()
+        if now - self._checked_at < self.poll_interval:
+            return
+        self._checked_at = now
+
+        generation = get_tag_generations([self.tag]).get(self.tag)
+        if generation != self._generation:
+            if self._generation is not None:
+                self.local.clear()
+                self.record('invalidations')
+            self._generation = generation
+
+    def get(self, key: str, loader: Callable[[], Any]) -> Any:
+        """
+        The local value, or loader()'s value from the shared tier, kept locally unless None
+        """
+        self._sync_generation()
+        value = self.local.get(key, _MISSING)
+        if value is not _MISSING:
+            self.record('local_hits')
+            return value
+
+        self.record('local_misses')
+        generation = self._generation
+        value = loader()
+        # Skip values read while an invalidation was being picked up
+        if value is not None and generation == self._generation:
+            self.local.set(key, value, self.timeout)
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        self.local.set(key, value, self.timeout)
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        """
+        Drop the key (or everything) locally and make other processes drop the prefix.
+        
+        This process adopts the new generation, so its remaining entries and a
+        value set right after stay local. If the tag moved more than once since
+        the last check, another process invalidated too and everything is dropped.
+        """
+        if key is None:
+            self.local.clear()
+        else:
+            self.local.delete(key)
+        previous = self._generation
+        generation = invalidate_tags(self.tag).get(self.tag)
+        if generation is None:
+            # Pick up the new generation on the next read
+            self._checked_at = 0.0
+            return
+        if previous is None or generation != previous + 1:
+            self.local.clear()
+            if previous is not None:
+                self.record('invalidations')
+        self._generation = generation
+        self._checked_at = time.monotonic()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            stats = dict(self._stats)
+        local_lookups = stats.get('local_hits', 0) + stats.get('local_misses', 0)
+        stats['local_hit_rate'] = round(stats.get('local_hits', 0) / local_lookups * 100, 2) if local_lookups else 0.0
+        stats['local_entries'] = len(self.local)
+        return stats
+
+
+_near_caches: Dict[str, NearCache] = {}
+_near_caches_lock = threading.Lock()
+
+
+def get_near_cache(prefix: str, enabled: Optional[bool] = None) -> Optional[NearCache]:
+    """
+    The near cache for a prefix, or None when the prefix has not opted in
+    """
+    if enabled is None:
+        enabled = prefix in NEAR_CACHE_PREFIXES
+    if not enabled:
+        return None
+
+    near_cache = _near_caches.get(prefix)
+    if near_cache is None:
+        with _near_caches_lock:
+            near_cache = _near_caches.setdefault(prefix, NearCache(prefix))
+    return near_cache
+
+
+def get_near_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    Local and shared tier hit/miss counters for each near-cached prefix in this process
+    """
+    return {prefix: near_cache.stats() for prefix, near_cache in list(_near_caches.items())}
+
+
+def clear_near_caches() -> None:
+    """
+    Empty every local tier in this process, e.g. between tests
+    """
+    for near_cache in list(_near_caches.values()):
+        near_cache.local.clear()
@@ -0,0 +1,161 @@
+"""
+Targeted, chunked fan-out of job-posted notifications for HireWise backend.
+
+A new job only notifies relevant job seekers: those with one of its skills
+who are near it (or it allows remote work, or their location is unknown),
+and those with an active job saved search that matches it. Seekers who
+disabled job-posted notifications are dropped in the same query. The
+post_save signal queues fan_out_job_posted_notifications_task once the job
+is committed; the task walks the recipient ids in primary key order and
+queues one create_job_posted_notifications_task per
+NOTIFICATION_FANOUT['CHUNK_SIZE'] recipients, so no request thread, query or
+transaction grows with the number of job seekers.
+"""
+
+import logging
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.models import F, Q, QuerySet, TextField, Value
+from django.db.models.functions import Lower
+
+from .geo import is_remote_location, nearby_location_ids
+from .models import JobPost, Notification, Skill, UserSkill
+from .search_analytics import SavedSearch
+
+User = get_user_model()
+logger = logging.getLogger(__name__)
+
+NOTIFICATION_FANOUT_CONFIG = getattr(settings, 'NOTIFICATION_FANOUT', {})
+
+CHUNK_SIZE = NOTIFICATION_FANOUT_CONFIG.get('CHUNK_SIZE', 1000)
+LOCATION_RADIUS_KM = NOTIFICATION_FANOUT_CONFIG.get('LOCATION_RADIUS_KM', 50)
+
+
+def job_skill_names(job_post: JobPost) -> List[str]:
+    """
+    Lower-cased, de-duplicated skills of a job
+    """
+    names = []
+    for skill in (job_post.skills_required or '').split(','):
+        skill = skill.strip().lower()
+        if skill and skill not in names:
+            names.append(skill)
+    return names
+
+
+def _skill_match_q(names: List[str]) -> Q:
+    skills = Skill.objects.annotate(name_lower=Lower('name')).filter(name_lower__in=names)
+    return Q(id__in=UserSkill.objects.filter(skill__in=skills).values('user_id'))
+
+
+def _location_match_q(job_post: JobPost) -> Q:
+    if job_post.remote_work_allowed or is_remote_location(job_post.location) or job_post.geo_location is None:
+        return Q()
+    # Seekers whose location is not in the gazetteer cannot be ruled out
+    return (
+        Q(job_seeker_profile__geo_location__in=nearby_location_ids(job_post.geo_location, LOCATION_RADIUS_KM)) |
+        Q(job_seeker_profile__geo_location__isnull=True)
+    )
+
+
+def _saved_search_match_q(job_post: JobPost) -> Q:
+    """
+    Seekers with an active job saved search whose query appears in the job and whose filters allow it
+    """
+    job_text = ' '.join([job_post.title, job_post.skills_required or '', job_post.location or ''])
+    searches = SavedSearch.objects.filter(
+        search_type='jobs', is_active=True, alerts_enabled=True
+    ).exclude(query='').annotate(
+        job_text=Value(job_text, output_field=TextField())
+    ).filter(
+        job_text__icontains=F('query')
+    ).filter(
+        Q(filters__job_type__isnull=True) | Q(filters__job_type=job_post.job_type),
+        Q(filters__experience_level__isnull=True) | Q(filters__experience_level=job_post.experience_level),
+    )
+    return Q(id__in=searches.values('user_id'))
+
+
+def relevant_job_seekers(job_post: JobPost) -> QuerySet:
+    """
+    Active job seekers to notify about a job, without those who opted out
+    """
+    relevant = _saved_search_match_q(job_post)
+    names = job_skill_names(job_post)
+    if names:
+        relevant |= _skill_match_q(names) & _location_match_q(job_post)
+
+    return User.objects.filter(user_type='job_seeker', is_active=True).filter(relevant).exclude(
+        notification_preferences__job_posted_enabled=False
+    )
+
+
+def iter_recipient_chunks(job_post: JobPost, chunk_size: int = CHUNK_SIZE) -> Iterator[List[str]]:
+    """
+    Relevant job seeker ids in chunks, paged on the primary key so each query stays an index range
+    """
+    recipient_ids = relevant_job_seekers(job_post).order_by('id').values_list('id', flat=True)
+    last_id = None
+    while True:
+        page = recipient_ids if last_id is None else recipient_ids.filter(id__gt=last_id)
+        chunk = list(page[:chunk_size])
+        if not chunk:
+            return
+        yield [str(recipient_id) for recipient_id in chunk]
+        last_id = chunk[-1]
+
+
+def create_job_posted_notifications(job_post: JobPost, recipient_ids: List[str]) -> int:
+    """
+    Notify one chunk of recipients about a job; recipients already notified are skipped, so retries are safe
+    """
+    from .notification_service import notification_service
+
+    already_notified = {
+        str(recipient_id) for recipient_id in Notification.objects.filter(
+            job_post=job_post, notification_type='job_posted', recipient_id__in=recipient_ids
+        ).values_list('recipient_id', flat=True)
+    }
+    pending = [recipient_id for recipient_id in recipient_ids if str(recipient_id) not in already_notified]
+    if not pending:
+        return 0
+
+    title, message, data = notification_service.job_posted_content(job_post)
+    created = notification_service.create_bulk_notifications(
+        recipient_ids=pending,
+        notification_type='job_posted',
+        title=title,
+        message=message,
+        data=data,
+        priority='normal',
+        job_post=job_post
+    )
+    return len(created)
+
+
+def fan_out_job_posted_notifications(
+    job_post: JobPost,
+    chunk_size: Optional[int] = None,
+    dispatch: Optional[Callable[[List[str]], Any]] = None,
+) -> Dict[str, int]:
+    """
+    Hand each chunk of relevant recipients to dispatch (a chunk task by default).
+
+    Returns the number of recipients and chunks.
+    """
+    if dispatch is None:
+        from .tasks import create_job_posted_notifications_task
+
+        def dispatch(recipient_ids):
+            create_job_posted_notifications_task.delay(str(job_post.id), recipient_ids)
+
+    recipients = chunks = 0
+    for recipient_ids in iter_recipient_chunks(job_post, chunk_size or CHUNK_SIZE):
+        dispatch(recipient_ids)
+        recipients += len(recipient_ids)
+        chunks += 1
+
+    logger.info(f"Job {job_post.id} fanned out to {recipients} job seekers in {chunks} chunks")
+    return {'recipients': recipients, 'chunks': chunks}
@@ -5,23 +5,60 @@ queuing, user preferences, and delivery management.
 
 import json
 import logging
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Tuple
 from django.utils import timezone
 from django.contrib.auth import get_user_model
-from django.core.cache import cache
 from django.db import transaction
-from django.db.models import Q
+from django.db.models import Count, Q
 from channels.layers import get_channel_layer
 from asgiref.sync import async_to_sync
 
 from .models import Notification, NotificationPreference, NotificationTemplate
-from .websocket_utils import websocket_notification_service
+from .cache_utils import cache_manager, CACHE_PREFIXES, CACHE_TIMEOUTS
+from . import notification_stream
+from .dashboard_counters import (
+    adjust_dashboard_counters, adjust_many_dashboard_counters, get_unread_notifications_count
+)
+from .websocket_utils import notification_message, websocket_notification_service
 from .middleware import websocket_connection_manager
 
 User = get_user_model()
 logger = logging.getLogger(__name__)
 
 
+def _load_active_notification_templates() -> Dict[Tuple[str, str], NotificationTemplate]:
+    """
+    Active templates by (template_type, delivery_channel), first in queryset order like .first()
+    """
+    queryset = NotificationTemplate.objects.filter(is_active=True)
+    if not queryset.ordered:
+        queryset = queryset.order_by('pk')
+    
+    templates = {}
+    for template in queryset:
+        templates.setdefault((template.template_type, template.delivery_channel), template)
+    return templates
+
+
+def get_active_notification_template(template_type: str, delivery_channel: str = 'websocket') -> Optional[NotificationTemplate]:
+    """
+    Active template for a notification type and channel.
+    
+    The whole template table is cached as one entry (near-cached per process)
+    and dropped by the NotificationTemplate save/delete signals.
+    """
+    try:
+        templates = cache_manager.get_or_set(
+            CACHE_PREFIXES['notification_templates'],
+            _load_active_notification_templates,
+            CACHE_TIMEOUTS['long']
+        )
+        return (templates or {}).get((template_type, delivery_channel))
+    except Exception as e:
+        logger.error(f"Error getting notification template: {e}")
+        return None
+
+
 class NotificationService:
     """
     Comprehensive service for managing notifications with real-time delivery,
@@ -102,11 +139,18 @@ class NotificationService:
         message: str,
         data: Optional[Dict] = None,
         priority: str = 'normal',
-        expires_at: Optional[timezone.datetime] = None
+        expires_at: Optional[timezone.datetime] = None,
+        job_post=None
     ) -> List[Notification]:
         """
         Create notifications for multiple recipients efficiently.
         
+        Preferences of all recipients are loaded in one query; recipients
+        without stored preferences get the defaults, without creating rows.
+        Only the insert runs in a transaction, and delivery happens after it
+        commits, in one batch (see _deliver_bulk). Callers fanning out to many
+        users pass chunks of recipients.
+        
         Args:
             recipient_ids: List of target user IDs
             notification_type: Type of notification
@@ -115,126 +159,122 @@ class NotificationService:
             data: Additional notification data
             priority: Notification priority
             expires_at: Expiration datetime
+            job_post: JobPost the notifications are about (optional)
         
         Returns:
             List of created Notification instances
         """
-        created_notifications = []
-        
         try:
-            with transaction.atomic():
-                # Get all recipients and their preferences
-                recipients = User.objects.filter(id__in=recipient_ids).select_related('notification_preferences')
-                
-                notifications_to_create = []
-                real_time_deliveries = []
-                
-                for recipient in recipients:
-                    # Check user preferences
-                    preferences = self.get_user_preferences(recipient)
-                    if not preferences.is_notification_enabled(notification_type):
-                        continue
-                    
-                    # Prepare notification for bulk creation
-                    notification_data = {
-                        'recipient': recipient,
-                        'notification_type': notification_type,
-                        'title': title,
-                        'message': message,
-                        'data': data or {},
-                        'priority': priority,
-                        'expires_at': expires_at
-                    }
-                    notifications_to_create.append(Notification(**notification_data))
-                    
-                    # Prepare real-time delivery info
-                    delivery_method = preferences.get_delivery_method(notification_type)
-                    real_time_deliveries.append({
-                        'recipient': recipient,
-                        'delivery_method': delivery_method,
-                        'notification_data': notification_data
-                    })
+            active_ids = list(
+                User.objects.filter(id__in=recipient_ids, is_active=True).values_list('id', flat=True)
+            )
+            preferences = {
+                preference.user_id: preference
+                for preference in NotificationPreference.objects.filter(user_id__in=active_ids)
+            }
+            
+            notifications_to_create = []
+            delivery_methods = []
+            for recipient_id in active_ids:
+                recipient_preferences = preferences.get(recipient_id) or NotificationPreference(user_id=recipient_id)
+                if not recipient_preferences.is_notification_enabled(notification_type):
+                    continue
                 
-                # Bulk create notifications
+                notifications_to_create.append(Notification(
+                    recipient_id=recipient_id,
+                    notification_type=notification_type,
+                    title=title,
+                    message=message,
+                    data=data or {},
+                    priority=priority,
+                    priority_rank=Notification.rank_for(priority),
+                    job_post=job_post,
+                    expires_at=expires_at
+                ))
+                delivery_methods.append(recipient_preferences.get_delivery_method(notification_type))
+            
+            with transaction.atomic():
                 created_notifications = Notification.objects.bulk_create(notifications_to_create)
-                
-                # Handle real-time deliveries
-                for i, delivery_info in enumerate(real_time_deliveries):
-                    if i < len(created_notifications):
-                        self._handle_notification_delivery(
-                            created_notifications[i],
-                            delivery_info['delivery_method'],
-                            send_real_time=True
-                        )
-                
-                logger.info(f"Bulk created {len(created_notifications)} notifications")
-                return created_notifications
+                # bulk_create sends no post_save, so count the unread notifications here
+                adjust_many_dashboard_counters(
+                    [notification.recipient_id for notification in created_notifications], notifications_unread=1
+                )
+            
+            self._deliver_bulk(created_notifications, delivery_methods)
+            
+            logger.info(f"Bulk created {len(created_notifications)} notifications")
+            return created_notifications
                 
         except Exception as e:
             logger.error(f"Error creating bulk notifications: {e}")
             return []
     
+    def job_posted_content(self, job_post) -> Tuple[str, str, Dict[str, Any]]:
+        """
+        Title, message and data of a job posted notification, shared by all its recipients.
+        
+        Args:
+            job_post: JobPost instance
+        
+        Returns:
+            (title, message, data) tuple
+        """
+        from .notification_fanout import job_skill_names
+        
+        profile = getattr(job_post.recruiter, 'recruiter_profile', None)
+        company_name = profile.company_name if profile else 'Company'
+        
+        # Get notification template
+        template = self.get_notification_template('job_posted', 'websocket')
+        
+        # Prepare context for template rendering
+        context = {
+            'job_title': job_post.title,
+            'company_name': company_name,
+            'location': job_post.location or 'Not specified',
+            'job_type': job_post.get_job_type_display(),
+            'skills_required': job_post.skills_required or 'Not specified',
+            'salary_range': self._format_salary_range(job_post.salary_min, job_post.salary_max)
+        }
+        
+        # Render title and message
+        title = template.render_title(context) if template else f"New Job: {job_post.title}"
+        message = template.render_message(context) if template else f"New job posted: {job_post.title} at {company_name}"
+        
+        data = {
+            'job_id': str(job_post.id),
+            'job_title': job_post.title,
+            'company': company_name,
+            'location': job_post.location,
+            'job_type': job_post.job_type,
+            'salary_min': job_post.salary_min,
+            'salary_max': job_post.salary_max,
+            'skills_required': job_skill_names(job_post)
+        }
+        return title, message, data
+    
     def send_job_posted_notification(self, job_post, target_user_ids: Optional[List[str]] = None):
         """
-        Send job posted notification to relevant users.
+        Send job posted notification to relevant users, one chunk at a time.
+        
+        Runs in the calling thread; the post_save signal queues
+        fan_out_job_posted_notifications_task instead.
         
         Args:
             job_post: JobPost instance
-            target_user_ids: Specific user IDs to notify (optional)
+            target_user_ids: Specific user IDs to notify (optional, default: relevant job seekers)
         """
+        from .notification_fanout import (
+            CHUNK_SIZE, create_job_posted_notifications, fan_out_job_posted_notifications
+        )
+        
         try:
-            # Get notification template
-            template = self.get_notification_template('job_posted', 'websocket')
-            
-            # Prepare context for template rendering
-            context = {
-                'job_title': job_post.title,
-                'company_name': job_post.company_name or 'Company',
-                'location': job_post.location,
-                'job_type': job_post.job_type,
-                'salary_range': self._format_salary_range(job_post.salary_min, job_post.salary_max)
-            }
-            
-            # Render title and message
-            title = template.render_title(context) if template else f"New Job: {job_post.title}"
-            message = template.render_message(context) if template else f"New job posted: {job_post.title} at {context['company_name']}"
-            
-            # Prepare notification data
-            notification_data = {
-                'job_id': str(job_post.id),
-                'job_title': job_post.title,
-                'company': context['company_name'],
-                'location': job_post.location,
-                'job_type': job_post.job_type,
-                'salary_min': job_post.salary_min,
-                'salary_max': job_post.salary_max,
-                'skills_required': job_post.skills_required
-            }
-            
             if target_user_ids:
-                # Send to specific users
-                self.create_bulk_notifications(
-                    recipient_ids=target_user_ids,
-                    notification_type='job_posted',
-                    title=title,
-                    message=message,
-                    data=notification_data,
-                    priority='normal'
-                )
+                for start in range(0, len(target_user_ids), CHUNK_SIZE):
+                    create_job_posted_notifications(job_post, target_user_ids[start:start + CHUNK_SIZE])
             else:
-                # Send to all job seekers
-                job_seeker_ids = list(
-                    User.objects.filter(user_type='job_seeker', is_active=True)
-                    .values_list('id', flat=True)
-                )
-                
-                self.create_bulk_notifications(
-                    recipient_ids=job_seeker_ids,
-                    notification_type='job_posted',
-                    title=title,
-                    message=message,
-                    data=notification_data,
-                    priority='normal'
+                fan_out_job_posted_notifications(
+                    job_post, dispatch=lambda recipient_ids: create_job_posted_notifications(job_post, recipient_ids)
                 )
             
             logger.info(f"Job posted notifications sent for job {job_post.id}")
@@ -429,29 +469,57 @@ class NotificationService:
             True if successful, False otherwise
         """
         try:
-            notification = Notification.objects.get(
-                id=notification_id,
-                recipient_id=user_id
-            )
-            
-            if not notification.is_read:
-                notification.mark_as_read()
+            read_at = timezone.now()
+            # Conditional update: of concurrent requests only one flips the row and decrements
+            updated = Notification.objects.filter(
+                id=notification_id, recipient_id=user_id, is_read=False
+            ).update(is_read=True, read_at=read_at)
+            
+            if updated:
+                adjust_dashboard_counters(user_id, notifications_unread=-1)
                 
                 # Send read acknowledgment via WebSocket
-                self._send_read_acknowledgment(notification)
+                self._send_read_acknowledgment(user_id, notification_id, read_at)
                 
                 logger.info(f"Notification {notification_id} marked as read")
                 return True
             
+            if not Notification.objects.filter(id=notification_id, recipient_id=user_id).exists():
+                logger.warning(f"Notification not found or access denied: {notification_id}")
+                return False
             return True
             
-        except Notification.DoesNotExist:
-            logger.warning(f"Notification not found or access denied: {notification_id}")
-            return False
         except Exception as e:
             logger.error(f"Error marking notification as read: {e}")
             return False
     
+    def mark_notification_as_unread(self, notification_id: str, user_id: str) -> bool:
+        """
+        Mark a read notification as unread again.
+        
+        Args:
+            notification_id: Notification ID
+            user_id: User ID (for security check)
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            updated = Notification.objects.filter(
+                id=notification_id, recipient_id=user_id, is_read=True
+            ).update(is_read=False, read_at=None)
+            
+            if updated:
+                adjust_dashboard_counters(user_id, notifications_unread=1)
+                logger.info(f"Notification {notification_id} marked as unread")
+                return True
+            
+            return Notification.objects.filter(id=notification_id, recipient_id=user_id).exists()
+            
+        except Exception as e:
+            logger.error(f"Error marking notification as unread: {e}")
+            return False
+    
     def mark_all_notifications_read(self, user_id: str, notification_type: Optional[str] = None) -> int:
         """
         Mark all notifications as read for a user.
@@ -476,6 +544,7 @@ class NotificationService:
             
             # Send bulk read acknowledgment
             if updated_count > 0:
+                adjust_dashboard_counters(user_id, notifications_unread=-updated_count)
                 self._send_bulk_read_acknowledgment(user_id, notification_type, updated_count)
             
             logger.info(f"Marked {updated_count} notifications as read for user {user_id}")
@@ -515,26 +584,21 @@ class NotificationService:
             if is_read is not None:
                 query &= Q(is_read=is_read)
             
-            # Get total count
-            total_count = Notification.objects.filter(query).count()
-            
-            # Get notifications with pagination (order by priority then creation date)
-            # Define priority order: urgent=4, high=3, normal=2, low=1
-            priority_order = {
-                'urgent': 4,
-                'high': 3,
-                'normal': 2,
-                'low': 1
-            }
-            
-            notifications = Notification.objects.filter(query).order_by('-created_at')[offset:offset + limit]
-            
-            # Sort by priority in Python since we can't do it easily in the database
-            notifications = sorted(
-                notifications, 
-                key=lambda n: (priority_order.get(n.priority, 2), n.created_at), 
-                reverse=True
+            # Highest priority first, newest first within a priority, ordered
+            # by the (recipient, is_read, priority_rank, created_at) index
+            notifications = list(
+                Notification.objects.filter(query).order_by('-priority_rank', '-created_at', '-id')[offset:offset + limit + 1]
             )
+            has_more = len(notifications) > limit
+            notifications = notifications[:limit]
+            
+            unread_count = get_unread_notifications_count(user_id)
+            if is_read is False and not notification_type:
+                total_count = unread_count
+            elif offset == 0 and not has_more:
+                total_count = len(notifications)
+            else:
+                total_count = Notification.objects.filter(query).count()
             
             # Serialize notifications
             notification_data = []
@@ -558,10 +622,8 @@ class NotificationService:
             return {
                 'notifications': notification_data,
                 'total_count': total_count,
-                'unread_count': Notification.objects.filter(
-                    recipient_id=user_id, is_read=False
-                ).count(),
-                'has_more': (offset + limit) < total_count,
+                'unread_count': unread_count,
+                'has_more': has_more,
                 'limit': limit,
                 'offset': offset
             }
@@ -588,10 +650,7 @@ class NotificationService:
             Number of unread notifications
         """
         try:
-            return Notification.objects.filter(
-                recipient_id=user_id,
-                is_read=False
-            ).count()
+            return get_unread_notifications_count(user_id)
         except Exception as e:
             logger.error(f"Error getting unread count: {e}")
             return 0
@@ -605,9 +664,15 @@ class NotificationService:
         """
         try:
             now = timezone.now()
-            expired_count = Notification.objects.filter(
-                expires_at__lt=now
-            ).delete()[0]
+            expired = Notification.objects.filter(expires_at__lt=now)
+            
+            with transaction.atomic():
+                unread_by_recipient = expired.filter(is_read=False).values('recipient_id').annotate(
+                    total=Count('id')
+                ).order_by().values_list('recipient_id', 'total')
+                for recipient_id, unread in unread_by_recipient:
+                    adjust_dashboard_counters(recipient_id, create_missing=False, notifications_unread=-unread)
+                expired_count = expired.delete()[0]
             
             if expired_count > 0:
                 logger.info(f"Cleaned up {expired_count} expired notifications")
@@ -625,74 +690,53 @@ class NotificationService:
         Args:
             notification: Notification instance
         """
+        self.queue_notifications_for_offline_users([notification])
+    
+    def queue_notifications_for_offline_users(self, notifications: List[Notification]):
+        """
+        Append notifications to their recipients' offline streams in one pipeline.
+        
+        Args:
+            notifications: Notification instances
+        """
         try:
-            # Use Redis to queue notifications for offline users
-            cache_key = f"offline_notifications:{notification.recipient.id}"
-            
-            # Get existing queued notifications
-            queued_notifications = cache.get(cache_key, [])
-            
-            # Add new notification to queue
-            notification_data = {
-                'id': str(notification.id),
-                'notification_type': notification.notification_type,
-                'title': notification.title,
-                'message': notification.message,
-                'data': notification.data,
-                'priority': notification.priority,
-                'created_at': notification.created_at.isoformat(),
-                'queued_at': timezone.now().isoformat()
-            }
-            
-            queued_notifications.append(notification_data)
-            
-            # Keep only the latest 100 notifications per user
-            if len(queued_notifications) > 100:
-                queued_notifications = queued_notifications[-100:]
-            
-            # Store back in cache with 7 days expiration
-            cache.set(cache_key, queued_notifications, 7 * 24 * 3600)
-            
-            logger.info(f"Notification queued for offline user {notification.recipient.id}")
+            queued = notification_stream.append_notifications(notifications)
+            if queued:
+                logger.info(f"Queued {len(queued)} notifications for offline users")
             
         except Exception as e:
             logger.error(f"Error queuing notification for offline user: {e}")
     
-    def deliver_queued_notifications(self, user_id: str):
+    def deliver_queued_notifications(self, user_id: str, cursor: Optional[str] = None) -> int:
         """
-        Deliver queued notifications when user comes online.
+        Deliver queued notifications after a cursor (or after the last ones
+        delivered) to the user's connections, as one batch.
         
         Args:
             user_id: User ID
+            cursor: Stream entry id the client has seen (optional)
+        
+        Returns:
+            Number of notifications delivered
         """
         try:
-            cache_key = f"offline_notifications:{user_id}"
-            queued_notifications = cache.get(cache_key, [])
+            entries, last_cursor = notification_stream.read_after(user_id, cursor)
             
-            if not queued_notifications:
-                return
+            if not entries:
+                return 0
             
-            # Send queued notifications via WebSocket
-            for notification_data in queued_notifications:
-                websocket_notification_service.send_notification_to_user(
-                    user_id=user_id,
-                    notification_type=notification_data['notification_type'],
-                    message=notification_data['message'],
-                    data={
-                        **notification_data['data'],
-                        'queued': True,
-                        'queued_at': notification_data['queued_at']
-                    },
-                    priority=notification_data['priority']
-                )
-            
-            # Clear the queue
-            cache.delete(cache_key)
+            async_to_sync(self.channel_layer.group_send)(
+                f"user_{user_id}",
+                notification_stream.replay_batch(entries, last_cursor)
+            )
+            notification_stream.mark_delivered(user_id, last_cursor)
             
-            logger.info(f"Delivered {len(queued_notifications)} queued notifications to user {user_id}")
+            logger.info(f"Delivered {len(entries)} queued notifications to user {user_id}")
+            return len(entries)
             
         except Exception as e:
             logger.error(f"Error delivering queued notifications: {e}")
+            return 0
     
     def get_user_preferences(self, user: User) -> NotificationPreference:
         """
@@ -739,15 +783,7 @@ class NotificationService:
         Returns:
             NotificationTemplate instance or None
         """
-        try:
-            return NotificationTemplate.objects.filter(
-                notification_type=notification_type,
-                delivery_method=delivery_method,
-                is_active=True
-            ).first()
-        except Exception as e:
-            logger.error(f"Error getting notification template: {e}")
-            return None
+        return get_active_notification_template(notification_type, delivery_method)
     
     def _handle_notification_delivery(self, notification: Notification, delivery_method: str, send_real_time: bool):
         """
@@ -759,7 +795,7 @@ class NotificationService:
             send_real_time: Whether to send real-time notification
         """
         try:
-            user_id = str(notification.recipient.id)
+            user_id = str(notification.recipient_id)
             
             # Check if user is online
             is_online = websocket_connection_manager.is_user_online(user_id)
@@ -788,6 +824,55 @@ class NotificationService:
         except Exception as e:
             logger.error(f"Error handling notification delivery: {e}")
     
+    def _deliver_bulk(self, notifications: List[Notification], delivery_methods: List[str]):
+        """
+        Deliver freshly created notifications in batches.
+        
+        Presence of every recipient is checked in one Redis round trip,
+        WebSocket notifications to online users go out in one channel-layer
+        batch and are marked sent with one UPDATE; offline recipients are
+        queued instead of being sent to.
+        
+        Args:
+            notifications: Notification instances
+            delivery_methods: Delivery method of each notification
+        """
+        try:
+            online_ids = websocket_connection_manager.online_user_ids(
+                {notification.recipient_id for notification in notifications}
+            )
+            
+            real_time = []
+            offline = []
+            for notification, delivery_method in zip(notifications, delivery_methods):
+                user_id = str(notification.recipient_id)
+                if user_id not in online_ids:
+                    offline.append(notification)
+                elif delivery_method in ['websocket', 'both']:
+                    real_time.append(notification)
+                
+                if delivery_method in ['email', 'both']:
+                    self._send_email_notification(notification)
+            
+            self.queue_notifications_for_offline_users(offline)
+            sent = websocket_notification_service.send_notifications_to_users([
+                (str(notification.recipient_id), notification_message(
+                    notification.notification_type, notification.message, notification.data, notification.priority
+                ))
+                for notification in real_time
+            ])
+            sent_ids = [notification.id for notification, ok in zip(real_time, sent) if ok]
+            if sent_ids:
+                sent_at = timezone.now()
+                Notification.objects.filter(id__in=sent_ids).update(is_sent=True, sent_at=sent_at)
+                for notification, ok in zip(real_time, sent):
+                    if ok:
+                        notification.is_sent = True
+                        notification.sent_at = sent_at
+            
+        except Exception as e:
+            logger.error(f"Error delivering bulk notifications: {e}")
+    
     def _send_email_notification(self, notification: Notification):
         """
         Send email notification (placeholder for email implementation).
@@ -799,23 +884,25 @@ class NotificationService:
         # For now, just log that email would be sent
         logger.info(f"Email notification would be sent for {notification.id}")
     
-    def _send_read_acknowledgment(self, notification: Notification):
+    def _send_read_acknowledgment(self, user_id: str, notification_id: str, read_at):
         """
         Send read acknowledgment via WebSocket.
         
         Args:
-            notification: Notification instance
+            user_id: Recipient user ID
+            notification_id: Notification ID
+            read_at: When the notification was marked as read
         """
         try:
-            user_id = str(notification.recipient.id)
+            user_id = str(user_id)
             
             if websocket_connection_manager.is_user_online(user_id):
                 async_to_sync(self.channel_layer.group_send)(
                     f"user_{user_id}",
                     {
                         'type': 'notification_read_acknowledgment',
-                        'notification_id': str(notification.id),
-                        'read_at': notification.read_at.isoformat() if notification.read_at else timezone.now().isoformat(),
+                        'notification_id': str(notification_id),
+                        'read_at': read_at.isoformat(),
                         'timestamp': timezone.now().isoformat()
                     }
                 )
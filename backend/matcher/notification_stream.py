@@ -0,0 +1,173 @@
+"""
+Offline notification streams for HireWise backend.
+
+Notifications for users who are not connected are appended to a per-user
+Redis stream. XADD appends and trims to NOTIFICATION_STREAM['MAX_LENGTH']
+entries in one atomic command, so concurrent producers never overwrite each
+other. Stream entry ids are the replay cursors: NotificationConsumer sends a
+reconnecting client everything after the cursor it passes (?cursor=<id>), or
+after the last entry delivered to that user, as one batch, and remembers the
+newest id it sent. Replay reads Redis only, never the database.
+"""
+
+import logging
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from . import fast_json
+
+logger = logging.getLogger(__name__)
+
+NOTIFICATION_STREAM_CONFIG = getattr(settings, 'NOTIFICATION_STREAM', {})
+
+MAX_LENGTH = NOTIFICATION_STREAM_CONFIG.get('MAX_LENGTH', 100)
+# Streams and delivered cursors of users who never come back expire
+TTL = NOTIFICATION_STREAM_CONFIG.get('TTL', 7 * 24 * 3600)
+REPLAY_LIMIT = NOTIFICATION_STREAM_CONFIG.get('REPLAY_LIMIT', 500)
+
+STREAM_KEY_PREFIX = 'notifications:offline'
+CURSOR_KEY_PREFIX = 'notifications:offline_cursor'
+START_CURSOR = '0-0'
+
+_CURSOR_PATTERN = re.compile(r'^\d+-\d+$')
+
+
+def stream_key(user_id) -> str:
+    return cache.make_key(f"{STREAM_KEY_PREFIX}:{user_id}")
+
+
+def cursor_key(user_id) -> str:
+    return cache.make_key(f"{CURSOR_KEY_PREFIX}:{user_id}")
+
+
+def is_valid_cursor(cursor: Any) -> bool:
+    return isinstance(cursor, str) and bool(_CURSOR_PATTERN.match(cursor))
+
+
+def cursor_position(cursor: Optional[str]) -> Tuple[int, int]:
+    """
+    Sortable form of a cursor; invalid or missing cursors sort first
+    """
+    if not is_valid_cursor(cursor):
+        return (0, 0)
+    milliseconds, sequence = cursor.split('-')
+    return (int(milliseconds), int(sequence))
+
+
+def _text(value) -> str:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def notification_entry(notification) -> Dict[str, Any]:
+    """
+    What a reconnecting client receives for a queued notification
+    """
+    return {
+        'id': str(notification.id),
+        'notification_type': notification.notification_type,
+        'title': notification.title,
+        'message': notification.message,
+        'data': notification.data,
+        'priority': notification.priority,
+        'created_at': notification.created_at.isoformat(),
+        'queued_at': timezone.now().isoformat()
+    }
+
+
+def append_notifications(notifications: List[Any]) -> List[str]:
+    """
+    Append notifications to their recipients' streams in one pipeline.
+
+    Returns the entry id of each notification, or an empty list when Redis
+    is unavailable.
+    """
+    from .cache_utils import get_redis_client
+
+    if not notifications:
+        return []
+    client = get_redis_client()
+    if client is None:
+        logger.warning(f"No Redis client; {len(notifications)} offline notifications not queued")
+        return []
+
+    try:
+        pipe = client.pipeline(transaction=False)
+        for notification in notifications:
+            key = stream_key(notification.recipient_id)
+            pipe.xadd(
+                key, {'payload': fast_json.dumps(notification_entry(notification))},
+                maxlen=MAX_LENGTH, approximate=False
+            )
+            pipe.expire(key, TTL)
+        # Every xadd is followed by its expire
+        return [_text(entry_id) for entry_id in pipe.execute()[::2]]
+    except Exception as e:
+        logger.error(f"Error appending offline notifications: {e}")
+        return []
+
+
+def read_after(user_id, cursor: Optional[str] = None, limit: int = REPLAY_LIMIT) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Queued notifications of a user after a cursor, oldest first.
+
+    Without a valid cursor, reading starts after the last entry delivered to
+    the user. Returns the entries, each with its 'cursor', and the cursor of
+    the newest one (the given cursor when there is nothing new).
+    """
+    from .cache_utils import get_redis_client
+
+    client = get_redis_client()
+    if client is None:
+        return [], cursor
+    try:
+        if not is_valid_cursor(cursor):
+            cursor = _text(client.get(cursor_key(user_id))) or START_CURSOR
+        # XREAD returns entries strictly after the given id
+        response = client.xread({stream_key(user_id): cursor}, count=limit)
+    except Exception as e:
+        logger.error(f"Error reading offline notifications for user {user_id}: {e}")
+        return [], cursor
+
+    entries = []
+    for _, stream_entries in response or []:
+        for entry_id, fields in stream_entries:
+            payload = fields.get(b'payload', fields.get('payload'))
+            try:
+                entry = fast_json.loads(payload)
+            except (TypeError, fast_json.JSONDecodeError):
+                logger.error(f"Skipping malformed offline notification {_text(entry_id)} for user {user_id}")
+                continue
+            entry['cursor'] = _text(entry_id)
+            entries.append(entry)
+    return entries, (entries[-1]['cursor'] if entries else cursor)
+
+
+def mark_delivered(user_id, cursor: Optional[str]) -> None:
+    """
+    Remember the newest entry delivered to a user, for clients that reconnect without a cursor
+    """
+    from .cache_utils import get_redis_client
+
+    client = get_redis_client()
+    if client is None or not is_valid_cursor(cursor) or cursor == START_CURSOR:
+        return
+    try:
+        client.set(cursor_key(user_id), cursor, ex=TTL)
+    except Exception as e:
+        logger.error(f"Error storing offline notification cursor for user {user_id}: {e}")
+
+
+def replay_batch(entries: List[Dict[str, Any]], cursor: Optional[str]) -> Dict[str, Any]:
+    """
+    Channel-layer event carrying replayed notifications, handled by NotificationConsumer.queued_notifications
+    """
+    return {
+        'type': 'queued_notifications',
+        'notifications': entries,
+        'cursor': cursor,
+        'timestamp': timezone.now().isoformat()
+    }
@@ -18,6 +18,8 @@ from rest_framework.response import Response
 from rest_framework.request import Request
 
 from .models import JobPost, Application, User, Resume, Skill
+from .geo import location_filter_q
+from .job_view_events import record_job_view
 from .serializers import (
     JobPostSerializer, JobPostListSerializer, ApplicationSerializer,
     UserSerializer, SkillSerializer
@@ -32,7 +34,7 @@ from .api_cache import (
 from .file_optimization import FileUploadManager, process_file_upload
 from .pagination_optimization import (
     OptimizedPageNumberPagination, OptimizedCursorPagination,
-    InfiniteScrollPagination, PaginationConfig
+    InfiniteScrollPagination, InvalidCursor, PaginationConfig
 )
 
 logger = logging.getLogger(__name__)
@@ -98,8 +100,8 @@ class OptimizedJobPostViewSet(viewsets.ModelViewSet):
         """
         instance = self.get_object()
         
-        # Increment view count asynchronously
-        instance.increment_view_count()
+        # Buffer the view; counts are applied by flush_job_view_events_task
+        record_job_view(instance, request)
         
         serializer = self.get_serializer(instance)
         return Response(serializer.data)
@@ -200,7 +202,7 @@ class OptimizedJobPostViewSet(viewsets.ModelViewSet):
         """
         Infinite scroll pagination for mobile apps.
         """
-        last_id = request.query_params.get('last_id')
+        cursor = request.query_params.get('cursor')
         page_size = int(request.query_params.get('page_size', 20))
         
         queryset = self.get_queryset()
@@ -212,9 +214,10 @@ class OptimizedJobPostViewSet(viewsets.ModelViewSet):
         
         # Use infinite scroll pagination
         paginator = InfiniteScrollPagination(page_size=page_size)
-        result = paginator.paginate_for_infinite_scroll(
-            queryset, last_id=last_id
-        )
+        try:
+            result = paginator.paginate_for_infinite_scroll(queryset, cursor=cursor)
+        except InvalidCursor as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
         
         # Serialize items
         serializer = JobPostListSerializer(result['items'], many=True)
@@ -222,7 +225,7 @@ class OptimizedJobPostViewSet(viewsets.ModelViewSet):
         return Response({
             'items': serializer.data,
             'has_more': result['has_more'],
-            'last_id': result['last_id'],
+            'next_cursor': result['next_cursor'],
             'count': result['count'],
         })
     
@@ -287,7 +290,7 @@ class OptimizedJobPostViewSet(viewsets.ModelViewSet):
             )
         
         if 'location' in filters:
-            queryset = queryset.filter(location__icontains=filters['location'])
+            queryset = queryset.filter(location_filter_q(filters['location'], filters.get('radius_km')))
         
         if 'job_type' in filters:
             queryset = queryset.filter(job_type=filters['job_type'])
@@ -498,10 +501,17 @@ class PerformanceMonitoringView(viewsets.GenericViewSet):
     def cache_stats(self, request):
         """
         Get cache performance statistics.
+        
+        `prefixes` has hits, misses, sets, bytes and latency per cache prefix
+        across all workers; pass ?scope=local for this process only.
         """
         from .cache_utils import CacheMonitor
         
+        scope = 'local' if request.query_params.get('scope') == 'local' else 'cluster'
         stats = CacheMonitor.get_cache_stats()
+        stats['prefixes'] = CacheMonitor.get_prefix_stats(scope)
+        stats['near_cache'] = CacheMonitor.get_near_cache_stats()
+        stats['value_sizes'] = CacheMonitor.get_value_size_stats()
         return Response(stats)
     
     @action(detail=False, methods=['get'])
@@ -522,18 +532,15 @@ class PerformanceMonitoringView(viewsets.GenericViewSet):
         """
         Manually trigger cache warm-up.
         """
-        from .cache_utils import warm_cache
-        from .api_cache import APICacheWarmer
+        from .tasks import warm_caches_task
         
         try:
-            warm_cache()
-            APICacheWarmer.warm_job_list_cache()
-            APICacheWarmer.warm_skills_cache()
+            task = warm_caches_task.delay()
             
-            return Response({'message': 'Cache warm-up completed successfully'})
+            return Response({'message': 'Cache warm-up started', 'task_id': task.id})
         except Exception as e:
             return Response(
-                {'error': f'Cache warm-up failed: {str(e)}'}, 
+                {'error': f'Could not start cache warm-up: {str(e)}'}, 
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
     
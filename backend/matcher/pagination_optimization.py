@@ -3,26 +3,43 @@ Pagination and lazy loading optimization utilities for HireWise backend.
 Provides efficient pagination strategies and lazy loading mechanisms.
 """
 
+import json
 import logging
 from typing import Dict, List, Optional, Any, Type, Union
 from datetime import datetime, timedelta
 from dataclasses import dataclass
 
+from django.core import signing
+from django.core.exceptions import EmptyResultSet
 from django.core.paginator import Paginator, Page, EmptyPage, PageNotAnInteger
+from django.db import connections
 from django.db.models import QuerySet, Model, Q, Count, Prefetch
 from django.db.models.query import QuerySet as QuerySetType
 from django.http import Http404
 from django.utils import timezone
 from django.conf import settings
 
-from rest_framework.pagination import PageNumberPagination, CursorPagination
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination, CursorPagination
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 from rest_framework import status
 
 from .cache_utils import cache_manager, CACHE_TIMEOUTS
 
 logger = logging.getLogger(__name__)
 
+PAGINATION_COUNT_CONFIG = getattr(settings, 'PAGINATION_COUNT', {})
+
+# Planner estimates at or above this many rows are reported instead of an exact count
+COUNT_ESTIMATE_THRESHOLD = PAGINATION_COUNT_CONFIG.get('ESTIMATE_THRESHOLD', 10000)
+COUNT_CACHE_TIMEOUT = PAGINATION_COUNT_CONFIG.get('CACHE_TIMEOUT', 60)
+COUNT_CACHE_PREFIX = 'pagination:count'
+
+# Feeds page newest first on their creation timestamp, with the primary key breaking ties
+DEFAULT_KEYSET_ORDERING = ('-created_at', '-pk')
+KEYSET_CURSOR_SALT = 'matcher.pagination.keyset'
+
 
 @dataclass
 class PaginationConfig:
@@ -64,27 +81,39 @@ class OptimizedPageNumberPagination(PageNumberPagination):
         if not page_size:
             return None
         
+        self.request = request
+        page_number = request.query_params.get(self.page_query_param, 1)
+        
         # Generate cache key for pagination
         cache_key = self._generate_pagination_cache_key(queryset, request, page_size)
         
-        # Try to get from cache
-        if self.config.enable_caching:
-            cached_result = cache_manager.get('pagination', cache_key)
-            if cached_result:
-                return cached_result['page_data']
-        
         # Optimize queryset before pagination
         optimized_queryset = self._optimize_queryset(queryset)
-        
         paginator = self._get_optimized_paginator(optimized_queryset, page_size)
-        page_number = request.query_params.get(self.page_query_param, 1)
+        
+        # Try to get from cache
+        if self.config.enable_caching:
+            cached_result = cache_manager.get('pagination', cache_key, page_number)
+            if cached_result:
+                page_info = cached_result['page_info']
+                paginator._count = page_info['count']
+                paginator.count_is_estimated = page_info.get('count_is_estimated', False)
+                if paginator.count_is_estimated:
+                    self.page = EstimatedCountPage(
+                        cached_result['page_data'], page_info['current_page'], paginator,
+                        has_next=page_info.get('has_next', False)
+                    )
+                else:
+                    self.page = Page(cached_result['page_data'], page_info['current_page'], paginator)
+                return list(self.page)
         
         try:
             page = paginator.page(page_number)
         except PageNotAnInteger:
             page = paginator.page(1)
         except EmptyPage:
-            page = paginator.page(paginator.num_pages)
+            page = self._out_of_range_page(paginator, page_number)
+        self.page = page
         
         # Cache the result
         if self.config.enable_caching:
@@ -92,18 +121,36 @@ class OptimizedPageNumberPagination(PageNumberPagination):
                 'page_data': list(page.object_list),
                 'page_info': {
                     'count': paginator.count,
+                    'count_is_estimated': getattr(paginator, 'count_is_estimated', False),
                     'num_pages': paginator.num_pages,
                     'current_page': page.number,
+                    'has_next': page.has_next(),
                 }
             }
             cache_manager.set(
                 'pagination', 
                 cache_data, 
                 self.config.cache_timeout,
-                cache_key
+                cache_key,
+                page_number
             )
         
-        return page
+        return list(page)
+    
+    def _out_of_range_page(self, paginator, page_number):
+        """
+        Page served for a number outside the results.
+        
+        Exact counts fall back to the last page. An estimated count can
+        overshoot the real end, so pages past it are empty instead.
+        """
+        if not getattr(paginator, 'count_is_estimated', False):
+            return paginator.page(paginator.num_pages)
+        
+        number = int(page_number)  # page() already rejected non-integers
+        if number < 1:
+            return paginator.page(1)
+        return EstimatedCountPage([], number, paginator, has_next=False)
     
     def get_paginated_response(self, data):
         """
@@ -111,6 +158,7 @@ class OptimizedPageNumberPagination(PageNumberPagination):
         """
         return Response({
             'count': self.page.paginator.count,
+            'count_is_estimated': getattr(self.page.paginator, 'count_is_estimated', False),
             'next': self.get_next_link(),
             'previous': self.get_previous_link(),
             'page_size': self.get_page_size(self.request),
@@ -205,15 +253,268 @@ class OptimizedCursorPagination(CursorPagination):
         return queryset
 
 
+class InvalidCursor(ValueError):
+    """
+    A cursor that was tampered with or issued for a different ordering
+    """
+
+
+@dataclass
+class KeysetPage:
+    """
+    One page of a keyset-paginated queryset and the cursors around it.
+    """
+    items: List[Any]
+    has_next: bool
+    has_previous: bool
+    next_cursor: Optional[str]
+    previous_cursor: Optional[str]
+
+
+class KeysetPaginator:
+    """
+    Composite keyset (seek) pagination.
+    
+    Pages continue strictly after the ordering values of the last item seen,
+    e.g. `created_at < t OR (created_at = t AND id < i)` for the default
+    ('-created_at', '-pk'), so each page is an index range scan no matter how
+    deep the client has scrolled, and rows inserted meanwhile are neither
+    skipped nor repeated. The last field must be unique. Cursors are signed,
+    so clients cannot forge positions or reuse them with another ordering.
+    """
+    
+    def __init__(self, ordering=DEFAULT_KEYSET_ORDERING, page_size: int = 20):
+        self.ordering = tuple(ordering)
+        self.fields = [field.lstrip('-') for field in self.ordering]
+        self.page_size = page_size
+    
+    def encode_cursor(self, item: Any, reverse: bool = False) -> str:
+        """
+        Opaque cursor for the position of item; reverse cursors page backwards from it
+        """
+        values = []
+        for field in self.fields:
+            value = item[field] if isinstance(item, dict) else getattr(item, field)
+            # Lookups parse ISO datetimes and stringified keys back into field values
+            values.append(value.isoformat() if hasattr(value, 'isoformat') else str(value))
+        return signing.dumps(
+            {'o': list(self.ordering), 'v': values, 'r': reverse},
+            salt=KEYSET_CURSOR_SALT, compress=True
+        )
+    
+    def decode_cursor(self, cursor: str):
+        """
+        (values, reverse) of a cursor issued by encode_cursor() for this ordering
+        """
+        try:
+            payload = signing.loads(cursor, salt=KEYSET_CURSOR_SALT)
+        except signing.BadSignature:
+            raise InvalidCursor('Invalid cursor')
+        if payload.get('o') != list(self.ordering) or len(payload.get('v', [])) != len(self.fields):
+            raise InvalidCursor('Invalid cursor')
+        return payload['v'], bool(payload.get('r'))
+    
+    def _seek_filter(self, values: List[str], reverse: bool) -> Q:
+        """
+        Rows strictly after values in the ordering (before them when reverse)
+        """
+        condition = Q()
+        for index, ordering_field in enumerate(self.ordering):
+            descending = ordering_field.startswith('-')
+            lookup = 'lt' if descending != reverse else 'gt'
+            clause = Q(**dict(zip(self.fields[:index], values[:index])))
+            clause &= Q(**{f'{self.fields[index]}__{lookup}': values[index]})
+            condition |= clause
+        return condition
+    
+    def orders_by_keyset(self, queryset: QuerySet) -> bool:
+        """
+        Whether the queryset is (or by default would be) ordered by the keyset's leading field
+        """
+        current = tuple(queryset.query.order_by) or tuple(queryset.model._meta.ordering)
+        return not current or current[0] == self.ordering[0]
+    
+    def paginate(self, queryset: QuerySet, cursor: Optional[str] = None) -> KeysetPage:
+        """
+        The page starting at cursor (the first page when None).
+        
+        Raises InvalidCursor for cursors this paginator did not issue.
+        """
+        reverse = False
+        if cursor:
+            values, reverse = self.decode_cursor(cursor)
+            queryset = queryset.filter(self._seek_filter(values, reverse))
+        
+        ordering = self.ordering
+        if reverse:
+            ordering = tuple(
+                field[1:] if field.startswith('-') else f'-{field}' for field in ordering
+            )
+        
+        # One extra row tells whether there is another page in this direction
+        items = list(queryset.order_by(*ordering)[:self.page_size + 1])
+        has_more = len(items) > self.page_size
+        items = items[:self.page_size]
+        if reverse:
+            items.reverse()
+        
+        has_next = bool(cursor) if reverse else has_more
+        has_previous = has_more if reverse else bool(cursor)
+        return KeysetPage(
+            items=items,
+            has_next=has_next and bool(items),
+            has_previous=has_previous and bool(items),
+            next_cursor=self.encode_cursor(items[-1]) if has_next and items else None,
+            previous_cursor=self.encode_cursor(items[0], reverse=True) if has_previous and items else None,
+        )
+
+
+class KeysetCursorPagination(BasePagination):
+    """
+    Keyset cursor pagination for list endpoints.
+    
+    Views choose the keyset with a `keyset_ordering` attribute (default
+    ('-created_at', '-pk')), which their default ordering must lead with and
+    their indexes must cover. Requests that pass `?page=` or sort by another
+    field fall back to page number pagination, so existing clients keep
+    working.
+    
+    Responses keep a `count`. Views can supply it from a maintained counter
+    with `get_keyset_count(queryset)`; otherwise it comes from
+    OptimizedPaginator, which caches exact counts and estimates large ones.
+    """
+    page_size = 20
+    max_page_size = 100
+    page_size_query_param = 'page_size'
+    cursor_query_param = 'cursor'
+    page_query_param = 'page'
+    fallback_class = PageNumberPagination
+    invalid_cursor_message = 'Invalid cursor'
+    
+    def __init__(self):
+        self.fallback = None
+        self.keyset_page = None
+        self.count = None
+        self.count_is_estimated = False
+    
+    def get_page_size(self, request) -> int:
+        try:
+            page_size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            return self.page_size
+        return min(page_size, self.max_page_size) if page_size > 0 else self.page_size
+    
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        paginator = KeysetPaginator(
+            getattr(view, 'keyset_ordering', DEFAULT_KEYSET_ORDERING), self.get_page_size(request)
+        )
+        
+        if self.page_query_param in request.query_params or not paginator.orders_by_keyset(queryset):
+            self.fallback = self.fallback_class()
+            return self.fallback.paginate_queryset(queryset, request, view)
+        
+        try:
+            self.keyset_page = paginator.paginate(queryset, request.query_params.get(self.cursor_query_param))
+        except InvalidCursor:
+            raise NotFound(self.invalid_cursor_message)
+        self.count, self.count_is_estimated = self.get_count(queryset, view)
+        return self.keyset_page.items
+    
+    def get_count(self, queryset, view=None):
+        """
+        (count, is_estimated) for the whole listing, not just the page
+        """
+        get_keyset_count = getattr(view, 'get_keyset_count', None)
+        if get_keyset_count is not None:
+            count = get_keyset_count(queryset)
+            if count is not None:
+                return count, False
+        
+        paginator = OptimizedPaginator(queryset, self.get_page_size(self.request))
+        return paginator.count, paginator.count_is_estimated
+    
+    def _link(self, cursor: Optional[str]) -> Optional[str]:
+        if cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, cursor)
+    
+    def get_next_link(self) -> Optional[str]:
+        if self.fallback:
+            return self.fallback.get_next_link()
+        return self._link(self.keyset_page.next_cursor)
+    
+    def get_previous_link(self) -> Optional[str]:
+        if self.fallback:
+            return self.fallback.get_previous_link()
+        return self._link(self.keyset_page.previous_cursor)
+    
+    def get_paginated_response(self, data):
+        if self.fallback:
+            return self.fallback.get_paginated_response(data)
+        return Response({
+            'count': self.count,
+            'count_is_estimated': self.count_is_estimated,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+    
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['count', 'results'],
+            'properties': {
+                'count': {'type': 'integer'},
+                'count_is_estimated': {'type': 'boolean'},
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+
+class EstimatedCountPage(Page):
+    """
+    Page of an estimated count.
+    
+    The estimate cannot tell whether more rows follow, so the paginator
+    fetches one row past the page and passes the answer as has_next.
+    """
+    
+    def __init__(self, object_list, number, paginator, has_next: bool):
+        super().__init__(object_list, number, paginator)
+        self._has_next = has_next
+    
+    def has_next(self):
+        return self._has_next
+    
+    def start_index(self):
+        if not self.object_list:
+            return 0
+        return (self.paginator.per_page * (self.number - 1)) + 1
+    
+    def end_index(self):
+        if not self.object_list:
+            return 0
+        return self.start_index() + len(self.object_list) - 1
+
+
 class OptimizedPaginator(Paginator):
     """
-    Optimized paginator with smart count estimation.
+    Paginator that estimates the count of large result sets.
+    
+    The planner's row estimate for the actual, filtered query (EXPLAIN) is used
+    when it is at least COUNT_ESTIMATE_THRESHOLD rows; smaller results are
+    counted exactly and the count is cached for COUNT_CACHE_TIMEOUT seconds
+    under the query's fingerprint. count_is_estimated says which one count is.
     """
     
     def __init__(self, object_list, per_page, **kwargs):
         super().__init__(object_list, per_page, **kwargs)
         self._count = None
-        self._estimated_count = None
+        self.count_is_estimated = False
     
     @property
     def count(self):
@@ -221,63 +522,100 @@ class OptimizedPaginator(Paginator):
         Get count with optimization for large datasets.
         """
         if self._count is None:
-            # For large datasets, use estimation instead of exact count
-            if self._should_use_estimated_count():
-                self._count = self._get_estimated_count()
-            else:
-                self._count = self.object_list.count()
+            self._count, self.count_is_estimated = self._get_count()
         
         return self._count
     
-    def _should_use_estimated_count(self):
+    def _get_count(self):
         """
-        Determine if estimated count should be used.
+        The count and whether it is a planner estimate.
         """
-        # Use estimated count for large tables or complex queries
+        if not isinstance(self.object_list, QuerySet):
+            return len(self.object_list), False
+        
+        fingerprint = self._query_fingerprint()
+        if fingerprint is not None:
+            cached = cache_manager.get(COUNT_CACHE_PREFIX, fingerprint)
+            if cached is not None:
+                return cached, False
+        
+        estimate = self._get_estimated_count()
+        if estimate is not None and estimate >= COUNT_ESTIMATE_THRESHOLD:
+            return estimate, True
+        
+        count = self.object_list.count()
+        if fingerprint is not None:
+            cache_manager.set(COUNT_CACHE_PREFIX, count, COUNT_CACHE_TIMEOUT, fingerprint)
+        return count, False
+    
+    def _query_fingerprint(self):
+        """
+        Hash of the query's SQL and parameters, the same for every page of a listing.
+        """
+        import hashlib
+        
         try:
-            # Quick check with LIMIT 1000
-            sample_count = self.object_list[:1000].count()
-            return sample_count >= 1000
-        except Exception:
-            return False
+            sql, params = self.object_list.query.sql_with_params()
+        except EmptyResultSet:
+            return None
+        except Exception as e:
+            logger.warning(f"Could not fingerprint paginated query: {e}")
+            return None
+        return hashlib.md5(f"{self.object_list.db}|{sql}|{params!r}".encode()).hexdigest()
     
     def _get_estimated_count(self):
         """
-        Get estimated count using database statistics.
+        The planner's row estimate for the filtered query, or None where unavailable.
         """
+        connection = connections[self.object_list.db]
+        if connection.vendor != 'postgresql':
+            return None
+        
         try:
-            from django.db import connection
-            
-            # Get table name
-            table_name = self.object_list.model._meta.db_table
-            
-            # Use database-specific estimation
+            # Ordering does not change the row count and only adds planning work
+            sql, params = self.object_list.order_by().query.sql_with_params()
             with connection.cursor() as cursor:
-                if connection.vendor == 'postgresql':
-                    cursor.execute(
-                        "SELECT reltuples::BIGINT FROM pg_class WHERE relname = %s",
-                        [table_name]
-                    )
-                    result = cursor.fetchone()
-                    if result:
-                        return int(result[0])
-                
-                elif connection.vendor == 'mysql':
-                    cursor.execute(
-                        "SELECT table_rows FROM information_schema.tables "
-                        "WHERE table_name = %s AND table_schema = DATABASE()",
-                        [table_name]
-                    )
-                    result = cursor.fetchone()
-                    if result:
-                        return int(result[0])
-            
-            # Fallback to actual count
-            return self.object_list.count()
-        
+                cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+                plan = cursor.fetchone()[0]
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            return int(plan[0]['Plan']['Plan Rows'])
+        except EmptyResultSet:
+            return 0
         except Exception as e:
             logger.warning(f"Count estimation failed: {e}")
-            return self.object_list.count()
+            return None
+    
+    def validate_number(self, number):
+        """
+        Pages past an estimated count are allowed; page() finds out whether they are empty.
+        """
+        if not self.count_is_estimated:
+            return super().validate_number(number)
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger(self.error_messages['invalid_page'])
+        if number < 1:
+            raise EmptyPage(self.error_messages['min_page'])
+        return number
+    
+    def page(self, number):
+        """
+        Return a Page object for the given 1-based page number.
+        """
+        # Settles count_is_estimated before the number is validated against it
+        self.count
+        if not self.count_is_estimated:
+            return super().page(number)
+        
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        # One extra row tells whether a next page exists
+        rows = list(self.object_list[bottom:bottom + self.per_page + 1])
+        if number > 1 and not rows:
+            raise EmptyPage(self.error_messages['no_results'])
+        return EstimatedCountPage(rows[:self.per_page], number, self, has_next=len(rows) > self.per_page)
 
 
 class LazyLoadingManager:
@@ -337,57 +675,40 @@ class LazyLoadingManager:
 
 class InfiniteScrollPagination:
     """
-    Pagination for infinite scroll interfaces.
+    Pagination for infinite scroll interfaces, on a (created_at, pk) keyset by default.
     """
     
-    def __init__(self, page_size: int = 20, max_items: int = 1000):
+    def __init__(self, page_size: int = 20, max_items: int = 1000, ordering=DEFAULT_KEYSET_ORDERING):
         self.page_size = page_size
         self.max_items = max_items
+        self.paginator = KeysetPaginator(ordering, page_size)
     
     def paginate_for_infinite_scroll(
         self,
         queryset: QuerySet,
-        last_id: Optional[str] = None,
-        direction: str = 'next'
+        cursor: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Paginate queryset for infinite scroll.
         
         Args:
             queryset: Base queryset to paginate
-            last_id: ID of last item from previous page
-            direction: 'next' or 'previous'
+            cursor: next_cursor (or previous_cursor) of the previous page
         
         Returns:
             Dictionary with items and pagination info
-        """
-        # Apply cursor-based filtering
-        if last_id:
-            if direction == 'next':
-                queryset = queryset.filter(id__lt=last_id)
-            else:
-                queryset = queryset.filter(id__gt=last_id)
-        
-        # Order by ID descending for consistent pagination
-        queryset = queryset.order_by('-id')
-        
-        # Get one extra item to check if there are more
-        items = list(queryset[:self.page_size + 1])
-        
-        has_more = len(items) > self.page_size
-        if has_more:
-            items = items[:self.page_size]
         
-        # Get first and last IDs for next pagination
-        first_id = items[0].id if items else None
-        last_id = items[-1].id if items else None
+        Raises:
+            InvalidCursor: if the cursor was not issued for this ordering
+        """
+        page = self.paginator.paginate(queryset, cursor)
         
         return {
-            'items': items,
-            'has_more': has_more,
-            'first_id': first_id,
-            'last_id': last_id,
-            'count': len(items),
+            'items': page.items,
+            'has_more': page.has_next,
+            'next_cursor': page.next_cursor,
+            'previous_cursor': page.previous_cursor,
+            'count': len(page.items),
         }
 
 
@@ -404,11 +725,6 @@ class PaginationOptimizer:
         return queryset.select_related(
             'recruiter',
             'recruiter__recruiter_profile'
-        ).prefetch_related(
-            Prefetch(
-                'applications',
-                queryset=queryset.model.applications.related.related_model.objects.select_related('job_seeker')
-            )
         ).annotate(
             applications_count=Count('applications')
         )
@@ -478,6 +794,7 @@ def paginate_queryset(
     return {
         'items': list(page_obj.object_list),
         'count': paginator.count,
+        'count_is_estimated': paginator.count_is_estimated,
         'num_pages': paginator.num_pages,
         'current_page': page_obj.number,
         'has_next': page_obj.has_next(),
@@ -489,14 +806,14 @@ def paginate_queryset(
 
 def create_infinite_scroll_response(
     queryset: QuerySet,
-    last_id: Optional[str] = None,
+    cursor: Optional[str] = None,
     page_size: int = 20
 ) -> Dict[str, Any]:
     """
     Create infinite scroll response from queryset.
     """
     paginator = InfiniteScrollPagination(page_size=page_size)
-    return paginator.paginate_for_infinite_scroll(queryset, last_id)
+    return paginator.paginate_for_infinite_scroll(queryset, cursor)
 
 
 def optimize_queryset_for_pagination(queryset: QuerySet, model_name: str) -> QuerySet:
@@ -0,0 +1,31 @@
+"""
+DRF parsers for HireWise backend.
+"""
+
+import codecs
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+
+from . import fast_json
+
+
+class FastJSONParser(JSONParser):
+    """
+    JSONParser that decodes with orjson when it is available.
+
+    Bodies in an encoding other than UTF-8 and the stdlib backend go through
+    JSONParser unchanged.
+    """
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if not fast_json.USE_ORJSON or codecs.lookup(encoding).name != 'utf-8':
+            return super().parse(stream, media_type, parser_context)
+
+        try:
+            return fast_json.loads(stream.read())
+        except ValueError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
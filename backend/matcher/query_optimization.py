@@ -10,13 +10,15 @@ from datetime import datetime, timedelta
 from django.db import models, connection
 from django.db.models import (
     Q, F, Count, Avg, Sum, Max, Min, Prefetch, 
-    Case, When, Value, IntegerField, FloatField
+    Case, When, Value, IntegerField, FloatField, DurationField, ExpressionWrapper
 )
 from django.db.models.query import QuerySet
 from django.utils import timezone
 from django.core.paginator import Paginator
 from django.conf import settings
 
+from .geo import location_filter_q
+
 logger = logging.getLogger(__name__)
 
 
@@ -34,29 +36,19 @@ class OptimizedQueryManager:
     ) -> Dict[str, Any]:
         """
         Get optimized job list with minimal database queries.
+        
+        Reads denormalized job search documents, so no recruiter join or
+        application count is needed.
         """
-        from .models import JobPost
+        from .models import JobSearchDocument
         
-        # Base queryset with optimizations
-        queryset = JobPost.objects.select_related(
-            'recruiter',
-            'recruiter__recruiter_profile'
-        ).filter(is_active=True)
+        # Documents only exist for active jobs
+        queryset = JobSearchDocument.objects.all()
         
         # Apply filters
         if filters:
             queryset = OptimizedQueryManager._apply_job_filters(queryset, filters, user)
         
-        # Add computed fields
-        queryset = queryset.annotate(
-            company_name=F('recruiter__recruiter_profile__company_name'),
-            total_applications=Count('applications'),
-            days_since_posted=models.ExpressionWrapper(
-                timezone.now() - F('created_at'),
-                output_field=models.DurationField()
-            )
-        )
-        
         # Order by relevance and recency
         queryset = queryset.order_by('-is_featured', '-created_at')
         
@@ -66,9 +58,10 @@ class OptimizedQueryManager:
         
         return {
             'jobs': list(page_obj.object_list.values(
-                'id', 'title', 'location', 'job_type', 'experience_level',
+                'title', 'location', 'job_type', 'experience_level',
                 'salary_min', 'salary_max', 'created_at', 'company_name',
-                'total_applications', 'views_count', 'is_featured'
+                'views_count', 'is_featured',
+                id=F('job_post_id'), total_applications=F('applications_count')
             )),
             'total_count': paginator.count,
             'page_count': paginator.num_pages,
@@ -80,21 +73,16 @@ class OptimizedQueryManager:
     @staticmethod
     def _apply_job_filters(queryset: QuerySet, filters: Dict, user=None) -> QuerySet:
         """
-        Apply filters to job queryset efficiently.
+        Apply filters to a job search document queryset efficiently.
         """
         # Search filter
         if search := filters.get('search'):
-            queryset = queryset.filter(
-                Q(title__icontains=search) |
-                Q(description__icontains=search) |
-                Q(skills_required__icontains=search) |
-                Q(recruiter__recruiter_profile__company_name__icontains=search)
-            )
+            queryset = queryset.filter(search_text__contains=search.lower())
         
         # Location filter
         if location := filters.get('location'):
             queryset = queryset.filter(
-                Q(location__icontains=location) |
+                location_filter_q(location, filters.get('radius_km')) |
                 Q(remote_work_allowed=True)
             )
         
@@ -128,10 +116,10 @@ class OptimizedQueryManager:
             if isinstance(skills, list):
                 skills_query = Q()
                 for skill in skills:
-                    skills_query |= Q(skills_required__icontains=skill)
+                    skills_query |= Q(skills_text__contains=skill.lower())
                 queryset = queryset.filter(skills_query)
             else:
-                queryset = queryset.filter(skills_required__icontains=skills)
+                queryset = queryset.filter(skills_text__contains=skills.lower())
         
         # Date range filter
         if date_from := filters.get('date_from'):
@@ -142,9 +130,7 @@ class OptimizedQueryManager:
         
         # Company filter
         if company := filters.get('company'):
-            queryset = queryset.filter(
-                recruiter__recruiter_profile__company_name__icontains=company
-            )
+            queryset = queryset.filter(company_name__icontains=company)
         
         # Remote work filter
         if filters.get('remote_only'):
@@ -264,7 +250,8 @@ class OptimizedQueryManager:
         """
         Get comprehensive job analytics with optimized queries.
         """
-        from .models import JobPost, Application, JobView
+        from .models import JobPost, Application
+        from .analytics_rollups import get_daily_applications
         
         # Single query for job with related data
         job = JobPost.objects.select_related(
@@ -280,8 +267,8 @@ class OptimizedQueryManager:
                 filter=Q(applications__status='reviewed')
             ),
             avg_match_score=Avg('applications__match_score'),
-            total_views=Count('job_views'),
-            unique_views=Count('job_views__viewer', distinct=True)
+            total_views=F('views_count'),
+            unique_views=F('analytics__unique_views')
         ).get(id=job_id)
         
         # Get application status distribution
@@ -291,16 +278,8 @@ class OptimizedQueryManager:
             count=Count('id')
         ).order_by('status')
         
-        # Get recent activity (last 30 days)
-        thirty_days_ago = timezone.now() - timedelta(days=30)
-        daily_stats = Application.objects.filter(
-            job_post_id=job_id,
-            applied_at__gte=thirty_days_ago
-        ).extra(
-            select={'day': 'date(applied_at)'}
-        ).values('day').annotate(
-            applications=Count('id')
-        ).order_by('day')
+        # Get recent activity (last 30 days) from daily rollups
+        daily_stats = get_daily_applications(job_id, days=30)
         
         return {
             'job_title': job.title,
@@ -310,12 +289,113 @@ class OptimizedQueryManager:
             'reviewed_applications': job.reviewed_applications,
             'avg_match_score': job.avg_match_score or 0,
             'total_views': job.total_views,
-            'unique_views': job.unique_views,
+            'unique_views': job.unique_views or 0,
             'conversion_rate': (job.total_applications / max(job.total_views, 1)) * 100,
             'status_distribution': list(status_distribution),
             'daily_applications': list(daily_stats),
         }
     
+    # (label, lower bound inclusive, upper bound exclusive) for match score histograms
+    MATCH_SCORE_BUCKETS = (
+        ('0-20', None, 0.2),
+        ('20-40', 0.2, 0.4),
+        ('40-60', 0.4, 0.6),
+        ('60-80', 0.6, 0.8),
+        ('80-100', 0.8, None),
+    )
+    
+    @staticmethod
+    def get_application_analytics(applications: QuerySet) -> Dict[str, Any]:
+        """
+        Recruiter application report in one query, whatever the number of applications.
+        
+        Applications are grouped by job post, and each group carries conditional
+        counts for the status and match score histograms and for each day of
+        the last 30, plus the sums behind the average match score and average
+        response time (applied_at to last update of non-pending applications).
+        The report adds the groups up; top jobs are the largest groups.
+        """
+        from .models import Application
+        
+        applications = applications.select_related(None).prefetch_related(None).order_by()
+        responded = ~Q(status='pending')
+        now = timezone.now()
+        since = now - timedelta(days=30)
+        
+        aggregates = {
+            'total': Count('id'),
+            'match_score_sum': Sum('match_score'),
+            'match_scored': Count('match_score'),
+            'responses': Count('id', filter=responded),
+            'response_time_sum': Sum(
+                ExpressionWrapper(F('updated_at') - F('applied_at'), output_field=DurationField()),
+                filter=responded,
+                output_field=DurationField(),
+            ),
+        }
+        for status_value, _ in Application.STATUS_CHOICES:
+            aggregates[f'status_{status_value}'] = Count('id', filter=Q(status=status_value))
+        for index, (_, lower, upper) in enumerate(OptimizedQueryManager.MATCH_SCORE_BUCKETS):
+            bucket = Q()
+            if lower is not None:
+                bucket &= Q(match_score__gte=lower)
+            if upper is not None:
+                bucket &= Q(match_score__lt=upper)
+            aggregates[f'match_bucket_{index}'] = Count('id', filter=bucket)
+        # Local calendar days, the first one starting 30 days ago
+        days = []
+        day = timezone.localtime(since).date()
+        while day <= timezone.localdate(now):
+            day_start = max(since, timezone.make_aware(datetime.combine(day, datetime.min.time())))
+            day_end = timezone.make_aware(datetime.combine(day + timedelta(days=1), datetime.min.time()))
+            aggregates[f'day_{len(days)}'] = Count(
+                'id', filter=Q(applied_at__gte=day_start, applied_at__lt=day_end)
+            )
+            days.append(day)
+            day += timedelta(days=1)
+        
+        jobs = list(applications.values('job_post__title', 'job_post__id').annotate(**aggregates))
+        
+        def total(name):
+            return sum(job[name] or 0 for job in jobs)
+        
+        match_scored = total('match_scored')
+        avg_match_score = total('match_score_sum') / match_scored if match_scored else 0
+        responses = total('responses')
+        response_time = sum((job['response_time_sum'] for job in jobs if job['response_time_sum']), timedelta())
+        avg_response_hours = response_time.total_seconds() / 3600 / responses if responses else 0
+        
+        top_jobs = sorted(jobs, key=lambda job: job['total'], reverse=True)[:10]
+        
+        return {
+            'total_applications': total('total'),
+            'status_distribution': [
+                {'status': status_value, 'count': total(f'status_{status_value}')}
+                for status_value in sorted(status for status, _ in Application.STATUS_CHOICES)
+                if total(f'status_{status_value}')
+            ],
+            'applications_over_time': [
+                {'day': day, 'count': total(f'day_{index}')}
+                for index, day in enumerate(days)
+                if total(f'day_{index}')
+            ],
+            'top_jobs': [
+                {
+                    'job_post__title': job['job_post__title'],
+                    'job_post__id': job['job_post__id'],
+                    'application_count': job['total'],
+                }
+                for job in top_jobs
+            ],
+            'average_match_score': round(avg_match_score, 2),
+            'match_score_distribution': [
+                (label, total(f'match_bucket_{index}'))
+                for index, (label, _, _) in enumerate(OptimizedQueryManager.MATCH_SCORE_BUCKETS)
+            ],
+            'average_response_time_hours': round(avg_response_hours, 2),
+            'total_response_times': responses,
+        }
+    
     @staticmethod
     def get_user_dashboard_data(user_id: str, user_type: str) -> Dict[str, Any]:
         """
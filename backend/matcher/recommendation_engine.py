@@ -10,14 +10,20 @@ from datetime import datetime, timedelta
 from collections import defaultdict, Counter
 import math
 
-from django.db.models import Q, Count, Avg, F, Case, When, Value, IntegerField
+from django.db.models import Q, Count, Avg, F, Sum, Case, When, Value, IntegerField
 from django.utils import timezone
 from django.core.cache import cache
 from django.conf import settings
 
 from .models import (
     User, JobPost, Application, Resume, AIAnalysisResult, 
-    JobSeekerProfile, RecruiterProfile, JobView, UserSkill, Skill
+    JobSeekerProfile, RecruiterProfile, JobView, UserSkill, Skill, JobSearchDocument
+)
+from .geo import location_filter_q, locations_match
+from .search_documents import serialize_search_document
+from .dashboard_counters import get_dashboard_counters
+from .cache_utils import (
+    metered_get, metered_set, get_cache_metrics, tagged_cache_key, job_tag, user_tag, RECOMMENDATIONS_TAG
 )
 
 logger = logging.getLogger(__name__)
@@ -39,8 +45,10 @@ class RecommendationEngine:
         if user.user_type != 'job_seeker':
             return []
         
-        cache_key = f"job_recommendations_{user.id}_{limit}"
-        cached_result = cache.get(cache_key)
+        cache_key = tagged_cache_key(
+            f"job_recommendations_{user.id}_{limit}", [RECOMMENDATIONS_TAG, user_tag(user.id)]
+        )
+        cached_result = metered_get('recommendations:jobs', cache_key)
         if cached_result:
             return cached_result
         
@@ -65,7 +73,7 @@ class RecommendationEngine:
                 rec['recommendation_type'] = self._determine_recommendation_type(rec)
                 rec['generated_at'] = timezone.now().isoformat()
             
-            cache.set(cache_key, recommendations, self.cache_timeout)
+            metered_set('recommendations:jobs', cache_key, recommendations, self.cache_timeout)
             return recommendations
             
         except Exception as e:
@@ -75,8 +83,10 @@ class RecommendationEngine:
         """
         Get candidate recommendations for a job posting (for recruiters)
         """
-        cache_key = f"candidate_recommendations_{job_post.id}_{limit}"
-        cached_result = cache.get(cache_key)
+        cache_key = tagged_cache_key(
+            f"candidate_recommendations_{job_post.id}_{limit}", [RECOMMENDATIONS_TAG, job_tag(job_post.id)]
+        )
+        cached_result = metered_get('recommendations:candidates', cache_key)
         if cached_result:
             return cached_result
         
@@ -96,7 +106,7 @@ class RecommendationEngine:
                 rec['recommendation_type'] = self._determine_candidate_recommendation_type(rec)
                 rec['generated_at'] = timezone.now().isoformat()
             
-            cache.set(cache_key, recommendations, self.cache_timeout)
+            metered_set('recommendations:candidates', cache_key, recommendations, self.cache_timeout)
             return recommendations
             
         except Exception as e:
@@ -111,12 +121,12 @@ class RecommendationEngine:
             profile = user.job_seeker_profile
             user_skills = list(user.user_skills.values_list('skill__name', flat=True))
             
-            # Build query for matching jobs
-            query = Q(is_active=True)
+            # Build query for matching job documents (active jobs only)
+            query = Q()
             
             # Exclude jobs user has already applied to
             applied_job_ids = user.applications.values_list('job_post_id', flat=True)
-            query &= ~Q(id__in=applied_job_ids)
+            query &= ~Q(job_post_id__in=applied_job_ids)
             
             # Filter by experience level
             if profile.experience_level:
@@ -125,21 +135,19 @@ class RecommendationEngine:
             # Filter by location preference (if remote work is not allowed)
             if profile.location:
                 query &= Q(
-                    Q(location__icontains=profile.location) | 
+                    location_filter_q(profile.location) | 
                     Q(remote_work_allowed=True)
                 )
             
             # Get jobs and score them
-            jobs = JobPost.objects.filter(query).select_related(
-                'recruiter__recruiter_profile'
-            ).prefetch_related('applications')[:limit * 3]
+            jobs = JobSearchDocument.objects.filter(query)[:limit * 3]
             
             recommendations = []
             for job in jobs:
                 score = self._calculate_content_based_score(user, job, user_skills)
                 if score > 0.3:  # Minimum threshold
                     recommendations.append({
-                        'job_id': str(job.id),
+                        'job_id': str(job.job_post_id),
                         'job': job,
                         'score': score,
                         'reason': self._generate_content_based_reason(user, job, user_skills)
@@ -194,20 +202,19 @@ class RecommendationEngine:
                 job_id = item['job_post']
                 job_scores[job_id] += item['view_count'] * 0.3
             
-            # Get job objects and create recommendations
+            # Get job documents and create recommendations
             job_ids = list(job_scores.keys())
-            jobs = JobPost.objects.filter(
-                id__in=job_ids,
-                is_active=True
+            jobs = JobSearchDocument.objects.filter(
+                job_post_id__in=job_ids
             ).exclude(
-                id__in=user.applications.values_list('job_post_id', flat=True)
-            ).select_related('recruiter__recruiter_profile')
+                job_post_id__in=user.applications.values_list('job_post_id', flat=True)
+            )
             
             recommendations = []
             for job in jobs:
-                score = job_scores[job.id] / max(job_scores.values()) if job_scores.values() else 0
+                score = job_scores[job.job_post_id] / max(job_scores.values()) if job_scores.values() else 0
                 recommendations.append({
-                    'job_id': str(job.id),
+                    'job_id': str(job.job_post_id),
                     'job': job,
                     'score': score,
                     'reason': f"Users with similar profiles showed interest in this position"
@@ -228,24 +235,19 @@ class RecommendationEngine:
             # Get trending jobs based on recent activity
             recent_date = timezone.now() - timedelta(days=7)
             
-            trending_jobs = JobPost.objects.filter(
-                is_active=True,
+            trending_jobs = list(JobSearchDocument.objects.filter(
                 created_at__gte=recent_date
             ).exclude(
-                id__in=user.applications.values_list('job_post_id', flat=True)
-            ).annotate(
-                popularity_score=Count('job_views') + Count('applications') * 2
-            ).order_by('-popularity_score').select_related(
-                'recruiter__recruiter_profile'
-            )[:limit]
+                job_post_id__in=user.applications.values_list('job_post_id', flat=True)
+            ).order_by('-popularity_score', '-created_at')[:limit])
             
             recommendations = []
-            max_score = trending_jobs.first().popularity_score if trending_jobs else 1
+            max_score = trending_jobs[0].popularity_score if trending_jobs else 1
             
             for job in trending_jobs:
                 score = job.popularity_score / max_score if max_score > 0 else 0
                 recommendations.append({
-                    'job_id': str(job.id),
+                    'job_id': str(job.job_post_id),
                     'job': job,
                     'score': score,
                     'reason': f"Trending position with {job.popularity_score} recent interactions"
@@ -339,7 +341,11 @@ class RecommendationEngine:
                 pass
             else:
                 # For non-remote jobs, match location
-                query &= Q(job_seeker_profile__location__icontains=job_post.location)
+                query &= location_filter_q(
+                    job_post.location,
+                    field='job_seeker_profile__geo_location',
+                    text_field='job_seeker_profile__location'
+                )
             
             candidates = User.objects.filter(query).exclude(
                 applications__job_post=job_post
@@ -418,14 +424,14 @@ class RecommendationEngine:
         
         return intersection / union if union > 0 else 0.0    
 
-    def _calculate_content_based_score(self, user: User, job: JobPost, user_skills: List[str]) -> float:
+    def _calculate_content_based_score(self, user: User, job: JobSearchDocument, user_skills: List[str]) -> float:
         """
         Calculate content-based recommendation score
         """
         score = 0.0
         
         # Skill matching (40% weight)
-        job_skills = [skill.strip().lower() for skill in job.skills_required.split(',') if skill.strip()]
+        job_skills = [skill.lower() for skill in job.skills]
         user_skills_lower = [skill.lower() for skill in user_skills]
         
         if job_skills:
@@ -439,7 +445,7 @@ class RecommendationEngine:
             score += 0.2
         
         # Location matching (15% weight)
-        if job.remote_work_allowed or (profile.location and profile.location.lower() in job.location.lower()):
+        if job.remote_work_allowed or locations_match(profile.location, job.location):
             score += 0.15
         
         # Salary matching (15% weight)
@@ -605,14 +611,14 @@ class RecommendationEngine:
         
         final_recommendations.sort(key=lambda x: x['score'], reverse=True)
         return final_recommendations[:limit] 
-    def _generate_content_based_reason(self, user: User, job: JobPost, user_skills: List[str]) -> str:
+    def _generate_content_based_reason(self, user: User, job: JobSearchDocument, user_skills: List[str]) -> str:
         """
         Generate explanation for content-based recommendation
         """
         reasons = []
         
         # Check skill matches
-        job_skills = [skill.strip().lower() for skill in job.skills_required.split(',') if skill.strip()]
+        job_skills = [skill.lower() for skill in job.skills]
         user_skills_lower = [skill.lower() for skill in user_skills]
         
         matching_skills = [skill for skill in job_skills if any(skill in user_skill for user_skill in user_skills_lower)]
@@ -627,7 +633,7 @@ class RecommendationEngine:
         # Check location
         if job.remote_work_allowed:
             reasons.append("Remote work available")
-        elif profile.location and profile.location.lower() in job.location.lower():
+        elif locations_match(profile.location, job.location):
             reasons.append(f"Located in your area ({job.location})")
         
         return "; ".join(reasons[:2]) if reasons else "Good match based on your profile"
@@ -682,85 +688,57 @@ class SearchOptimizer:
     Advanced search optimization and indexing for jobs and candidates
     """
     
+    # Search cache layers and the cache metrics prefix each is recorded under
+    CACHE_LAYERS = {
+        'job_results': 'search:jobs',
+        'candidate_results': 'search:candidates',
+        'personalization': 'search:personalization',
+    }
+    
     def __init__(self):
         self.cache_timeout = getattr(settings, 'SEARCH_CACHE_TIMEOUT', 1800)  # 30 minutes
+        self.personalization_cache_timeout = getattr(settings, 'SEARCH_PERSONALIZATION_CACHE_TIMEOUT', 300)
     
     def search_jobs(self, query: str, filters: Dict[str, Any] = None, 
                    user: User = None, limit: int = 20, offset: int = 0) -> Dict[str, Any]:
         """
-        Advanced job search with optimization and personalization
+        Advanced job search with optimization and personalization.
+        
+        The ranked result page is cached once per normalized query, filters and page
+        as job IDs with scores, and shared by all users. Personalization is applied
+        per user on top of the hydrated page.
         """
         try:
-            # Build cache key
-            cache_key = self._build_search_cache_key('jobs', query, filters, user, limit, offset)
-            cached_result = cache.get(cache_key)
-            if cached_result:
-                return cached_result
-            
-            # Build base query
-            base_query = Q(is_active=True)
-            
-            # Apply text search
-            if query:
-                text_query = self._build_text_search_query(query)
-                base_query &= text_query
-            
-            # Apply filters
-            if filters:
-                filter_query = self._build_filter_query(filters)
-                base_query &= filter_query
-            
-            # Get jobs with annotations for ranking
-            jobs_queryset = JobPost.objects.filter(base_query).select_related(
-                'recruiter__recruiter_profile'
-            ).annotate(
-                relevance_score=self._build_relevance_annotation(query, user),
-                popularity_score=Count('job_views') + Count('applications') * 2,
-                freshness_score=Case(
-                    When(created_at__gte=timezone.now() - timedelta(days=7), then=Value(3)),
-                    When(created_at__gte=timezone.now() - timedelta(days=30), then=Value(2)),
-                    default=Value(1),
-                    output_field=IntegerField()
-                )
-            ).order_by('-relevance_score', '-popularity_score', '-freshness_score')
-            
-            # Get total count for pagination
-            total_count = jobs_queryset.count()
+            # Shared result layer: ranked job IDs with scores
+            cache_key = self._build_search_cache_key('jobs', query, filters, limit, offset)
+            cached_ids = metered_get(self.CACHE_LAYERS['job_results'], cache_key)
             
-            # Apply pagination
-            jobs = jobs_queryset[offset:offset + limit]
+            if cached_ids is not None:
+                ranked_jobs = self._hydrate_ranked_jobs(cached_ids['results'])
+                total_count = cached_ids['total_count']
+            else:
+                ranked_jobs, total_count = self._rank_jobs(query, filters, limit, offset)
+                metered_set(self.CACHE_LAYERS['job_results'], cache_key, {
+                    'results': [
+                        [str(job.job_post_id), relevance_score, popularity_score]
+                        for job, relevance_score, popularity_score in ranked_jobs
+                    ],
+                    'total_count': total_count
+                }, self.cache_timeout)
             
             # Prepare results
-            results = []
-            for job in jobs:
-                job_data = {
-                    'id': str(job.id),
-                    'title': job.title,
-                    'company': job.recruiter.recruiter_profile.company_name if hasattr(job.recruiter, 'recruiter_profile') else 'Unknown',
-                    'location': job.location,
-                    'remote_work_allowed': job.remote_work_allowed,
-                    'job_type': job.job_type,
-                    'experience_level': job.experience_level,
-                    'salary_min': job.salary_min,
-                    'salary_max': job.salary_max,
-                    'skills_required': job.skills_required.split(',') if job.skills_required else [],
-                    'created_at': job.created_at.isoformat(),
-                    'relevance_score': getattr(job, 'relevance_score', 0),
-                    'popularity_score': getattr(job, 'popularity_score', 0),
-                    'applications_count': job.applications_count,
-                    'views_count': job.views_count
-                }
-                
-                # Add personalization if user is provided
-                if user and user.user_type == 'job_seeker':
-                    job_data['personalization'] = self._get_job_personalization(job, user)
-                
-                results.append(job_data)
+            results = [
+                self._serialize_job_result(job, relevance_score, popularity_score)
+                for job, relevance_score, popularity_score in ranked_jobs
+            ]
             
-            # Track search analytics
-            self._track_search_analytics(query, filters, user, total_count)
+            # Per-user personalization overlay
+            if user and user.user_type == 'job_seeker':
+                page_jobs = [job for job, _, _ in ranked_jobs]
+                for job_data, personalization in zip(results, self._personalize_jobs(page_jobs, user)):
+                    job_data['personalization'] = personalization
             
-            search_result = {
+            return {
                 'results': results,
                 'total_count': total_count,
                 'page_size': limit,
@@ -771,9 +749,6 @@ class SearchOptimizer:
                 'filters_applied': filters or {}
             }
             
-            cache.set(cache_key, search_result, self.cache_timeout)
-            return search_result
-            
         except Exception as e:
             logger.error(f"Error in job search: {str(e)}")
             return {
@@ -783,7 +758,72 @@ class SearchOptimizer:
                 'offset': offset,
                 'has_next': False,
                 'error': str(e)
-            } 
+            }
+    
+    def _rank_jobs(self, query: str, filters: Dict[str, Any], limit: int,
+                   offset: int) -> Tuple[List[Tuple[JobSearchDocument, int, int]], int]:
+        """
+        Run the ranked query over job search documents and return one page of
+        (document, relevance, popularity)
+        """
+        # Documents only exist for active jobs; the join guards against bulk
+        # deactivations the reconciler has not caught up with yet
+        base_query = Q(job_post__is_active=True)
+        
+        # Apply text search
+        if query:
+            text_query = self._build_text_search_query(query)
+            base_query &= text_query
+        
+        # Apply filters
+        if filters:
+            filter_query = self._build_filter_query(filters)
+            base_query &= filter_query
+        
+        # Popularity and freshness are precomputed on the document
+        documents = JobSearchDocument.objects.filter(base_query).annotate(
+            relevance_score=self._build_relevance_annotation(query)
+        ).order_by('-relevance_score', '-popularity_score', '-freshness_score')
+        
+        # Get total count for pagination
+        total_count = documents.count()
+        
+        # Apply pagination
+        ranked_jobs = [
+            (document, document.relevance_score, document.popularity_score)
+            for document in documents[offset:offset + limit]
+        ]
+        
+        return ranked_jobs, total_count
+    
+    def _hydrate_ranked_jobs(self, ranked_ids: List[List[Any]]) -> List[Tuple[JobSearchDocument, int, int]]:
+        """
+        Load cached job IDs in one query, keeping rank order and dropping jobs no longer active
+        """
+        jobs_by_id = {
+            str(document.job_post_id): document
+            for document in JobSearchDocument.objects.filter(
+                job_post_id__in=[job_id for job_id, _, _ in ranked_ids], job_post__is_active=True
+            ).order_by()
+        }
+        
+        return [
+            (jobs_by_id[job_id], relevance_score, popularity_score)
+            for job_id, relevance_score, popularity_score in ranked_ids
+            if job_id in jobs_by_id
+        ]
+    
+    def _serialize_job_result(self, document: JobSearchDocument, relevance_score: int,
+                              popularity_score: int) -> Dict[str, Any]:
+        """
+        Build the user-independent part of a job search result
+        """
+        return {
+            **serialize_search_document(document),
+            'relevance_score': relevance_score,
+            'popularity_score': popularity_score,
+        }
+    
     def search_candidates(self, query: str, filters: Dict[str, Any] = None,
                          user: User = None, limit: int = 20, offset: int = 0) -> Dict[str, Any]:
         """
@@ -794,9 +834,9 @@ class SearchOptimizer:
         
         try:
             # Build cache key
-            cache_key = self._build_search_cache_key('candidates', query, filters, user, limit, offset)
-            cached_result = cache.get(cache_key)
-            if cached_result:
+            cache_key = self._build_search_cache_key('candidates', query, filters, limit, offset)
+            cached_result = metered_get(self.CACHE_LAYERS['candidate_results'], cache_key)
+            if cached_result is not None:
                 return cached_result
             
             # Build base query
@@ -849,9 +889,6 @@ class SearchOptimizer:
                 
                 results.append(candidate_data)
             
-            # Track search analytics
-            self._track_search_analytics(query, filters, user, total_count, search_type='candidates')
-            
             search_result = {
                 'results': results,
                 'total_count': total_count,
@@ -863,7 +900,7 @@ class SearchOptimizer:
                 'filters_applied': filters or {}
             }
             
-            cache.set(cache_key, search_result, self.cache_timeout)
+            metered_set(self.CACHE_LAYERS['candidate_results'], cache_key, search_result, self.cache_timeout)
             return search_result
             
         except Exception as e:
@@ -881,18 +918,10 @@ class SearchOptimizer:
         """
         Build text search query for jobs
         """
-        search_terms = query.lower().split()
-        
         text_query = Q()
-        for term in search_terms:
-            term_query = (
-                Q(title__icontains=term) |
-                Q(description__icontains=term) |
-                Q(requirements__icontains=term) |
-                Q(skills_required__icontains=term) |
-                Q(recruiter__recruiter_profile__company_name__icontains=term)
-            )
-            text_query &= term_query
+        for term in query.lower().split():
+            # search_text holds title, company, location, skills, description and requirements
+            text_query &= Q(search_text__contains=term)
         
         return text_query
     
@@ -923,7 +952,7 @@ class SearchOptimizer:
         filter_query = Q()
         
         if filters.get('location'):
-            location_query = Q(location__icontains=filters['location'])
+            location_query = location_filter_q(filters['location'], filters.get('radius_km'))
             if filters.get('include_remote', True):
                 location_query |= Q(remote_work_allowed=True)
             filter_query &= location_query
@@ -944,11 +973,11 @@ class SearchOptimizer:
             skills = filters['skills'] if isinstance(filters['skills'], list) else [filters['skills']]
             skills_query = Q()
             for skill in skills:
-                skills_query |= Q(skills_required__icontains=skill)
+                skills_query |= Q(skills_text__contains=skill.strip().lower())
             filter_query &= skills_query
         
         if filters.get('company'):
-            filter_query &= Q(recruiter__recruiter_profile__company_name__icontains=filters['company'])
+            filter_query &= Q(company_name__icontains=filters['company'])
         
         if filters.get('posted_within_days'):
             days = int(filters['posted_within_days'])
@@ -964,7 +993,11 @@ class SearchOptimizer:
         filter_query = Q()
         
         if filters.get('location'):
-            filter_query &= Q(job_seeker_profile__location__icontains=filters['location'])
+            filter_query &= location_filter_q(
+                filters['location'], filters.get('radius_km'),
+                field='job_seeker_profile__geo_location',
+                text_field='job_seeker_profile__location'
+            )
         
         if filters.get('experience_level'):
             filter_query &= Q(job_seeker_profile__experience_level=filters['experience_level'])
@@ -983,7 +1016,7 @@ class SearchOptimizer:
             filter_query &= Q(job_seeker_profile__expected_salary__lte=filters['expected_salary_max'])
         
         return filter_query   
-    def _build_relevance_annotation(self, query: str, user: User = None):
+    def _build_relevance_annotation(self, query: str):
         """
         Build relevance score annotation for search results
         """
@@ -1000,13 +1033,13 @@ class SearchOptimizer:
             relevance_cases.append(
                 When(title__icontains=term, then=Value(5 - i))
             )
-            # Medium weight for description matches
+            # Medium weight for skill matches
             relevance_cases.append(
-                When(description__icontains=term, then=Value(3 - i))
+                When(skills_text__contains=term, then=Value(3 - i))
             )
-            # Lower weight for other field matches
+            # Lower weight for description and other field matches
             relevance_cases.append(
-                When(skills_required__icontains=term, then=Value(2 - i))
+                When(search_text__contains=term, then=Value(2 - i))
             )
         
         return Case(*relevance_cases, default=Value(0), output_field=IntegerField())
@@ -1038,61 +1071,108 @@ class SearchOptimizer:
             output_field=IntegerField()
         )
     
-    def _get_job_personalization(self, job: JobPost, user: User) -> Dict[str, Any]:
+    def _get_personalization_context(self, user: User) -> Dict[str, Any]:
+        """
+        Get the profile fields and skills used to personalize results, cached per user
         """
-        Get personalization data for a job relative to a user
+        cache_key = f"search_personalization_{user.id}"
+        context = metered_get(self.CACHE_LAYERS['personalization'], cache_key)
+        
+        if context is None:
+            profile = getattr(user, 'job_seeker_profile', None)
+            context = {
+                'skills': list(user.user_skills.values_list('skill__name', flat=True)),
+                'experience_level': profile.experience_level if profile else None,
+                'location': profile.location if profile else None,
+                'expected_salary': profile.expected_salary if profile else None,
+            }
+            metered_set(self.CACHE_LAYERS['personalization'], cache_key, context, self.personalization_cache_timeout)
+        
+        return context
+    
+    def _personalize_jobs(self, jobs: List[JobSearchDocument], user: User) -> List[Dict[str, Any]]:
+        """
+        Get personalization data for a page of jobs relative to a user.
+        
+        The user's skills and profile come from the cached context, and applied and
+        viewed flags are loaded for the whole page at once, so the query count does
+        not depend on the page size.
         """
         try:
-            profile = user.job_seeker_profile
-            user_skills = list(user.user_skills.values_list('skill__name', flat=True))
-            
-            # Calculate skill match
-            job_skills = [skill.strip() for skill in job.skills_required.split(',') if skill.strip()]
-            matching_skills = [skill for skill in job_skills if any(skill.lower() in user_skill.lower() for user_skill in user_skills)]
-            
-            # Check if already applied
-            has_applied = user.applications.filter(job_post=job).exists()
+            context = self._get_personalization_context(user)
+            job_ids = [job.job_post_id for job in jobs]
             
-            # Check if viewed before
-            has_viewed = JobView.objects.filter(job_post=job, viewer=user).exists()
+            applied_job_ids = set(
+                Application.objects.filter(job_seeker=user, job_post_id__in=job_ids)
+                .order_by().values_list('job_post_id', flat=True)
+            )
+            viewed_job_ids = set(
+                JobView.objects.filter(viewer=user, job_post_id__in=job_ids)
+                .order_by().values_list('job_post_id', flat=True).distinct()
+            )
+            user_skills_lower = [skill.lower() for skill in context['skills']]
             
-            return {
-                'skill_match_percentage': (len(matching_skills) / len(job_skills) * 100) if job_skills else 0,
-                'matching_skills': matching_skills,
-                'missing_skills': [skill for skill in job_skills if skill not in matching_skills],
-                'experience_level_match': profile.experience_level == job.experience_level if profile else False,
-                'location_match': job.remote_work_allowed or (profile and profile.location and profile.location.lower() in job.location.lower()),
-                'salary_match': self._check_salary_match(profile, job),
-                'has_applied': has_applied,
-                'has_viewed': has_viewed,
-                'recommendation_score': 0.0  # Will be filled by recommendation engine
-            }
+            return [
+                self._get_job_personalization(
+                    job, context, user_skills_lower,
+                    has_applied=job.job_post_id in applied_job_ids,
+                    has_viewed=job.job_post_id in viewed_job_ids
+                )
+                for job in jobs
+            ]
             
         except Exception as e:
             logger.error(f"Error getting job personalization: {str(e)}")
-            return {}
+            return [{} for _ in jobs]
+    
+    def _get_job_personalization(self, job: JobSearchDocument, context: Dict[str, Any], user_skills_lower: List[str],
+                                 has_applied: bool, has_viewed: bool) -> Dict[str, Any]:
+        """
+        Get personalization data for a job from preloaded user context, without queries
+        """
+        # Calculate skill match
+        job_skills = job.skills
+        matching_skills = [skill for skill in job_skills if any(skill.lower() in user_skill for user_skill in user_skills_lower)]
+        
+        return {
+            'skill_match_percentage': (len(matching_skills) / len(job_skills) * 100) if job_skills else 0,
+            'matching_skills': matching_skills,
+            'missing_skills': [skill for skill in job_skills if skill not in matching_skills],
+            'experience_level_match': context['experience_level'] == job.experience_level,
+            'location_match': bool(job.remote_work_allowed or locations_match(context['location'], job.location)),
+            'salary_match': self._check_salary_match(context['expected_salary'], job),
+            'has_applied': has_applied,
+            'has_viewed': has_viewed,
+            'recommendation_score': 0.0  # Will be filled by recommendation engine
+        }
     
-    def _check_salary_match(self, profile, job: JobPost) -> bool:
+    def _check_salary_match(self, expected_salary, job: JobSearchDocument) -> bool:
         """
         Check if job salary matches user expectations
         """
-        if not profile or not profile.expected_salary or not job.salary_min:
+        if not expected_salary or not job.salary_min:
             return False
         
-        return profile.expected_salary >= job.salary_min
+        return expected_salary >= job.salary_min
     
     def _build_search_cache_key(self, search_type: str, query: str, filters: Dict[str, Any],
-                               user: User, limit: int, offset: int) -> str:
+                               limit: int, offset: int) -> str:
         """
-        Build cache key for search results
+        Build cache key for search results shared by all users
         """
         import hashlib
         
+        normalized_query = ' '.join((query or '').lower().split())
+        normalized_filters = sorted(
+            (key, sorted(value) if isinstance(value, (list, tuple)) else value)
+            for key, value in (filters or {}).items()
+            if value not in (None, '', [])
+        )
+        
         key_parts = [
             search_type,
-            query or '',
-            str(sorted(filters.items())) if filters else '',
-            str(user.id) if user else 'anonymous',
+            normalized_query,
+            str(normalized_filters),
             str(limit),
             str(offset)
         ]
@@ -1102,22 +1182,23 @@ class SearchOptimizer:
         
         return f"search_{search_type}_{key_hash}"
     
-    def _track_search_analytics(self, query: str, filters: Dict[str, Any], user: User,
-                               result_count: int, search_type: str = 'jobs'):
+    @classmethod
+    def invalidate_personalization(cls, user_id) -> None:
         """
-        Track search analytics for optimization
+        Drop the cached personalization context for a user
         """
-        try:
-            from .models import SearchAnalytics
-            
-            # This would require creating a SearchAnalytics model
-            # For now, we'll just log the search
-            logger.info(f"Search performed - Type: {search_type}, Query: '{query}', "
-                       f"Filters: {filters}, User: {user.id if user else 'anonymous'}, "
-                       f"Results: {result_count}")
-            
-        except Exception as e:
-            logger.error(f"Error tracking search analytics: {str(e)}")
+        cache.delete(f"search_personalization_{user_id}")
+    
+    @classmethod
+    def get_cache_stats(cls) -> Dict[str, Dict[str, Any]]:
+        """
+        Get hits, misses, hit rate and latency per search cache layer, across workers
+        """
+        metrics = get_cache_metrics()
+        return {
+            layer: metrics.get(prefix, {'hits': 0, 'misses': 0, 'hit_rate': 0.0})
+            for layer, prefix in cls.CACHE_LAYERS.items()
+        }
 
 
 class PersonalizedContentDelivery:
@@ -1272,28 +1353,26 @@ class PersonalizedContentDelivery:
             profile = user.job_seeker_profile
             recent_date = timezone.now() - timedelta(days=7)
             
-            query = Q(is_active=True, created_at__gte=recent_date)
+            query = Q(created_at__gte=recent_date)
             
             # Filter by user's experience level if available
             if profile and profile.experience_level:
                 query &= Q(experience_level=profile.experience_level)
             
             # Exclude jobs user has already applied to
-            query &= ~Q(id__in=user.applications.values_list('job_post_id', flat=True))
+            query &= ~Q(job_post_id__in=user.applications.values_list('job_post_id', flat=True))
             
-            trending_jobs = JobPost.objects.filter(query).annotate(
-                trend_score=Count('job_views') + Count('applications') * 2
-            ).order_by('-trend_score').select_related(
-                'recruiter__recruiter_profile'
+            trending_jobs = JobSearchDocument.objects.filter(query).order_by(
+                '-popularity_score', '-created_at'
             )[:limit]
             
             return [
                 {
-                    'id': str(job.id),
+                    'id': str(job.job_post_id),
                     'title': job.title,
-                    'company': job.recruiter.recruiter_profile.company_name if hasattr(job.recruiter, 'recruiter_profile') else 'Unknown',
+                    'company': job.company_name or 'Unknown',
                     'location': job.location,
-                    'trend_score': job.trend_score,
+                    'trend_score': job.popularity_score,
                     'created_at': job.created_at.isoformat()
                 }
                 for job in trending_jobs
@@ -1308,10 +1387,11 @@ class PersonalizedContentDelivery:
         Get statistics for job seeker dashboard
         """
         try:
+            counters = get_dashboard_counters(user)
             return {
-                'total_applications': user.applications.count(),
-                'pending_applications': user.applications.filter(status='pending').count(),
-                'interview_scheduled': user.applications.filter(status='interview_scheduled').count(),
+                'total_applications': counters.applications_total,
+                'pending_applications': counters.applications_pending,
+                'interview_scheduled': counters.applications_interview_scheduled,
                 'profile_views': JobView.objects.filter(viewer=user).count(),
                 'resume_count': user.resumes.count(),
                 'skills_count': user.user_skills.count()
@@ -1325,12 +1405,13 @@ class PersonalizedContentDelivery:
         Get statistics for recruiter dashboard
         """
         try:
+            counters = get_dashboard_counters(user)
             return {
-                'active_jobs': user.job_posts.filter(is_active=True).count(),
-                'total_applications': Application.objects.filter(job_post__recruiter=user).count(),
-                'pending_applications': Application.objects.filter(job_post__recruiter=user, status='pending').count(),
-                'total_job_views': sum(job.views_count for job in user.job_posts.all()),
-                'hired_candidates': Application.objects.filter(job_post__recruiter=user, status='hired').count()
+                'active_jobs': counters.job_posts_active,
+                'total_applications': counters.applications_total,
+                'pending_applications': counters.applications_pending,
+                'total_job_views': user.job_posts.aggregate(total=Sum('views_count'))['total'] or 0,
+                'hired_candidates': counters.applications_hired
             }
         except Exception as e:
             logger.error(f"Error getting recruiter stats: {str(e)}")
@@ -21,6 +21,10 @@ from rest_framework.permissions import IsAuthenticated, AllowAny
 from .models import User, JobPost, Application, JobSeekerProfile, RecruiterProfile
 from .recommendation_engine import RecommendationEngine, SearchOptimizer, PersonalizedContentDelivery
 from .search_analytics import SearchAnalytics, PopularSearchTerms, SearchSuggestions, UserSearchPreferences, SavedSearch
+from .search_events import (
+    record_search_event, record_search_interaction, get_search_event_stats, is_valid_search_id
+)
+from .search_documents import serialize_search_document
 from .serializers import JobPostListSerializer
 
 logger = logging.getLogger(__name__)
@@ -49,28 +53,13 @@ class JobRecommendationView(generics.GenericAPIView):
             # Format response
             formatted_recommendations = []
             for rec in recommendations:
-                job = rec['job']
                 formatted_rec = {
                     'job_id': rec['job_id'],
                     'score': rec['score'],
                     'reasons': rec['reasons'],
                     'sources': rec['sources'],
                     'recommendation_type': rec['recommendation_type'],
-                    'job': {
-                        'id': str(job.id),
-                        'title': job.title,
-                        'company': job.recruiter.recruiter_profile.company_name if hasattr(job.recruiter, 'recruiter_profile') else 'Unknown',
-                        'location': job.location,
-                        'remote_work_allowed': job.remote_work_allowed,
-                        'job_type': job.job_type,
-                        'experience_level': job.experience_level,
-                        'salary_min': job.salary_min,
-                        'salary_max': job.salary_max,
-                        'skills_required': job.skills_required.split(',') if job.skills_required else [],
-                        'created_at': job.created_at.isoformat(),
-                        'applications_count': job.applications_count,
-                        'views_count': job.views_count
-                    }
+                    'job': serialize_search_document(rec['job'])
                 }
                 formatted_recommendations.append(formatted_rec)
             
@@ -208,7 +197,9 @@ class AdvancedJobSearchView(generics.GenericAPIView):
             
             # Track search analytics
             if request.user.is_authenticated:
-                self._track_search_analytics(request.user, query, filters, len(search_results.get('results', [])))
+                search_results['search_id'] = self._track_search_analytics(
+                    request, query, filters, len(search_results.get('results', []))
+                )
             
             return Response(search_results, status=status.HTTP_200_OK)
             
@@ -219,32 +210,18 @@ class AdvancedJobSearchView(generics.GenericAPIView):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
     
-    def _track_search_analytics(self, user, query, filters, result_count):
+    def _track_search_analytics(self, request, query, filters, result_count):
         """
-        Track search analytics for optimization
+        Buffer a search event; rows are written by flush_search_events_task
         """
         try:
-            SearchAnalytics.objects.create(
-                user=user,
-                search_type='jobs',
-                query=query,
-                filters_applied=filters,
-                results_count=result_count
+            return record_search_event(
+                'jobs', query, filters, result_count,
+                user=request.user, request=request
             )
-            
-            # Update popular search terms
-            if query:
-                popular_term, created = PopularSearchTerms.objects.get_or_create(
-                    search_type='jobs',
-                    term=query.lower(),
-                    defaults={'search_count': 1}
-                )
-                if not created:
-                    popular_term.search_count += 1
-                    popular_term.save()
-                    
         except Exception as e:
             logger.error(f"Error tracking search analytics: {str(e)}")
+            return None
 
 
 class AdvancedCandidateSearchView(generics.GenericAPIView):
@@ -290,7 +267,9 @@ class AdvancedCandidateSearchView(generics.GenericAPIView):
             )
             
             # Track search analytics
-            self._track_search_analytics(request.user, query, filters, len(search_results.get('results', [])))
+            search_results['search_id'] = self._track_search_analytics(
+                request, query, filters, len(search_results.get('results', []))
+            )
             
             return Response(search_results, status=status.HTTP_200_OK)
             
@@ -301,32 +280,18 @@ class AdvancedCandidateSearchView(generics.GenericAPIView):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
     
-    def _track_search_analytics(self, user, query, filters, result_count):
+    def _track_search_analytics(self, request, query, filters, result_count):
         """
-        Track search analytics for optimization
+        Buffer a search event; rows are written by flush_search_events_task
         """
         try:
-            SearchAnalytics.objects.create(
-                user=user,
-                search_type='candidates',
-                query=query,
-                filters_applied=filters,
-                results_count=result_count
+            return record_search_event(
+                'candidates', query, filters, result_count,
+                user=request.user, request=request
             )
-            
-            # Update popular search terms
-            if query:
-                popular_term, created = PopularSearchTerms.objects.get_or_create(
-                    search_type='candidates',
-                    term=query.lower(),
-                    defaults={'search_count': 1}
-                )
-                if not created:
-                    popular_term.search_count += 1
-                    popular_term.save()
-                    
         except Exception as e:
             logger.error(f"Error tracking search analytics: {str(e)}")
+            return None
 
 
 @api_view(['GET'])
@@ -665,6 +630,40 @@ def search_analytics_view(request):
         )
 
 
+@api_view(['GET'])
+@permission_classes([permissions.IsAdminUser])
+def search_event_pipeline_stats_view(request):
+    """
+    Get buffer depth, batch sizes and flush lag of the search event pipeline
+    """
+    try:
+        return Response(get_search_event_stats(), status=status.HTTP_200_OK)
+        
+    except Exception as e:
+        logger.error(f"Error getting search event pipeline stats: {str(e)}")
+        return Response(
+            {'error': 'Failed to get pipeline stats', 'details': str(e)}, 
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAdminUser])
+def search_cache_stats_view(request):
+    """
+    Get hit rates of the shared search result caches and the personalization layer
+    """
+    try:
+        return Response(SearchOptimizer.get_cache_stats(), status=status.HTTP_200_OK)
+        
+    except Exception as e:
+        logger.error(f"Error getting search cache stats: {str(e)}")
+        return Response(
+            {'error': 'Failed to get search cache stats', 'details': str(e)}, 
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def track_search_interaction_view(request):
@@ -683,24 +682,14 @@ def track_search_interaction_view(request):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Update search analytics with interaction data
-        try:
-            search_analytics = SearchAnalytics.objects.get(
-                id=search_id,
-                user=request.user
+        if not is_valid_search_id(search_id):
+            return Response(
+                {'error': 'Invalid search_id'},
+                status=status.HTTP_400_BAD_REQUEST
             )
-            
-            # Add to clicked results
-            if interaction_type == 'click':
-                clicked_results = search_analytics.clicked_results or []
-                if result_id not in clicked_results:
-                    clicked_results.append(result_id)
-                    search_analytics.clicked_results = clicked_results
-                    search_analytics.save()
-            
-        except SearchAnalytics.DoesNotExist:
-            # If search analytics record doesn't exist, create a basic one
-            pass
+        
+        # Buffer the interaction; clicks are applied to the search row on flush
+        record_search_interaction(search_id, interaction_type, result_id, user=request.user)
         
         # Log the interaction for analytics
         logger.info(f"Search interaction - User: {request.user.id}, "
@@ -0,0 +1,31 @@
+"""
+DRF renderers for HireWise backend.
+"""
+
+from rest_framework.renderers import JSONRenderer
+
+from . import fast_json
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer that encodes with orjson when it is available.
+
+    Output matches JSONRenderer's compact form. Indented responses
+    (`Accept: application/json; indent=4`), COMPACT_JSON=False, ASCII output
+    and the stdlib backend go through JSONRenderer unchanged.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if not fast_json.USE_ORJSON or indent is not None or not self.compact or self.ensure_ascii:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = fast_json.dumps_bytes(data)
+        # Same escaping as JSONRenderer: these are line terminators in JavaScript
+        if b'\xe2\x80' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
@@ -35,8 +35,8 @@ class SearchAnalytics(models.Model):
     user_agent = models.TextField(blank=True)
     session_id = models.CharField(max_length=40, blank=True)
     
-    # Timestamps
-    searched_at = models.DateTimeField(auto_now_add=True)
+    # Timestamps (set explicitly when events are flushed from the buffer)
+    searched_at = models.DateTimeField(default=timezone.now)
     
     class Meta:
         ordering = ['-searched_at']
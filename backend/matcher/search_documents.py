@@ -0,0 +1,278 @@
+"""
+Denormalized job search documents for HireWise backend.
+
+Each active JobPost has one JobSearchDocument row carrying everything search,
+listings, recommendations and cache warming need: company name, normalized
+skills, location, salary range, popularity and freshness. Signals keep rows in
+step with writes; reconcile_job_search_documents() repairs drift from bulk
+updates and refreshes time-dependent scores.
+"""
+
+import logging
+from datetime import timedelta
+from typing import Any, Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+
+from .models import Application, JobPost, JobSearchDocument, JobView
+
+logger = logging.getLogger(__name__)
+
+SEARCH_DOCUMENTS_CONFIG = getattr(settings, 'SEARCH_DOCUMENTS', {})
+
+RECONCILE_BATCH_SIZE = SEARCH_DOCUMENTS_CONFIG.get('RECONCILE_BATCH_SIZE', 500)
+
+# JobPost fields copied into the document; saves touching none of them skip the sync
+SOURCE_FIELDS = frozenset({
+    'recruiter', 'title', 'slug', 'description', 'requirements', 'location', 'geo_location',
+    'remote_work_allowed', 'job_type', 'experience_level', 'salary_min', 'salary_max',
+    'salary_currency', 'skills_required', 'is_featured', 'application_deadline', 'is_active',
+})
+
+# Applications weigh twice as much as views in popularity
+APPLICATION_WEIGHT = 2
+
+
+def normalize_skills(skills_required: Optional[str]) -> List[str]:
+    """
+    Split a comma-separated skills string into stripped, case-insensitively unique names
+    """
+    seen = set()
+    skills = []
+    for skill in (skills_required or '').split(','):
+        skill = skill.strip()
+        if skill and skill.lower() not in seen:
+            seen.add(skill.lower())
+            skills.append(skill)
+    return skills
+
+
+def skills_text(skills: Iterable[str]) -> str:
+    """
+    Lower-cased, comma-delimited skills (",python,django,") so a single skill can be
+    matched with `skills_text__contains=f",{skill},"` and a fragment with `__contains`
+    """
+    skills = [skill.lower() for skill in skills]
+    return f",{','.join(skills)}," if skills else ''
+
+
+def freshness_score(created_at, now=None) -> int:
+    """
+    Freshness bucket: 3 within a week, 2 within a month, 1 otherwise
+    """
+    age = (now or timezone.now()) - created_at
+    if age <= timedelta(days=7):
+        return 3
+    if age <= timedelta(days=30):
+        return 2
+    return 1
+
+
+def popularity_score(views_count: int, applications_count: int) -> int:
+    return views_count + applications_count * APPLICATION_WEIGHT
+
+
+def build_search_document(job: JobPost, views_count: int = 0, applications_count: int = 0,
+                          now=None) -> JobSearchDocument:
+    """
+    Build (without saving) the search document for a job
+    """
+    recruiter = job.recruiter
+    profile = getattr(recruiter, 'recruiter_profile', None)
+    company_name = profile.company_name if profile else ''
+    skills = normalize_skills(job.skills_required)
+
+    search_text = ' '.join(
+        part for part in (
+            job.title, company_name, job.location, ' '.join(skills), job.description, job.requirements
+        ) if part
+    ).lower()
+
+    return JobSearchDocument(
+        job_post_id=job.id,
+        recruiter_id=job.recruiter_id,
+        title=job.title,
+        slug=job.slug,
+        company_name=company_name,
+        company_logo=profile.company_logo.name if profile and profile.company_logo else '',
+        recruiter_name=recruiter.username,
+        location=job.location,
+        geo_location_id=job.geo_location_id,
+        remote_work_allowed=job.remote_work_allowed,
+        job_type=job.job_type,
+        experience_level=job.experience_level,
+        salary_min=job.salary_min,
+        salary_max=job.salary_max,
+        salary_currency=job.salary_currency,
+        skills=skills,
+        skills_text=skills_text(skills),
+        search_text=search_text,
+        is_featured=job.is_featured,
+        application_deadline=job.application_deadline,
+        created_at=job.created_at,
+        views_count=views_count,
+        applications_count=applications_count,
+        popularity_score=popularity_score(views_count, applications_count),
+        freshness_score=freshness_score(job.created_at, now),
+    )
+
+
+DOCUMENT_UPDATE_FIELDS = [
+    'recruiter', 'title', 'slug', 'company_name', 'company_logo', 'recruiter_name', 'location',
+    'geo_location', 'remote_work_allowed', 'job_type', 'experience_level', 'salary_min', 'salary_max',
+    'salary_currency', 'skills', 'skills_text', 'search_text', 'is_featured', 'application_deadline',
+    'created_at', 'views_count', 'applications_count', 'popularity_score', 'freshness_score', 'synced_at',
+]
+
+
+def sync_job_search_document(job: JobPost) -> Optional[JobSearchDocument]:
+    """
+    Create, refresh or delete the search document after a job is saved.
+
+    Counters are carried over from the existing row; signals and the reconciler own them.
+    """
+    if not job.is_active:
+        JobSearchDocument.objects.filter(job_post_id=job.id).delete()
+        return None
+
+    counts = JobSearchDocument.objects.filter(job_post_id=job.id).values(
+        'views_count', 'applications_count'
+    ).first()
+    if counts is None:
+        counts = {
+            'views_count': job.job_views.count(),
+            'applications_count': job.applications.count(),
+        }
+
+    document = build_search_document(job, **counts)
+    JobSearchDocument.objects.bulk_create(
+        [document],
+        update_conflicts=True,
+        unique_fields=['job_post'],
+        update_fields=DOCUMENT_UPDATE_FIELDS,
+    )
+    return document
+
+
+def refresh_recruiter_documents(recruiter_profile) -> int:
+    """
+    Copy a recruiter's company name and logo onto their job documents
+    """
+    return JobSearchDocument.objects.filter(recruiter_id=recruiter_profile.user_id).update(
+        company_name=recruiter_profile.company_name,
+        company_logo=recruiter_profile.company_logo.name if recruiter_profile.company_logo else '',
+        synced_at=timezone.now(),
+    )
+
+
+def adjust_document_counters(job_post_id, views: int = 0, applications: int = 0) -> int:
+    """
+    Atomically shift view/application counters and popularity for one document
+    """
+    return JobSearchDocument.objects.filter(job_post_id=job_post_id).update(
+        views_count=Greatest(F('views_count') + views, 0),
+        applications_count=Greatest(F('applications_count') + applications, 0),
+        popularity_score=Greatest(
+            F('popularity_score') + views + applications * APPLICATION_WEIGHT, 0
+        ),
+    )
+
+
+def reconcile_job_search_documents(batch_size: int = RECONCILE_BATCH_SIZE) -> Dict[str, int]:
+    """
+    Rebuild documents from the source tables.
+
+    Deletes documents for jobs that are inactive, upserts one document per active
+    job with counters recounted from applications and job views, and refreshes
+    freshness buckets. Catches changes made with queryset.update(), which skips
+    signals.
+    """
+    removed, _ = JobSearchDocument.objects.filter(job_post__is_active=False).delete()
+    upserted = _rebuild_documents(JobPost.objects.all(), batch_size)
+
+    logger.info(f"Reconciled job search documents: {upserted} upserted, {removed} removed")
+    return {'upserted': upserted, 'removed': removed}
+
+
+def sync_job_search_documents(job_ids: Iterable, batch_size: int = RECONCILE_BATCH_SIZE) -> Dict[str, int]:
+    """
+    Bring the documents of specific jobs up to date after a bulk queryset.update()
+    """
+    job_ids = list(job_ids)
+    removed, _ = JobSearchDocument.objects.filter(
+        job_post_id__in=job_ids, job_post__is_active=False
+    ).delete()
+    upserted = _rebuild_documents(JobPost.objects.filter(id__in=job_ids), batch_size)
+    return {'upserted': upserted, 'removed': removed}
+
+
+def _related_count(related_model, job_field: str = 'job_post'):
+    """
+    Correlated per-job row count of a related table.
+
+    Counting two relations with joins would multiply their rows (views x
+    applications per job); separate subqueries each scan one index range.
+    """
+    counts = related_model.objects.filter(**{job_field: OuterRef('pk')}).order_by().values(
+        job_field
+    ).annotate(total=Count('pk')).values('total')
+    return Coalesce(Subquery(counts), 0)
+
+
+def _rebuild_documents(jobs, batch_size: int) -> int:
+    now = timezone.now()
+    active_jobs = jobs.filter(is_active=True).select_related(
+        'recruiter', 'recruiter__recruiter_profile'
+    ).annotate(
+        document_views=_related_count(JobView),
+        document_applications=_related_count(Application),
+    ).order_by('created_at', 'id')
+
+    upserted = 0
+    batch = []
+    for job in active_jobs.iterator(chunk_size=batch_size):
+        batch.append(build_search_document(
+            job, views_count=job.document_views, applications_count=job.document_applications, now=now
+        ))
+        if len(batch) >= batch_size:
+            upserted += _upsert_documents(batch)
+            batch = []
+    if batch:
+        upserted += _upsert_documents(batch)
+    return upserted
+
+
+def _upsert_documents(documents: List[JobSearchDocument]) -> int:
+    with transaction.atomic():
+        JobSearchDocument.objects.bulk_create(
+            documents,
+            update_conflicts=True,
+            unique_fields=['job_post'],
+            update_fields=DOCUMENT_UPDATE_FIELDS,
+        )
+    return len(documents)
+
+
+def serialize_search_document(document: JobSearchDocument) -> Dict[str, Any]:
+    """
+    Common job payload for search results and recommendations
+    """
+    return {
+        'id': str(document.job_post_id),
+        'title': document.title,
+        'company': document.company_name or 'Unknown',
+        'location': document.location,
+        'remote_work_allowed': document.remote_work_allowed,
+        'job_type': document.job_type,
+        'experience_level': document.experience_level,
+        'salary_min': document.salary_min,
+        'salary_max': document.salary_max,
+        'skills_required': document.skills,
+        'created_at': document.created_at.isoformat(),
+        'applications_count': document.applications_count,
+        'views_count': document.views_count,
+    }
@@ -0,0 +1,641 @@
+"""
+Buffered search analytics ingestion for HireWise backend.
+
+Search endpoints append lightweight events to a buffer instead of writing
+SearchAnalytics rows on the request path. A periodic Celery task drains the
+Redis buffer and persists events in bulk, updating PopularSearchTerms counters
+with aggregated increments. Without Redis each process buffers its own events
+and a daemon thread in that process flushes them. Events that cannot be persisted on their own are moved
+to a dead-letter list, so one bad event never blocks the rest of the buffer.
+"""
+
+import json
+import time
+import uuid
+import logging
+import threading
+from collections import Counter, defaultdict, deque
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import InterfaceError, OperationalError, close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .cache_utils import get_redis_client
+from .exceptions import get_client_ip
+
+logger = logging.getLogger(__name__)
+
+SEARCH_EVENTS_CONFIG = getattr(settings, 'SEARCH_EVENTS', {})
+
+BUFFER_KEY = 'search_events:buffer'
+PROCESSING_KEY = 'search_events:processing'
+STATS_KEY = 'search_events:stats'
+RECENT_BATCHES_KEY = 'search_events:recent_batches'
+DEAD_LETTER_SUFFIX = 'dead_letter'
+FLUSH_INTERVAL = SEARCH_EVENTS_CONFIG.get('FLUSH_INTERVAL', 30)
+MAX_BUFFER_LENGTH = SEARCH_EVENTS_CONFIG.get('MAX_BUFFER_LENGTH', 100000)
+FLUSH_BATCH_SIZE = SEARCH_EVENTS_CONFIG.get('FLUSH_BATCH_SIZE', 1000)
+LOCAL_FLUSH_THRESHOLD = SEARCH_EVENTS_CONFIG.get('LOCAL_FLUSH_THRESHOLD', 500)
+CLAIM_TIMEOUT = SEARCH_EVENTS_CONFIG.get('CLAIM_TIMEOUT', 600)  # seconds
+DEAD_LETTER_MAX_LENGTH = SEARCH_EVENTS_CONFIG.get('DEAD_LETTER_MAX_LENGTH', 10000)
+RECENT_FLUSHES_KEPT = 20
+
+COUNTER_FIELDS = ('flush_runs', 'events_flushed', 'dropped_events', 'failed_flushes', 'dead_lettered_events')
+
+# Errors that say the database is unavailable rather than that an event is bad
+TRANSIENT_ERRORS = (OperationalError, InterfaceError)
+
+
+class SearchEventBuffer:
+    """
+    Append-only buffer of search events.
+
+    Events are pushed to a Redis list shared by all workers. A flush claims a
+    batch by moving it onto its own processing list and only deletes it once
+    the batch is committed, so a failed write puts the events back.
+
+    When the cache backend is not Redis, events go to an in-process deque that
+    only a background flusher thread in the same process can drain; the
+    Celery flush task never sees it.
+
+    Other event pipelines reuse the buffer with their own keys and override
+    _record_dropped() and _on_local_push() to report to their own stats and flusher.
+    """
+
+    def __init__(self, key: str = BUFFER_KEY, max_length: int = MAX_BUFFER_LENGTH,
+                 processing_key: str = PROCESSING_KEY):
+        self.key = key
+        self.max_length = max_length
+        self.processing_key = processing_key
+        self._local = deque()
+        self._local_claims = {}
+        self._local_dead_letters = deque(maxlen=DEAD_LETTER_MAX_LENGTH)
+        self._lock = threading.Lock()
+
+    def _redis_key(self) -> str:
+        return cache.make_key(self.key)
+
+    def _processing_index_key(self) -> str:
+        return cache.make_key(self.processing_key)
+
+    def _record_dropped(self, count: int) -> None:
+        _incr_stat('dropped_events', count)
+
+    def _on_local_push(self, pending: int) -> None:
+        _ensure_local_flusher(request_flush=pending >= LOCAL_FLUSH_THRESHOLD)
+
+    def push(self, event: Dict[str, Any]) -> bool:
+        """
+        Append an event to the buffer, trimming the oldest events past max_length.
+        """
+        payload = json.dumps(event, cls=DjangoJSONEncoder)
+        client = get_redis_client()
+
+        if client is None:
+            with self._lock:
+                dropped = 0
+                if len(self._local) >= self.max_length:
+                    self._local.popleft()
+                    dropped = 1
+                self._local.append(payload)
+                pending = len(self._local)
+            if dropped:
+                self._record_dropped(dropped)
+            self._on_local_push(pending)
+            return True
+
+        try:
+            pipe = client.pipeline(transaction=False)
+            pipe.rpush(self._redis_key(), payload)
+            pipe.ltrim(self._redis_key(), -self.max_length, -1)
+            length, _ = pipe.execute()
+            if length > self.max_length:
+                self._record_dropped(length - self.max_length)
+            return True
+        except Exception as e:
+            logger.error(f"Error buffering event in {self.key}: {e}")
+            return False
+
+    def claim_batch(self, batch_size: int) -> Tuple[Optional[str], List[Dict[str, Any]]]:
+        """
+        Move up to batch_size events from the head of the buffer onto a processing list.
+
+        Returns the claim id to pass to ack() or requeue(), and the decoded events.
+        """
+        claim_id = f"{self.processing_key}:{uuid.uuid4().hex}"
+        client = get_redis_client()
+
+        if client is None:
+            with self._lock:
+                payloads = [self._local.popleft() for _ in range(min(batch_size, len(self._local)))]
+                if payloads:
+                    self._local_claims[claim_id] = payloads
+        else:
+            claim_key = cache.make_key(claim_id)
+            client.zadd(self._processing_index_key(), {claim_key: time.time()})
+            pipe = client.pipeline(transaction=False)
+            for _ in range(batch_size):
+                pipe.lmove(self._redis_key(), claim_key, 'LEFT', 'RIGHT')
+            payloads = [payload for payload in pipe.execute() if payload is not None]
+            if not payloads:
+                client.zrem(self._processing_index_key(), claim_key)
+
+        if not payloads:
+            return None, []
+
+        events = []
+        for payload in payloads:
+            try:
+                events.append(json.loads(payload))
+            except (TypeError, ValueError):
+                logger.warning(f"Dropping malformed event from {self.key}")
+        return claim_id, events
+
+    def ack(self, claim_id: str) -> None:
+        """
+        Discard a claimed batch once it has been persisted.
+        """
+        client = get_redis_client()
+
+        if client is None:
+            with self._lock:
+                self._local_claims.pop(claim_id, None)
+            return
+
+        claim_key = cache.make_key(claim_id)
+        pipe = client.pipeline(transaction=True)
+        pipe.delete(claim_key)
+        pipe.zrem(self._processing_index_key(), claim_key)
+        pipe.execute()
+
+    def requeue(self, claim_id: str) -> None:
+        """
+        Put a claimed batch back at the head of the buffer, preserving order.
+        """
+        client = get_redis_client()
+
+        if client is None:
+            with self._lock:
+                payloads = self._local_claims.pop(claim_id, [])
+                self._local.extendleft(reversed(payloads))
+            return
+
+        self._requeue_redis(client, cache.make_key(claim_id))
+
+    def _requeue_redis(self, client, claim_key: str) -> None:
+        pipe = client.pipeline(transaction=False)
+        for _ in range(client.llen(claim_key)):
+            pipe.lmove(claim_key, self._redis_key(), 'RIGHT', 'LEFT')
+        pipe.delete(claim_key)
+        pipe.zrem(self._processing_index_key(), claim_key)
+        pipe.execute()
+
+    def dead_letter(self, events: List[Dict[str, Any]]) -> None:
+        """
+        Keep events that cannot be persisted for inspection, capped at DEAD_LETTER_MAX_LENGTH.
+        """
+        if not events:
+            return
+        payloads = [json.dumps(event, cls=DjangoJSONEncoder) for event in events]
+        client = get_redis_client()
+
+        if client is None:
+            with self._lock:
+                self._local_dead_letters.extend(payloads)
+            return
+
+        try:
+            key = cache.make_key(f"{self.key}:{DEAD_LETTER_SUFFIX}")
+            pipe = client.pipeline(transaction=False)
+            pipe.rpush(key, *payloads)
+            pipe.ltrim(key, -DEAD_LETTER_MAX_LENGTH, -1)
+            pipe.execute()
+        except Exception as e:
+            logger.error(f"Error dead-lettering {len(events)} events from {self.key}: {e}")
+
+    def recover_stale_claims(self, timeout: int = CLAIM_TIMEOUT) -> int:
+        """
+        Requeue batches claimed by flushers that died before acknowledging them.
+        """
+        client = get_redis_client()
+        if client is None:
+            return 0
+
+        stale_keys = client.zrangebyscore(self._processing_index_key(), 0, time.time() - timeout)
+        for claim_key in stale_keys:
+            claim_key = claim_key.decode() if isinstance(claim_key, bytes) else claim_key
+            logger.warning(f"Requeueing stale event claim {claim_key}")
+            self._requeue_redis(client, claim_key)
+        return len(stale_keys)
+
+    def clear(self) -> None:
+        """
+        Drop all buffered and claimed events.
+        """
+        with self._lock:
+            self._local.clear()
+            self._local_claims.clear()
+            self._local_dead_letters.clear()
+
+        client = get_redis_client()
+        if client is not None:
+            claim_keys = client.zrange(self._processing_index_key(), 0, -1)
+            client.delete(
+                self._redis_key(), self._processing_index_key(),
+                cache.make_key(f"{self.key}:{DEAD_LETTER_SUFFIX}"), *claim_keys
+            )
+
+    def __len__(self) -> int:
+        client = get_redis_client()
+        if client is None:
+            return len(self._local)
+        try:
+            return client.llen(self._redis_key())
+        except Exception as e:
+            logger.error(f"Error reading length of {self.key}: {e}")
+            return 0
+
+
+search_event_buffer = SearchEventBuffer()
+
+
+class LocalFlusher:
+    """
+    Daemon thread that runs a flush function every interval seconds, or sooner
+    when asked. Used when a buffer is not backed by Redis.
+
+    It is started by the first push to a process's local buffer, so every
+    process holding local events drains them itself; flushes never run in
+    the pushing thread.
+    """
+
+    def __init__(self, name: str, flush: Callable[[], Any], interval: int):
+        self.name = name
+        self.flush = flush
+        self.interval = interval
+        self._thread = None
+        self._requested = threading.Event()
+        self._lock = threading.Lock()
+
+    def ensure(self, request_flush: bool = False) -> None:
+        """
+        Start the thread if it is not running, optionally waking it for an early flush.
+        """
+        if self._thread is None or not self._thread.is_alive():
+            with self._lock:
+                if self._thread is None or not self._thread.is_alive():
+                    self._thread = threading.Thread(target=self._loop, name=self.name, daemon=True)
+                    self._thread.start()
+
+        if request_flush:
+            self._requested.set()
+
+    def _loop(self) -> None:
+        while True:
+            self._requested.wait(self.interval)
+            self._requested.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Error in {self.name}: {e}")
+            finally:
+                close_old_connections()
+
+
+_local_flusher = LocalFlusher('search-events-flusher', lambda: flush_search_events(), FLUSH_INTERVAL)
+
+
+def _ensure_local_flusher(request_flush: bool = False) -> None:
+    """
+    Start the in-process flusher used when the buffer is not backed by Redis.
+    """
+    _local_flusher.ensure(request_flush)
+
+
+def record_search_event(search_type: str, query: str, filters: Optional[Dict] = None,
+                        results_count: int = 0, user=None, request=None) -> str:
+    """
+    Buffer a search event and return the id its SearchAnalytics row will get.
+    """
+    search_id = str(uuid.uuid4())
+    event = {
+        'kind': 'search',
+        'id': search_id,
+        'search_type': search_type,
+        'query': query or '',
+        'filters': filters or {},
+        'results_count': results_count,
+        'user_id': str(user.id) if user is not None and user.is_authenticated else None,
+        'searched_at': timezone.now(),
+        'enqueued_at': time.time(),
+    }
+
+    if request is not None:
+        event.update({
+            'ip_address': get_client_ip(request),
+            'user_agent': request.META.get('HTTP_USER_AGENT', '')[:500],
+            'session_id': getattr(getattr(request, 'session', None), 'session_key', None) or '',
+        })
+
+    search_event_buffer.push(event)
+    return search_id
+
+
+def is_valid_search_id(search_id: Any) -> bool:
+    try:
+        uuid.UUID(str(search_id))
+    except (TypeError, ValueError, AttributeError):
+        return False
+    return True
+
+
+def record_search_interaction(search_id: str, interaction_type: str, result_id: str, user=None) -> bool:
+    """
+    Buffer a click or other interaction against a previously recorded search.
+
+    Returns False without buffering anything when search_id is not a UUID.
+    """
+    if not is_valid_search_id(search_id):
+        return False
+    return search_event_buffer.push({
+        'kind': 'interaction',
+        'search_id': str(search_id),
+        'interaction_type': interaction_type,
+        'result_id': str(result_id),
+        'user_id': str(user.id) if user is not None else None,
+        'enqueued_at': time.time(),
+    })
+
+
+def persist_claimed_batch(
+    buffer: SearchEventBuffer,
+    claim_id: str,
+    events: List[Dict[str, Any]],
+    persist: Callable[[List[Dict[str, Any]]], Any],
+    stats_key: str = STATS_KEY,
+) -> List[Any]:
+    """
+    Persist a claimed batch and acknowledge it, returning the results of persist().
+
+    When the batch fails because the database is unavailable, it is put back
+    on the buffer and the error re-raised. Any other failure means some event
+    is bad: the events are then persisted one at a time and those that still
+    fail are dead-lettered, so they cannot block later flushes.
+    """
+    try:
+        result = persist(events)
+    except TRANSIENT_ERRORS:
+        buffer.requeue(claim_id)
+        _incr_stat('failed_flushes', stats_key=stats_key)
+        raise
+    except Exception as batch_error:
+        logger.error(f"Batch of {len(events)} events from {buffer.key} failed, isolating bad events: {batch_error}")
+    else:
+        buffer.ack(claim_id)
+        return [result]
+
+    results = []
+    failed = []
+    for index, event in enumerate(events):
+        try:
+            results.append(persist([event]))
+        except TRANSIENT_ERRORS:
+            # Persisted events are not retried; the rest go back on the buffer
+            for remaining in events[index:]:
+                buffer.push(remaining)
+            buffer.dead_letter(failed)
+            buffer.ack(claim_id)
+            _incr_stat('failed_flushes', stats_key=stats_key)
+            raise
+        except Exception as e:
+            logger.error(f"Dead-lettering event from {buffer.key}: {e}")
+            failed.append(event)
+
+    buffer.dead_letter(failed)
+    buffer.ack(claim_id)
+    if failed:
+        _incr_stat('dead_lettered_events', len(failed), stats_key=stats_key)
+    return results
+
+
+def flush_search_events(batch_size: int = FLUSH_BATCH_SIZE, max_batches: int = 10) -> Dict[str, Any]:
+    """
+    Drain the buffer into SearchAnalytics and PopularSearchTerms.
+
+    Each batch is written in one transaction: a bulk insert of search rows,
+    aggregated counter upserts for popular terms and a bulk update of clicks.
+    A batch that fails because the database is unavailable is put back on the
+    buffer and the error re-raised; bad events are dead-lettered.
+    """
+    search_event_buffer.recover_stale_claims()
+
+    total_events = 0
+    batches = []
+
+    try:
+        for _ in range(max_batches):
+            claim_id, events = search_event_buffer.claim_batch(batch_size)
+            if claim_id is None:
+                break
+
+            started = time.time()
+            oldest = min((event.get('enqueued_at', started) for event in events), default=started)
+
+            persist_claimed_batch(search_event_buffer, claim_id, events, _persist_events)
+
+            batch_stats = {
+                'size': len(events),
+                'lag_seconds': round(started - oldest, 3),
+                'duration_ms': round((time.time() - started) * 1000, 2),
+            }
+            batches.append(batch_stats)
+            total_events += len(events)
+
+            if len(events) < batch_size:
+                break
+    finally:
+        _update_flush_stats(batches)
+
+    return {
+        'events_flushed': total_events,
+        'batches': batches,
+        'pending': len(search_event_buffer),
+    }
+
+
+def _persist_events(events: List[Dict[str, Any]]) -> None:
+    from .search_analytics import SearchAnalytics
+
+    searches = [event for event in events if event.get('kind') == 'search']
+    interactions = [event for event in events if event.get('kind') == 'interaction']
+
+    with transaction.atomic():
+        if searches:
+            SearchAnalytics.objects.bulk_create(
+                [
+                    SearchAnalytics(
+                        id=event['id'],
+                        user_id=event.get('user_id'),
+                        search_type=event['search_type'],
+                        query=event.get('query', ''),
+                        filters_applied=event.get('filters') or {},
+                        results_count=event.get('results_count', 0),
+                        ip_address=event.get('ip_address'),
+                        user_agent=event.get('user_agent', ''),
+                        session_id=event.get('session_id', ''),
+                        searched_at=parse_datetime(event['searched_at']) if event.get('searched_at') else timezone.now(),
+                    )
+                    for event in searches
+                ],
+                batch_size=500,
+                ignore_conflicts=True,
+            )
+            _upsert_popular_terms(searches)
+
+        if interactions:
+            _apply_interactions(interactions)
+
+
+def _upsert_popular_terms(searches: List[Dict[str, Any]]) -> None:
+    """
+    Increment PopularSearchTerms counters with one statement per distinct increment.
+    """
+    from .search_analytics import PopularSearchTerms
+
+    term_counts = Counter(
+        (event['search_type'], event['query'].strip().lower()[:255])
+        for event in searches
+        if event.get('query', '').strip()
+    )
+    if not term_counts:
+        return
+
+    # Make sure every term has a row, then increment atomically so concurrent
+    # flushers never lose counts.
+    PopularSearchTerms.objects.bulk_create(
+        [
+            PopularSearchTerms(search_type=search_type, term=term, search_count=0)
+            for search_type, term in term_counts
+        ],
+        ignore_conflicts=True,
+    )
+
+    by_increment = defaultdict(lambda: defaultdict(list))
+    for (search_type, term), count in term_counts.items():
+        by_increment[count][search_type].append(term)
+
+    now = timezone.now()
+    for increment, terms_by_type in by_increment.items():
+        for search_type, terms in terms_by_type.items():
+            PopularSearchTerms.objects.filter(
+                search_type=search_type, term__in=terms
+            ).update(search_count=F('search_count') + increment, last_searched=now)
+
+
+def _apply_interactions(interactions: List[Dict[str, Any]]) -> None:
+    from .search_analytics import SearchAnalytics
+
+    clicks = defaultdict(list)
+    for event in interactions:
+        if event.get('interaction_type') != 'click':
+            continue
+        if not is_valid_search_id(event.get('search_id')):
+            logger.warning(f"Dropping interaction with invalid search id {event.get('search_id')!r}")
+            continue
+        clicks[str(uuid.UUID(str(event['search_id'])))].append((event['result_id'], event.get('user_id')))
+
+    if not clicks:
+        return
+
+    searches = list(SearchAnalytics.objects.filter(id__in=list(clicks.keys())))
+    for search in searches:
+        clicked_results = search.clicked_results or []
+        for result_id, user_id in clicks[str(search.id)]:
+            # Users may only record clicks against their own searches
+            if user_id != str(search.user_id):
+                continue
+            if result_id not in clicked_results:
+                clicked_results.append(result_id)
+        search.clicked_results = clicked_results
+
+    SearchAnalytics.objects.bulk_update(searches, ['clicked_results'], batch_size=500)
+
+
+def _incr_stat(name: str, amount: int = 1, stats_key: str = STATS_KEY) -> None:
+    """
+    Atomically increment a pipeline counter shared by all processes.
+    """
+    try:
+        client = get_redis_client()
+        if client is not None:
+            client.hincrby(cache.make_key(stats_key), name, amount)
+            return
+
+        key = f"{stats_key}:{name}"
+        cache.add(key, 0, None)
+        cache.incr(key, amount)
+    except Exception as e:
+        logger.error(f"Error updating event stat {stats_key}:{name}: {e}")
+
+
+def _update_flush_stats(batches: List[Dict[str, Any]]) -> None:
+    _incr_stat('flush_runs')
+
+    latest = {'last_flush_at': timezone.now().isoformat()}
+    if batches:
+        _incr_stat('events_flushed', sum(batch['size'] for batch in batches))
+        latest.update({
+            'last_batch_size': batches[-1]['size'],
+            'last_flush_lag_seconds': max(batch['lag_seconds'] for batch in batches),
+        })
+
+    try:
+        client = get_redis_client()
+        if client is not None:
+            pipe = client.pipeline(transaction=False)
+            pipe.hset(cache.make_key(STATS_KEY), mapping={k: json.dumps(v) for k, v in latest.items()})
+            if batches:
+                pipe.lpush(cache.make_key(RECENT_BATCHES_KEY), *[json.dumps(batch) for batch in batches])
+                pipe.ltrim(cache.make_key(RECENT_BATCHES_KEY), 0, RECENT_FLUSHES_KEPT - 1)
+            pipe.execute()
+            return
+
+        cache.set_many({f"{STATS_KEY}:{k}": v for k, v in latest.items()}, None)
+        if batches:
+            recent = cache.get(RECENT_BATCHES_KEY) or []
+            cache.set(RECENT_BATCHES_KEY, (list(reversed(batches)) + recent)[:RECENT_FLUSHES_KEPT], None)
+    except Exception as e:
+        logger.error(f"Error updating search event flush stats: {e}")
+
+
+def get_search_event_stats() -> Dict[str, Any]:
+    """
+    Get buffer depth, dropped events and flush statistics for monitoring.
+    """
+    stats = {field: 0 for field in COUNTER_FIELDS}
+    client = get_redis_client()
+
+    if client is not None:
+        for field, value in client.hgetall(cache.make_key(STATS_KEY)).items():
+            field = field.decode() if isinstance(field, bytes) else field
+            stats[field] = json.loads(value)
+        recent_batches = [
+            json.loads(batch) for batch in client.lrange(cache.make_key(RECENT_BATCHES_KEY), 0, -1)
+        ]
+    else:
+        fields = COUNTER_FIELDS + ('last_flush_at', 'last_batch_size', 'last_flush_lag_seconds')
+        values = cache.get_many([f"{STATS_KEY}:{field}" for field in fields])
+        stats.update({key.split(':')[-1]: value for key, value in values.items()})
+        recent_batches = cache.get(RECENT_BATCHES_KEY) or []
+
+    stats['recent_batches'] = recent_batches
+    stats['pending_events'] = len(search_event_buffer)
+
+    sizes = [batch['size'] for batch in recent_batches]
+    stats['avg_batch_size'] = round(sum(sizes) / len(sizes), 2) if sizes else 0
+    return stats
@@ -8,7 +8,7 @@ from .models import (
     Application, AIAnalysisResult, InterviewSession, Skill, UserSkill,
     EmailVerificationToken, PasswordResetToken, JobAnalytics, JobView,
     Notification, ResumeTemplate, ResumeTemplateVersion, UserResumeTemplate,
-    Conversation, Message
+    Conversation, Message, JobSearchDocument
 )
 
 
@@ -68,7 +68,7 @@ class JobSeekerProfileSerializer(serializers.ModelSerializer):
     class Meta:
         model = JobSeekerProfile
         fields = '__all__'
-        read_only_fields = ['user']
+        read_only_fields = ['user', 'geo_location']
 
 
 class RecruiterProfileSerializer(serializers.ModelSerializer):
@@ -101,7 +101,7 @@ class JobPostSerializer(serializers.ModelSerializer):
         fields = '__all__'
         read_only_fields = [
             'id', 'recruiter', 'created_at', 'updated_at', 'views_count', 
-            'applications_count', 'slug', 'is_expired', 'days_since_posted'
+            'applications_count', 'slug', 'is_expired', 'days_since_posted', 'geo_location'
         ]
     
     def get_applications_count(self, obj):
@@ -206,6 +206,42 @@ class JobPostListSerializer(serializers.ModelSerializer):
         return []
 
 
+class JobSearchDocumentListSerializer(serializers.ModelSerializer):
+    """Job listing rows served from denormalized search documents, same shape as JobPostListSerializer"""
+    id = serializers.UUIDField(source='job_post_id', read_only=True)
+    company_logo = serializers.SerializerMethodField()
+    is_active = serializers.SerializerMethodField()
+    is_expired = serializers.ReadOnlyField()
+    days_since_posted = serializers.ReadOnlyField()
+    skills_list = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = JobSearchDocument
+        fields = [
+            'id', 'title', 'company_name', 'company_logo', 'recruiter_name', 'location', 'job_type',
+            'experience_level', 'salary_min', 'salary_max', 'salary_currency',
+            'skills_list', 'is_active', 'is_featured', 'created_at', 'views_count',
+            'applications_count', 'is_expired', 'days_since_posted', 'slug'
+        ]
+    
+    def get_company_logo(self, obj):
+        """Build the logo URL from the stored file name, like ImageField would"""
+        if not obj.company_logo:
+            return None
+        from django.core.files.storage import default_storage
+        url = default_storage.url(obj.company_logo)
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
+    
+    def get_is_active(self, obj):
+        """Documents only exist for active jobs"""
+        return True
+    
+    def get_skills_list(self, obj):
+        """Normalized skills (limited to first 5)"""
+        return obj.skills[:5]
+
+
 class JobAnalyticsSerializer(serializers.ModelSerializer):
     """Serializer for job analytics data"""
     
@@ -3,13 +3,24 @@ Django signals for real-time notifications.
 """
 
 import logging
-from django.db.models.signals import post_save, pre_save
+from django.db import transaction
+from django.db.models.signals import post_save, pre_save, post_delete
 from django.dispatch import receiver
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 
-from .models import JobPost, Application, Notification, NotificationPreference, NotificationTemplate
-from .notification_service import notification_service
+from .models import (
+    JobPost, Application, Notification, NotificationPreference, NotificationTemplate,
+    JobSeekerProfile, UserSkill, RecruiterProfile, JobView, InterviewSession, ResumeTemplate
+)
+from .notification_service import notification_service, get_active_notification_template
+from .cache_utils import AnalyticsCacheManager, cache_manager, CACHE_PREFIXES
+from .dashboard_counters import (
+    adjust_dashboard_counters, application_deltas, refresh_job_post_counters, refresh_profile_completion
+)
+from .search_documents import (
+    SOURCE_FIELDS, adjust_document_counters, refresh_recruiter_documents, sync_job_search_document
+)
 
 User = get_user_model()
 logger = logging.getLogger(__name__)
@@ -22,28 +33,21 @@ def job_posted_notification(sender, instance, created, **kwargs):
     Requirement 5.1: WHEN a job is posted THEN the system SHALL send real-time notifications to relevant job seekers via WebSocket
     """
     if created and instance.is_active:
-        try:
-            # Parse skills from the skills_required field
-            skills_required = []
-            if instance.skills_required:
-                # Assuming skills are stored as comma-separated or JSON
-                if isinstance(instance.skills_required, str):
-                    skills_required = [skill.strip() for skill in instance.skills_required.split(',')]
-                elif isinstance(instance.skills_required, list):
-                    skills_required = instance.skills_required
-            
-            # Get company name from recruiter profile
-            company_name = "Unknown Company"
-            if hasattr(instance.recruiter, 'recruiter_profile'):
-                company_name = instance.recruiter.recruiter_profile.company_name
-            
-            # Use the new notification service to send job posted notifications
-            notification_service.send_job_posted_notification(instance)
-            
-            logger.info(f"Job posted notification sent for job {instance.id}: {instance.title}")
-            
-        except Exception as e:
-            logger.error(f"Failed to send job posted notification for job {instance.id}: {e}")
+        # Fan out from a worker once the job is visible to it, never from the request thread
+        job_id = str(instance.id)
+        transaction.on_commit(lambda: _queue_job_posted_fan_out(job_id))
+
+
+def _queue_job_posted_fan_out(job_id):
+    """Queue the job posted notification fan-out for a committed job."""
+    try:
+        from .tasks import fan_out_job_posted_notifications_task
+        
+        fan_out_job_posted_notifications_task.delay(job_id)
+        logger.info(f"Job posted notifications queued for job {job_id}")
+        
+    except Exception as e:
+        logger.error(f"Failed to queue job posted notifications for job {job_id}: {e}")
 
 
 @receiver(post_save, sender=Application)
@@ -120,82 +124,7 @@ def match_score_notification(sender, job_seeker_id, job_id, job_title, match_sco
 
 def _get_notification_template(template_type: str, delivery_channel: str = 'websocket') -> NotificationTemplate:
     """Get notification template for given type and channel."""
-    try:
-        return NotificationTemplate.objects.filter(
-            template_type=template_type,
-            delivery_channel=delivery_channel,
-            is_active=True
-        ).first()
-    except NotificationTemplate.DoesNotExist:
-        return None
-
-
-def _create_job_posted_notifications(job_post, company_name, skills_required):
-    """Create persistent notifications for job posting."""
-    try:
-        # Get all job seekers who have notifications enabled
-        job_seekers = User.objects.filter(user_type='job_seeker')
-        template = _get_notification_template('job_posted')
-        
-        notifications_to_create = []
-        
-        for job_seeker in job_seekers:
-            # Check user preferences
-            preferences, created = NotificationPreference.objects.get_or_create(
-                user=job_seeker,
-                defaults={
-                    'job_posted_enabled': True,
-                    'job_posted_delivery': 'websocket'
-                }
-            )
-            
-            if not preferences.is_notification_enabled('job_posted'):
-                continue
-            
-            # Skip if in quiet hours
-            if preferences.is_in_quiet_hours():
-                continue
-            
-            # Create notification context
-            context = {
-                'job_title': job_post.title,
-                'company_name': company_name,
-                'location': job_post.location or "Not specified",
-                'job_type': job_post.get_job_type_display(),
-                'skills_required': ', '.join(skills_required) if skills_required else 'Not specified',
-                'user_name': job_seeker.first_name or job_seeker.username
-            }
-            
-            # Render notification content
-            if template:
-                title = template.render_title(context)
-                message = template.render_message(context)
-            else:
-                title = f"New Job: {job_post.title}"
-                message = f"A new {job_post.get_job_type_display().lower()} position at {company_name} has been posted."
-            
-            notifications_to_create.append(Notification(
-                recipient=job_seeker,
-                notification_type='job_posted',
-                title=title,
-                message=message,
-                job_post=job_post,
-                data={
-                    'job_id': str(job_post.id),
-                    'company_name': company_name,
-                    'location': job_post.location,
-                    'skills_required': skills_required
-                },
-                priority='normal'
-            ))
-        
-        # Bulk create notifications
-        if notifications_to_create:
-            Notification.objects.bulk_create(notifications_to_create)
-            logger.info(f"Created {len(notifications_to_create)} job posted notifications")
-            
-    except Exception as e:
-        logger.error(f"Failed to create job posted notifications: {e}")
+    return get_active_notification_template(template_type, delivery_channel)
 
 
 def _create_application_received_notification(application):
@@ -449,4 +378,174 @@ def create_notification_preferences(sender, instance, created, **kwargs):
             )
             logger.info(f"Created notification preferences for user {instance.id}")
         except Exception as e:
-            logger.error(f"Failed to create notification preferences for user {instance.id}: {e}")
\ No newline at end of file
+            logger.error(f"Failed to create notification preferences for user {instance.id}: {e}")
+
+
+# Keep cached search personalization in step with the profile it was built from
+@receiver([post_save, post_delete], sender=JobSeekerProfile)
+@receiver([post_save, post_delete], sender=UserSkill)
+def invalidate_search_personalization(sender, instance, **kwargs):
+    """Drop the cached search personalization context for the affected user."""
+    from .recommendation_engine import SearchOptimizer
+    
+    SearchOptimizer.invalidate_personalization(instance.user_id)
+
+
+# Keep denormalized job search documents in step with their source rows
+@receiver(post_save, sender=JobPost)
+def sync_job_search_document_on_save(sender, instance, created, update_fields=None, **kwargs):
+    """Upsert or drop the job's search document when a document field changes."""
+    if update_fields and not (set(update_fields) & SOURCE_FIELDS):
+        return
+    try:
+        sync_job_search_document(instance)
+    except Exception as e:
+        logger.error(f"Failed to sync search document for job {instance.id}: {e}")
+
+
+@receiver(post_save, sender=RecruiterProfile)
+def refresh_job_search_documents_company(sender, instance, created, **kwargs):
+    """Copy company name and logo changes onto the recruiter's job documents."""
+    if not created:
+        refresh_recruiter_documents(instance)
+
+
+@receiver(post_save, sender=Application)
+def count_application_in_search_document(sender, instance, created, **kwargs):
+    """Shift the job document's application count and popularity."""
+    if created:
+        adjust_document_counters(instance.job_post_id, applications=1)
+
+
+@receiver(post_delete, sender=Application)
+def uncount_application_in_search_document(sender, instance, **kwargs):
+    """Take a deleted application back out of the job document's counts."""
+    adjust_document_counters(instance.job_post_id, applications=-1)
+
+
+@receiver(post_save, sender=JobView)
+def count_job_view_in_search_document(sender, instance, created, **kwargs):
+    """Shift the job document's view count and popularity."""
+    if created:
+        adjust_document_counters(instance.job_post_id, views=1)
+
+
+# Cached recruiter application reports are keyed on this generation counter
+@receiver([post_save, post_delete], sender=Application)
+def bump_recruiter_application_generation(sender, instance, **kwargs):
+    """Invalidate the recruiter's cached application analytics."""
+    recruiter_id = JobPost.objects.filter(id=instance.job_post_id).values_list('recruiter_id', flat=True).first()
+    if recruiter_id is not None:
+        AnalyticsCacheManager.bump_application_generation(recruiter_id)
+
+
+# Per-user dashboard counters; reconcile_dashboard_counters() corrects drift
+def _application_user_ids(application):
+    recruiter_id = JobPost.objects.filter(id=application.job_post_id).values_list('recruiter_id', flat=True).first()
+    return application.job_seeker_id, recruiter_id
+
+
+@receiver(post_save, sender=Application)
+def count_application_in_dashboards(sender, instance, created, **kwargs):
+    """Shift the applicant's and recruiter's application counters."""
+    old_status = getattr(instance, '_original_status', None)
+    if created:
+        deltas = application_deltas(instance.status, 1)
+    elif old_status and old_status != instance.status:
+        deltas = application_deltas(old_status, -1, total=False)
+        for field, amount in application_deltas(instance.status, 1, total=False).items():
+            deltas[field] = deltas.get(field, 0) + amount
+    else:
+        return
+    for user_id in _application_user_ids(instance):
+        adjust_dashboard_counters(user_id, **deltas)
+
+
+@receiver(post_delete, sender=Application)
+def uncount_application_in_dashboards(sender, instance, **kwargs):
+    """Take a deleted application out of the applicant's and recruiter's counters."""
+    for user_id in _application_user_ids(instance):
+        adjust_dashboard_counters(user_id, create_missing=False, **application_deltas(instance.status, -1))
+
+
+@receiver(pre_save, sender=InterviewSession)
+def store_original_interview_status(sender, instance, **kwargs):
+    """Remember the stored status so scheduled-interview counters can follow changes."""
+    instance._original_status = (
+        InterviewSession.objects.filter(pk=instance.pk).values_list('status', flat=True).first()
+        if instance.pk else None
+    )
+
+
+def _adjust_scheduled_interviews(interview, amount, create_missing=True):
+    application = Application.objects.filter(id=interview.application_id).first()
+    if application is None:
+        return
+    for user_id in _application_user_ids(application):
+        adjust_dashboard_counters(user_id, create_missing=create_missing, interviews_scheduled=amount)
+
+
+@receiver(post_save, sender=InterviewSession)
+def count_interview_in_dashboards(sender, instance, created, **kwargs):
+    """Shift scheduled-interview counters when an interview is scheduled or leaves that status."""
+    was_scheduled = getattr(instance, '_original_status', None) == 'scheduled'
+    is_scheduled = instance.status == 'scheduled'
+    if was_scheduled != is_scheduled:
+        _adjust_scheduled_interviews(instance, 1 if is_scheduled else -1)
+
+
+@receiver(post_delete, sender=InterviewSession)
+def uncount_interview_in_dashboards(sender, instance, **kwargs):
+    """Take a deleted scheduled interview out of the counters."""
+    if instance.status == 'scheduled':
+        _adjust_scheduled_interviews(instance, -1, create_missing=False)
+
+
+@receiver(post_save, sender=JobPost)
+def count_job_post_in_dashboard(sender, instance, created, update_fields=None, **kwargs):
+    """Recount the recruiter's job posts when one is created or (de)activated."""
+    if created or update_fields is None or 'is_active' in update_fields:
+        refresh_job_post_counters(instance.recruiter_id)
+
+
+@receiver(post_delete, sender=JobPost)
+def uncount_job_post_in_dashboard(sender, instance, **kwargs):
+    """Recount the recruiter's job posts after a deletion."""
+    refresh_job_post_counters(instance.recruiter_id, create_missing=False)
+
+
+@receiver(post_save, sender=JobSeekerProfile)
+@receiver(post_save, sender=RecruiterProfile)
+@receiver(post_save, sender=UserSkill)
+def refresh_dashboard_profile_completion(sender, instance, **kwargs):
+    """Recompute profile completion after a profile or skill change."""
+    refresh_profile_completion(instance.user_id)
+
+
+@receiver(post_delete, sender=JobSeekerProfile)
+@receiver(post_delete, sender=RecruiterProfile)
+@receiver(post_delete, sender=UserSkill)
+def refresh_dashboard_profile_completion_on_delete(sender, instance, **kwargs):
+    """Recompute profile completion after a profile or skill is removed."""
+    refresh_profile_completion(instance.user_id, create_missing=False)
+
+
+@receiver(post_save, sender=Notification)
+def count_unread_notification(sender, instance, created, **kwargs):
+    """Count a new unread notification; reads and bulk writes are counted by the notification service."""
+    if created and not instance.is_read:
+        adjust_dashboard_counters(instance.recipient_id, notifications_unread=1)
+
+
+@receiver(post_save, sender=NotificationTemplate)
+@receiver(post_delete, sender=NotificationTemplate)
+def invalidate_notification_templates(sender, instance, **kwargs):
+    """Drop the cached template table, here and in every process's near cache."""
+    cache_manager.delete(CACHE_PREFIXES['notification_templates'])
+
+
+@receiver(post_save, sender=ResumeTemplate)
+@receiver(post_delete, sender=ResumeTemplate)
+def invalidate_resume_template_categories(sender, instance, **kwargs):
+    """Drop the cached template category counts."""
+    cache_manager.delete(CACHE_PREFIXES['resume_template_categories'])
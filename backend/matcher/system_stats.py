@@ -0,0 +1,199 @@
+"""
+System statistics snapshot for HireWise admin dashboards.
+
+A Celery beat task computes the admin statistics once per interval with one
+conditional aggregate per table, stores the snapshot in the cache and pushes
+the values that changed to the admin WebSocket group. The admin dashboard
+pages and the AdminConsumer read the snapshot instead of counting every
+table on every request.
+"""
+
+import logging
+from datetime import timedelta
+from typing import Any, Dict, Optional
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Avg, Count, Q
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import AIAnalysisResult, Application, JobPost, Notification, Resume, User
+
+logger = logging.getLogger(__name__)
+
+SYSTEM_STATS_CONFIG = getattr(settings, 'SYSTEM_STATS', {})
+
+SNAPSHOT_KEY = 'system_stats:snapshot'
+SNAPSHOT_INTERVAL = SYSTEM_STATS_CONFIG.get('SNAPSHOT_INTERVAL', 60)
+# Outlives a few missed runs; get_system_stats_snapshot() recomputes after that
+SNAPSHOT_TIMEOUT = SYSTEM_STATS_CONFIG.get('SNAPSHOT_TIMEOUT', SNAPSHOT_INTERVAL * 5)
+DAILY_SERIES_DAYS = SYSTEM_STATS_CONFIG.get('DAILY_SERIES_DAYS', 90)
+
+ADMIN_GROUP = 'admin_updates'
+
+MATCH_SCORE_RANGES = [
+    ('90-100', Q(match_score__gte=90)),
+    ('80-89', Q(match_score__gte=80, match_score__lt=90)),
+    ('70-79', Q(match_score__gte=70, match_score__lt=80)),
+    ('60-69', Q(match_score__gte=60, match_score__lt=70)),
+    ('50-59', Q(match_score__gte=50, match_score__lt=60)),
+    ('0-49', Q(match_score__lt=50, match_score__gt=0)),
+]
+
+
+def _daily_counts(queryset, field: str, since) -> Dict[str, int]:
+    return {
+        row['day'].isoformat(): row['count']
+        for row in queryset.filter(**{f'{field}__gte': since}).annotate(
+            day=TruncDate(field)
+        ).values('day').annotate(count=Count('id')).order_by()
+    }
+
+
+def compute_system_stats(now=None) -> Dict[str, Any]:
+    """
+    Compute the full admin statistics snapshot
+    """
+    now = now or timezone.now()
+    today = timezone.localtime(now).replace(hour=0, minute=0, second=0, microsecond=0)
+    last_24h = now - timedelta(hours=24)
+    week_ago = now - timedelta(days=7)
+    series_start = today - timedelta(days=DAILY_SERIES_DAYS)
+
+    users = User.objects.aggregate(
+        total=Count('id'),
+        new_today=Count('id', filter=Q(date_joined__gte=today)),
+        new_week=Count('id', filter=Q(date_joined__gte=week_ago)),
+        active_today=Count('id', filter=Q(last_login__gte=today)),
+        active_24h=Count('id', filter=Q(last_login__gte=last_24h)),
+        active_week=Count('id', filter=Q(last_login__gte=week_ago)),
+        unverified=Count('id', filter=Q(is_verified=False)),
+        job_seekers=Count('id', filter=Q(user_type='job_seeker')),
+        recruiters=Count('id', filter=Q(user_type='recruiter')),
+    )
+    users['breakdown'] = list(
+        User.objects.values('user_type').annotate(count=Count('id')).order_by('user_type')
+    )
+
+    jobs = JobPost.objects.aggregate(
+        total=Count('id'),
+        active=Count('id', filter=Q(is_active=True)),
+        featured=Count('id', filter=Q(is_featured=True)),
+        expired=Count('id', filter=Q(application_deadline__lt=now)),
+        posted_24h=Count('id', filter=Q(created_at__gte=last_24h)),
+        posted_7d=Count('id', filter=Q(created_at__gte=week_ago)),
+    )
+
+    applications = Application.objects.aggregate(
+        total=Count('id'),
+        new_today=Count('id', filter=Q(applied_at__gte=today)),
+        submitted_24h=Count('id', filter=Q(applied_at__gte=last_24h)),
+        submitted_7d=Count('id', filter=Q(applied_at__gte=week_ago)),
+        pending=Count('id', filter=Q(status='pending')),
+        processed_today=Count('id', filter=Q(updated_at__gte=today)),
+        **{f'match_{name}': Count('id', filter=condition) for name, condition in MATCH_SCORE_RANGES}
+    )
+    applications['match_score_distribution'] = [
+        {'range': name, 'count': applications.pop(f'match_{name}')} for name, _ in MATCH_SCORE_RANGES
+    ]
+    applications['breakdown'] = list(
+        Application.objects.values('status').annotate(count=Count('id')).order_by('status')
+    )
+
+    resumes = Resume.objects.aggregate(total=Count('id'), parsed=Count('id', filter=~Q(parsed_text='')))
+    resumes['parsing_rate'] = round(resumes['parsed'] / resumes['total'] * 100, 1) if resumes['total'] else 0
+
+    ai = AIAnalysisResult.objects.aggregate(
+        total_analyses=Count('id'),
+        avg_confidence=Avg('confidence_score'),
+        avg_processing_time=Avg('processing_time'),
+        recent_failures=Count('id', filter=Q(confidence_score__lt=0.5, processed_at__gte=last_24h)),
+    )
+    ai['avg_confidence'] = round((ai['avg_confidence'] or 0) * 100, 1)
+    ai['avg_processing_time'] = round(ai['avg_processing_time'] or 0, 3)
+
+    notifications = Notification.objects.aggregate(
+        total=Count('id'),
+        unread=Count('id', filter=Q(is_read=False)),
+        sent_24h=Count('id', filter=Q(created_at__gte=last_24h)),
+    )
+
+    top_jobs = [
+        {'id': str(row['id']), 'title': row['title'], 'app_count': row['app_count']}
+        for row in JobPost.objects.annotate(app_count=Count('applications')).order_by(
+            '-app_count'
+        ).values('id', 'title', 'app_count')[:5]
+    ]
+
+    return {
+        'generated_at': now.isoformat(),
+        'users': users,
+        'jobs': jobs,
+        'applications': applications,
+        'resumes': resumes,
+        'ai': ai,
+        'notifications': notifications,
+        'top_jobs': top_jobs,
+        'daily': {
+            'users': _daily_counts(User.objects.all(), 'date_joined', series_start),
+            'jobs': _daily_counts(JobPost.objects.all(), 'created_at', series_start),
+            'applications': _daily_counts(Application.objects.all(), 'applied_at', series_start),
+        },
+    }
+
+
+def get_system_stats_snapshot() -> Dict[str, Any]:
+    """
+    The cached snapshot, computed and stored if the beat task has not produced one
+    """
+    snapshot = cache.get(SNAPSHOT_KEY)
+    if snapshot is None:
+        snapshot = compute_system_stats()
+        cache.set(SNAPSHOT_KEY, snapshot, SNAPSHOT_TIMEOUT)
+    return snapshot
+
+
+def snapshot_changes(previous: Optional[Dict[str, Any]], current: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Nested dict of the values in current that differ from previous; lists are replaced whole
+    """
+    if previous is None:
+        return current
+
+    changes = {}
+    for key, value in current.items():
+        old = previous.get(key)
+        if isinstance(value, dict) and isinstance(old, dict):
+            nested = snapshot_changes(old, value)
+            if nested:
+                changes[key] = nested
+        elif value != old:
+            changes[key] = value
+    return changes
+
+
+def publish_system_stats() -> Dict[str, Any]:
+    """
+    Recompute the snapshot, store it and push what changed to connected admins
+    """
+    previous = cache.get(SNAPSHOT_KEY)
+    snapshot = compute_system_stats()
+    cache.set(SNAPSHOT_KEY, snapshot, SNAPSHOT_TIMEOUT)
+
+    changes = snapshot_changes(previous, snapshot)
+    changes.pop('generated_at', None)
+    if changes:
+        try:
+            async_to_sync(get_channel_layer().group_send)(ADMIN_GROUP, {
+                'type': 'system_stats_update',
+                'changes': changes,
+                'full': previous is None,
+                'generated_at': snapshot['generated_at'],
+            })
+        except Exception as e:
+            logger.error(f"Failed to push system stats to admins: {e}")
+
+    return {'generated_at': snapshot['generated_at'], 'changed_sections': sorted(changes)}
@@ -11,6 +11,8 @@ import logging
 import json
 from typing import Dict, List, Optional, Any
 
+from .cache_codec import decode_value, encode_value
+
 logger = logging.getLogger(__name__)
 
 
@@ -243,7 +245,7 @@ class TaskResultTracker:
                 'result': result_data
             }
             
-            cache.set(cache_key, json.dumps(result_info), cls.CACHE_TIMEOUT)
+            cache.set(cache_key, encode_value(json.dumps(result_info), cls.CACHE_PREFIX), cls.CACHE_TIMEOUT)
             logger.info(f"Result stored for task {task_id}")
             
         except Exception as e:
@@ -262,7 +264,7 @@ class TaskResultTracker:
         """
         try:
             cache_key = f"{cls.CACHE_PREFIX}:{task_id}"
-            result_data = cache.get(cache_key)
+            result_data = decode_value(cache.get(cache_key))
             
             if result_data:
                 return json.loads(result_data)
@@ -644,6 +644,324 @@ def batch_send_notifications_task(self, user_ids, notification_type, message, da
     }
 
 
+@shared_task(bind=True)
+def fan_out_job_posted_notifications_task(self, job_id):
+    """
+    Background task queueing job posted notification chunks for a job's relevant job seekers.
+    """
+    try:
+        from .models import JobPost
+        from .notification_fanout import fan_out_job_posted_notifications
+        
+        job_post = JobPost.objects.select_related('recruiter__recruiter_profile').get(id=job_id)
+        if not job_post.is_active:
+            return {'task_id': self.request.id, 'job_id': job_id, 'status': 'skipped'}
+        
+        result = fan_out_job_posted_notifications(job_post)
+        
+        return {
+            'task_id': self.request.id,
+            'job_id': job_id,
+            'status': 'completed',
+            **result
+        }
+        
+    except Exception as e:
+        logger.error(f"Error fanning out job posted notifications for job {job_id}: {str(e)}")
+        return {
+            'task_id': self.request.id,
+            'job_id': job_id,
+            'status': 'failed',
+            'error': str(e)
+        }
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=30)
+def create_job_posted_notifications_task(self, job_id, recipient_ids):
+    """
+    Background task creating and delivering one chunk of job posted notifications.
+    """
+    try:
+        from .models import JobPost
+        from .notification_fanout import create_job_posted_notifications
+        
+        job_post = JobPost.objects.select_related('recruiter__recruiter_profile').get(id=job_id)
+        created = create_job_posted_notifications(job_post, recipient_ids)
+        
+        return {
+            'task_id': self.request.id,
+            'job_id': job_id,
+            'status': 'completed',
+            'recipients': len(recipient_ids),
+            'created': created
+        }
+        
+    except Exception as e:
+        logger.error(f"Error creating job posted notifications for job {job_id}: {str(e)}")
+        # Already notified recipients are skipped on retry
+        raise self.retry(exc=e, countdown=30)
+
+
+@shared_task(bind=True)
+def flush_search_events_task(self, batch_size=None):
+    """
+    Periodic task draining the Redis search event buffer into SearchAnalytics.
+    
+    Without Redis, events stay in each web process's own buffer and are
+    drained by that process's flusher thread instead.
+    """
+    try:
+        from .search_events import flush_search_events, FLUSH_BATCH_SIZE
+        
+        result = flush_search_events(batch_size=batch_size or FLUSH_BATCH_SIZE)
+        
+        if result['events_flushed']:
+            logger.info(f"Flushed {result['events_flushed']} search events "
+                       f"in {len(result['batches'])} batches, {result['pending']} pending")
+        
+        return {
+            'task_id': self.request.id,
+            'status': 'completed',
+            **result
+        }
+        
+    except Exception as e:
+        logger.error(f"Error flushing search events: {str(e)}")
+        return {
+            'task_id': self.request.id,
+            'status': 'failed',
+            'error': str(e)
+        }
+
+
+@shared_task(bind=True)
+def cleanup_expired_exports_task(self):
+    """
+    Periodic task deleting background export files whose download links have expired.
+    """
+    try:
+        from .exports import delete_expired_exports
+        
+        deleted = delete_expired_exports()
+        logger.info(f"Deleted {deleted} expired export files")
+        
+        return {
+            'task_id': self.request.id,
+            'deleted_files': deleted,
+            'status': 'completed'
+        }
+        
+    except Exception as e:
+        logger.error(f"Error cleaning up expired exports: {str(e)}")
+        return {
+            'task_id': self.request.id,
+            'status': 'failed',
+            'error': str(e)
+        }
+
+
+@shared_task(bind=True)
+def export_applications_task(self, user_id, params=None):
+    """
+    Background task writing a user's filtered applications to a gzip CSV and
+    notifying them over WebSocket when the file is ready.
+    """
+    logger.info(f"Exporting applications for user {user_id}")
+    
+    try:
+        from .models import User
+        from .views import ApplicationViewSet
+        from .exports import export_applications_to_storage
+        from .notification_service import notification_service
+        
+        user = User.objects.get(id=user_id)
+        applications = ApplicationViewSet.applications_for(user, params or {})
+        result = export_applications_to_storage(user, applications)
+        
+        notification_service.create_notification(
+            recipient_id=str(user_id),
+            notification_type='system_message',
+            title='Application export ready',
+            message=f"Your export of {result['rows']} applications is ready to download.",
+            data={'task_id': self.request.id, 'export_url': result['url'], 'rows': result['rows']},
+        )
+        
+        return {
+            'task_id': self.request.id,
+            'user_id': str(user_id),
+            'status': 'completed',
+            'file': result['name'],
+            'url': result['url'],
+            'rows': result['rows'],
+        }
+        
+    except Exception as e:
+        logger.error(f"Error exporting applications for user {user_id}: {str(e)}")
+        return {
+            'task_id': self.request.id,
+            'user_id': str(user_id),
+            'status': 'failed',
+            'error': str(e)
+        }
+
+
+@shared_task(bind=True)
+def flush_job_view_events_task(self, batch_size=None):
+    """
+    Periodic task draining the Redis job view buffer into JobView, view counts and JobAnalytics.
+    
+    Without Redis, views stay in each web process's own buffer and are
+    drained by that process's flusher thread instead.
+    """
+    try:
+        from .job_view_events import flush_job_view_events, FLUSH_BATCH_SIZE
+        
+        result = flush_job_view_events(batch_size=batch_size or FLUSH_BATCH_SIZE)
+        
+        if result['views_flushed']:
+            logger.info(f"Flushed {result['views_flushed']} job views for {result['jobs_updated']} jobs "
+                       f"in {result['batches']} batches, {result['pending']} pending")
+        
+        return {
+            'task_id': self.request.id,
+            'status': 'completed',
+            **result
+        }
+        
+    except Exception as e:
+        logger.error(f"Error flushing job view events: {str(e)}")
+        return {
+            'task_id': self.request.id,
+            'status': 'failed',
+            'error': str(e)
+        }
+
+
+@shared_task(bind=True)
+def build_job_analytics_rollups_task(self):
+    """
+    Periodic task folding new job views and applications into hourly and daily rollups.
+    """
+    try:
+        from .analytics_rollups import build_job_analytics_rollups
+        
+        result = build_job_analytics_rollups()
+        
+        return {
+            'task_id': self.request.id,
+            'status': 'completed',
+            **result
+        }
+        
+    except Exception as e:
+        logger.error(f"Error building job analytics rollups: {str(e)}")
+        return {
+            'task_id': self.request.id,
+            'status': 'failed',
+            'error': str(e)
+        }
+
+
+@shared_task(bind=True)
+def reconcile_job_search_documents_task(self, batch_size=None):
+    """
+    Periodic task rebuilding job search documents from JobPost and refreshing freshness scores.
+    """
+    try:
+        from .search_documents import reconcile_job_search_documents, RECONCILE_BATCH_SIZE
+        
+        result = reconcile_job_search_documents(batch_size=batch_size or RECONCILE_BATCH_SIZE)
+        
+        return {
+            'task_id': self.request.id,
+            'status': 'completed',
+            **result
+        }
+        
+    except Exception as e:
+        logger.error(f"Error reconciling job search documents: {str(e)}")
+        return {
+            'task_id': self.request.id,
+            'status': 'failed',
+            'error': str(e)
+        }
+
+
+@shared_task(bind=True)
+def reconcile_dashboard_counters_task(self, batch_size=None):
+    """
+    Periodic task recounting per-user dashboard counters from the source tables.
+    """
+    try:
+        from .dashboard_counters import reconcile_dashboard_counters, RECONCILE_BATCH_SIZE
+        
+        result = reconcile_dashboard_counters(batch_size=batch_size or RECONCILE_BATCH_SIZE)
+        
+        return {
+            'task_id': self.request.id,
+            'status': 'completed',
+            **result
+        }
+        
+    except Exception as e:
+        logger.error(f"Error reconciling dashboard counters: {str(e)}")
+        return {
+            'task_id': self.request.id,
+            'status': 'failed',
+            'error': str(e)
+        }
+
+
+@shared_task(bind=True)
+def refresh_system_stats_task(self):
+    """
+    Periodic task recomputing the admin statistics snapshot and pushing changes to admins.
+    """
+    try:
+        from .system_stats import publish_system_stats
+        
+        result = publish_system_stats()
+        
+        return {
+            'task_id': self.request.id,
+            'status': 'completed',
+            **result
+        }
+        
+    except Exception as e:
+        logger.error(f"Error refreshing system stats: {str(e)}")
+        return {
+            'task_id': self.request.id,
+            'status': 'failed',
+            'error': str(e)
+        }
+
+
+@shared_task(bind=True)
+def warm_caches_task(self, kinds=None, concurrency=None):
+    """
+    Periodic task refilling search, recommendation and popular job caches from recent traffic.
+    """
+    try:
+        from .cache_warming import run_cache_warming
+        
+        result = run_cache_warming(kinds, concurrency)
+        
+        return {
+            'task_id': self.request.id,
+            'status': 'completed',
+            **result
+        }
+        
+    except Exception as e:
+        logger.error(f"Error warming caches: {str(e)}")
+        return {
+            'task_id': self.request.id,
+            'status': 'failed',
+            'error': str(e)
+        }
+
+
 @shared_task(bind=True)
 def health_check_task(self):
     """
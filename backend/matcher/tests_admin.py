@@ -1,15 +1,17 @@
 import pytest
-from django.test import TestCase, Client
+from django.test import TestCase, Client, RequestFactory
 from django.contrib.auth import get_user_model
 from django.urls import reverse
 from django.contrib.admin.sites import AdminSite
 from django.http import HttpRequest
 from django.contrib.messages.storage.fallback import FallbackStorage
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 import csv
 import io
+import json
 from datetime import datetime, timedelta
 from django.utils import timezone
+from django.core.cache import cache
 
 from .models import (
     User, JobSeekerProfile, RecruiterProfile, Resume, JobPost, 
@@ -17,6 +19,8 @@ from .models import (
     EmailVerificationToken, PasswordResetToken, JobAnalytics, JobView,
     Notification, NotificationPreference, NotificationTemplate
 )
+from .admin_views import analytics_api
+from .system_stats import SNAPSHOT_KEY, get_system_stats_snapshot, publish_system_stats, snapshot_changes
 from .admin import (
     UserAdmin, JobSeekerProfileAdmin, RecruiterProfileAdmin, ResumeAdmin,
     JobPostAdmin, ApplicationAdmin, AIAnalysisResultAdmin, InterviewSessionAdmin,
@@ -529,6 +533,88 @@ class AdminCustomizationTest(AdminTestCase):
         self.assertContains(response, 'readonly')
 
 
+class SystemStatsSnapshotTest(TestCase):
+    """Test the periodic admin statistics snapshot"""
+    
+    def setUp(self):
+        cache.clear()
+        self.admin_user = User.objects.create_user(
+            username='admin', email='admin@test.com', password='testpass123',
+            user_type='admin', is_staff=True, is_superuser=True
+        )
+        self.recruiter = User.objects.create_user(
+            username='recruiter', email='recruiter@test.com', password='testpass123', user_type='recruiter'
+        )
+        self.job_seeker = User.objects.create_user(
+            username='jobseeker', email='jobseeker@test.com', password='testpass123',
+            user_type='job_seeker', is_verified=True
+        )
+        self.job_post = JobPost.objects.create(
+            recruiter=self.recruiter, title='Python Developer', description='Description',
+            location='Remote', job_type='full_time', experience_level='mid', skills_required='Python'
+        )
+        self.resume = Resume.objects.create(
+            job_seeker=self.job_seeker, original_filename='resume.pdf', file_size=1024, parsed_text='Python'
+        )
+        Application.objects.create(
+            job_seeker=self.job_seeker, job_post=self.job_post, resume=self.resume, match_score=85
+        )
+    
+    def test_snapshot_counts(self):
+        """Test the snapshot aggregates match the tables"""
+        snapshot = get_system_stats_snapshot()
+        
+        self.assertEqual(snapshot['users']['total'], 3)
+        self.assertEqual(snapshot['users']['unverified'], 2)
+        self.assertEqual(snapshot['jobs']['active'], 1)
+        self.assertEqual(snapshot['applications']['pending'], 1)
+        self.assertEqual(snapshot['resumes']['parsing_rate'], 100.0)
+        distribution = {item['range']: item['count'] for item in snapshot['applications']['match_score_distribution']}
+        self.assertEqual(distribution['80-89'], 1)
+        self.assertEqual(snapshot['top_jobs'][0]['app_count'], 1)
+        self.assertEqual(sum(snapshot['daily']['applications'].values()), 1)
+    
+    def test_snapshot_is_read_from_cache(self):
+        """Test admin endpoints reuse the snapshot instead of counting again"""
+        get_system_stats_snapshot()
+        JobPost.objects.create(
+            recruiter=self.recruiter, title='Second Job', description='Description',
+            location='Remote', job_type='full_time', experience_level='mid'
+        )
+        
+        request = RequestFactory().get('/admin/analytics/', {'days': 7})
+        request.user = self.admin_user
+        response = analytics_api(request)
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(json.loads(response.content)['daily_jobs']), 7)
+        self.assertEqual(get_system_stats_snapshot()['jobs']['total'], 1)
+    
+    def test_publish_pushes_only_changes(self):
+        """Test the snapshot task sends the changed values to the admin group"""
+        cache.set(SNAPSHOT_KEY, get_system_stats_snapshot())
+        Application.objects.filter(job_seeker=self.job_seeker).update(status='reviewed')
+        
+        with patch('matcher.system_stats.get_channel_layer') as mock_layer:
+            mock_layer.return_value.group_send = AsyncMock()
+            result = publish_system_stats()
+        
+        self.assertEqual(result['changed_sections'], ['applications'])
+        group, message = mock_layer.return_value.group_send.call_args[0]
+        self.assertEqual(group, 'admin_updates')
+        self.assertEqual(message['type'], 'system_stats_update')
+        self.assertEqual(message['changes']['applications']['pending'], 0)
+        self.assertNotIn('users', message['changes'])
+    
+    def test_snapshot_changes(self):
+        """Test nested diffing of snapshots"""
+        previous = {'users': {'total': 1, 'new_today': 0}, 'top_jobs': [1]}
+        current = {'users': {'total': 2, 'new_today': 0}, 'top_jobs': [1]}
+        
+        self.assertEqual(snapshot_changes(previous, current), {'users': {'total': 2}})
+        self.assertEqual(snapshot_changes(None, current), current)
+
+
 @pytest.mark.django_db
 class AdminPerformanceTest:
     """Test admin interface performance"""
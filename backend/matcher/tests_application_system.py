@@ -3,7 +3,10 @@ Comprehensive tests for job application system
 """
 import json
 from datetime import datetime, timedelta
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 from rest_framework.test import APITestCase, APIClient
@@ -14,8 +17,9 @@ from unittest.mock import patch, MagicMock
 
 from .models import (
     User, JobPost, RecruiterProfile, JobSeekerProfile, 
-    Application, Resume, AIAnalysisResult
+    Application, Resume, AIAnalysisResult, InterviewSession, DashboardCounters
 )
+from .dashboard_counters import reconcile_dashboard_counters
 from .serializers import ApplicationSerializer
 
 User = get_user_model()
@@ -1030,6 +1034,148 @@ class ApplicationAnalyticsTest(APITestCase):
         match_dist = response.data['match_score_distribution']
         self.assertEqual(len(match_dist), 5)  # 5 ranges
     
+    def test_application_analytics_uses_constant_queries(self):
+        """Test that the report is built from a single aggregate query"""
+        cache.clear()
+        token = self.get_jwt_token(self.recruiter_user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('application-analytics'))
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        application_queries = [
+            query for query in queries.captured_queries if 'matcher_application' in query['sql']
+        ]
+        self.assertEqual(len(application_queries), 1)
+        self.assertEqual(dict(response.data['match_score_distribution']), {
+            '0-20': 0, '20-40': 0, '40-60': 0, '60-80': 1, '80-100': 2
+        })
+        self.assertEqual(response.data['total_response_times'], 2)
+        self.assertEqual(sum(day['count'] for day in response.data['applications_over_time']), 3)
+        self.assertEqual([job['application_count'] for job in response.data['top_jobs']], [1, 1, 1])
+    
+    def test_application_analytics_cached_until_applications_change(self):
+        """Test that cached reports are dropped when an application changes"""
+        token = self.get_jwt_token(self.recruiter_user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        url = reverse('application-analytics')
+        
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertFalse(any('matcher_application' in query['sql'] for query in queries.captured_queries))
+        self.assertEqual(response.data['total_response_times'], 2)
+        
+        self.app1.status = 'reviewed'
+        self.app1.save()
+        
+        response = self.client.get(url)
+        self.assertEqual(response.data['total_response_times'], 3)
+    
+    def test_application_export_streams_in_constant_queries(self):
+        """Test that the streamed export reads rows through one projection query"""
+        token = self.get_jwt_token(self.recruiter_user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('application-export'))
+            content = b''.join(response.streaming_content).decode('utf-8')
+        
+        application_queries = [
+            query for query in queries.captured_queries if 'matcher_application' in query['sql']
+        ]
+        self.assertEqual(len(application_queries), 2)  # threshold count + rows
+        self.assertIn('Test Company', content)
+        self.assertEqual(len(content.strip().split('\n')), 4)
+    
+    def test_application_export_in_background(self):
+        """Test that async exports write a gzip file and notify the user"""
+        import gzip
+        import tempfile
+        from django.core.files.storage import FileSystemStorage
+        from .tasks import export_applications_task
+        
+        with tempfile.TemporaryDirectory() as export_dir:
+            storage = FileSystemStorage(location=export_dir)
+            with patch('matcher.exports.export_storage', storage), \
+                    patch('matcher.notification_service.notification_service.create_notification') as notify:
+                result = export_applications_task.apply(
+                    args=[str(self.recruiter_user.id), {'status': 'pending,hired'}]
+                ).get()
+                
+                self.assertEqual(result['status'], 'completed')
+                self.assertEqual(result['rows'], 2)
+                with gzip.open(storage.path(result['file']), 'rt', encoding='utf-8') as export_file:
+                    lines = export_file.read().strip().split('\n')
+        
+        self.assertEqual(len(lines), 3)
+        self.assertNotIn('/media/', result['url'])
+        notify.assert_called_once()
+        self.assertEqual(notify.call_args.kwargs['data']['rows'], 2)
+    
+    def test_application_export_download_requires_owner(self):
+        """Test that export files are only served to their owner through a signed link"""
+        import tempfile
+        from django.core.files.storage import FileSystemStorage
+        from .exports import export_applications_to_storage
+        
+        with tempfile.TemporaryDirectory() as export_dir:
+            storage = FileSystemStorage(location=export_dir)
+            with patch('matcher.exports.export_storage', storage), \
+                    patch('matcher.views.export_storage', storage):
+                applications = Application.objects.filter(job_post__recruiter=self.recruiter_user)
+                result = export_applications_to_storage(self.recruiter_user, applications)
+                
+                self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.get_jwt_token(self.job_seeker_user)}')
+                forbidden = self.client.get(result['url'])
+                self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.get_jwt_token(self.recruiter_user)}')
+                response = self.client.get(result['url'])
+                content = b''.join(response.streaming_content)
+                response.close()
+                tampered = self.client.get(result['url'][:-2] + 'xx/')
+        
+        self.assertEqual(forbidden.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('attachment', response['Content-Disposition'])
+        self.assertTrue(content.startswith(b'\x1f\x8b'))  # gzip magic
+        self.assertEqual(tampered.status_code, status.HTTP_404_NOT_FOUND)
+    
+    def test_cleanup_removes_expired_exports(self):
+        """Test that the cleanup deletes export files past their retention"""
+        import os
+        import tempfile
+        from django.core.files.base import ContentFile
+        from django.core.files.storage import FileSystemStorage
+        from .exports import delete_expired_exports
+        
+        with tempfile.TemporaryDirectory() as export_dir:
+            storage = FileSystemStorage(location=export_dir)
+            with patch('matcher.exports.export_storage', storage):
+                old_name = storage.save('exports/applications/1/old.csv.gz', ContentFile(b'old'))
+                old_time = (timezone.now() - timedelta(days=2)).timestamp()
+                os.utime(storage.path(old_name), (old_time, old_time))
+                new_name = storage.save('exports/applications/1/new.csv.gz', ContentFile(b'new'))
+                
+                deleted = delete_expired_exports(max_age=24 * 3600)
+                
+                self.assertEqual(deleted, 1)
+                self.assertFalse(storage.exists(old_name))
+                self.assertTrue(storage.exists(new_name))
+    
+    def test_application_export_async_request_queues_task(self):
+        """Test that ?async=true queues the background export"""
+        token = self.get_jwt_token(self.recruiter_user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        
+        with patch('matcher.tasks.export_applications_task.apply_async') as apply_async:
+            apply_async.return_value = MagicMock(id='export-task')
+            response = self.client.get(reverse('application-export'), {'async': 'true', 'status': 'hired'})
+        
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data['task_id'], 'export-task')
+        apply_async.assert_called_once_with(args=[str(self.recruiter_user.id), {'status': 'hired'}])
+    
     def test_application_analytics_job_seeker_forbidden(self):
         """Test that job seekers cannot access recruiter analytics"""
         token = self.get_jwt_token(self.job_seeker_user)
@@ -1053,7 +1199,7 @@ class ApplicationAnalyticsTest(APITestCase):
         self.assertIn('attachment; filename="applications.csv"', response['Content-Disposition'])
         
         # Check CSV content
-        content = response.content.decode('utf-8')
+        content = b''.join(response.streaming_content).decode('utf-8')
         lines = content.strip().split('\n')
         
         # Check header
@@ -1225,4 +1371,109 @@ class ApplicationWorkflowIntegrationTest(APITestCase):
         export_url = reverse('application-export')
         response = self.client.get(export_url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response['Content-Type'], 'text/csv')
\ No newline at end of file
+        self.assertEqual(response['Content-Type'], 'text/csv')
+
+
+class DashboardCountersTest(APITestCase):
+    """Test counter-backed dashboard statistics"""
+    
+    def setUp(self):
+        self.recruiter_user = User.objects.create_user(
+            username='recruiter1',
+            email='recruiter@test.com',
+            password='testpass123',
+            user_type='recruiter'
+        )
+        RecruiterProfile.objects.create(user=self.recruiter_user, company_name='Test Company')
+        
+        self.job_seeker_user = User.objects.create_user(
+            username='jobseeker1',
+            email='jobseeker@test.com',
+            password='testpass123',
+            user_type='job_seeker'
+        )
+        JobSeekerProfile.objects.create(
+            user=self.job_seeker_user, location='Boston', experience_level='mid', bio='Backend developer'
+        )
+        
+        self.job_posts = [
+            JobPost.objects.create(
+                recruiter=self.recruiter_user,
+                title=f'Engineer {index}',
+                description='Test description',
+                requirements='Test requirements',
+                location='Remote',
+                job_type='full_time',
+                experience_level='mid',
+                skills_required='Python'
+            )
+            for index in range(3)
+        ]
+        self.resume = Resume.objects.create(
+            job_seeker=self.job_seeker_user,
+            original_filename='test_resume.pdf',
+            file_size=1024,
+            is_primary=True
+        )
+        self.applications = [
+            Application.objects.create(job_seeker=self.job_seeker_user, job_post=job_post, resume=self.resume)
+            for job_post in self.job_posts
+        ]
+        self.client = APIClient()
+    
+    def get_dashboard(self, user):
+        self.client.force_authenticate(user=user)
+        response = self.client.get(reverse('dashboard-stats'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+    
+    def test_counters_follow_application_and_interview_changes(self):
+        """Test signals keep both sides' counters in step"""
+        self.applications[0].status = 'shortlisted'
+        self.applications[0].save()
+        self.applications[1].delete()
+        InterviewSession.objects.create(
+            application=self.applications[0], interview_type='technical', scheduled_at=timezone.now()
+        )
+        self.job_posts[2].is_active = False
+        self.job_posts[2].save()
+        
+        seeker_stats = self.get_dashboard(self.job_seeker_user)
+        self.assertEqual(seeker_stats['total_applications'], 2)
+        self.assertEqual(seeker_stats['pending_applications'], 1)
+        self.assertEqual(seeker_stats['shortlisted_applications'], 1)
+        self.assertEqual(seeker_stats['interviews_scheduled'], 1)
+        self.assertEqual(seeker_stats['profile_completion'], 50)
+        
+        recruiter_stats = self.get_dashboard(self.recruiter_user)
+        self.assertEqual(recruiter_stats['total_job_posts'], 3)
+        self.assertEqual(recruiter_stats['active_job_posts'], 2)
+        self.assertEqual(recruiter_stats['total_applications'], 2)
+        self.assertEqual(recruiter_stats['pending_applications'], 1)
+        self.assertEqual(recruiter_stats['interviews_scheduled'], 1)
+    
+    def test_dashboard_reads_single_counters_row(self):
+        """Test the dashboard endpoint does not count applications per request"""
+        self.get_dashboard(self.job_seeker_user)
+        
+        with CaptureQueriesContext(connection) as queries:
+            self.get_dashboard(self.job_seeker_user)
+        
+        statements = [query['sql'] for query in queries.captured_queries]
+        self.assertEqual(sum('matcher_dashboardcounters' in sql for sql in statements), 1)
+        self.assertFalse(any('matcher_application' in sql for sql in statements))
+    
+    def test_reconcile_corrects_drift(self):
+        """Test reconciliation recounts changes made without signals"""
+        Application.objects.filter(job_seeker=self.job_seeker_user).update(status='hired')
+        DashboardCounters.objects.filter(user=self.recruiter_user).update(job_posts_total=10)
+        
+        result = reconcile_dashboard_counters()
+        
+        self.assertEqual(result['users'], 2)
+        self.assertEqual(result['corrected'], 2)
+        seeker_counters = DashboardCounters.objects.get(user=self.job_seeker_user)
+        self.assertEqual(seeker_counters.applications_pending, 0)
+        self.assertEqual(seeker_counters.applications_hired, 3)
+        self.assertEqual(DashboardCounters.objects.get(user=self.recruiter_user).job_posts_total, 3)
+        self.assertEqual(reconcile_dashboard_counters()['corrected'], 0)
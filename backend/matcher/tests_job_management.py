@@ -3,7 +3,10 @@ Comprehensive tests for enhanced job posting management
 """
 import json
 from datetime import datetime, timedelta
+from django.core.cache import cache
+from django.db import OperationalError, connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 from rest_framework.test import APITestCase, APIClient
@@ -14,9 +17,14 @@ from unittest.mock import patch, MagicMock
 
 from .models import (
     User, JobPost, RecruiterProfile, JobSeekerProfile, 
-    Application, Resume, JobAnalytics, JobView
+    Application, Resume, JobAnalytics, JobView, JobAnalyticsHourly, JobAnalyticsDaily, JobSearchDocument
+)
+from .serializers import JobPostSerializer, JobPostListSerializer, JobSearchDocumentListSerializer
+from .geo import haversine_km, load_gazetteer, locations_match, resolve_location, within_radius
+from .job_view_events import job_view_buffer, flush_job_view_events, get_job_view_stats
+from .analytics_rollups import (
+    build_job_analytics_rollups, get_job_analytics_range, get_job_analytics_series
 )
-from .serializers import JobPostSerializer, JobPostListSerializer
 
 User = get_user_model()
 
@@ -456,6 +464,9 @@ class JobPostAPITest(APITestCase):
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         
+        # Views are buffered and applied by the flush task
+        flush_job_view_events()
+        
         # Check that view count was incremented
         self.job_post1.refresh_from_db()
         self.assertEqual(self.job_post1.views_count, initial_views + 1)
@@ -640,6 +651,51 @@ class JobPostAPITest(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         # Should include both active and inactive jobs for the recruiter
         self.assertEqual(len(response.data['results']), 3)  # 2 active + 1 inactive
+    
+    def test_job_list_projection_matches_serializer(self):
+        """Test projected list rows match the list serializers field for field"""
+        token = self.get_jwt_token(self.recruiter_user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        url = reverse('job-post-list')
+        
+        response = self.client.get(url, {'my_jobs': 'true', 'ordering': 'title'})
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        expected = JobPostListSerializer(
+            JobPost.objects.filter(recruiter=self.recruiter_user).order_by('title'), many=True,
+            context={'request': response.wsgi_request}
+        ).data
+        self.assertEqual(json.loads(json.dumps(response.data['results'])), json.loads(json.dumps(expected)))
+        
+        response = self.client.get(url, {'ordering': 'title'})
+        expected = JobSearchDocumentListSerializer(
+            JobSearchDocument.objects.order_by('title'), many=True, context={'request': response.wsgi_request}
+        ).data
+        self.assertEqual(json.loads(json.dumps(response.data['results'])), json.loads(json.dumps(expected)))
+    
+    def test_job_list_sparse_fields(self):
+        """Test ?fields= limits the payload and the columns read"""
+        Application.objects.create(
+            job_seeker=self.job_seeker_user,
+            job_post=self.job_post1,
+            resume=Resume.objects.create(job_seeker=self.job_seeker_user, original_filename='cv.pdf', file_size=1)
+        )
+        token = self.get_jwt_token(self.recruiter_user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        url = reverse('job-post-list')
+        
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, {'my_jobs': 'true', 'fields': 'id,title'})
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.data['results'][0]), {'id', 'title'})
+        statements = [query['sql'] for query in queries.captured_queries]
+        self.assertFalse(any('matcher_application' in sql for sql in statements))
+        self.assertFalse(any('matcher_recruiterprofile' in sql for sql in statements))
+        
+        response = self.client.get(url, {'fields': 'title,salary'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('salary', str(response.data['fields']))
 
 
 class JobAnalyticsTest(TestCase):
@@ -763,6 +819,312 @@ class JobViewTest(TestCase):
         self.assertEqual(job_view.ip_address, '192.168.1.1')
 
 
+class JobViewPipelineTest(APITestCase):
+    """Test buffered job view tracking"""
+    
+    def setUp(self):
+        cache.clear()
+        job_view_buffer.clear()
+        
+        self.recruiter_user = User.objects.create_user(
+            username='recruiter1',
+            email='recruiter@test.com',
+            password='testpass123',
+            user_type='recruiter'
+        )
+        RecruiterProfile.objects.create(
+            user=self.recruiter_user,
+            company_name='Test Company'
+        )
+        
+        self.job_seeker_user = User.objects.create_user(
+            username='jobseeker1',
+            email='jobseeker@test.com',
+            password='testpass123',
+            user_type='job_seeker'
+        )
+        
+        self.job_post = JobPost.objects.create(
+            recruiter=self.recruiter_user,
+            title='Test Job',
+            description='Test description',
+            requirements='Test requirements',
+            location='Test Location',
+            job_type='full_time',
+            experience_level='mid',
+            skills_required='Python, Django'
+        )
+        
+        token = str(RefreshToken.for_user(self.job_seeker_user).access_token)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        self.url = reverse('job-post-detail', kwargs={'pk': self.job_post.pk})
+    
+    def tearDown(self):
+        job_view_buffer.clear()
+    
+    def test_retrieve_does_not_write_views(self):
+        """Test that a job detail request only buffers the view"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        writes = [
+            query['sql'] for query in queries.captured_queries
+            if query['sql'].lstrip().upper().startswith(('INSERT', 'UPDATE'))
+        ]
+        self.assertEqual(writes, [])
+        self.assertFalse(JobView.objects.filter(job_post=self.job_post).exists())
+        self.assertEqual(len(job_view_buffer), 1)
+    
+    def test_local_buffer_is_flushed_by_background_thread(self):
+        """Test that without Redis a full local buffer is flushed by the flusher thread, never the request"""
+        import threading
+        from .search_events import LocalFlusher
+        
+        flushed = threading.Event()
+        flush_threads = []
+        
+        def flush():
+            flush_threads.append(threading.current_thread().name)
+            flushed.set()
+        
+        flusher = LocalFlusher('test-job-view-events-flusher', flush, 3600)
+        with patch('matcher.search_events.get_redis_client', return_value=None), \
+                patch('matcher.job_view_events.LOCAL_FLUSH_THRESHOLD', 1), \
+                patch('matcher.job_view_events._local_flusher', flusher):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(self.url)
+            self.assertTrue(flushed.wait(5))
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(any(
+            query['sql'].lstrip().upper().startswith(('INSERT', 'UPDATE'))
+            for query in queries.captured_queries
+        ))
+        self.assertEqual(flush_threads, ['test-job-view-events-flusher'])
+    
+    def test_flush_applies_views_and_analytics(self):
+        """Test that a flush writes view rows, counts and analytics"""
+        self.client.get(self.url, REMOTE_ADDR='10.0.0.1')
+        self.client.get(self.url, REMOTE_ADDR='10.0.0.1')
+        self.client.get(self.url, REMOTE_ADDR='10.0.0.2')
+        
+        result = flush_job_view_events()
+        
+        self.assertEqual(result['views_flushed'], 3)
+        self.assertEqual(result['jobs_updated'], 1)
+        self.job_post.refresh_from_db()
+        self.assertEqual(self.job_post.views_count, 3)
+        self.assertEqual(JobView.objects.filter(job_post=self.job_post).count(), 3)
+        
+        analytics = JobAnalytics.objects.get(job_post=self.job_post)
+        self.assertEqual(analytics.total_views, 3)
+        self.assertEqual(analytics.unique_views, 2)
+        self.assertEqual(analytics.total_applications, 0)
+    
+    def test_flush_updates_each_job_once(self):
+        """Test that view counts are incremented once per job, not once per view"""
+        for _ in range(10):
+            self.client.get(self.url)
+        
+        with CaptureQueriesContext(connection) as queries:
+            flush_job_view_events()
+        
+        view_count_updates = [
+            query['sql'] for query in queries.captured_queries
+            if query['sql'].lstrip().upper().startswith('UPDATE') and '"matcher_jobpost"' in query['sql']
+        ]
+        self.assertEqual(len(view_count_updates), 1)
+        self.job_post.refresh_from_db()
+        self.assertEqual(self.job_post.views_count, 10)
+    
+    def test_malformed_forwarded_for_falls_back_to_remote_addr(self):
+        """Test that only valid client addresses are buffered"""
+        self.client.get(self.url, HTTP_X_FORWARDED_FOR='not-an-ip, 10.0.0.9', REMOTE_ADDR='10.0.0.3')
+        
+        flush_job_view_events()
+        
+        self.assertEqual(JobView.objects.get(job_post=self.job_post).ip_address, '10.0.0.3')
+    
+    def test_bad_view_is_dead_lettered_without_blocking_the_batch(self):
+        """Test that a view that cannot be stored does not stall later flushes"""
+        self.client.get(self.url, REMOTE_ADDR='10.0.0.1')
+        job_view_buffer.push({'job_post_id': str(self.job_post.id), 'ip_address': 'garbage'})
+        self.client.get(self.url, REMOTE_ADDR='10.0.0.2')
+        
+        result = flush_job_view_events()
+        
+        self.assertEqual(result['pending'], 0)
+        self.assertEqual(JobView.objects.filter(job_post=self.job_post).count(), 2)
+        self.assertEqual(get_job_view_stats()['dead_lettered_events'], 1)
+    
+    def test_failed_flush_requeues_views(self):
+        """Test that buffered views survive a failed database write"""
+        self.client.get(self.url)
+        
+        with patch('matcher.job_view_events._persist_views', side_effect=OperationalError('db down')):
+            with self.assertRaises(OperationalError):
+                flush_job_view_events()
+        
+        self.assertEqual(len(job_view_buffer), 1)
+        self.assertEqual(get_job_view_stats()['failed_flushes'], 1)
+        
+        flush_job_view_events()
+        
+        self.job_post.refresh_from_db()
+        self.assertEqual(self.job_post.views_count, 1)
+
+
+class JobAnalyticsRollupTest(APITestCase):
+    """Test hourly and daily job analytics rollups"""
+    
+    def setUp(self):
+        cache.clear()
+        
+        self.recruiter_user = User.objects.create_user(
+            username='recruiter1',
+            email='recruiter@test.com',
+            password='testpass123',
+            user_type='recruiter'
+        )
+        RecruiterProfile.objects.create(
+            user=self.recruiter_user,
+            company_name='Test Company'
+        )
+        self.job_seeker_user = User.objects.create_user(
+            username='jobseeker1',
+            email='jobseeker@test.com',
+            password='testpass123',
+            user_type='job_seeker'
+        )
+        self.resume = Resume.objects.create(
+            job_seeker=self.job_seeker_user,
+            original_filename='resume.pdf',
+            is_primary=True,
+            file_size=1024
+        )
+        self.job_post = JobPost.objects.create(
+            recruiter=self.recruiter_user,
+            title='Test Job',
+            description='Test description',
+            requirements='Test requirements',
+            location='Test Location',
+            job_type='full_time',
+            experience_level='mid',
+            skills_required='Python, Django'
+        )
+        JobAnalytics.objects.get_or_create(job_post=self.job_post)
+        
+        self.day = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=3)
+    
+    def _view(self, at, ip='10.0.0.1', referrer=''):
+        view = JobView.objects.create(job_post=self.job_post, ip_address=ip, referrer=referrer)
+        JobView.objects.filter(id=view.id).update(viewed_at=at)
+    
+    def test_rollups_bucket_views_and_applications(self):
+        """Test that raw rows are folded into hourly and daily buckets"""
+        self._view(self.day + timedelta(hours=9, minutes=5), ip='10.0.0.1', referrer='https://www.linkedin.com/jobs')
+        self._view(self.day + timedelta(hours=9, minutes=40), ip='10.0.0.1')
+        self._view(self.day + timedelta(hours=15), ip='10.0.0.2')
+        application = Application.objects.create(
+            job_seeker=self.job_seeker_user, job_post=self.job_post, resume=self.resume
+        )
+        Application.objects.filter(id=application.id).update(applied_at=self.day + timedelta(hours=15, minutes=30))
+        
+        build_job_analytics_rollups()
+        
+        hourly = list(JobAnalyticsHourly.objects.filter(job_post=self.job_post).values_list(
+            'bucket_start', 'views', 'unique_viewers', 'applications'
+        ))
+        self.assertEqual(hourly, [
+            (self.day + timedelta(hours=9), 2, 1, 0),
+            (self.day + timedelta(hours=15), 1, 1, 1),
+        ])
+        daily = JobAnalyticsDaily.objects.get(job_post=self.job_post, bucket_start=self.day)
+        self.assertEqual((daily.views, daily.unique_viewers, daily.applications), (3, 2, 1))
+        self.assertEqual(daily.referrers, {'www.linkedin.com': 1, 'direct': 2})
+    
+    def test_rollups_resume_from_high_water_mark(self):
+        """Test that reruns pick up new rows without double counting"""
+        self._view(timezone.now() - timedelta(minutes=1))
+        build_job_analytics_rollups()
+        
+        self._view(timezone.now())
+        build_job_analytics_rollups()
+        
+        self.assertEqual(
+            sum(JobAnalyticsDaily.objects.filter(job_post=self.job_post).values_list('views', flat=True)), 2
+        )
+        self.assertEqual(
+            sum(JobAnalyticsHourly.objects.filter(job_post=self.job_post).values_list('views', flat=True)), 2
+        )
+    
+    def test_daily_rollups_are_summed_from_hourly_buckets(self):
+        """Test that a rerun reads raw rows of the open hours only and rebuilds days from hourly rows"""
+        self._view(timezone.now() - timedelta(hours=5), ip='10.0.0.1')
+        build_job_analytics_rollups()
+        self._view(timezone.now(), ip='10.0.0.2')
+        
+        with CaptureQueriesContext(connection) as queries:
+            build_job_analytics_rollups()
+        
+        view_queries = [q['sql'].lower() for q in queries.captured_queries if 'matcher_jobview' in q['sql']]
+        self.assertTrue(view_queries)
+        self.assertFalse(any("'day'" in sql for sql in view_queries))  # raw rows are only truncated to hours
+        self.assertEqual(
+            sum(JobAnalyticsDaily.objects.filter(job_post=self.job_post).values_list('views', flat=True)), 2
+        )
+        self.assertEqual(
+            sum(JobAnalyticsDaily.objects.filter(job_post=self.job_post).values_list('unique_viewers', flat=True)), 2
+        )
+    
+    def test_range_reads_bounded_rows(self):
+        """Test that a long range is answered from daily rows plus hourly edges"""
+        for days_ago in range(1, 40):
+            self._view(timezone.now() - timedelta(days=days_ago))
+        build_job_analytics_rollups()
+        
+        with CaptureQueriesContext(connection) as queries:
+            summary = get_job_analytics_range(
+                self.job_post.id, timezone.now() - timedelta(days=45), timezone.now()
+            )
+        
+        self.assertEqual(summary['views'], 39)
+        self.assertFalse(any('matcher_jobview' in query['sql'] for query in queries.captured_queries))
+        
+        series = get_job_analytics_series(
+            self.job_post.id, timezone.now() - timedelta(days=10), timezone.now(), 'day'
+        )
+        self.assertEqual(len(series), 11)
+        self.assertEqual(sum(bucket['views'] for bucket in series), 10)
+        
+        with self.assertRaises(ValueError):
+            get_job_analytics_series(self.job_post.id, self.day - timedelta(days=365), timezone.now(), 'hour')
+    
+    def test_analytics_endpoint_uses_rollups(self):
+        """Test that the recruiter analytics endpoint reports ranges from rollups"""
+        self._view(timezone.now() - timedelta(days=2))
+        self._view(timezone.now() - timedelta(days=20))
+        build_job_analytics_rollups()
+        
+        token = str(RefreshToken.for_user(self.recruiter_user).access_token)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        url = reverse('job-post-analytics', kwargs={'pk': self.job_post.pk})
+        
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['recent_views'], 1)
+        self.assertEqual(len(response.data['timeline']), 8)
+        
+        start = (timezone.now() - timedelta(days=30)).date().isoformat()
+        response = self.client.get(url, {'start': start, 'granularity': 'day'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['range']['views'], 2)
+        
+        response = self.client.get(url, {'start': 'yesterday'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
 class JobPostSerializerTest(TestCase):
     """Test JobPost serializers"""
     
@@ -855,4 +1217,108 @@ class JobPostSerializerTest(TestCase):
         # Should be limited to first 5 skills
         self.assertEqual(len(skills_list), 5)
         expected_skills = ['Python', 'Django', 'React', 'PostgreSQL', 'Redis']
-        self.assertEqual(skills_list, expected_skills)
\ No newline at end of file
+        self.assertEqual(skills_list, expected_skills)
+
+
+class GeoLocationMatchingTest(APITestCase):
+    """Test gazetteer-backed location resolution and radius filtering"""
+    
+    def setUp(self):
+        load_gazetteer()
+        
+        self.recruiter_user = User.objects.create_user(
+            username='georecruiter',
+            email='georecruiter@test.com',
+            password='testpass123',
+            user_type='recruiter'
+        )
+        RecruiterProfile.objects.create(user=self.recruiter_user, company_name='Geo Company')
+        
+        self.job_seeker_user = User.objects.create_user(
+            username='geoseeker',
+            email='geoseeker@test.com',
+            password='testpass123',
+            user_type='job_seeker'
+        )
+        
+        self.oakland_job = self._create_job('Oakland Engineer', 'Oakland, CA')
+        self.san_jose_job = self._create_job('San Jose Engineer', 'San Jose, CA')
+        self.la_job = self._create_job('LA Engineer', 'Los Angeles, CA, USA')
+        self.unknown_job = self._create_job('Somewhere Engineer', 'Springfield Office')
+        
+    def _create_job(self, title, location):
+        return JobPost.objects.create(
+            recruiter=self.recruiter_user,
+            title=title,
+            description='Geo test job',
+            requirements='Python',
+            location=location,
+            job_type='full_time',
+            experience_level='mid',
+            skills_required='Python'
+        )
+        
+    def test_resolve_location_aliases(self):
+        """Test that spellings of the same place resolve to one Location"""
+        san_francisco = resolve_location('San Francisco')
+        self.assertIsNotNone(san_francisco)
+        self.assertEqual(resolve_location('SF Bay Area'), san_francisco)
+        self.assertEqual(resolve_location('San Francisco, CA, USA'), san_francisco)
+        self.assertIsNone(resolve_location('Remote'))
+        self.assertIsNone(resolve_location('Springfield Office'))
+        
+    def test_job_post_save_sets_geo_location(self):
+        """Test that saving a job resolves its location"""
+        self.assertEqual(self.oakland_job.geo_location.name, 'Oakland')
+        self.assertEqual(self.la_job.geo_location.name, 'Los Angeles')
+        self.assertIsNone(self.unknown_job.geo_location)
+        
+        self.oakland_job.location = 'NYC'
+        self.oakland_job.save(update_fields=['location'])
+        self.oakland_job.refresh_from_db()
+        self.assertEqual(self.oakland_job.geo_location.name, 'New York')
+        
+    def test_within_radius(self):
+        """Test bounding-box prefiltered haversine radius filter"""
+        san_francisco = resolve_location('San Francisco')
+        nearby = within_radius(
+            JobPost.objects.all(), san_francisco.latitude, san_francisco.longitude, 50,
+            prefix='geo_location__'
+        )
+        self.assertEqual(list(nearby), [self.oakland_job])
+        self.assertLess(nearby[0].distance_km, 20)
+        
+        wide = within_radius(
+            JobPost.objects.all(), san_francisco.latitude, san_francisco.longitude, 100,
+            prefix='geo_location__'
+        )
+        self.assertEqual(set(wide), {self.oakland_job, self.san_jose_job})
+        
+    def test_locations_match(self):
+        """Test distance-based matching with text fallback"""
+        self.assertTrue(locations_match('SF Bay Area', 'Oakland, CA'))
+        self.assertFalse(locations_match('San Francisco', 'San Jose'))
+        self.assertTrue(locations_match('San Francisco', 'San Jose', radius_km=100))
+        self.assertTrue(locations_match('Springfield', 'Springfield Office'))
+        self.assertAlmostEqual(haversine_km(0, 0, 0, 1), 111.19, places=1)
+        
+    def test_job_list_location_radius_filter(self):
+        """Test location filter on the job list uses the gazetteer radius"""
+        token = str(RefreshToken.for_user(self.job_seeker_user).access_token)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        url = reverse('job-post-list')
+        
+        response = self.client.get(url, {'location': 'SF Bay Area'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([job['title'] for job in response.data['results']], ['Oakland Engineer'])
+        
+        response = self.client.get(url, {'location': 'San Francisco', 'radius_km': '100'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            {job['title'] for job in response.data['results']}, {'Oakland Engineer', 'San Jose Engineer'}
+        )
+        
+        # Unknown places fall back to text matching
+        response = self.client.get(url, {'location': 'Springfield'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([job['title'] for job in response.data['results']], ['Somewhere Engineer'])
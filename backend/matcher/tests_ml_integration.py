@@ -320,7 +320,22 @@ class MatchScoreCacheTestCase(TestCase):
         cache_key = MatchScoreCache.get_cache_key(resume_id, job_id)
         expected_key = f"match_score:{resume_id}:{job_id}"
         
-        self.assertEqual(cache_key, expected_key)
+        # Tagged keys carry a version suffix that changes on invalidation
+        self.assertTrue(cache_key.startswith(f"{expected_key}:t"))
+    
+    def test_tag_invalidation_drops_cached_scores(self):
+        """Test that job and AI cache invalidation reach cached match scores"""
+        from .api_cache import CacheInvalidationManager
+        
+        MatchScoreCache.cache_score('resume-1', 'job-1', {'match_score': 70.0})
+        MatchScoreCache.cache_score('resume-2', 'job-2', {'match_score': 80.0})
+        
+        MatchScoreCache.invalidate_cache(job_id='job-1')
+        self.assertIsNone(MatchScoreCache.get_cached_score('resume-1', 'job-1'))
+        self.assertIsNotNone(MatchScoreCache.get_cached_score('resume-2', 'job-2'))
+        
+        CacheInvalidationManager.invalidate_ai_caches()
+        self.assertIsNone(MatchScoreCache.get_cached_score('resume-2', 'job-2'))
 
 
 class MatchScoreAPITestCase(APITestCase):
@@ -5,20 +5,31 @@ Tests for the notification system including signals, models, and WebSocket funct
 import json
 import pytest
 from unittest.mock import patch, MagicMock
+from django.db import connection
 from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
 from django.contrib.auth import get_user_model
 from django.utils import timezone
+from django.core.cache import cache
 from channels.testing import WebsocketCommunicator
 from channels.db import database_sync_to_async
 from datetime import timedelta
 
 from .models import (
     JobPost, Application, Resume, Notification, NotificationPreference, 
-    NotificationTemplate, JobSeekerProfile, RecruiterProfile
+    NotificationTemplate, JobSeekerProfile, RecruiterProfile, Location, Skill, UserSkill, DashboardCounters
+)
+from .search_analytics import SavedSearch
+from .notification_fanout import (
+    create_job_posted_notifications, fan_out_job_posted_notifications, relevant_job_seekers
 )
 from .signals import match_score_calculated
 from .consumers import NotificationConsumer
 from .notification_utils import notification_broadcaster
+from .notification_service import get_active_notification_template, notification_service
+from . import notification_stream
+from .cache_utils import get_redis_client
+from .near_cache import clear_near_caches
 
 User = get_user_model()
 
@@ -202,6 +213,31 @@ class NotificationModelTests(TestCase):
         
         self.assertEqual(rendered_title, 'New Job: Software Engineer')
         self.assertIn('template error', rendered_message)
+    
+    def test_active_template_lookup_is_cached(self):
+        """Test template lookups are served from the cache until a template changes."""
+        cache.clear()
+        clear_near_caches()
+        
+        self.assertIsNone(get_active_notification_template('job_posted', 'websocket'))
+        
+        template = NotificationTemplate.objects.create(
+            template_type='job_posted',
+            delivery_channel='websocket',
+            title_template='New Job: {job_title}',
+            message_template='A new {job_type} position at {company_name} has been posted.',
+            is_default=True
+        )
+        
+        self.assertEqual(get_active_notification_template('job_posted', 'websocket'), template)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_active_notification_template('job_posted', 'websocket'), template)
+            self.assertIsNone(get_active_notification_template('job_posted', 'email'))
+        
+        template.is_active = False
+        template.save()
+        
+        self.assertIsNone(get_active_notification_template('job_posted', 'websocket'))
 
 
 class NotificationSignalTests(TestCase):
@@ -532,6 +568,33 @@ class NotificationConsumerTests(TransactionTestCase):
             )
             
             await communicator.disconnect()
+    
+    async def test_connect_replays_notifications_after_cursor(self):
+        """A reconnecting client gets everything after its cursor in one batch."""
+        user = await self.create_test_user()
+        notifications = await database_sync_to_async(lambda: [
+            Notification.objects.create(
+                recipient=user, notification_type='system_update', title=f'Update {i}', message=f'Update {i}'
+            )
+            for i in range(3)
+        ])()
+        cursors = await database_sync_to_async(notification_stream.append_notifications)(notifications)
+        
+        communicator = WebsocketCommunicator(
+            NotificationConsumer.as_asgi(), f"/ws/notifications/?cursor={cursors[0]}"
+        )
+        communicator.scope['user'] = user
+        connected, subprotocol = await communicator.connect()
+        self.assertTrue(connected)
+        
+        self.assertEqual((await communicator.receive_json_from())['type'], 'connection_established')
+        replay = await communicator.receive_json_from()
+        self.assertEqual(replay['type'], 'queued_notifications')
+        self.assertEqual([entry['title'] for entry in replay['notifications']], ['Update 1', 'Update 2'])
+        self.assertEqual(replay['cursor'], cursors[-1])
+        
+        await communicator.disconnect()
+        await database_sync_to_async(get_redis_client().delete)(notification_stream.stream_key(user.id))
 
 
 class NotificationIntegrationTests(TestCase):
@@ -664,5 +727,278 @@ class NotificationIntegrationTests(TestCase):
         self.assertIn('Custom message', notification.message)
 
 
+
+class NotificationFanoutTests(TestCase):
+    """Test targeting and chunking of job posted notifications."""
+    
+    def setUp(self):
+        """Set up a job in Berlin and job seekers around it."""
+        self.berlin = Location.objects.create(name='Berlin', country_code='DE', latitude=52.52, longitude=13.405)
+        self.tokyo = Location.objects.create(name='Tokyo', country_code='JP', latitude=35.68, longitude=139.69)
+        python = Skill.objects.create(name='Python', category='language')
+        
+        self.recruiter = User.objects.create_user(
+            username='recruiter1', email='recruiter@example.com', user_type='recruiter'
+        )
+        RecruiterProfile.objects.create(user=self.recruiter, company_name='Tech Corp')
+        self.job_post = JobPost.objects.create(
+            recruiter=self.recruiter,
+            title='Backend Engineer',
+            description='Python developer position',
+            location='Berlin',
+            job_type='full_time',
+            experience_level='mid',
+            skills_required='python, Django'
+        )
+        JobPost.objects.filter(id=self.job_post.id).update(geo_location=self.berlin)
+        self.job_post.refresh_from_db()
+        
+        self.seekers = {}
+        for name, location, has_skill in [
+            ('nearby', self.berlin, True),
+            ('far', self.tokyo, True),
+            ('unknown_location', None, True),
+            ('no_skill', self.berlin, False),
+            ('opted_out', self.berlin, True),
+        ]:
+            user = User.objects.create_user(
+                username=name, email=f'{name}@example.com', user_type='job_seeker'
+            )
+            JobSeekerProfile.objects.create(user=user)
+            JobSeekerProfile.objects.filter(user=user).update(geo_location=location)
+            if has_skill:
+                UserSkill.objects.create(user=user, skill=python, proficiency_level='advanced')
+            self.seekers[name] = user
+        
+        NotificationPreference.objects.update_or_create(
+            user=self.seekers['opted_out'], defaults={'job_posted_enabled': False}
+        )
+        SavedSearch.objects.create(
+            user=self.seekers['far'], name='Backend', search_type='jobs', query='backend engineer'
+        )
+        SavedSearch.objects.create(
+            user=self.seekers['no_skill'], name='Interns', search_type='jobs',
+            query='backend', filters={'job_type': 'internship'}
+        )
+    
+    def test_recipients_match_skill_and_location_or_saved_search(self):
+        """Only seekers with a nearby skill match or a matching saved search are notified."""
+        recipients = set(relevant_job_seekers(self.job_post).values_list('username', flat=True))
+        
+        self.assertEqual(recipients, {'nearby', 'unknown_location', 'far'})
+    
+    def test_remote_jobs_ignore_location(self):
+        """Remote jobs reach skilled seekers anywhere."""
+        self.job_post.remote_work_allowed = True
+        
+        recipients = set(relevant_job_seekers(self.job_post).values_list('username', flat=True))
+        
+        self.assertEqual(recipients, {'nearby', 'far', 'unknown_location'})
+    
+    def test_fan_out_chunks_and_skips_notified_recipients(self):
+        """Chunks cover every recipient once and retried chunks create nothing new."""
+        chunks = []
+        result = fan_out_job_posted_notifications(self.job_post, chunk_size=2, dispatch=chunks.append)
+        
+        self.assertEqual(result, {'recipients': 3, 'chunks': 2})
+        self.assertEqual([len(chunk) for chunk in chunks], [2, 1])
+        
+        created = sum(create_job_posted_notifications(self.job_post, chunk) for chunk in chunks)
+        self.assertEqual(created, 3)
+        self.assertEqual(create_job_posted_notifications(self.job_post, chunks[0]), 0)
+        
+        notifications = Notification.objects.filter(job_post=self.job_post, notification_type='job_posted')
+        self.assertEqual(notifications.count(), 3)
+        self.assertIn('Tech Corp', notifications.first().message)
+    
+    def test_chunk_queries_do_not_grow_with_recipients(self):
+        """Preferences are bulk-loaded, not fetched or created per recipient."""
+        recipient_ids = [str(user.id) for user in self.seekers.values()]
+        preference_count = NotificationPreference.objects.count()
+        notification_service.job_posted_content(self.job_post)
+        
+        with CaptureQueriesContext(connection) as single:
+            create_job_posted_notifications(self.job_post, recipient_ids[:1])
+        with CaptureQueriesContext(connection) as several:
+            create_job_posted_notifications(self.job_post, recipient_ids[1:])
+        
+        self.assertEqual(len(several), len(single))
+        self.assertEqual(NotificationPreference.objects.count(), preference_count)
+        self.assertEqual(
+            Notification.objects.filter(job_post=self.job_post).count(), len(recipient_ids) - 1
+        )
+
+
+
+class NotificationListingTests(TestCase):
+    """Test priority ordering and unread counts of notification listings."""
+    
+    def setUp(self):
+        """Set up a job seeker with a counters row."""
+        self.user = User.objects.create_user(
+            username='reader', email='reader@example.com', user_type='job_seeker'
+        )
+        JobSeekerProfile.objects.create(user=self.user)
+        self.user_id = str(self.user.id)
+    
+    def notify(self, priority='normal', title='Update'):
+        return notification_service.create_notification(
+            recipient_id=self.user_id, notification_type='system_update', title=title,
+            message=title, priority=priority, send_real_time=False
+        )
+    
+    def test_priority_outranks_recency_across_pages(self):
+        """An older urgent notification is on the first page, not after the newer ones."""
+        urgent = self.notify('urgent', 'Urgent')
+        for i in range(5):
+            self.notify(title=f'Normal {i}')
+        
+        first_page = notification_service.get_user_notifications(self.user_id, limit=2)
+        
+        self.assertEqual(urgent.priority_rank, Notification.PRIORITY_RANKS['urgent'])
+        self.assertEqual(first_page['notifications'][0]['id'], str(urgent.id))
+        self.assertEqual(first_page['notifications'][1]['title'], 'Normal 4')
+        self.assertTrue(first_page['has_more'])
+        self.assertEqual(first_page['total_count'], 6)
+    
+    def test_unread_counter_follows_create_read_and_mark_all(self):
+        """The unread counter is shifted by every write path and read without counting."""
+        first = self.notify()
+        self.notify()
+        notification_service.create_bulk_notifications(
+            recipient_ids=[self.user_id], notification_type='system_update', title='Bulk', message='Bulk'
+        )
+        self.assertEqual(notification_service.get_unread_count(self.user_id), 3)
+        
+        notification_service.mark_notification_as_read(str(first.id), self.user_id)
+        notification_service.mark_notification_as_read(str(first.id), self.user_id)
+        with self.assertNumQueries(1):
+            self.assertEqual(notification_service.get_unread_count(self.user_id), 2)
+        
+        notification_service.mark_all_notifications_read(self.user_id)
+        self.assertEqual(notification_service.get_unread_count(self.user_id), 0)
+        self.assertEqual(
+            DashboardCounters.objects.get(user=self.user).notifications_unread,
+            Notification.objects.filter(recipient=self.user, is_read=False).count()
+        )
+    
+    def test_keyset_listing_reports_count(self):
+        """Keyset pages keep a count; the unread listing takes it from the counter."""
+        from rest_framework.test import APIClient
+        
+        for i in range(3):
+            self.notify(title=f'Update {i}')
+        Notification.objects.filter(recipient=self.user, title='Update 0').update(is_read=True)
+        client = APIClient()
+        client.force_authenticate(self.user)
+        
+        response = client.get('/api/v1/notifications/', {'page_size': 1})
+        self.assertEqual(response.data['count'], 3)
+        self.assertIsNotNone(response.data['next'])
+        
+        with patch('matcher.notification_service.notification_service.get_unread_count', return_value=7) as unread:
+            response = client.get('/api/v1/notifications/', {'is_read': 'false', 'page_size': 1})
+        unread.assert_called_once_with(self.user_id)
+        self.assertEqual(response.data['count'], 7)
+        self.assertEqual(len(response.data['results']), 1)
+    
+    def test_mark_read_decrements_only_when_it_flips_the_row(self):
+        """Marking read is a conditional update; a row another request already flipped is not counted again."""
+        notification = self.notify()
+        self.notify()
+        # Another request marked it read after this one loaded the notification
+        Notification.objects.filter(id=notification.id).update(is_read=True, read_at=timezone.now())
+        
+        with patch.object(notification_service, '_send_read_acknowledgment') as acknowledge:
+            self.assertTrue(notification_service.mark_notification_as_read(str(notification.id), self.user_id))
+        
+        # The other request did the decrement; this one leaves the counter alone
+        acknowledge.assert_not_called()
+        self.assertEqual(notification_service.get_unread_count(self.user_id), 2)
+        
+        other = User.objects.create_user(username='other', email='other@example.com', user_type='job_seeker')
+        self.assertFalse(notification_service.mark_notification_as_read(str(notification.id), str(other.id)))
+    
+    def test_detail_update_keeps_unread_counter_in_step(self):
+        """Marking a notification unread through the detail view counts it again."""
+        from rest_framework.test import APIClient
+        
+        notification = self.notify()
+        client = APIClient()
+        client.force_authenticate(self.user)
+        url = f'/api/v1/notifications/{notification.id}/'
+        
+        response = client.patch(url, {'is_read': True}, format='json')
+        self.assertTrue(response.data['is_read'])
+        self.assertEqual(notification_service.get_unread_count(self.user_id), 0)
+        
+        response = client.patch(url, {'is_read': False}, format='json')
+        self.assertFalse(response.data['is_read'])
+        self.assertIsNone(response.data['read_at'])
+        self.assertEqual(notification_service.get_unread_count(self.user_id), 1)
+        
+        client.patch(url, {'is_read': False}, format='json')
+        self.assertEqual(notification_service.get_unread_count(self.user_id), 1)
+
+
+class NotificationStreamTests(TestCase):
+    """Test the per-user offline notification streams."""
+    
+    def setUp(self):
+        """Set up a recipient with an empty stream."""
+        self.user = User.objects.create_user(
+            username='offline', email='offline@example.com', user_type='job_seeker'
+        )
+        self.client_redis = get_redis_client()
+        if self.client_redis is None:
+            self.skipTest('Offline notification streams need Redis')
+        self.addCleanup(
+            self.client_redis.delete,
+            notification_stream.stream_key(self.user.id), notification_stream.cursor_key(self.user.id)
+        )
+    
+    def notifications(self, count):
+        return [
+            Notification.objects.create(
+                recipient=self.user, notification_type='system_update', title=f'Update {i}', message=f'Update {i}'
+            )
+            for i in range(count)
+        ]
+    
+    def test_concurrent_appends_are_not_lost(self):
+        """Appends from many producers all land in the stream."""
+        from concurrent.futures import ThreadPoolExecutor
+        
+        notifications = self.notifications(20)
+        with ThreadPoolExecutor(max_workers=10) as executor:
+            list(executor.map(notification_service.queue_notification_for_offline_user, notifications))
+        
+        entries, _ = notification_stream.read_after(self.user.id)
+        self.assertEqual(
+            sorted(entry['id'] for entry in entries), sorted(str(notification.id) for notification in notifications)
+        )
+    
+    def test_stream_is_capped(self):
+        """Only the newest MAX_LENGTH entries are kept."""
+        with patch.object(notification_stream, 'MAX_LENGTH', 5):
+            notification_stream.append_notifications(self.notifications(8))
+        
+        entries, _ = notification_stream.read_after(self.user.id)
+        self.assertEqual([entry['title'] for entry in entries], [f'Update {i}' for i in range(3, 8)])
+    
+    def test_read_after_resumes_from_delivered_cursor(self):
+        """Without a client cursor, reading continues after the last delivered entry."""
+        cursors = notification_stream.append_notifications(self.notifications(3))
+        
+        entries, cursor = notification_stream.read_after(self.user.id, cursors[0])
+        self.assertEqual([entry['cursor'] for entry in entries], cursors[1:])
+        
+        notification_stream.mark_delivered(self.user.id, cursor)
+        self.assertEqual(notification_stream.read_after(self.user.id), ([], cursor))
+        
+        entries, _ = notification_stream.read_after(self.user.id, 'not-a-cursor')
+        self.assertEqual(entries, [])
+
+
 if __name__ == '__main__':
     pytest.main([__file__])
\ No newline at end of file
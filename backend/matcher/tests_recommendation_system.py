@@ -11,6 +11,8 @@ from django.contrib.auth import get_user_model
 from django.urls import reverse
 from django.utils import timezone
 from django.core.cache import cache
+from django.db import OperationalError, connection
+from django.test.utils import CaptureQueriesContext
 
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
@@ -18,10 +20,14 @@ from rest_framework_simplejwt.tokens import RefreshToken
 
 from .models import (
     JobPost, Application, Resume, JobSeekerProfile, RecruiterProfile,
-    Skill, UserSkill, JobView, AIAnalysisResult
+    Skill, UserSkill, JobView, AIAnalysisResult, JobSearchDocument
 )
 from .search_analytics import SearchAnalytics, PopularSearchTerms, SearchSuggestions, SavedSearch
 from .recommendation_engine import RecommendationEngine, SearchOptimizer, PersonalizedContentDelivery
+from .search_events import (
+    search_event_buffer, record_search_event, flush_search_events, get_search_event_stats
+)
+from .search_documents import reconcile_job_search_documents
 
 User = get_user_model()
 
@@ -142,6 +148,20 @@ class RecommendationEngineTestCase(TestCase):
             self.assertGreaterEqual(rec['score'], 0.0)
             self.assertLessEqual(rec['score'], 1.0)
     
+    def test_job_changes_drop_cached_recommendations(self):
+        """Test that job cache invalidation reaches cached recommendation lists"""
+        from .api_cache import CacheInvalidationManager
+        
+        self.recommendation_engine.get_job_recommendations_for_user(self.job_seeker, limit=10)
+        with patch.object(self.recommendation_engine, '_get_content_based_job_recommendations') as content_based:
+            self.recommendation_engine.get_job_recommendations_for_user(self.job_seeker, limit=10)
+            content_based.assert_not_called()
+            
+            CacheInvalidationManager.invalidate_job_caches(job_id=str(self.job_post1.id))
+            content_based.return_value = []
+            self.recommendation_engine.get_job_recommendations_for_user(self.job_seeker, limit=10)
+            content_based.assert_called_once()
+    
     def test_get_candidate_recommendations_for_job(self):
         """Test candidate recommendations for recruiters"""
         recommendations = self.recommendation_engine.get_candidate_recommendations_for_job(
@@ -190,7 +210,7 @@ class RecommendationEngineTestCase(TestCase):
         user_skills = ['Python', 'Django', 'JavaScript']
         
         score = self.recommendation_engine._calculate_content_based_score(
-            self.job_seeker, self.job_post1, user_skills
+            self.job_seeker, self.job_post1.search_document, user_skills
         )
         
         self.assertIsInstance(score, float)
@@ -358,6 +378,88 @@ class SearchOptimizerTestCase(TestCase):
         self.assertIn('error', results)
         self.assertEqual(results['error'], 'Access denied')
     
+    def test_search_results_shared_across_users(self):
+        """Test that identical searches from different users share the result cache"""
+        other_seeker = User.objects.create_user(
+            username='jobseeker2',
+            email='jobseeker2@test.com',
+            password='testpass123',
+            user_type='job_seeker'
+        )
+        JobSeekerProfile.objects.create(user=other_seeker, location='Remote', experience_level='senior')
+        
+        first = self.search_optimizer.search_jobs(query='Python ', user=self.job_seeker, limit=10)
+        second = self.search_optimizer.search_jobs(query='python', user=other_seeker, limit=10)
+        
+        self.assertEqual(
+            [job['id'] for job in first['results']],
+            [job['id'] for job in second['results']]
+        )
+        stats = SearchOptimizer.get_cache_stats()
+        self.assertEqual(stats['job_results']['hits'], 1)
+        self.assertEqual(stats['job_results']['misses'], 1)
+        self.assertEqual(stats['personalization']['misses'], 2)
+        
+        # Personalization is applied per user on top of the shared page
+        self.assertTrue(first['results'][0]['personalization']['experience_level_match'])
+        self.assertFalse(second['results'][0]['personalization']['experience_level_match'])
+    
+    def test_cached_search_drops_inactive_jobs(self):
+        """Test that jobs deactivated after caching are not returned from the ID cache"""
+        self.search_optimizer.search_jobs(query='Developer', limit=10)
+        JobPost.objects.filter(id=self.job_post1.id).update(is_active=False)
+        
+        results = self.search_optimizer.search_jobs(query='developer', limit=10)
+        
+        self.assertEqual([job['id'] for job in results['results']], [str(self.job_post2.id)])
+    
+    def test_personalization_query_count_independent_of_page_size(self):
+        """Test that personalizing a page of 20 results runs a constant number of queries"""
+        for i in range(20):
+            job = JobPost.objects.create(
+                recruiter=self.recruiter,
+                title=f'Backend Engineer {i}',
+                description='Backend role',
+                location='San Francisco',
+                job_type='full_time',
+                experience_level='mid',
+                skills_required='Python, PostgreSQL',
+                is_active=True
+            )
+            if i % 2 == 0:
+                JobView.objects.create(job_post=job, viewer=self.job_seeker, ip_address='127.0.0.1')
+        
+        # Warm the shared result layer so only hydration and personalization hit the DB
+        self.search_optimizer.search_jobs(query='backend', limit=5)
+        self.search_optimizer.search_jobs(query='backend', limit=20)
+        
+        # hydrate page, profile, skills, applied flags, viewed flags
+        user = User.objects.get(pk=self.job_seeker.pk)
+        with self.assertNumQueries(5):
+            small_page = self.search_optimizer.search_jobs(query='backend', user=user, limit=5)
+        SearchOptimizer.invalidate_personalization(self.job_seeker.id)
+        user = User.objects.get(pk=self.job_seeker.pk)
+        with self.assertNumQueries(5):
+            results = self.search_optimizer.search_jobs(query='backend', user=user, limit=20)
+        
+        self.assertEqual(len(small_page['results']), 5)
+        self.assertEqual(len(results['results']), 20)
+        self.assertEqual(sum(job['personalization']['has_viewed'] for job in results['results']), 10)
+        self.assertFalse(any(job['personalization']['has_applied'] for job in results['results']))
+    
+    def test_personalization_context_invalidated_on_profile_change(self):
+        """Test that profile updates drop the cached personalization layer"""
+        self.search_optimizer.search_jobs(query='Python', user=self.job_seeker, limit=10)
+        
+        profile = self.job_seeker.job_seeker_profile
+        profile.experience_level = 'senior'
+        profile.save()
+        
+        results = self.search_optimizer.search_jobs(query='Python', user=self.job_seeker, limit=10)
+        
+        self.assertFalse(results['results'][0]['personalization']['experience_level_match'])
+        self.assertEqual(SearchOptimizer.get_cache_stats()['personalization']['hits'], 0)
+    
     def test_build_text_search_query(self):
         """Test text search query building"""
         query = self.search_optimizer._build_text_search_query('Python Django')
@@ -712,6 +814,335 @@ class SearchAnalyticsTestCase(APITestCase):
         self.assertIn('recent_searches', data)
 
 
+class SearchEventPipelineTestCase(APITestCase):
+    """
+    Test cases for the buffered search analytics pipeline
+    """
+    
+    def setUp(self):
+        """Set up test data"""
+        cache.clear()
+        search_event_buffer.clear()
+        
+        self.client = APIClient()
+        
+        self.user = User.objects.create_user(
+            username='searcher',
+            email='searcher@test.com',
+            password='testpass123',
+            user_type='job_seeker'
+        )
+        
+        self.token = str(RefreshToken.for_user(self.user).access_token)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.token}')
+    
+    def tearDown(self):
+        """Drop buffered events so they do not leak into other tests"""
+        search_event_buffer.clear()
+    
+    def test_search_request_does_not_write_analytics(self):
+        """Test that searching only buffers an event"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('v1:advanced-job-search'), {'q': 'python'})
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('search_id', response.json())
+        writes = [
+            query['sql'] for query in queries.captured_queries
+            if query['sql'].lstrip().upper().startswith(('INSERT', 'UPDATE'))
+        ]
+        self.assertEqual(writes, [])
+        self.assertEqual(SearchAnalytics.objects.count(), 0)
+        self.assertEqual(PopularSearchTerms.objects.count(), 0)
+        self.assertEqual(len(search_event_buffer), 1)
+    
+    def test_local_buffer_is_flushed_by_background_thread(self):
+        """Test that without Redis a full local buffer is flushed by the flusher thread, never the request"""
+        import threading
+        from .search_events import LocalFlusher
+        
+        flushed = threading.Event()
+        flush_threads = []
+        
+        def flush():
+            flush_threads.append(threading.current_thread().name)
+            flushed.set()
+        
+        flusher = LocalFlusher('test-search-events-flusher', flush, 3600)
+        with patch('matcher.search_events.get_redis_client', return_value=None), \
+                patch('matcher.search_events.LOCAL_FLUSH_THRESHOLD', 1), \
+                patch('matcher.search_events._local_flusher', flusher):
+            record_search_event('jobs', 'python', {}, 1)
+            self.assertTrue(flushed.wait(5))
+        
+        self.assertEqual(flush_threads, ['test-search-events-flusher'])
+    
+    def test_flush_persists_events_and_aggregates_terms(self):
+        """Test that a flush writes rows and increments popular terms in bulk"""
+        PopularSearchTerms.objects.create(search_type='jobs', term='python', search_count=5)
+        
+        for _ in range(3):
+            record_search_event('jobs', 'Python', {}, 10, user=self.user)
+        record_search_event('jobs', 'django', {'location': 'Remote'}, 4, user=self.user)
+        
+        result = flush_search_events(batch_size=2)
+        
+        self.assertEqual(result['events_flushed'], 4)
+        self.assertEqual([batch['size'] for batch in result['batches']], [2, 2])
+        self.assertEqual(result['pending'], 0)
+        self.assertEqual(SearchAnalytics.objects.filter(user=self.user).count(), 4)
+        self.assertEqual(PopularSearchTerms.objects.get(term='python').search_count, 8)
+        self.assertEqual(PopularSearchTerms.objects.get(term='django').search_count, 1)
+    
+    def test_flush_uses_bulk_writes(self):
+        """Test that the number of writes does not grow with the batch size"""
+        for i in range(20):
+            record_search_event('jobs', f'term{i % 4}', {}, 1, user=self.user)
+        
+        with CaptureQueriesContext(connection) as queries:
+            flush_search_events()
+        
+        inserts = [q for q in queries.captured_queries if q['sql'].lstrip().upper().startswith('INSERT')]
+        updates = [q for q in queries.captured_queries if q['sql'].lstrip().upper().startswith('UPDATE')]
+        self.assertEqual(len(inserts), 2)  # search rows + popular term rows
+        self.assertEqual(len(updates), 1)  # one grouped increment (all terms searched 5 times)
+        self.assertEqual(SearchAnalytics.objects.count(), 20)
+    
+    def test_failed_flush_requeues_batch(self):
+        """Test that events survive a failed database write"""
+        record_search_event('jobs', 'python', {}, 10, user=self.user)
+        record_search_event('jobs', 'django', {}, 10, user=self.user)
+        
+        with patch('matcher.search_events._persist_events', side_effect=OperationalError('db down')):
+            with self.assertRaises(OperationalError):
+                flush_search_events()
+        
+        self.assertEqual(len(search_event_buffer), 2)
+        self.assertEqual(get_search_event_stats()['failed_flushes'], 1)
+        
+        result = flush_search_events()
+        
+        self.assertEqual(result['events_flushed'], 2)
+        self.assertEqual(
+            list(SearchAnalytics.objects.order_by('searched_at').values_list('query', flat=True)),
+            ['python', 'django']
+        )
+    
+    def test_bad_event_is_dead_lettered_without_blocking_the_batch(self):
+        """Test that an event that cannot be persisted does not stall later flushes"""
+        record_search_event('jobs', 'python', {}, 10, user=self.user)
+        search_event_buffer.push({'kind': 'search', 'id': 'not-a-uuid', 'search_type': 'jobs', 'query': 'bad'})
+        record_search_event('jobs', 'django', {}, 10, user=self.user)
+        
+        result = flush_search_events()
+        
+        self.assertEqual(result['pending'], 0)
+        self.assertEqual(
+            sorted(SearchAnalytics.objects.values_list('query', flat=True)), ['django', 'python']
+        )
+        self.assertEqual(get_search_event_stats()['dead_lettered_events'], 1)
+    
+    def test_interaction_with_invalid_search_id_is_rejected(self):
+        """Test that interactions are only buffered for UUID search ids"""
+        response = self.client.post(reverse('v1:track-search-interaction'), {
+            'search_id': 'not-a-uuid',
+            'interaction_type': 'click',
+            'result_id': 'job-1'
+        }, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(len(search_event_buffer), 0)
+    
+    def test_trimmed_events_are_counted(self):
+        """Test that events dropped by the buffer cap are reported"""
+        with patch.object(search_event_buffer, 'max_length', 3):
+            for i in range(5):
+                record_search_event('jobs', f'term{i}', {}, 1, user=self.user)
+        
+        stats = get_search_event_stats()
+        
+        self.assertEqual(stats['dropped_events'], 2)
+        self.assertEqual(stats['pending_events'], 3)
+    
+    def test_click_interaction_applied_on_flush(self):
+        """Test that buffered clicks are attached to their search row"""
+        search_id = record_search_event('jobs', 'python', {}, 10, user=self.user)
+        
+        response = self.client.post(reverse('v1:track-search-interaction'), {
+            'search_id': search_id,
+            'interaction_type': 'click',
+            'result_id': 'job-1'
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        
+        flush_search_events()
+        
+        self.assertEqual(SearchAnalytics.objects.get(id=search_id).clicked_results, ['job-1'])
+    
+    def test_flush_stats_are_reported(self):
+        """Test that batch sizes and flush lag are observable"""
+        record_search_event('jobs', 'python', {}, 10, user=self.user)
+        flush_search_events()
+        
+        stats = get_search_event_stats()
+        
+        self.assertEqual(stats['flush_runs'], 1)
+        self.assertEqual(stats['events_flushed'], 1)
+        self.assertEqual(stats['last_batch_size'], 1)
+        self.assertIn('last_flush_lag_seconds', stats)
+        self.assertEqual(stats['pending_events'], 0)
+
+
+class JobSearchDocumentTestCase(APITestCase):
+    """
+    Test cases for the denormalized job search documents
+    """
+    
+    def setUp(self):
+        """Set up test data"""
+        cache.clear()
+        
+        self.client = APIClient()
+        
+        self.recruiter = User.objects.create_user(
+            username='doc_recruiter',
+            email='docrecruiter@test.com',
+            password='testpass123',
+            user_type='recruiter'
+        )
+        self.recruiter_profile = RecruiterProfile.objects.create(
+            user=self.recruiter,
+            company_name='Doc Corp',
+            industry='Technology'
+        )
+        
+        self.job_seeker = User.objects.create_user(
+            username='doc_seeker',
+            email='docseeker@test.com',
+            password='testpass123',
+            user_type='job_seeker'
+        )
+        self.resume = Resume.objects.create(
+            job_seeker=self.job_seeker,
+            original_filename='resume.pdf',
+            is_primary=True,
+            file_size=1024
+        )
+        
+        self.job = JobPost.objects.create(
+            recruiter=self.recruiter,
+            title='Python Engineer',
+            description='Build APIs with Django',
+            requirements='Python',
+            location='Remote',
+            job_type='full_time',
+            experience_level='mid',
+            skills_required='Python, Django, python',
+            is_active=True
+        )
+    
+    def test_document_created_with_job(self):
+        """Test that saving an active job writes its document"""
+        document = JobSearchDocument.objects.get(job_post=self.job)
+        
+        self.assertEqual(document.title, 'Python Engineer')
+        self.assertEqual(document.company_name, 'Doc Corp')
+        self.assertEqual(document.skills, ['Python', 'Django'])
+        self.assertEqual(document.skills_text, ',python,django,')
+        self.assertIn('build apis with django', document.search_text)
+        self.assertEqual(document.freshness_score, 3)
+    
+    def test_document_follows_job_updates(self):
+        """Test that edits are copied and deactivation removes the document"""
+        self.job.title = 'Senior Python Engineer'
+        self.job.save()
+        
+        self.assertEqual(JobSearchDocument.objects.get(job_post=self.job).title, 'Senior Python Engineer')
+        
+        self.job.is_active = False
+        self.job.save()
+        
+        self.assertFalse(JobSearchDocument.objects.filter(job_post=self.job).exists())
+    
+    def test_company_rename_refreshes_documents(self):
+        """Test that recruiter profile changes reach existing documents"""
+        self.recruiter_profile.company_name = 'Renamed Corp'
+        self.recruiter_profile.save()
+        
+        self.assertEqual(JobSearchDocument.objects.get(job_post=self.job).company_name, 'Renamed Corp')
+    
+    def test_counters_track_applications_and_views(self):
+        """Test that application and view signals adjust popularity"""
+        application = Application.objects.create(
+            job_seeker=self.job_seeker, job_post=self.job, resume=self.resume
+        )
+        JobView.objects.create(job_post=self.job, viewer=self.job_seeker, ip_address='127.0.0.1')
+        
+        document = JobSearchDocument.objects.get(job_post=self.job)
+        self.assertEqual(document.applications_count, 1)
+        self.assertEqual(document.views_count, 1)
+        self.assertEqual(document.popularity_score, 3)
+        
+        application.delete()
+        
+        document.refresh_from_db()
+        self.assertEqual(document.applications_count, 0)
+        self.assertEqual(document.popularity_score, 1)
+    
+    def test_reconcile_repairs_bulk_update_drift(self):
+        """Test that the reconciler catches changes made without signals"""
+        inactive = JobPost.objects.create(
+            recruiter=self.recruiter, title='Old Role', description='Old', requirements='Old',
+            location='Remote', job_type='contract', experience_level='senior', is_active=True
+        )
+        JobPost.objects.filter(id=inactive.id).update(is_active=False)
+        JobPost.objects.filter(id=self.job.id).update(title='Staff Python Engineer')
+        JobSearchDocument.objects.filter(job_post=self.job).update(views_count=99, popularity_score=99)
+        
+        result = reconcile_job_search_documents()
+        
+        self.assertEqual(result, {'upserted': 1, 'removed': 1})
+        document = JobSearchDocument.objects.get(job_post=self.job)
+        self.assertEqual(document.title, 'Staff Python Engineer')
+        self.assertEqual(document.views_count, 0)
+        self.assertEqual(document.popularity_score, 0)
+        self.assertFalse(JobSearchDocument.objects.filter(job_post=inactive).exists())
+    
+    def test_reconcile_counts_views_and_applications_separately(self):
+        """Test that reconciled counters are not multiplied by each other"""
+        Application.objects.create(job_seeker=self.job_seeker, job_post=self.job, resume=self.resume)
+        JobView.objects.bulk_create([
+            JobView(job_post=self.job, viewer=self.job_seeker, ip_address='127.0.0.1') for _ in range(3)
+        ])
+        JobSearchDocument.objects.filter(job_post=self.job).update(views_count=0, applications_count=0)
+        
+        with CaptureQueriesContext(connection) as queries:
+            reconcile_job_search_documents()
+        
+        document = JobSearchDocument.objects.get(job_post=self.job)
+        self.assertEqual(document.views_count, 3)
+        self.assertEqual(document.applications_count, 1)
+        self.assertEqual(document.popularity_score, 5)
+        job_query = next(q['sql'] for q in queries.captured_queries if 'FROM "matcher_jobpost"' in q['sql'])
+        self.assertNotIn('DISTINCT', job_query.upper())
+    
+    def test_job_list_served_from_documents(self):
+        """Test that the public job listing needs no join to the recruiter tables"""
+        token = str(RefreshToken.for_user(self.job_seeker).access_token)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('job-post-list'), {'skills': 'django'})
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.data['results']
+        self.assertEqual([job['id'] for job in results], [str(self.job.id)])
+        self.assertEqual(results[0]['company_name'], 'Doc Corp')
+        listing_queries = [q['sql'] for q in queries.captured_queries if 'matcher_jobsearchdocument' in q['sql']]
+        self.assertTrue(listing_queries)
+        self.assertFalse(any('matcher_recruiterprofile' in sql for sql in listing_queries))
+
+
 class RecommendationPerformanceTestCase(TestCase):
     """
     Test cases for recommendation system performance
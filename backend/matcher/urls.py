@@ -153,6 +153,8 @@ urlpatterns = [
     path('search/saved/<uuid:search_id>/', recommendation_views.delete_saved_search_view, name='delete-saved-search'),
     path('search/analytics/', recommendation_views.search_analytics_view, name='search-analytics'),
     path('search/track-interaction/', recommendation_views.track_search_interaction_view, name='track-search-interaction'),
+    path('search/analytics/pipeline/', recommendation_views.search_event_pipeline_stats_view, name='search-event-pipeline-stats'),
+    path('search/cache/stats/', recommendation_views.search_cache_stats_view, name='search-cache-stats'),
     
     # Include router URLs
     path('', include(router.urls)),
@@ -8,6 +8,7 @@ from django.utils.decorators import method_decorator
 from django.db.models import Q, Count, Avg
 from django.conf import settings
 from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
 from datetime import timedelta
 
 from rest_framework import status, generics, viewsets, permissions
@@ -21,8 +22,9 @@ from rest_framework_simplejwt.exceptions import TokenError, InvalidToken
 
 import json
 import os
+import hashlib
 import logging
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone as dt_timezone
 from django.db import models
 
 logger = logging.getLogger(__name__)
@@ -32,7 +34,7 @@ from .models import (
     Application, AIAnalysisResult, InterviewSession, Skill, UserSkill,
     EmailVerificationToken, PasswordResetToken, JobAnalytics, JobView,
     Notification, ResumeTemplate, ResumeTemplateVersion, UserResumeTemplate,
-    Conversation, Message
+    Conversation, Message, JobSearchDocument
 )
 from .serializers import (
     UserRegistrationSerializer, UserLoginSerializer, UserSerializer,
@@ -43,7 +45,8 @@ from .serializers import (
     PasswordResetRequestSerializer, PasswordResetConfirmSerializer, ChangePasswordSerializer,
     UserProfileUpdateSerializer, JobAnalyticsSerializer, JobViewSerializer,
     NotificationSerializer, ResumeTemplateSerializer, ResumeTemplateVersionSerializer,
-    UserResumeTemplateSerializer, ResumeTemplateListSerializer, ConversationSerializer, MessageSerializer
+    UserResumeTemplateSerializer, ResumeTemplateListSerializer, ConversationSerializer, MessageSerializer,
+    JobSearchDocumentListSerializer
 )
 from .jwt_serializers import (
     CustomTokenObtainPairSerializer, CustomTokenRefreshSerializer,
@@ -60,6 +63,20 @@ from .utils import (
     send_welcome_email
 )
 from .services import GeminiResumeParser, FileValidator, GeminiAPIError
+from .geo import location_filter_q
+from .job_view_events import record_job_view
+from .analytics_rollups import get_job_analytics_range, get_job_analytics_series
+from .cache_utils import AnalyticsCacheManager, cache_manager, CACHE_PREFIXES, CACHE_TIMEOUTS
+from .query_optimization import OptimizedQueryManager
+from .dashboard_counters import dashboard_stats_for, get_dashboard_counters
+from .list_projections import (
+    JOB_DOCUMENT_LIST_FIELDS, JOB_POST_LIST_FIELDS, parse_fields_param, project_rows, render_rows
+)
+from .pagination_optimization import KeysetCursorPagination
+from .exports import (
+    APPLICATION_EXPORT_HEADER, ASYNC_THRESHOLD as ASYNC_EXPORT_THRESHOLD, application_export_rows,
+    export_storage, resolve_export_download, stream_csv
+)
 
 
 # JWT Authentication Views
@@ -1053,45 +1070,64 @@ def batch_parse_resumes_view(request):
 # Job Post Views
 class JobPostViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetCursorPagination
+    keyset_ordering = ('-created_at', '-pk')
     
     def get_serializer_class(self):
         """Return appropriate serializer based on action"""
         if self.action == 'list':
+            if self._lists_search_documents():
+                return JobSearchDocumentListSerializer
             return JobPostListSerializer
         elif self.action == 'create':
             return JobPostCreateSerializer
         return JobPostSerializer
     
+    def _lists_search_documents(self):
+        """Listings of active jobs are served from denormalized search documents"""
+        return self.action == 'list' and not (
+            self.request.user.user_type == 'recruiter' and
+            self.request.query_params.get('my_jobs') == 'true'
+        )
+    
     def get_queryset(self):
         """Enhanced queryset with advanced filtering and search"""
+        if self._lists_search_documents():
+            return self._filter_jobs(JobSearchDocument.objects.all(), documents=True)
+        
         queryset = JobPost.objects.select_related(
             'recruiter', 'recruiter__recruiter_profile'
-        ).prefetch_related('applications')
+        )
         
         # Base filtering - only active jobs for non-owners
-        if self.request.user.user_type != 'recruiter' or self.action == 'list':
+        if self.request.user.user_type != 'recruiter':
             queryset = queryset.filter(is_active=True)
         
         # Recruiter can only modify their own jobs
         if self.request.user.user_type == 'recruiter':
             if self.action in ['update', 'partial_update', 'destroy']:
                 queryset = queryset.filter(recruiter=self.request.user)
-            elif self.action == 'list' and self.request.query_params.get('my_jobs') == 'true':
+            elif self.action == 'list':
                 # For my_jobs, show all jobs (active and inactive) for the recruiter
-                queryset = JobPost.objects.select_related(
-                    'recruiter', 'recruiter__recruiter_profile'
-                ).prefetch_related('applications').filter(recruiter=self.request.user)
+                queryset = queryset.filter(recruiter=self.request.user)
         
+        return self._filter_jobs(queryset)
+    
+    def _filter_jobs(self, queryset, documents=False):
+        """Apply search, filter and ordering query params to jobs or their search documents"""
         # Advanced search functionality
         search = self.request.query_params.get('search', '').strip()
         if search:
-            queryset = queryset.filter(
-                Q(title__icontains=search) |
-                Q(description__icontains=search) |
-                Q(skills_required__icontains=search) |
-                Q(location__icontains=search) |
-                Q(recruiter__recruiter_profile__company_name__icontains=search)
-            )
+            if documents:
+                queryset = queryset.filter(search_text__contains=search.lower())
+            else:
+                queryset = queryset.filter(
+                    Q(title__icontains=search) |
+                    Q(description__icontains=search) |
+                    Q(skills_required__icontains=search) |
+                    Q(location__icontains=search) |
+                    Q(recruiter__recruiter_profile__company_name__icontains=search)
+                )
         
         # Filter by job type
         job_type = self.request.query_params.get('job_type')
@@ -1105,7 +1141,7 @@ class JobPostViewSet(viewsets.ModelViewSet):
             experience_levels = experience_level.split(',')
             queryset = queryset.filter(experience_level__in=experience_levels)
         
-        # Location filtering with fuzzy matching
+        # Location filtering within radius_km of a gazetteer location
         location = self.request.query_params.get('location', '').strip()
         if location:
             # Only include remote jobs if specifically searching for "remote"
@@ -1115,7 +1151,8 @@ class JobPostViewSet(viewsets.ModelViewSet):
                     Q(remote_work_allowed=True)
                 )
             else:
-                queryset = queryset.filter(location__icontains=location)
+                radius_km = self.request.query_params.get('radius_km')
+                queryset = queryset.filter(location_filter_q(location, radius_km))
         
         # Salary range filtering
         salary_min = self.request.query_params.get('salary_min')
@@ -1145,7 +1182,10 @@ class JobPostViewSet(viewsets.ModelViewSet):
         if skills:
             skill_list = [skill.strip() for skill in skills.split(',') if skill.strip()]
             for skill in skill_list:
-                queryset = queryset.filter(skills_required__icontains=skill)
+                if documents:
+                    queryset = queryset.filter(skills_text__contains=skill.lower())
+                else:
+                    queryset = queryset.filter(skills_required__icontains=skill)
         
         # Remote work filter
         remote_only = self.request.query_params.get('remote_only')
@@ -1189,6 +1229,24 @@ class JobPostViewSet(viewsets.ModelViewSet):
         
         return queryset
     
+    def list(self, request, *args, **kwargs):
+        """
+        Read-only listing built from a values() projection of the columns the
+        requested fields need; `?fields=id,title,...` selects a subset
+        """
+        spec = JOB_DOCUMENT_LIST_FIELDS if self._lists_search_documents() else JOB_POST_LIST_FIELDS
+        fields = parse_fields_param(request.query_params.get('fields'), spec)
+        rows = project_rows(
+            self.filter_queryset(self.get_queryset()), spec, fields,
+            extra_columns=[field.lstrip('-') for field in self.keyset_ordering]
+        )
+        context = self.get_serializer_context()
+        
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(render_rows(page, spec, fields, context))
+        return Response(render_rows(rows, spec, fields, context))
+    
     def get_permissions(self):
         """Set permissions based on action"""
         if self.action == 'create':
@@ -1208,64 +1266,14 @@ class JobPostViewSet(viewsets.ModelViewSet):
         JobAnalytics.objects.create(job_post=job_post)
     
     def retrieve(self, request, *args, **kwargs):
-        """Enhanced retrieve with view tracking and analytics"""
+        """Retrieve with buffered view tracking; views and analytics are written by flush_job_view_events_task"""
         instance = self.get_object()
         
-        # Track job view
-        self._track_job_view(instance, request)
-        
-        # Increment view count atomically
-        instance.increment_view_count()
-        
-        # Update analytics
-        self._update_job_analytics(instance, request)
+        record_job_view(instance, request)
         
         serializer = self.get_serializer(instance)
         return Response(serializer.data)
     
-    def _track_job_view(self, job_post, request):
-        """Track individual job view"""
-        try:
-            # Get client IP
-            x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
-            if x_forwarded_for:
-                ip_address = x_forwarded_for.split(',')[0]
-            else:
-                ip_address = request.META.get('REMOTE_ADDR', '127.0.0.1')
-            
-            # Create job view record
-            JobView.objects.create(
-                job_post=job_post,
-                viewer=request.user if request.user.is_authenticated else None,
-                ip_address=ip_address,
-                user_agent=request.META.get('HTTP_USER_AGENT', ''),
-                referrer=request.META.get('HTTP_REFERER', ''),
-                session_id=request.session.session_key or ''
-            )
-        except Exception as e:
-            logger.error(f"Error tracking job view: {str(e)}")
-    
-    def _update_job_analytics(self, job_post, request):
-        """Update job analytics"""
-        try:
-            analytics, created = JobAnalytics.objects.get_or_create(job_post=job_post)
-            
-            # Update view counts
-            analytics.total_views = job_post.views_count
-            analytics.unique_views = JobView.objects.filter(job_post=job_post).values('ip_address').distinct().count()
-            analytics.total_applications = job_post.applications.count()
-            
-            # Update conversion rate
-            analytics.update_conversion_rate()
-            
-            # Update geographic distribution
-            location_data = JobView.objects.filter(job_post=job_post).values_list('ip_address', flat=True)
-            # In a real implementation, you'd use a GeoIP service to get locations
-            
-            analytics.save()
-        except Exception as e:
-            logger.error(f"Error updating job analytics: {str(e)}")
-    
     @action(detail=True, methods=['get'])
     def applications(self, request, pk=None):
         """Get applications for a job post (recruiter only)"""
@@ -1297,16 +1305,29 @@ class JobPostViewSet(viewsets.ModelViewSet):
         if job_post.recruiter != request.user:
             raise PermissionDenied("Access denied")
         
+        # Time range (ISO datetimes or dates) and bucket size for the timeline
+        now = timezone.now()
+        try:
+            end = self._parse_analytics_time(request.query_params.get('end')) or now
+            start = self._parse_analytics_time(request.query_params.get('start')) or end - timedelta(days=7)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        if start >= end:
+            return Response({'error': 'start must be before end'}, status=status.HTTP_400_BAD_REQUEST)
+        granularity = request.query_params.get('granularity', 'day')
+        
         try:
             analytics = job_post.analytics
             serializer = JobAnalyticsSerializer(analytics)
             
-            # Add additional analytics data
+            # Add additional analytics data, read from hourly/daily rollups
             data = serializer.data
-            data['recent_views'] = JobView.objects.filter(
-                job_post=job_post,
-                viewed_at__gte=timezone.now() - timedelta(days=7)
-            ).count()
+            data['recent_views'] = get_job_analytics_range(job_post.id, now - timedelta(days=7), now)['views']
+            data['range'] = get_job_analytics_range(job_post.id, start, end)
+            try:
+                data['timeline'] = get_job_analytics_series(job_post.id, start, end, granularity)
+            except ValueError as e:
+                return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
             
             data['top_skills_searched'] = self._get_top_skills_for_job(job_post)
             
@@ -1314,6 +1335,20 @@ class JobPostViewSet(viewsets.ModelViewSet):
         except JobAnalytics.DoesNotExist:
             return Response({'error': 'Analytics not available'}, status=404)
     
+    def _parse_analytics_time(self, value):
+        """Parse an ISO datetime or date query param; dates mean midnight UTC"""
+        if not value:
+            return None
+        parsed = parse_datetime(value)
+        if parsed is None:
+            parsed_date = parse_date(value)
+            if parsed_date is None:
+                raise ValueError(f"Invalid date or datetime: {value}")
+            parsed = datetime.combine(parsed_date, datetime.min.time())
+        if timezone.is_naive(parsed):
+            parsed = timezone.make_aware(parsed, dt_timezone.utc)
+        return parsed
+    
     def _get_top_skills_for_job(self, job_post):
         """Get top skills that led to this job being viewed"""
         # This is a simplified implementation
@@ -1393,13 +1428,23 @@ class JobPostViewSet(viewsets.ModelViewSet):
 class ApplicationViewSet(viewsets.ModelViewSet):
     serializer_class = ApplicationSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetCursorPagination
+    keyset_ordering = ('-applied_at', '-pk')
     
     def get_queryset(self):
         """Enhanced queryset with filtering and search capabilities"""
-        if self.request.user.user_type == 'job_seeker':
-            queryset = Application.objects.filter(job_seeker=self.request.user)
-        elif self.request.user.user_type == 'recruiter':
-            queryset = Application.objects.filter(job_post__recruiter=self.request.user)
+        return self.applications_for(self.request.user, self.request.query_params)
+    
+    @staticmethod
+    def applications_for(user, params):
+        """Applications visible to user, filtered and ordered by the list query params.
+        
+        Also used by background exports, which only have the user and a dict of params.
+        """
+        if user.user_type == 'job_seeker':
+            queryset = Application.objects.filter(job_seeker=user)
+        elif user.user_type == 'recruiter':
+            queryset = Application.objects.filter(job_post__recruiter=user)
         else:
             return Application.objects.none()
         
@@ -1409,19 +1454,19 @@ class ApplicationViewSet(viewsets.ModelViewSet):
         ).prefetch_related('ai_analyses')
         
         # Filter by status
-        status_filter = self.request.query_params.get('status')
+        status_filter = params.get('status')
         if status_filter:
             status_list = status_filter.split(',')
             queryset = queryset.filter(status__in=status_list)
         
         # Filter by job post
-        job_post_id = self.request.query_params.get('job_post')
+        job_post_id = params.get('job_post')
         if job_post_id:
             queryset = queryset.filter(job_post_id=job_post_id)
         
         # Filter by date range
-        date_from = self.request.query_params.get('date_from')
-        date_to = self.request.query_params.get('date_to')
+        date_from = params.get('date_from')
+        date_to = params.get('date_to')
         if date_from:
             try:
                 from datetime import datetime
@@ -1439,7 +1484,7 @@ class ApplicationViewSet(viewsets.ModelViewSet):
                 pass
         
         # Search functionality
-        search = self.request.query_params.get('search', '').strip()
+        search = params.get('search', '').strip()
         if search:
             queryset = queryset.filter(
                 Q(job_post__title__icontains=search) |
@@ -1448,7 +1493,7 @@ class ApplicationViewSet(viewsets.ModelViewSet):
             )
         
         # Sorting
-        ordering = self.request.query_params.get('ordering', '-applied_at')
+        ordering = params.get('ordering', '-applied_at')
         valid_orderings = [
             'applied_at', '-applied_at', 'status', '-status', 
             'match_score', '-match_score', 'updated_at', '-updated_at'
@@ -1593,68 +1638,25 @@ class ApplicationViewSet(viewsets.ModelViewSet):
         if request.user.user_type != 'recruiter':
             raise PermissionDenied("Only recruiters can view application analytics")
         
-        applications = self.get_queryset()
-        
-        # Overall statistics
-        total_applications = applications.count()
-        
-        # Status distribution
-        from django.db.models import Count
-        status_distribution = applications.values('status').annotate(
-            count=Count('id')
-        ).order_by('status')
-        
-        # Applications over time (last 30 days)
-        from django.db.models import TruncDate
-        applications_over_time = applications.filter(
-            applied_at__gte=timezone.now() - timedelta(days=30)
-        ).extra(
-            select={'day': 'date(applied_at)'}
-        ).values('day').annotate(
-            count=Count('id')
-        ).order_by('day')
-        
-        # Top performing jobs (by application count)
-        top_jobs = applications.values(
-            'job_post__title', 'job_post__id'
-        ).annotate(
-            application_count=Count('id')
-        ).order_by('-application_count')[:10]
-        
-        # Average match scores
-        from django.db.models import Avg
-        avg_match_score = applications.aggregate(
-            avg_score=Avg('match_score')
-        )['avg_score'] or 0
-        
-        # Match score distribution
-        match_score_ranges = [
-            ('0-20', applications.filter(match_score__lt=0.2).count()),
-            ('20-40', applications.filter(match_score__gte=0.2, match_score__lt=0.4).count()),
-            ('40-60', applications.filter(match_score__gte=0.4, match_score__lt=0.6).count()),
-            ('60-80', applications.filter(match_score__gte=0.6, match_score__lt=0.8).count()),
-            ('80-100', applications.filter(match_score__gte=0.8).count()),
-        ]
-        
-        # Response time analytics (time from application to first status change)
-        response_times = []
-        for app in applications.exclude(status='pending'):
-            if app.updated_at and app.applied_at:
-                response_time = (app.updated_at - app.applied_at).total_seconds() / 3600  # in hours
-                response_times.append(response_time)
-        
-        avg_response_time = sum(response_times) / len(response_times) if response_times else 0
-        
-        return Response({
-            'total_applications': total_applications,
-            'status_distribution': list(status_distribution),
-            'applications_over_time': list(applications_over_time),
-            'top_jobs': list(top_jobs),
-            'average_match_score': round(avg_match_score, 2),
-            'match_score_distribution': match_score_ranges,
-            'average_response_time_hours': round(avg_response_time, 2),
-            'total_response_times': len(response_times)
-        })
+        # Reports are cached per generation of the recruiter's applications,
+        # so any application change makes the next request recompute
+        timeout = getattr(settings, 'APPLICATION_ANALYTICS_CACHE_TIMEOUT', CACHE_TIMEOUTS['medium'])
+        generation = AnalyticsCacheManager.get_application_generation(request.user.id) if timeout else None
+        cache_key = None
+        if generation is not None:
+            params = hashlib.md5(
+                json.dumps(sorted(request.query_params.lists())).encode()
+            ).hexdigest()[:12]
+            cache_key = f"applications:{request.user.id}:{generation}:{params}"
+            cached = AnalyticsCacheManager.get_cached_analytics_data(cache_key)
+            if cached is not None:
+                return Response(cached)
+        
+        data = OptimizedQueryManager.get_application_analytics(self.get_queryset())
+        
+        if cache_key:
+            AnalyticsCacheManager.cache_analytics_data(cache_key, data, timeout)
+        return Response(data)
     
     @action(detail=True, methods=['get'])
     def timeline(self, request, pk=None):
@@ -1703,34 +1705,48 @@ class ApplicationViewSet(viewsets.ModelViewSet):
     
     @action(detail=False, methods=['get'])
     def export(self, request):
-        """Export applications data (CSV format)"""
-        import csv
-        from django.http import HttpResponse
+        """Export applications data (CSV format), streamed or as a background gzip file"""
+        from django.http import StreamingHttpResponse
         
         applications = self.get_queryset()
         
-        response = HttpResponse(content_type='text/csv')
+        run_async = request.query_params.get('async', '').lower() == 'true'
+        if not run_async:
+            run_async = applications.count() > ASYNC_EXPORT_THRESHOLD
+        
+        if run_async:
+            from .tasks import export_applications_task
+            
+            params = {key: value for key, value in request.query_params.items() if key != 'async'}
+            task = export_applications_task.apply_async(args=[str(request.user.id), params])
+            return Response({
+                'task_id': task.id,
+                'status': 'queued',
+                'message': 'Export queued; you will be notified when the file is ready'
+            }, status=status.HTTP_202_ACCEPTED)
+        
+        response = StreamingHttpResponse(
+            stream_csv(APPLICATION_EXPORT_HEADER, application_export_rows(applications)),
+            content_type='text/csv'
+        )
         response['Content-Disposition'] = 'attachment; filename="applications.csv"'
+        return response
+    
+    @action(detail=False, methods=['get'], url_path=r'export/download/(?P<token>[^/.]+)', url_name='download-export')
+    def download_export(self, request, token=None):
+        """Download a background export through the signed link sent when it was ready"""
+        from django.http import FileResponse
         
-        writer = csv.writer(response)
-        writer.writerow([
-            'Application ID', 'Job Title', 'Company', 'Applicant', 'Status',
-            'Applied Date', 'Match Score', 'Cover Letter Preview'
-        ])
-        
-        for app in applications:
-            writer.writerow([
-                str(app.id),
-                app.job_post.title,
-                app.job_post.recruiter.recruiter_profile.company_name,
-                app.job_seeker.username,
-                app.get_status_display(),
-                app.applied_at.strftime('%Y-%m-%d %H:%M'),
-                f"{app.match_score:.2f}",
-                app.cover_letter[:100] + '...' if len(app.cover_letter) > 100 else app.cover_letter
-            ])
+        name = resolve_export_download(request.user, token)
+        if name is None:
+            return Response({'error': 'Export not found or link expired'}, status=status.HTTP_404_NOT_FOUND)
         
-        return response
+        return FileResponse(
+            export_storage.open(name, 'rb'),
+            as_attachment=True,
+            filename=os.path.basename(name),
+            content_type='application/gzip'
+        )
 
 
 # AI-powered Job Matching
@@ -1819,69 +1835,9 @@ class InterviewSessionViewSet(viewsets.ModelViewSet):
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def dashboard_stats(request):
-    """Get dashboard statistics based on user type"""
-    if request.user.user_type == 'job_seeker':
-        stats = {
-            'total_applications': Application.objects.filter(job_seeker=request.user).count(),
-            'pending_applications': Application.objects.filter(
-                job_seeker=request.user, status='pending'
-            ).count(),
-            'shortlisted_applications': Application.objects.filter(
-                job_seeker=request.user, status='shortlisted'
-            ).count(),
-            'interviews_scheduled': InterviewSession.objects.filter(
-                application__job_seeker=request.user, status='scheduled'
-            ).count(),
-            'profile_completion': calculate_profile_completion(request.user),
-        }
-    elif request.user.user_type == 'recruiter':
-        stats = {
-            'total_job_posts': JobPost.objects.filter(recruiter=request.user).count(),
-            'active_job_posts': JobPost.objects.filter(
-                recruiter=request.user, is_active=True
-            ).count(),
-            'total_applications': Application.objects.filter(
-                job_post__recruiter=request.user
-            ).count(),
-            'pending_applications': Application.objects.filter(
-                job_post__recruiter=request.user, status='pending'
-            ).count(),
-            'interviews_scheduled': InterviewSession.objects.filter(
-                application__job_post__recruiter=request.user, status='scheduled'
-            ).count(),
-        }
-    else:
-        stats = {}
-    
-    return Response(stats)
-
-
-# Utility Functions
-def calculate_profile_completion(user):
-    """Calculate profile completion percentage"""
-    if user.user_type == 'job_seeker':
-        try:
-            profile = user.job_seeker_profile
-            fields = [
-                profile.date_of_birth, profile.location, profile.experience_level,
-                profile.current_position, profile.skills, profile.bio
-            ]
-            completed = sum(1 for field in fields if field)
-            return int((completed / len(fields)) * 100)
-        except:
-            return 0
-    elif user.user_type == 'recruiter':
-        try:
-            profile = user.recruiter_profile
-            fields = [
-                profile.company_name, profile.company_website,
-                profile.industry, profile.company_description, profile.location
-            ]
-            completed = sum(1 for field in fields if field)
-            return int((completed / len(fields)) * 100)
-        except:
-            return 0
-    return 0
+    """Get dashboard statistics based on user type, from the user's dashboard counters"""
+    counters = get_dashboard_counters(request.user)
+    return Response(dashboard_stats_for(request.user, counters))
 
 
 # Skills Management
@@ -2610,6 +2566,8 @@ class NotificationListView(generics.ListAPIView):
     """
     serializer_class = NotificationSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetCursorPagination
+    keyset_ordering = ('-created_at', '-pk')
     
     def get_queryset(self):
         queryset = Notification.objects.filter(recipient=self.request.user)
@@ -2632,10 +2590,26 @@ class NotificationListView(generics.ListAPIView):
         
         return queryset.order_by('-created_at')
     
+    def get_keyset_count(self, queryset):
+        """
+        The unread listing is counted by the user's dashboard counter; other filters are counted by the paginator
+        """
+        params = self.request.query_params
+        is_read = params.get('is_read')
+        if is_read is None or is_read.lower() in ['true', '1', 'yes'] or params.get('type') or params.get('priority'):
+            return None
+        
+        from .notification_service import notification_service
+        
+        return notification_service.get_unread_count(str(self.request.user.id))
+    
     def list(self, request, *args, **kwargs):
         """
-        Enhanced list method using notification service
+        Keyset-paginated list; clients still sending `offset` get the notification service's page
         """
+        if 'offset' not in request.query_params:
+            return super().list(request, *args, **kwargs)
+        
         try:
             from .notification_service import notification_service
             
@@ -2680,15 +2654,24 @@ class NotificationDetailView(generics.RetrieveUpdateAPIView):
         return Notification.objects.filter(recipient=self.request.user)
     
     def perform_update(self, serializer):
-        # Use notification service for marking as read
-        if serializer.validated_data.get('is_read') and not serializer.instance.is_read:
-            from .notification_service import notification_service
-            notification_service.mark_notification_as_read(
-                notification_id=str(serializer.instance.id),
-                user_id=str(self.request.user.id)
-            )
-        else:
-            serializer.save()
+        from .notification_service import notification_service
+        
+        notification = serializer.instance
+        changes = dict(serializer.validated_data)
+        # Read state goes through the service, which keeps the unread counter in step
+        is_read = changes.pop('is_read', None)
+        changes.pop('read_at', None)
+        
+        if is_read is True:
+            notification_service.mark_notification_as_read(str(notification.id), str(self.request.user.id))
+        elif is_read is False:
+            notification_service.mark_notification_as_unread(str(notification.id), str(self.request.user.id))
+        
+        if changes:
+            for field, value in changes.items():
+                setattr(notification, field, value)
+            notification.save(update_fields=list(changes))
+        notification.refresh_from_db()
 
 
 @api_view(['POST'])
@@ -2879,11 +2862,14 @@ def deliver_queued_notifications(request):
     try:
         from .notification_service import notification_service
         
-        notification_service.deliver_queued_notifications(str(request.user.id))
+        delivered = notification_service.deliver_queued_notifications(
+            str(request.user.id), request.data.get('cursor')
+        )
         
         return Response({
             'success': True,
-            'message': 'Queued notifications delivered'
+            'message': 'Queued notifications delivered',
+            'delivered': delivered
         })
     
     except Exception as e:
@@ -3758,6 +3744,8 @@ class MessageListView(generics.ListCreateAPIView):
     """
     serializer_class = MessageSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetCursorPagination
+    keyset_ordering = ('sent_at', 'pk')
     
     def get_queryset(self):
         conversation_id = self.request.query_params.get('conversation_id')
@@ -4370,8 +4358,8 @@ class ResumeTemplateViewSet(viewsets.ModelViewSet):
         """
         Get available template categories with counts.
         """
-        try:
-            categories = ResumeTemplate.objects.filter(is_active=True).values('category').annotate(
+        def load_categories():
+            return list(ResumeTemplate.objects.filter(is_active=True).values('category').annotate(
                 count=Count('id'),
                 category_display=models.Case(
                     *[models.When(category=choice[0], then=models.Value(choice[1])) 
@@ -4379,10 +4367,18 @@ class ResumeTemplateViewSet(viewsets.ModelViewSet):
                     default=models.Value('Unknown'),
                     output_field=models.CharField()
                 )
-            ).order_by('category')
+            ).order_by('category'))
+        
+        try:
+            # Near-cached per process; dropped by the ResumeTemplate signals
+            categories = cache_manager.get_or_set(
+                CACHE_PREFIXES['resume_template_categories'], load_categories, CACHE_TIMEOUTS['long']
+            )
+            if categories is None:
+                categories = load_categories()
             
             return Response({
-                'categories': list(categories)
+                'categories': categories
             })
         except Exception as e:
             logger.error(f"Error fetching template categories: {str(e)}")
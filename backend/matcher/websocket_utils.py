@@ -2,10 +2,12 @@
 WebSocket utility functions for sending real-time notifications and messages.
 """
 
+import asyncio
 import json
 import logging
 from channels.layers import get_channel_layer
 from asgiref.sync import async_to_sync
+from django.conf import settings
 from django.utils import timezone
 from django.contrib.auth import get_user_model
 from .middleware import websocket_connection_manager
@@ -13,6 +15,25 @@ from .middleware import websocket_connection_manager
 User = get_user_model()
 logger = logging.getLogger(__name__)
 
+NOTIFICATION_DELIVERY_CONFIG = getattr(settings, 'NOTIFICATION_DELIVERY', {})
+
+# Channel-layer sends in flight at once during a bulk delivery
+BULK_SEND_CONCURRENCY = NOTIFICATION_DELIVERY_CONFIG.get('BULK_SEND_CONCURRENCY', 100)
+
+
+def notification_message(notification_type, message, data=None, priority='normal'):
+    """
+    Channel-layer event handled by NotificationConsumer.notification_message
+    """
+    return {
+        'type': 'notification_message',
+        'message': message,
+        'notification_type': notification_type,
+        'timestamp': timezone.now().isoformat(),
+        'data': data or {},
+        'priority': priority
+    }
+
 
 class WebSocketNotificationService:
     """
@@ -39,14 +60,7 @@ class WebSocketNotificationService:
                 logger.debug(f"User {user_id} is not online, skipping real-time notification")
                 return False
             
-            notification_data = {
-                'type': 'notification_message',
-                'message': message,
-                'notification_type': notification_type,
-                'timestamp': timezone.now().isoformat(),
-                'data': data or {},
-                'priority': priority
-            }
+            notification_data = notification_message(notification_type, message, data, priority)
             
             # Send to user-specific group
             async_to_sync(self.channel_layer.group_send)(
@@ -61,6 +75,49 @@ class WebSocketNotificationService:
             logger.error(f"Error sending notification to user {user_id}: {e}")
             return False
     
+    def send_notifications_to_users(self, messages, concurrency=BULK_SEND_CONCURRENCY):
+        """
+        Send many notifications in one trip into the event loop.
+        
+        The sends run concurrently over the channel layer's connection pool
+        instead of paying an async_to_sync hop and a Redis round trip each.
+        Callers are expected to have filtered out offline users.
+        
+        Args:
+            messages (list): (user_id, notification_message(...)) pairs
+            concurrency (int): Sends in flight at once
+        
+        Returns:
+            list: Whether each message was handed to the channel layer, in input order
+        """
+        if not messages:
+            return []
+        try:
+            results = async_to_sync(self._group_send_many)(messages, concurrency)
+        except Exception as e:
+            logger.error(f"Error sending bulk notifications: {e}")
+            return [False] * len(messages)
+        
+        sent = []
+        for (user_id, _), result in zip(messages, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error sending notification to user {user_id}: {result}")
+            sent.append(not isinstance(result, Exception))
+        logger.info(f"Bulk sent {sum(sent)}/{len(messages)} notifications")
+        return sent
+    
+    async def _group_send_many(self, messages, concurrency):
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        
+        async def send(user_id, notification_data):
+            async with semaphore:
+                await self.channel_layer.group_send(f"user_{user_id}", notification_data)
+        
+        return await asyncio.gather(
+            *(send(user_id, notification_data) for user_id, notification_data in messages),
+            return_exceptions=True
+        )
+    
     def send_notification_to_role(self, user_type, notification_type, message, data=None, priority='normal'):
         """
         Send a notification to all users of a specific role.
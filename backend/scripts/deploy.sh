@@ -262,6 +262,21 @@ health_check() {
     fi
 }
 
+# Function to warm caches after a deploy
+warm_caches() {
+    log_info "Warming caches..."
+    
+    cd "$PROJECT_DIR"
+    source venv/bin/activate
+    
+    # A cold cache only costs latency, so a failure here does not fail the deploy
+    if python manage.py warm_cache; then
+        log_success "Caches warmed"
+    else
+        log_warning "Cache warm-up failed; caches will fill from traffic"
+    fi
+}
+
 # Function to create backup
 create_backup() {
     if [ "$ENVIRONMENT" != "production" ]; then
@@ -349,6 +364,10 @@ main() {
     start_services
     health_check
     
+    if [ "$ENVIRONMENT" = "production" ]; then
+        warm_caches
+    fi
+    
     log_success "Deployment completed successfully!"
     echo ""
     log_info "Next steps:"
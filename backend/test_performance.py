@@ -3,9 +3,12 @@ Performance tests and benchmarks for HireWise backend optimization.
 Tests caching, database queries, file operations, and API response times.
 """
 
+import json
 import time
+import uuid
 import statistics
 import logging
+from decimal import Decimal
 from typing import Dict, List, Any, Callable
 from datetime import datetime, timedelta
 from unittest.mock import patch, MagicMock
@@ -14,26 +17,39 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 import pytest
 from django.test import TestCase, TransactionTestCase, override_settings
 from django.core.cache import cache
+from django.core.paginator import EmptyPage
 from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
 from django.contrib.auth import get_user_model
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.utils import timezone
 
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
+from rest_framework.response import Response
 
 from matcher.models import (
     JobPost, Application, Resume, JobSeekerProfile, RecruiterProfile,
-    Skill, UserSkill, AIAnalysisResult
+    Skill, UserSkill, AIAnalysisResult, Notification, NotificationPreference
 )
 from matcher.cache_utils import (
-    cache_manager, JobCacheManager, UserCacheManager, AICacheManager
+    cache_manager, JobCacheManager, UserCacheManager, AICacheManager,
+    CacheEntry, coalesced_get_or_set, coalescing_stats,
+    invalidate_tags, tagged_cache_key, job_tag, JOB_LIST_TAG, CacheMonitor, get_redis_client
 )
 from matcher.query_optimization import OptimizedQueryManager, DatabaseOptimizer
 from matcher.api_cache import APICacheManager, api_cache
+from matcher.cache_codec import decode_value, encode_value, size_histograms, MARKER, CODEC_PLAIN, CODEC_ZLIB
+from matcher.cache_metrics import CacheMetrics, cache_metrics
+from matcher.cache_warming import WarmTarget, collect_targets, warm_targets
+from matcher.recommendation_engine import SearchOptimizer
+from matcher.search_analytics import PopularSearchTerms
+from matcher import near_cache
+from matcher.near_cache import LocalLRUCache, clear_near_caches
 from matcher.file_optimization import FileOptimizer, FileUploadManager
 from matcher.pagination_optimization import (
-    OptimizedPageNumberPagination, OptimizedPaginator, InfiniteScrollPagination
+    OptimizedPageNumberPagination, OptimizedPaginator, InfiniteScrollPagination,
+    InvalidCursor, KeysetPaginator, PaginationConfig
 )
 
 User = get_user_model()
@@ -184,6 +200,556 @@ class CachePerformanceTests(TestCase):
         logger.info(f"Cache Invalidation Performance: {stats}")
 
 
+class CacheCoalescingTests(TestCase):
+    """
+    Test single-flight recomputation, stale-while-revalidate and early expiration.
+    """
+    
+    def setUp(self):
+        cache.clear()
+        coalescing_stats.reset()
+    
+    def test_concurrent_misses_compute_once(self):
+        """
+        Concurrent misses for one key run the computation once and wait for it
+        """
+        calls = []
+        
+        def compute():
+            calls.append(1)
+            time.sleep(0.2)
+            return {'jobs': [1, 2, 3]}
+        
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            futures = [
+                executor.submit(coalesced_get_or_set, 'test:stampede', compute, 60)
+                for _ in range(8)
+            ]
+            results = [future.result() for future in as_completed(futures)]
+        
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(value == {'jobs': [1, 2, 3]} for value, _ in results))
+        self.assertEqual(sorted(state for _, state in results), ['coalesced'] * 7 + ['miss'])
+        self.assertEqual(coalescing_stats.snapshot()['test']['coalesced_waits'], 7)
+    
+    def test_stale_value_served_while_refreshing(self):
+        """
+        An expired value is refreshed by one caller and served to the others
+        """
+        cache.set('test:stale', CacheEntry('old', time.time() - 1, 0.01), 60)
+        
+        # Another request holds the refresh lock
+        cache.add('test:stale:lock', 'other', 30)
+        value, state = coalesced_get_or_set('test:stale', lambda: 'new', 60, stale_timeout=60)
+        self.assertEqual((value, state), ('old', 'stale'))
+        
+        cache.delete('test:stale:lock')
+        value, state = coalesced_get_or_set(
+            'test:stale', lambda: 'new', 60, stale_timeout=60, background_refresh=False
+        )
+        self.assertEqual((value, state), ('new', 'miss'))
+        self.assertEqual(decode_value(cache.get('test:stale')).value, 'new')
+    
+    def test_probabilistic_early_expiration(self):
+        """
+        Slow-to-compute values close to expiry are refreshed early unless beta is 0
+        """
+        cache.set('test:early', CacheEntry('old', time.time() + 1, 1000), 60)
+        
+        with patch('matcher.cache_utils.random.random', return_value=0.5):
+            self.assertEqual(
+                coalesced_get_or_set('test:early', lambda: 'new', 60, early_expiration_beta=0),
+                ('old', 'hit')
+            )
+            self.assertEqual(
+                coalesced_get_or_set('test:early', lambda: 'new', 60, background_refresh=False),
+                ('new', 'miss')
+            )
+    
+    def test_api_cache_headers(self):
+        """
+        The decorated view runs once; later requests are served from the cache
+        """
+        from django.contrib.auth.models import AnonymousUser
+        from django.test import RequestFactory
+        
+        calls = []
+        
+        @api_cache(timeout=60, vary_on_user=False)
+        def view(request):
+            calls.append(1)
+            return Response({'calls': len(calls)})
+        
+        factory = RequestFactory()
+        responses = []
+        for _ in range(2):
+            request = factory.get('/api/test/')
+            request.user = AnonymousUser()
+            responses.append(view(request))
+        
+        self.assertEqual(len(calls), 1)
+        self.assertEqual([response['X-Cache'] for response in responses], ['MISS', 'HIT'])
+        self.assertEqual(responses[1].data, {'calls': 1})
+    
+    def test_api_cache_refreshes_stale_responses_in_the_request(self):
+        """
+        A stale response is re-rendered with the request that finds it, not on a background thread
+        """
+        from django.contrib.auth.models import AnonymousUser
+        from django.test import RequestFactory
+        
+        rendered_for = []
+        
+        @api_cache(timeout=60, vary_on_user=False, stale_timeout=60)
+        def view(request):
+            rendered_for.append(request)
+            return Response({'calls': len(rendered_for)})
+        
+        factory = RequestFactory()
+        requests = []
+        for _ in range(2):
+            request = factory.get('/api/stale/')
+            request.user = AnonymousUser()
+            requests.append(request)
+        
+        view(requests[0])
+        with patch('matcher.cache_utils.time.time', return_value=time.time() + 90), \
+                patch('matcher.cache_utils._get_refresh_executor') as executor:
+            response = view(requests[1])
+        
+        executor.assert_not_called()
+        self.assertEqual(rendered_for, requests)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data, {'calls': 2})
+
+
+class CacheTagInvalidationTests(TestCase):
+    """
+    Test invalidating cache entries through tag generations.
+    """
+    
+    def setUp(self):
+        cache.clear()
+    
+    def test_invalidating_a_tag_changes_only_its_keys(self):
+        """
+        Bumping a tag changes the keys stored under it and no others
+        """
+        job_key = tagged_cache_key('api:job-detail', [job_tag(1)])
+        list_key = tagged_cache_key('api:job-list', [JOB_LIST_TAG])
+        
+        self.assertEqual(tagged_cache_key('api:job-detail', [job_tag(1)]), job_key)
+        
+        invalidate_tags(job_tag(1))
+        
+        self.assertNotEqual(tagged_cache_key('api:job-detail', [job_tag(1)]), job_key)
+        self.assertEqual(tagged_cache_key('api:job-list', [JOB_LIST_TAG]), list_key)
+    
+    def test_job_list_invalidation_without_pattern_scan(self):
+        """
+        Job list entries are dropped by a tag bump, not a keyspace scan
+        """
+        filters = {'location': 'remote'}
+        JobCacheManager.cache_job_list(filters, 1, [{'id': 1}])
+        self.assertEqual(JobCacheManager.get_cached_job_list(filters, 1), [{'id': 1}])
+        
+        with patch.object(cache_manager, 'delete_pattern') as delete_pattern:
+            JobCacheManager.invalidate_job_caches()
+        
+        delete_pattern.assert_not_called()
+        self.assertIsNone(JobCacheManager.get_cached_job_list(filters, 1))
+    
+    def test_api_cache_tags_from_url_kwargs(self):
+        """
+        Tag templates are formatted with the view kwargs
+        """
+        from django.contrib.auth.models import AnonymousUser
+        from django.test import RequestFactory
+        from matcher.api_cache import CacheInvalidationManager
+        
+        calls = []
+        
+        @api_cache(timeout=60, vary_on_user=False, tags=['job:{pk}'])
+        def view(request, pk):
+            calls.append(pk)
+            return Response({'id': pk})
+        
+        def get(pk):
+            request = RequestFactory().get(f'/api/job-posts/{pk}/')
+            request.user = AnonymousUser()
+            return view(request, pk=pk)
+        
+        self.assertEqual(get('a')['X-Cache'], 'MISS')
+        self.assertEqual(get('b')['X-Cache'], 'MISS')
+        self.assertEqual(get('a')['X-Cache'], 'HIT')
+        
+        CacheInvalidationManager.invalidate_job_caches(job_id='a')
+        
+        self.assertEqual(get('a')['X-Cache'], 'MISS')
+        self.assertEqual(get('b')['X-Cache'], 'HIT')
+        self.assertEqual(calls, ['a', 'b', 'a'])
+
+
+class NearCacheTests(TestCase):
+    """
+    Test the per-process LRU tier in front of the shared cache.
+    """
+    
+    def setUp(self):
+        cache.clear()
+        clear_near_caches()
+    
+    def test_lru_eviction_and_ttl(self):
+        """
+        The least recently used entry is evicted first; expired entries are not returned
+        """
+        lru = LocalLRUCache(max_entries=2)
+        lru.set('a', 1, 60)
+        lru.set('b', 2, 60)
+        lru.get('a')
+        lru.set('c', 3, 60)
+        
+        self.assertEqual(lru.get('a'), 1)
+        self.assertIsNone(lru.get('b'))
+        
+        lru.set('d', 4, -1)
+        self.assertIsNone(lru.get('d'))
+    
+    def test_opted_in_prefix_reads_locally(self):
+        """
+        Repeated reads of a near-cached prefix skip the shared cache
+        """
+        calls = []
+        
+        def load():
+            calls.append(1)
+            return ['Python', 'Django']
+        
+        with patch.object(near_cache, 'NEAR_CACHE_PREFIXES', {'test:near'}):
+            for _ in range(3):
+                self.assertEqual(cache_manager.get_or_set('test:near', load, 60), ['Python', 'Django'])
+            
+            with patch.object(cache_manager.cache, 'get', side_effect=AssertionError('shared tier read')):
+                self.assertEqual(cache_manager.get_or_set('test:near', load, 60), ['Python', 'Django'])
+        
+        stats = near_cache.get_near_cache_stats()['test:near']
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(stats['local_hits'], 3)
+        self.assertEqual(stats['shared_misses'], 1)
+    
+    def test_invalidation_from_another_process(self):
+        """
+        Bumping the prefix tag, as another process's delete does, drops local entries
+        """
+        with patch.object(near_cache, 'NEAR_CACHE_PREFIXES', {'test:shared'}):
+            cache_manager.set('test:shared', 'old', 60)
+            self.assertEqual(cache_manager.get('test:shared'), 'old')
+            
+            # Another process writes the shared tier and broadcasts the change
+            cache.set('test:shared', 'new', 60)
+            invalidate_tags('near:test:shared')
+            near_cache.get_near_cache('test:shared').poll_interval = 0
+            
+            self.assertEqual(cache_manager.get('test:shared'), 'new')
+
+    
+    def test_set_keeps_value_local_in_writing_process(self):
+        """
+        A set followed by a get in the same process is a local hit, and the
+        prefix's other local entries survive
+        """
+        with patch.object(near_cache, 'NEAR_CACHE_PREFIXES', {'test:write'}):
+            cache_manager.set('test:write', ['Python'], 60, 'a')
+            self.assertEqual(cache_manager.get('test:write', 'a'), ['Python'])
+            near = near_cache.get_near_cache('test:write')
+            near.poll_interval = 0
+            
+            cache_manager.set('test:write', ['Python', 'Django'], 60, 'b')
+            with patch.object(cache_manager.cache, 'get', side_effect=AssertionError('shared tier read')):
+                self.assertEqual(cache_manager.get('test:write', 'b'), ['Python', 'Django'])
+                self.assertEqual(cache_manager.get('test:write', 'a'), ['Python'])
+        
+        stats = near.stats()
+        self.assertEqual(stats['local_hits'], 3)
+        self.assertNotIn('invalidations', stats)
+    
+    def test_set_after_another_process_invalidated_drops_local_entries(self):
+        """
+        When the tag also moved elsewhere since the last check, older local entries are dropped
+        """
+        with patch.object(near_cache, 'NEAR_CACHE_PREFIXES', {'test:race'}):
+            cache_manager.set('test:race', 'old', 60, 'a')
+            self.assertEqual(cache_manager.get('test:race', 'a'), 'old')
+            
+            # Another process changes 'a' and broadcasts before this one writes 'b'
+            cache.set(cache_manager._generate_cache_key('test:race', 'a'), 'new', 60)
+            invalidate_tags('near:test:race')
+            cache_manager.set('test:race', 'value', 60, 'b')
+            
+            self.assertEqual(cache_manager.get('test:race', 'a'), 'new')
+            self.assertEqual(cache_manager.get('test:race', 'b'), 'value')
+    
+    def test_delete_removes_shared_value_before_invalidating(self):
+        """
+        The generation bump happens only once the shared key is gone
+        """
+        with patch.object(near_cache, 'NEAR_CACHE_PREFIXES', {'test:delete'}):
+            cache_manager.set('test:delete', 'old', 60)
+            shared_at_invalidation = []
+            near = near_cache.get_near_cache('test:delete')
+            invalidate = near.invalidate
+            
+            def record_shared(key=None):
+                shared_at_invalidation.append(cache.get(key))
+                invalidate(key)
+            
+            with patch.object(near, 'invalidate', side_effect=record_shared):
+                self.assertTrue(cache_manager.delete('test:delete'))
+            
+            self.assertEqual(shared_at_invalidation, [None])
+            self.assertIsNone(cache_manager.get('test:delete'))
+
+
+class CacheCodecTests(TestCase):
+    """
+    Test compressed, size-aware cache value encoding.
+    """
+    
+    def setUp(self):
+        cache.clear()
+        size_histograms.reset()
+    
+    def test_large_values_are_compressed(self):
+        """
+        Values above the threshold are stored compressed and much smaller
+        """
+        recommendations = [
+            {'job_id': str(uuid.uuid4()), 'title': 'Senior Python Developer', 'score': 87.5,
+             'skills': ['python', 'django', 'postgresql', 'redis'], 'recommendation_type': 'content_based'}
+            for _ in range(200)
+        ]
+        encoded = encode_value(recommendations, 'recommendations:jobs')
+        
+        self.assertEqual(encoded[:len(MARKER) + 1], MARKER + CODEC_ZLIB)
+        self.assertLess(len(encoded), len(json.dumps(recommendations)) / 2)
+        self.assertEqual(decode_value(encoded), recommendations)
+    
+    def test_small_and_legacy_values_coexist(self):
+        """
+        Small values are stored plain, and entries written before the codec still read back
+        """
+        encoded = encode_value({'count': 3}, 'test')
+        self.assertEqual(encoded[:len(MARKER) + 1], MARKER + CODEC_PLAIN)
+        self.assertEqual(decode_value(encoded), {'count': 3})
+        
+        cache.set('test:legacy', [1, 2, 3], 60)
+        self.assertEqual(decode_value(cache.get('test:legacy')), [1, 2, 3])
+        self.assertEqual(decode_value(b'plain bytes'), b'plain bytes')
+        self.assertIsNone(decode_value(None))
+    
+    def test_cache_manager_round_trip_records_sizes(self):
+        """
+        CacheManager stores encoded values and records their sizes per prefix
+        """
+        large = ['x' * 100] * 100
+        cache_manager.set('test:codec', large, 60, 'big')
+        cache_manager.set('test:codec', 'small', 60, 'small')
+        
+        self.assertTrue(cache.get('test:codec:big').startswith(MARKER + CODEC_ZLIB))
+        self.assertEqual(cache_manager.get('test:codec', 'big'), large)
+        self.assertEqual(cache_manager.get('test:codec', 'small'), 'small')
+        
+        sizes = CacheMonitor.get_value_size_stats()['test:codec']
+        self.assertEqual(sizes['count'], 2)
+        self.assertEqual(sizes['compressed'], 1)
+        self.assertLess(sizes['compression_ratio'], 0.5)
+        self.assertEqual(sum(sizes['buckets'].values()), 2)
+
+
+class CacheMetricsTests(TestCase):
+    """
+    Test per-prefix cache hit/miss instrumentation.
+    """
+    
+    def setUp(self):
+        cache.clear()
+        cache_metrics.reset()
+    
+    def test_cache_manager_records_per_prefix(self):
+        """
+        Hits, misses, sets and bytes are counted under the prefix they belong to
+        """
+        cache_manager.get('test:metrics', 'a')
+        cache_manager.set('test:metrics', {'value': 1}, 60, 'a')
+        cache_manager.get('test:metrics', 'a')
+        cache_manager.get('test:other', 'a')
+        
+        stats = CacheMonitor.get_prefix_stats('local')
+        self.assertEqual(stats['test:metrics']['hits'], 1)
+        self.assertEqual(stats['test:metrics']['misses'], 1)
+        self.assertEqual(stats['test:metrics']['sets'], 1)
+        self.assertEqual(stats['test:metrics']['hit_rate'], 50.0)
+        self.assertGreater(stats['test:metrics']['bytes_read'], 0)
+        self.assertEqual(stats['test:metrics']['bytes_read'], stats['test:metrics']['bytes_written'])
+        self.assertEqual(stats['test:other']['misses'], 1)
+    
+    def test_concurrent_recording_is_not_lost(self):
+        """
+        Per-thread counters add up to every recorded lookup
+        """
+        metrics = CacheMetrics(flush_interval=3600)
+        
+        def record():
+            for i in range(1000):
+                metrics.record_get('test', hit=i % 4 != 0, nbytes=10)
+        
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            for future in [executor.submit(record) for _ in range(8)]:
+                future.result()
+        
+        stats = metrics.snapshot('local')['test']
+        self.assertEqual(stats['hits'] + stats['misses'], 8000)
+        self.assertEqual(stats['hit_rate'], 75.0)
+        self.assertEqual(stats['bytes_read'], 80000)
+    
+    def test_finished_thread_shards_are_retired(self):
+        """
+        Shards of finished threads are dropped without losing their counters
+        """
+        metrics = CacheMetrics(flush_interval=3600)
+        
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            for future in [executor.submit(metrics.record_get, 'test', True) for _ in range(4)]:
+                future.result()
+        metrics.record_get('test', hit=False)
+        
+        stats = metrics.snapshot('local')['test']
+        self.assertEqual((stats['hits'], stats['misses']), (4, 1))
+        self.assertEqual(len(metrics._shards), 1)  # only this thread is still alive
+    
+    def test_flush_sends_each_recorded_lookup_once(self):
+        """
+        Lookups recorded while a flush runs are sent by the next flush, not twice
+        """
+        metrics = CacheMetrics(flush_interval=3600)
+        client = MagicMock()
+        pipe = client.pipeline.return_value
+        local_totals = metrics.local_totals
+        
+        def totals_then_record():
+            totals = local_totals()
+            metrics.record_get('test', hit=True)  # lands between snapshot and flush
+            return totals
+        
+        metrics.record_get('test', hit=True)
+        with patch('matcher.cache_utils.get_redis_client', return_value=client), \
+                patch.object(metrics, 'local_totals', side_effect=totals_then_record):
+            metrics.flush()
+            metrics.flush()
+        
+        sent = sum(call.args[2] for call in pipe.hincrby.call_args_list if call.args[1] == 'hits')
+        self.assertEqual(sent, 2)
+        self.assertEqual(metrics._flushed['test']['hits'], 2)
+        self.assertEqual(local_totals()['test']['hits'], 3)
+    
+    def test_flushed_counters_aggregate_across_workers(self):
+        """
+        Counters flushed by several processes add up in the cluster view
+        """
+        if get_redis_client() is None:
+            self.skipTest("Cross-worker aggregation needs the Redis cache backend")
+        
+        worker_a, worker_b = CacheMetrics(flush_interval=3600), CacheMetrics(flush_interval=3600)
+        worker_a.record_get('test:shared', hit=True)
+        worker_a.flush()
+        worker_a.record_get('test:shared', hit=True)
+        worker_b.record_get('test:shared', hit=False)
+        worker_b.flush()
+        
+        stats = worker_a.snapshot()['test:shared']
+        self.assertEqual((stats['hits'], stats['misses']), (2, 1))
+        
+        # Flushing again only adds what was recorded since the last flush
+        worker_b.flush()
+        self.assertEqual(worker_b.snapshot()['test:shared']['misses'], 1)
+
+
+class CacheWarmingTests(TestCase):
+    """
+    Test data-driven, parallel cache warming.
+    """
+    
+    def setUp(self):
+        cache.clear()
+        self.recruiter = User.objects.create_user(
+            username='warm_recruiter', email='warm_recruiter@test.com', user_type='recruiter'
+        )
+        RecruiterProfile.objects.create(user=self.recruiter, company_name='Warm Co')
+        self.job_seeker = User.objects.create_user(
+            username='warm_seeker', email='warm_seeker@test.com', user_type='job_seeker'
+        )
+        JobSeekerProfile.objects.create(user=self.job_seeker, experience_level='mid')
+        User.objects.filter(pk__in=[self.recruiter.pk, self.job_seeker.pk]).update(last_login=timezone.now())
+        self.job = JobPost.objects.create(
+            recruiter=self.recruiter, title='Python Developer', description='Backend role',
+            location='Remote', job_type='full_time', experience_level='mid',
+            skills_required='Python,Django', views_count=100
+        )
+    
+    def test_targets_follow_recent_traffic(self):
+        """
+        Popular searches, active users and popular jobs become warming targets
+        """
+        PopularSearchTerms.objects.create(search_type='jobs', term='python', search_count=40)
+        
+        labels = {(target.kind, target.label) for target in collect_targets()}
+        
+        self.assertIn(('searches', 'jobs:python'), labels)
+        self.assertIn(('recommendations', f'user:{self.job_seeker.id}'), labels)
+        self.assertIn(('recommendations', f'job:{self.job.id}:dashboard'), labels)
+        self.assertIn(('popular_jobs', f'job:{self.job.id}'), labels)
+    
+    def test_search_warming_fills_the_key_requests_read(self):
+        """
+        A warmed popular search is a cache hit for the API's first page
+        """
+        PopularSearchTerms.objects.create(search_type='jobs', term='Python', search_count=40)
+        
+        result = warm_targets(collect_targets(['searches']), concurrency=1)
+        
+        self.assertEqual(result['warmed'], {'searches': 1})
+        cache_key = SearchOptimizer()._build_search_cache_key('jobs', 'python', {}, 20, 0)
+        self.assertIsNotNone(cache.get(cache_key))
+    
+    def test_parallel_warming_respects_concurrency_and_reports_progress(self):
+        """
+        Targets run at most concurrency at a time; failures are counted, not raised
+        """
+        import threading
+        running, peak, lock = [0], [0], threading.Lock()
+        
+        def warm():
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.02)
+            with lock:
+                running[0] -= 1
+        
+        def fail():
+            raise ValueError('boom')
+        
+        targets = [WarmTarget('test', str(i), warm) for i in range(12)] + [WarmTarget('test', 'bad', fail)]
+        progress = []
+        result = warm_targets(targets, concurrency=3, progress=lambda done, total, target, error: progress.append(done))
+        
+        self.assertLessEqual(peak[0], 3)
+        self.assertGreater(peak[0], 1)
+        self.assertEqual(result['warmed'], {'test': 12})
+        self.assertEqual(result['failed'], {'test': 1})
+        self.assertEqual(progress, list(range(1, 14)))
+
+
 class DatabasePerformanceTests(TransactionTestCase):
     """
     Test database query performance and optimization.
@@ -592,6 +1158,435 @@ class PaginationPerformanceTests(TestCase):
             )
             
             logger.info(f"Pagination Performance (page_size={page_size}): {stats}")
+    
+    def test_exact_count_is_filter_aware_and_cached(self):
+        """
+        Small results are counted exactly per filter, and repeat pages reuse the count
+        """
+        cache.clear()
+        filtered = JobPost.objects.filter(location='Location 7').order_by('-created_at')
+        
+        paginator = OptimizedPaginator(filtered, 5)
+        self.assertEqual(paginator.count, 20)
+        self.assertFalse(paginator.count_is_estimated)
+        self.assertEqual(OptimizedPaginator(JobPost.objects.order_by('-created_at'), 5).count, 1000)
+        
+        with self.assertNumQueries(0):
+            self.assertEqual(OptimizedPaginator(filtered, 5).count, 20)
+    
+    def test_large_planner_estimate_is_reported_as_estimated(self):
+        """
+        Planner estimates above the threshold replace the exact count, pages past it still load
+        """
+        cache.clear()
+        queryset = JobPost.objects.order_by('-created_at')
+        
+        with patch.object(OptimizedPaginator, '_get_estimated_count', return_value=50000):
+            paginator = OptimizedPaginator(queryset, 20)
+            self.assertEqual(paginator.count, 50000)
+            self.assertTrue(paginator.count_is_estimated)
+            self.assertEqual(len(paginator.page(50).object_list), 20)
+            self.assertTrue(paginator.page(49).has_next())
+            self.assertFalse(paginator.page(50).has_next())
+            with self.assertRaises(EmptyPage):
+                paginator.page(60)
+        
+        with patch.object(OptimizedPaginator, '_get_estimated_count', return_value=900):
+            paginator = OptimizedPaginator(queryset, 20)
+            self.assertEqual(paginator.count, 1000)
+            self.assertFalse(paginator.count_is_estimated)
+    
+    def test_page_past_overestimated_count_is_empty(self):
+        """
+        Pages between the real end and an overshooting estimate return empty results instead of failing
+        """
+        from rest_framework.request import Request
+        from rest_framework.test import APIRequestFactory
+        
+        cache.clear()
+        queryset = JobPost.objects.order_by('-created_at')
+        pagination = OptimizedPageNumberPagination(PaginationConfig(enable_caching=False))
+        
+        with patch.object(OptimizedPaginator, '_get_estimated_count', return_value=50000):
+            request = Request(APIRequestFactory().get('/jobs/', {'page': 60}))
+            results = pagination.paginate_queryset(queryset, request)
+            response = pagination.get_paginated_response(results)
+            
+            self.assertEqual(results, [])
+            self.assertIsNone(response.data['next'])
+            self.assertFalse(response.data['pagination_info']['has_next'])
+            
+            request = Request(APIRequestFactory().get('/jobs/', {'page': 50}))
+            self.assertEqual(len(pagination.paginate_queryset(queryset, request)), 20)
+            self.assertIsNone(pagination.get_paginated_response([]).data['next'])
+    
+    def test_keyset_pages_cover_ties_once_in_both_directions(self):
+        """
+        Rows sharing a created_at are neither skipped nor repeated, forwards or backwards
+        """
+        queryset = JobPost.objects.filter(location='Location 7')
+        queryset.update(created_at=timezone.now())
+        paginator = KeysetPaginator(page_size=6)
+        
+        pages, cursor = [], None
+        while True:
+            page = paginator.paginate(queryset, cursor)
+            pages.append([job.id for job in page.items])
+            if not page.has_next:
+                break
+            cursor = page.next_cursor
+        seen = [job_id for items in pages for job_id in items]
+        self.assertEqual(len(seen), 20)
+        self.assertEqual(seen, list(queryset.order_by('-created_at', '-pk').values_list('id', flat=True)))
+        
+        previous = paginator.paginate(queryset, page.previous_cursor)
+        self.assertEqual([job.id for job in previous.items], pages[-2])
+        self.assertTrue(previous.has_next)
+    
+    def test_keyset_cursors_are_opaque_and_bound_to_ordering(self):
+        """
+        Tampered cursors and cursors from another ordering are rejected
+        """
+        queryset = JobPost.objects.filter(is_active=True)
+        cursor = KeysetPaginator(page_size=20).paginate(queryset).next_cursor
+        self.assertNotIn(str(queryset.order_by('-created_at', '-pk').values_list('id', flat=True)[19]), cursor)
+        
+        with self.assertRaises(InvalidCursor):
+            KeysetPaginator(page_size=20).paginate(queryset, cursor[:-2] + 'xx')
+        with self.assertRaises(InvalidCursor):
+            KeysetPaginator(('created_at', 'pk'), page_size=20).paginate(queryset, cursor)
+        
+        result = InfiniteScrollPagination(page_size=20).paginate_for_infinite_scroll(queryset, cursor)
+        self.assertEqual(result['count'], 20)
+        self.assertTrue(result['has_more'])
+
+
+class JobListSerializationBenchmark(TestCase):
+    """
+    Compare job list pages built from serialized instances with the values() projection.
+    """
+    
+    def setUp(self):
+        self.benchmark = PerformanceBenchmark("Job List Serialization")
+        recruiter = User.objects.create_user(
+            username='recruiter',
+            email='recruiter@test.com',
+            user_type='recruiter'
+        )
+        RecruiterProfile.objects.create(user=recruiter, company_name='Test Company')
+        
+        JobPost.objects.bulk_create([
+            JobPost(
+                recruiter=recruiter,
+                title=f'Job {i}',
+                description=f'Description {i}',
+                location='Remote',
+                job_type='full_time',
+                experience_level='mid',
+                skills_required='Python, Django, React, SQL, Docker, AWS'
+            )
+            for i in range(20)
+        ])
+        
+        # 50 applications per job
+        seekers = User.objects.bulk_create([
+            User(username=f'seeker{i}', email=f'seeker{i}@test.com', user_type='job_seeker')
+            for i in range(50)
+        ])
+        resumes = Resume.objects.bulk_create([
+            Resume(job_seeker=seeker, original_filename='cv.pdf', file_size=1024) for seeker in seekers
+        ])
+        Application.objects.bulk_create([
+            Application(job_seeker=resume.job_seeker, job_post=job, resume=resume)
+            for job in JobPost.objects.all() for resume in resumes
+        ])
+        
+        self.queryset = JobPost.objects.order_by('-created_at')
+    
+    def test_projection_vs_serializer(self):
+        """
+        Rows fetched and time per page of 20 jobs
+        """
+        from matcher.serializers import JobPostListSerializer
+        from matcher.list_projections import (
+            JOB_POST_LIST_FIELDS, parse_fields_param, project_rows, render_rows
+        )
+        
+        fields = parse_fields_param(None, JOB_POST_LIST_FIELDS)
+        rows_fetched = {}
+        
+        def serialized_page():
+            # The list path before projections: instances with every application prefetched
+            jobs = list(self.queryset.select_related(
+                'recruiter', 'recruiter__recruiter_profile'
+            ).prefetch_related('applications')[:20])
+            rows_fetched['serializer'] = len(jobs) + sum(len(job.applications.all()) for job in jobs)
+            return JobPostListSerializer(jobs, many=True).data
+        
+        def projected_page():
+            rows = list(project_rows(self.queryset, JOB_POST_LIST_FIELDS, fields)[:20])
+            rows_fetched['projection'] = len(rows)
+            return render_rows(rows, JOB_POST_LIST_FIELDS, fields)
+        
+        serializer_stats = self.benchmark.run_benchmark(serialized_page, iterations=10)
+        projection_stats = self.benchmark.run_benchmark(projected_page, iterations=10)
+        
+        self.assertEqual(rows_fetched['serializer'], 20 + 20 * 50)
+        self.assertEqual(rows_fetched['projection'], 20)
+        self.assertLess(projection_stats['avg_time'], serializer_stats['avg_time'])
+        
+        logger.info(f"Job list page via serializer ({rows_fetched['serializer']} rows): {serializer_stats}")
+        logger.info(f"Job list page via projection ({rows_fetched['projection']} rows): {projection_stats}")
+
+
+class JSONEncodingBenchmark(TestCase):
+    """
+    Compare the fast JSON renderer and parser with DRF's stdlib-based ones.
+    """
+    
+    def setUp(self):
+        self.benchmark = PerformanceBenchmark("JSON Encoding")
+        now = timezone.now()
+        self.payload = {
+            'count': 100,
+            'results': [
+                {
+                    'id': uuid.uuid4(),
+                    'title': f'Job {i} \u2014 Senior Engineer',
+                    'salary_min': Decimal('85000.00'),
+                    'created_at': now - timedelta(days=i),
+                    'deadline': (now + timedelta(days=30)).date(),
+                    'skills_list': ['Python', 'Django', 'React', 'SQL', 'Docker'],
+                    'is_featured': i % 5 == 0,
+                    'views_count': i * 7,
+                }
+                for i in range(100)
+            ]
+        }
+    
+    def test_renderer_matches_drf(self):
+        """
+        Same bytes as JSONRenderer on both backends
+        """
+        from rest_framework.renderers import JSONRenderer
+        from matcher.renderers import FastJSONRenderer
+        from matcher import fast_json
+        
+        payload = {'text': 'line\u2028break', **self.payload}
+        expected = JSONRenderer().render(payload)
+        self.assertEqual(FastJSONRenderer().render(payload), expected)
+        with patch.object(fast_json, 'USE_ORJSON', False):
+            self.assertEqual(FastJSONRenderer().render(payload), expected)
+    
+    def test_parser_round_trip(self):
+        """
+        Parsed bodies equal the stdlib decoding; malformed bodies raise ParseError
+        """
+        from io import BytesIO
+        from rest_framework.exceptions import ParseError
+        from rest_framework.renderers import JSONRenderer
+        from matcher.parsers import FastJSONParser
+        
+        body = JSONRenderer().render(self.payload)
+        self.assertEqual(FastJSONParser().parse(BytesIO(body)), json.loads(body))
+        with self.assertRaises(ParseError):
+            FastJSONParser().parse(BytesIO(b'{"title": '))
+    
+    def test_fast_renderer_vs_drf(self):
+        """
+        Time to render a 100-job response
+        """
+        from rest_framework.renderers import JSONRenderer
+        from matcher.renderers import FastJSONRenderer
+        from matcher import fast_json
+        
+        drf_stats = self.benchmark.run_benchmark(JSONRenderer().render, 50, self.payload)
+        fast_stats = self.benchmark.run_benchmark(FastJSONRenderer().render, 50, self.payload)
+        
+        if fast_json.USE_ORJSON:
+            self.assertLess(fast_stats['avg_time'], drf_stats['avg_time'])
+        
+        logger.info(f"JSONRenderer: {drf_stats}")
+        logger.info(f"FastJSONRenderer (orjson={fast_json.USE_ORJSON}): {fast_stats}")
+
+
+class NotificationFanoutBenchmark(TestCase):
+    """
+    Job posted notification fan-out against 100k job seekers, one in ten relevant.
+    """
+    SEEKERS = 100000
+    RELEVANT_EVERY = 10
+    CHUNK_SIZE = 1000
+    
+    @classmethod
+    def setUpTestData(cls):
+        python = Skill.objects.create(name='Python', category='language')
+        recruiter = User.objects.create_user(
+            username='recruiter', email='recruiter@test.com', user_type='recruiter'
+        )
+        RecruiterProfile.objects.create(user=recruiter, company_name='Test Company')
+        
+        # bulk_create skips the signals, so no seeker has stored preferences
+        seekers = User.objects.bulk_create([
+            User(username=f'seeker{i}', email=f'seeker{i}@test.com', user_type='job_seeker', password='!')
+            for i in range(cls.SEEKERS)
+        ], batch_size=5000)
+        UserSkill.objects.bulk_create([
+            UserSkill(user=seeker, skill=python, proficiency_level='intermediate')
+            for seeker in seekers[::cls.RELEVANT_EVERY]
+        ], batch_size=5000)
+        
+        cls.job_post = JobPost.objects.create(
+            recruiter=recruiter,
+            title='Python Engineer',
+            description='Python developer position',
+            location='Remote',
+            remote_work_allowed=True,
+            job_type='full_time',
+            experience_level='mid',
+            skills_required='Python, Django'
+        )
+    
+    def setUp(self):
+        self.benchmark = PerformanceBenchmark("Notification Fan-out")
+    
+    def test_fan_out_selects_relevant_seekers_in_chunks(self):
+        """
+        Recipient selection costs one query per chunk, whatever the number of job seekers
+        """
+        from matcher.notification_fanout import fan_out_job_posted_notifications
+        
+        expected = self.SEEKERS // self.RELEVANT_EVERY
+        chunks = []
+        with CaptureQueriesContext(connection) as queries:
+            stats = self.benchmark.run_benchmark(
+                lambda: fan_out_job_posted_notifications(self.job_post, self.CHUNK_SIZE, chunks.append),
+                iterations=1
+            )
+        
+        self.assertEqual(sum(len(chunk) for chunk in chunks), expected)
+        self.assertEqual(len(queries), len(chunks) + 1)
+        logger.info(f"Fan-out of {expected} recipients in {len(chunks)} chunks: {stats}")
+    
+    def test_chunk_creation_throughput(self):
+        """
+        Creating one chunk takes a fixed number of queries and no preference rows
+        """
+        from matcher.notification_fanout import create_job_posted_notifications, iter_recipient_chunks
+        from matcher.notification_service import notification_service
+        
+        chunk = next(iter_recipient_chunks(self.job_post, self.CHUNK_SIZE))
+        notification_service.job_posted_content(self.job_post)
+        
+        with CaptureQueriesContext(connection) as queries:
+            stats = self.benchmark.run_benchmark(
+                lambda: create_job_posted_notifications(self.job_post, chunk), iterations=1
+            )
+        
+        self.assertEqual(Notification.objects.filter(job_post=self.job_post).count(), len(chunk))
+        self.assertFalse(NotificationPreference.objects.filter(user__user_type='job_seeker').exists())
+        # Includes building the seekers' missing dashboard counter rows in one batch
+        self.assertLess(len(queries), 20)
+        logger.info(f"Created {len(chunk)} notifications in {stats['avg_time']:.3f}s "
+                    f"({len(chunk) / stats['avg_time']:.0f}/s, {len(queries)} queries)")
+
+
+class NotificationDeliveryBenchmark(TestCase):
+    """
+    Real-time delivery of a bulk notification batch, half of the recipients
+    connected to another process.
+    """
+    RECIPIENTS = 1000
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.recipients = User.objects.bulk_create([
+            User(username=f'recipient{i}', email=f'recipient{i}@test.com', user_type='job_seeker', password='!')
+            for i in range(cls.RECIPIENTS)
+        ])
+    
+    def setUp(self):
+        from matcher.middleware import websocket_connection_manager
+        
+        self.benchmark = PerformanceBenchmark("Notification Delivery")
+        self.manager = websocket_connection_manager
+        self.online = [str(user.id) for user in self.recipients[::2]]
+        # Presence only, as seen from a Celery worker
+        for user_id in self.online:
+            self.manager._update_presence(user_id, f'test.channel.{user_id}', connected=True)
+    
+    def tearDown(self):
+        for user_id in self.online:
+            self.manager._update_presence(user_id, f'test.channel.{user_id}', connected=False)
+    
+    def _notifications(self):
+        return Notification.objects.bulk_create([
+            Notification(recipient=user, notification_type='system_update', title='Update', message='Update')
+            for user in self.recipients
+        ])
+    
+    def test_presence_is_shared_across_processes(self):
+        online = self.manager.online_user_ids([user.id for user in self.recipients])
+        
+        self.assertEqual(online, set(self.online))
+        self.assertTrue(self.manager.is_user_online(self.online[0]))
+        self.assertFalse(self.manager.is_user_online(str(self.recipients[1].id)))
+    
+    def test_presence_expires_without_refresh(self):
+        from matcher.cache_utils import get_redis_client
+        from matcher.middleware import PRESENCE_TTL
+        
+        client = get_redis_client()
+        if client is None:
+            self.skipTest("Presence needs Redis")
+        user_id = self.online[0]
+        key = self.manager._presence_key(user_id)
+        # A channel of a process that died, last refreshed more than a TTL ago
+        client.zadd(key, {f'test.channel.{user_id}': time.time() - 1})
+        
+        self.assertFalse(self.manager.is_user_online(user_id))
+        
+        self.manager.add_connection(user_id, f'test.live.{user_id}', {'consumer_type': 'notification'})
+        try:
+            # Dead channels are dropped whenever a live one refreshes
+            self.assertEqual(client.zcard(key), 1)
+            self.assertLessEqual(client.ttl(key), PRESENCE_TTL)
+            
+            self.manager.connection_metadata[f'test.live.{user_id}']['presence_refreshed_at'] = 0
+            client.expire(key, 5)
+            self.manager.touch_connection(user_id, f'test.live.{user_id}')
+            self.assertGreater(client.ttl(key), 5)
+            self.assertTrue(self.manager.is_user_online(user_id))
+        finally:
+            self.manager.remove_connection(user_id, f'test.live.{user_id}')
+    
+    def test_bulk_delivery_throughput(self):
+        """
+        One presence round trip, one channel-layer batch and one UPDATE beat a round trip per notification
+        """
+        from matcher.notification_service import notification_service
+        
+        methods = ['websocket'] * self.RECIPIENTS
+        
+        with patch.object(notification_service, 'queue_notifications_for_offline_users'):
+            notifications = self._notifications()
+            started = time.perf_counter()
+            for notification, method in zip(notifications, methods):
+                notification_service._handle_notification_delivery(notification, method, send_real_time=True)
+            one_by_one = time.perf_counter() - started
+            
+            notifications = self._notifications()
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                notification_service._deliver_bulk(notifications, methods)
+                bulk = time.perf_counter() - started
+        
+        sent = Notification.objects.filter(id__in=[notification.id for notification in notifications], is_sent=True)
+        self.assertEqual(sent.count(), len(self.online))
+        self.assertEqual(len(queries), 1)
+        logger.info(f"Delivered {self.RECIPIENTS} notifications: one by one {self.RECIPIENTS / one_by_one:.0f}/s, "
+                    f"bulk {self.RECIPIENTS / bulk:.0f}/s")
+        self.assertLess(bulk, one_by_one)
 
 
 class OverallPerformanceBenchmark(TestCase):